@@ -0,0 +1,65 @@
+from celery import shared_task
+from celery.utils.log import get_task_logger
+
+from api.applications.helpers import auto_match_sanctions
+from api.applications.libraries.submission_pipeline import fail_submission_pipeline, run_submission_pipeline_stages
+from api.applications.models import StandardApplication
+from api.staticdata.statuses.enums import CaseStatusEnum
+
+
+MAX_ATTEMPTS = 5
+RETRY_BACKOFF = 30
+
+SANCTIONS_MATCHING_BATCH_SIZE = 100
+# Seconds to wait between batches so that re-matching doesn't crowd out searches made by users
+SANCTIONS_MATCHING_BATCH_INTERVAL = 10
+
+
+logger = get_task_logger(__name__)
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=(Exception,),
+    max_retries=MAX_ATTEMPTS,
+    retry_backoff=RETRY_BACKOFF,
+)
+def run_submission_pipeline(self, application_id, run_id, base_url):
+    """
+    Runs the work that follows an application being submitted: flagging and routing rules, sanctions
+    matching and generating the application form
+    """
+    logger.info("Running submission pipeline %s for application %s", run_id, application_id)
+    try:
+        run_submission_pipeline_stages(application_id, run_id, base_url)
+    except Exception as e:
+        if self.request.retries >= self.max_retries:
+            logger.exception("Submission pipeline %s for application %s failed", run_id, application_id)
+            fail_submission_pipeline(application_id, run_id, e)
+        raise
+
+
+@shared_task
+def match_sanctions_for_open_cases(after_id=None):
+    """
+    Re-runs sanctions matching for open standard applications one batch at a time, queueing the next batch
+    to run after a pause
+    """
+    applications = (
+        StandardApplication.objects.filter(status__is_terminal=False)
+        .exclude(status__status=CaseStatusEnum.DRAFT)
+        .order_by("id")
+        .only("id")
+    )
+    if after_id:
+        applications = applications.filter(id__gt=after_id)
+
+    batch = list(applications[:SANCTIONS_MATCHING_BATCH_SIZE])
+    for application in batch:
+        auto_match_sanctions(application)
+    logger.info("Matched sanctions for %s open applications after %s", len(batch), after_id)
+
+    if len(batch) == SANCTIONS_MATCHING_BATCH_SIZE:
+        match_sanctions_for_open_cases.apply_async(
+            args=(str(batch[-1].id),), countdown=SANCTIONS_MATCHING_BATCH_INTERVAL
+        )
@@ -182,3 +182,10 @@ class SecurityClassifiedApprovalsType(models.TextChoices):
 class NSGListType(models.TextChoices):
     TRIGGER_LIST = "TRIGGER_LIST"
     DUAL_USE = "DUAL_USE"
+
+
+class SubmissionPipelineStatus(models.TextChoices):
+    PENDING = "pending", "Pending"
+    RUNNING = "running", "Running"
+    COMPLETE = "complete", "Complete"
+    FAILED = "failed", "Failed"
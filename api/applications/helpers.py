@@ -4,17 +4,18 @@ from datetime import timedelta
 from django.conf import settings
 from django.utils import timezone
 
-from elasticsearch_dsl import Search, Q
+from elasticsearch_dsl import MultiSearch, Search, Q
 from elasticsearch.exceptions import NotFoundError
 
 from api.appeals.constants import APPEAL_DAYS
-from api.applications.models import GoodOnApplication
+from api.applications.models import GoodOnApplication, PartyOnApplication
 from api.applications.serializers.good import GoodOnStandardLicenceSerializer
 from api.cases.enums import AdviceType, AdviceLevel
 from api.documents.models import Document
 from api.documents.libraries import s3_operations
 from api.external_data.models import SanctionMatch
 from api.licences.models import GoodOnLicence
+from api.parties.enums import PartyType
 
 logger = logging.getLogger(__name__)
 
@@ -98,38 +99,74 @@ def delete_uploaded_document(data):
         s3_operations.delete_file(None, doc_key)
 
 
+def get_sanction_search(name):
+    return (
+        Search(index=settings.ELASTICSEARCH_SANCTION_INDEX_ALIAS)
+        .query(build_query(name=name))
+        .update_from_dict({"size": 50, "collapse": {"field": "reference"}})
+    )
+
+
 def auto_match_sanctions(application):
-    parties = []
-    if application.end_user:
-        parties.append(application.end_user.party)
-
-    for item in application.ultimate_end_users:
-        parties.append(item.party)
-
-    for party in parties:
-        query = build_query(name=party.signatory_name_euu)
-        results = (
-            Search(index=settings.ELASTICSEARCH_SANCTION_INDEX_ALIAS)
-            .query(query)
-            .update_from_dict({"size": 50, "collapse": {"field": "reference"}})
-        )
+    """
+    Matches the end user and ultimate end users of `application` against the sanctions index with a single
+    multi-search request, recording and flagging any matches that haven't been found before
+    """
+    parties_on_application = list(
+        application.parties.filter(
+            deleted_at__isnull=True, party__type__in=[PartyType.END_USER, PartyType.ULTIMATE_END_USER]
+        ).select_related("party")
+    )
+    if not parties_on_application:
+        return
+
+    multi_search = MultiSearch(index=settings.ELASTICSEARCH_SANCTION_INDEX_ALIAS)
+    for party_on_application in parties_on_application:
+        multi_search = multi_search.add(get_sanction_search(party_on_application.party.signatory_name_euu))
 
+    try:
+        responses = multi_search.execute(raise_on_error=False)
+    except NotFoundError:
+        return
+
+    existing_matches = set(
+        SanctionMatch.objects.filter(party_on_application__in=parties_on_application).values_list(
+            "party_on_application_id", "elasticsearch_reference"
+        )
+    )
+    new_matches = []
+    for party_on_application, response in zip(parties_on_application, responses):
         try:
-            matches = results.execute().hits
-        except (KeyError, NotFoundError):
-            pass
-        else:
-            for match in matches:
-                if match.meta.score > 0.5:
-                    party_on_application = application.parties.get(party=party)
-                    reference = match["reference"][0]
-                    if not party_on_application.sanction_matches.filter(elasticsearch_reference=reference).exists():
-                        SanctionMatch.objects.create(
-                            party_on_application=party_on_application,
-                            elasticsearch_reference=reference,
-                            name=match["name"],
-                            flag_uuid=match["flag_uuid"],
-                        )
+            hits = response.hits
+        except KeyError:
+            continue
+        for match in hits:
+            reference = match["reference"][0]
+            if match.meta.score <= 0.5 or (party_on_application.id, reference) in existing_matches:
+                continue
+            existing_matches.add((party_on_application.id, reference))
+            new_matches.append(
+                SanctionMatch(
+                    party_on_application=party_on_application,
+                    elasticsearch_reference=reference,
+                    name=match["name"],
+                    flag_uuid=match["flag_uuid"],
+                )
+            )
+
+    if not new_matches:
+        return
+
+    SanctionMatch.objects.bulk_create(new_matches, ignore_conflicts=True)
+    # bulk_create skips SanctionMatch.save, which is what normally flags the party
+    PartyOnApplicationFlag = PartyOnApplication.flags.through
+    PartyOnApplicationFlag.objects.bulk_create(
+        [
+            PartyOnApplicationFlag(partyonapplication_id=match.party_on_application.id, flag_id=match.flag_uuid)
+            for match in new_matches
+        ],
+        ignore_conflicts=True,
+    )
 
 
 def normalize_address(value):
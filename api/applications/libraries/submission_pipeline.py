@@ -0,0 +1,109 @@
+import logging
+import uuid
+from uuid import UUID
+
+from django.db import transaction
+from django.utils import timezone
+
+from api.applications.enums import SubmissionPipelineStatus
+from api.applications.helpers import auto_match_sanctions
+from api.applications.libraries.get_applications import get_application
+from api.applications.models import ApplicationSubmissionPipeline
+from api.cases.enums import CaseTypeSubTypeEnum
+from api.cases.generated_documents.helpers import auto_generate_case_document
+from api.cases.models import CaseQueueMovement
+from api.core.constants import AutoGeneratedDocuments
+from api.flags.enums import SystemFlags
+from lite_routing.routing_rules_internal.flagging_engine import apply_flagging_rules_to_case
+from lite_routing.routing_rules_internal.routing_engine import run_routing_rules
+
+logger = logging.getLogger(__name__)
+
+
+def apply_flagging_rules(application, base_url):
+    apply_flagging_rules_to_case(application)
+
+
+def apply_routing_rules(application, base_url):
+    queues_assigned = run_routing_rules(application)
+    created_at = timezone.now()
+    for queue in queues_assigned:
+        CaseQueueMovement.objects.create(case=application.case_ptr, queue_id=queue, created_at=created_at)
+
+
+def add_enforcement_check_flag(application, base_url=None):
+    if UUID(SystemFlags.ENFORCEMENT_CHECK_REQUIRED) not in application.flags.values_list("id", flat=True):
+        application.flags.add(SystemFlags.ENFORCEMENT_CHECK_REQUIRED)
+
+
+def match_sanctions(application, base_url):
+    if application.case_type.sub_type in [CaseTypeSubTypeEnum.STANDARD]:
+        auto_match_sanctions(application)
+
+
+def generate_application_form(application, base_url):
+    auto_generate_case_document(
+        "application_form",
+        application,
+        AutoGeneratedDocuments.APPLICATION_FORM,
+        base_url,
+    )
+
+
+# Run in this order, as routing depends on the flags applied before it
+STAGES = (
+    ("flagging_rules", apply_flagging_rules),
+    ("routing_rules", apply_routing_rules),
+    ("enforcement_check_flag", add_enforcement_check_flag),
+    ("sanctions_matching", match_sanctions),
+    ("application_form", generate_application_form),
+)
+
+
+def reset_submission_pipeline(application):
+    """
+    Records that the post-submission stages are outstanding for `application`, superseding any run
+    left over from an earlier submission of it
+    """
+    pipeline, _ = ApplicationSubmissionPipeline.objects.update_or_create(
+        application=application,
+        defaults={
+            "run_id": uuid.uuid4(),
+            "status": SubmissionPipelineStatus.PENDING,
+            "completed_stages": [],
+            "error": "",
+        },
+    )
+    return pipeline
+
+
+def run_submission_pipeline_stages(application_id, run_id, base_url):
+    """
+    Runs each outstanding stage in its own transaction along with recording it as completed, so a retried
+    run picks up from the first stage that didn't complete rather than repeating earlier ones
+    """
+    for stage_name, stage in STAGES:
+        with transaction.atomic():
+            # Locking the pipeline row stops two workers running the same stage at once
+            pipeline = ApplicationSubmissionPipeline.objects.select_for_update().get(application_id=application_id)
+            if str(pipeline.run_id) != str(run_id):
+                logger.info("Submission pipeline run %s for %s has been superseded", run_id, application_id)
+                return
+            if stage_name in pipeline.completed_stages:
+                continue
+
+            stage(get_application(application_id), base_url)
+
+            pipeline.completed_stages.append(stage_name)
+            pipeline.status = SubmissionPipelineStatus.RUNNING
+            pipeline.save()
+
+    ApplicationSubmissionPipeline.objects.filter(application_id=application_id, run_id=run_id).update(
+        status=SubmissionPipelineStatus.COMPLETE, updated_at=timezone.now()
+    )
+
+
+def fail_submission_pipeline(application_id, run_id, error):
+    ApplicationSubmissionPipeline.objects.filter(application_id=application_id, run_id=run_id).update(
+        status=SubmissionPipelineStatus.FAILED, error=str(error), updated_at=timezone.now()
+    )
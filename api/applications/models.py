@@ -13,6 +13,7 @@ from api.applications.enums import (
     ApplicationExportLicenceOfficialType,
     SecurityClassifiedApprovalsType,
     NSGListType,
+    SubmissionPipelineStatus,
 )
 from api.applications.managers import BaseApplicationManager, StandardApplicationQuerySet
 from api.applications.libraries.application_helpers import create_submitted_audit
@@ -788,3 +789,21 @@ class DenialMatchOnApplication(TimestampableModel):
         DenialEntity, related_name="denial_matches_on_application", on_delete=models.CASCADE
     )
     category = models.TextField(choices=denial_enums.DenialMatchCategory.choices)
+
+
+class ApplicationSubmissionPipeline(TimestampableModel):
+    """
+    Tracks the work done in the background once an application has been submitted, so that caseworkers can
+    see whether flagging, routing, sanctions matching and the application form are still outstanding
+    """
+
+    application = models.OneToOneField(
+        BaseApplication, primary_key=True, on_delete=models.CASCADE, related_name="submission_pipeline"
+    )
+    # Regenerated on every submission so that a run left over from an earlier submission stops itself
+    run_id = models.UUIDField(default=uuid.uuid4)
+    status = models.CharField(
+        choices=SubmissionPipelineStatus.choices, default=SubmissionPipelineStatus.PENDING, max_length=20
+    )
+    completed_stages = ArrayField(models.CharField(max_length=50), default=list, blank=True)
+    error = models.TextField(blank=True, default="")
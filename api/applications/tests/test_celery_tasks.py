@@ -0,0 +1,22 @@
+from unittest import mock
+
+from api.applications import celery_tasks
+from api.staticdata.statuses.enums import CaseStatusEnum
+from api.staticdata.statuses.libraries.get_case_status import get_case_status_by_status
+from test_helpers.clients import DataTestClient
+
+
+class MatchSanctionsForOpenCasesTests(DataTestClient):
+    @mock.patch.object(celery_tasks, "SANCTIONS_MATCHING_BATCH_SIZE", 2)
+    @mock.patch("api.applications.celery_tasks.auto_match_sanctions")
+    def test_matches_every_open_application_in_batches(self, mock_auto_match_sanctions):
+        open_applications = [self.create_standard_application_case(self.organisation) for _ in range(3)]
+        finalised = self.create_standard_application_case(self.organisation)
+        finalised.status = get_case_status_by_status(CaseStatusEnum.FINALISED)
+        finalised.save()
+        self.create_draft_standard_application(self.organisation)
+
+        celery_tasks.match_sanctions_for_open_cases()
+
+        matched_ids = [call.args[0].id for call in mock_auto_match_sanctions.call_args_list]
+        self.assertEqual(matched_ids, sorted(application.id for application in open_applications))
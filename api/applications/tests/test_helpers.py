@@ -59,6 +59,32 @@ class AbstractAutoMatchTests:
         self.assertEqual(party_on_application.sanction_matches.first().elasticsearch_reference, "123")
         self.assertEqual(str(party_on_application.flags.first().pk), SystemFlags.SANCTION_UK_MATCH)
 
+    @pytest.mark.elasticsearch
+    def test_auto_match_sanctions_rerun_does_not_duplicate_matches(self):
+        prepare_index()
+
+        application = self.create_application()
+
+        party = self.get_party(application)
+        party.signatory_name_euu = "Jim Example"
+        party.save()
+
+        SanctionDocumentType(
+            name=party.signatory_name_euu,
+            address="123 fake street",
+            flag_uuid=SystemFlags.SANCTION_UK_MATCH,
+            reference="123",
+        ).save()
+        SanctionDocumentType._index.refresh()
+
+        helpers.auto_match_sanctions(application)
+        helpers.auto_match_sanctions(application)
+
+        party_on_application = application.parties.get(party=party)
+
+        self.assertEqual(party_on_application.sanction_matches.count(), 1)
+        self.assertEqual(party_on_application.flags.count(), 1)
+
     @pytest.mark.elasticsearch
     def test_auto_match_sanctions_avoid_false_positives(self):
         names = [
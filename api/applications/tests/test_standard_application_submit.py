@@ -309,7 +309,8 @@ class StandardApplicationTests(DataTestClient):
 
         url = reverse("applications:application_submit", kwargs={"pk": standard_application.id})
 
-        response = self.client.put(url, data, **self.exporter_headers)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put(url, data, **self.exporter_headers)
 
         standard_application.refresh_from_db()
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -402,7 +403,8 @@ class StandardApplicationTests(DataTestClient):
         }
 
         url = reverse("applications:application_submit", kwargs={"pk": self.draft.id})
-        response = self.client.put(url, data, **self.exporter_headers)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put(url, data, **self.exporter_headers)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
@@ -488,7 +490,8 @@ class StandardApplicationTests(DataTestClient):
         }
         url = reverse("applications:application_submit", kwargs={"pk": draft.id})
 
-        response = self.client.put(url, data=data, **self.exporter_headers)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put(url, data=data, **self.exporter_headers)
         self.draft.refresh_from_db()
         case_flags = [str(flag_id) for flag_id in draft.flags.values_list("id", flat=True)]
 
@@ -532,7 +535,8 @@ class StandardApplicationTests(DataTestClient):
             "foi_reason": "Because",
             "agreed_to_declaration_text": "I Agree",
         }
-        response = self.client.put(self.url, data=data, **self.exporter_headers)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put(self.url, data=data, **self.exporter_headers)
         self.draft.refresh_from_db()
         case_flags = [str(flag_id) for flag_id in self.draft.flags.values_list("id", flat=True)]
 
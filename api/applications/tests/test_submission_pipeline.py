@@ -0,0 +1,76 @@
+from unittest import mock
+
+from django.urls import reverse
+from rest_framework import status
+
+from api.applications.enums import SubmissionPipelineStatus
+from api.applications.libraries import submission_pipeline
+from api.applications.models import ApplicationSubmissionPipeline
+from api.cases.enums import CaseDocumentState
+from api.cases.models import CaseDocument
+from test_helpers.clients import DataTestClient
+
+
+@mock.patch("api.documents.libraries.s3_operations.upload_bytes_file")
+@mock.patch("api.cases.generated_documents.helpers.html_to_pdf")
+class SubmissionPipelineTests(DataTestClient):
+    def setUp(self):
+        super().setUp()
+        self.draft = self.create_draft_standard_application(self.organisation)
+        self.url = reverse("applications:application_submit", kwargs={"pk": self.draft.id})
+        self.exporter_user.set_role(self.organisation, self.exporter_super_user_role)
+        self.data = {
+            "submit_declaration": True,
+            "agreed_to_declaration": True,
+            "agreed_to_foi": True,
+            "foi_reason": "Because",
+            "agreed_to_declaration_text": "I Agree",
+        }
+
+    def test_submit_returns_before_pipeline_runs(self, html_to_pdf_func, upload_bytes_file_func):
+        response = self.client.put(self.url, self.data, **self.exporter_headers)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        pipeline = ApplicationSubmissionPipeline.objects.get(application=self.draft)
+        self.assertEqual(pipeline.status, SubmissionPipelineStatus.PENDING)
+        self.assertEqual(pipeline.completed_stages, [])
+        html_to_pdf_func.assert_not_called()
+
+    def test_pipeline_runs_every_stage_after_commit(self, html_to_pdf_func, upload_bytes_file_func):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.put(self.url, self.data, **self.exporter_headers)
+
+        pipeline = ApplicationSubmissionPipeline.objects.get(application=self.draft)
+        self.assertEqual(pipeline.status, SubmissionPipelineStatus.COMPLETE)
+        self.assertEqual(pipeline.completed_stages, [name for name, _ in submission_pipeline.STAGES])
+        self.assertEqual(
+            CaseDocument.objects.filter(case=self.draft, type=CaseDocumentState.AUTO_GENERATED).count(),
+            1,
+        )
+
+        case_response = self.client.get(reverse("cases:case", kwargs={"pk": self.draft.id}), **self.gov_headers)
+        case_pipeline = case_response.json()["case"]["submission_pipeline"]
+        self.assertEqual(case_pipeline["status"], SubmissionPipelineStatus.COMPLETE)
+
+    def test_pipeline_skips_completed_stages(self, html_to_pdf_func, upload_bytes_file_func):
+        pipeline = submission_pipeline.reset_submission_pipeline(self.draft)
+        pipeline.completed_stages = ["flagging_rules", "routing_rules", "enforcement_check_flag", "sanctions_matching"]
+        pipeline.save()
+
+        submission_pipeline.run_submission_pipeline_stages(self.draft.id, pipeline.run_id, "http://testserver/")
+
+        pipeline.refresh_from_db()
+        self.assertEqual(pipeline.status, SubmissionPipelineStatus.COMPLETE)
+        self.assertEqual(pipeline.completed_stages[-1], "application_form")
+        html_to_pdf_func.assert_called_once()
+
+    def test_superseded_run_does_nothing(self, html_to_pdf_func, upload_bytes_file_func):
+        old_run_id = submission_pipeline.reset_submission_pipeline(self.draft).run_id
+        submission_pipeline.reset_submission_pipeline(self.draft)
+
+        submission_pipeline.run_submission_pipeline_stages(self.draft.id, old_run_id, "http://testserver/")
+
+        pipeline = ApplicationSubmissionPipeline.objects.get(application=self.draft)
+        self.assertEqual(pipeline.status, SubmissionPipelineStatus.PENDING)
+        self.assertEqual(pipeline.completed_stages, [])
+        html_to_pdf_func.assert_not_called()
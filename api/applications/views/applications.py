@@ -1,5 +1,5 @@
 from copy import deepcopy
-from uuid import UUID
+from functools import partial
 
 from django.db import transaction
 from django.db.models import F, Q
@@ -23,10 +23,8 @@ from api.appeals.models import Appeal
 from api.appeals.serializers import AppealSerializer
 from api.applications import constants
 from api.applications.creators import validate_application_ready_for_submission, validate_agree_to_declaration
-from api.applications.helpers import (
-    validate_and_create_goods_on_licence,
-    auto_match_sanctions,
-)
+from api.applications.celery_tasks import run_submission_pipeline
+from api.applications.helpers import validate_and_create_goods_on_licence
 from api.applications.libraries.application_helpers import (
     can_status_be_set_by_gov_user,
 )
@@ -38,6 +36,11 @@ from api.applications.libraries.edit_applications import (
 from api.applications.libraries.get_applications import get_application
 from api.applications.libraries.goods_on_applications import add_goods_flags_to_submitted_application
 from api.applications.libraries.licence import get_default_duration
+from api.applications.libraries.submission_pipeline import (
+    add_enforcement_check_flag,
+    match_sanctions,
+    reset_submission_pipeline,
+)
 from api.applications.models import (
     BaseApplication,
     SiteOnApplication,
@@ -61,15 +64,13 @@ from api.cases.enums import (
     CaseTypeEnum,
     CaseTypeReferenceEnum,
 )
-from api.cases.models import CaseQueueMovement
 from api.cases.generated_documents.models import GeneratedCaseDocument
-from api.cases.generated_documents.helpers import auto_generate_case_document
 from api.cases.libraries.get_flags import get_flags
 from api.cases.notify import notify_exporter_appeal_acknowledgement
 from api.cases.serializers import ApplicationManageSubStatusSerializer
 from api.cases.celery_tasks import get_application_target_sla
 from api.core.authentication import ExporterAuthentication, GovAuthentication
-from api.core.constants import ExporterPermissions, GovPermissions, AutoGeneratedDocuments
+from api.core.constants import ExporterPermissions, GovPermissions
 from api.core.decorators import (
     application_is_editable,
     application_is_major_editable,
@@ -83,7 +84,7 @@ from api.core.permissions import (
 )
 from api.applications.views.filters import ApplicationSiteFilter, ApplicationStateFilter
 from api.applications.views.helpers.advice import ensure_lu_countersign_complete
-from api.flags.enums import FlagStatuses, SystemFlags
+from api.flags.enums import FlagStatuses
 from api.goods.serializers import GoodCreateSerializer
 from api.goods.models import FirearmGoodDetails
 from api.licences.enums import LicenceStatus
@@ -100,9 +101,6 @@ from api.staticdata.statuses.serializers import CaseSubStatusSerializer
 from api.staticdata.statuses.models import CaseSubStatus
 from api.users.libraries.notifications import get_case_notifications
 from api.users.models import ExporterUser
-from lite_routing.routing_rules_internal.flagging_engine import apply_flagging_rules_to_case
-
-from lite_routing.routing_rules_internal.routing_engine import run_routing_rules
 
 
 class ApplicationList(ListCreateAPIView):
@@ -301,17 +299,6 @@ class ApplicationSubmission(APIView):
             application.on_submit(old_status)
 
             add_goods_flags_to_submitted_application(application)
-            apply_flagging_rules_to_case(application)
-            auto_generate_case_document(
-                "application_form",
-                application,
-                AutoGeneratedDocuments.APPLICATION_FORM,
-                request.build_absolute_uri(),
-            )
-            queues_assigned = run_routing_rules(application)
-            created_at = timezone.now()
-            for queue in queues_assigned:
-                CaseQueueMovement.objects.create(case=application.case_ptr, queue_id=queue, created_at=created_at)
 
             # Set the sites on this application as used so their name/site records located at are no longer editable
             sites_on_application = SiteOnApplication.objects.filter(application=application)
@@ -319,11 +306,20 @@ class ApplicationSubmission(APIView):
                 is_used_on_application=True
             )
 
-        if UUID(SystemFlags.ENFORCEMENT_CHECK_REQUIRED) not in application.flags.values_list("id", flat=True):
-            application.flags.add(SystemFlags.ENFORCEMENT_CHECK_REQUIRED)
-
-        if application.case_type.sub_type in [CaseTypeSubTypeEnum.STANDARD]:
-            auto_match_sanctions(application)
+            # Flagging and routing rules, sanctions matching and the application form run in the background once
+            # the submission has been committed
+            pipeline = reset_submission_pipeline(application)
+            transaction.on_commit(
+                partial(
+                    run_submission_pipeline.delay,
+                    str(application.id),
+                    str(pipeline.run_id),
+                    request.build_absolute_uri(),
+                )
+            )
+        else:
+            add_enforcement_check_flag(application)
+            match_sanctions(application, request.build_absolute_uri())
 
         # Serialize for the response message
         application_manifest = application.get_application_manifest()
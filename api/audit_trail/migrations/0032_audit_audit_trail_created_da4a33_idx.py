@@ -0,0 +1,17 @@
+# Generated by Django 4.2.19 on 2026-10-18 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("audit_trail", "0031_alter_audit_verb"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="audit",
+            index=models.Index(fields=["created_at", "id"], name="audit_trail_created_da4a33_idx"),
+        ),
+    ]
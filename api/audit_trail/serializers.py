@@ -44,6 +44,14 @@ class AuditSerializer(serializers.ModelSerializer):
             }
 
     def get_text(self, instance):
+        # Texts can be rendered ahead of time for a batch of audits and passed in the context, see get_audit_texts
+        texts = self.context.get("texts", {})
+        if instance.id in texts:
+            return texts[instance.id]
+        return self.render_text(instance)
+
+    @staticmethod
+    def render_text(instance):
         verb = AuditType(instance.verb)
         payload = deepcopy(instance.payload)
 
@@ -1,7 +1,10 @@
+from collections import defaultdict
 from datetime import date
 from typing import Dict, Union, Optional
 
+from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.db.models import Q
 from api.audit_trail.serializers import AuditSerializer
 from rest_framework.exceptions import PermissionDenied
@@ -141,6 +144,66 @@ def filter_object_activity(
     return audit_qs
 
 
+AUDIT_TEXT_CACHE_KEY = "audit-text"
+
+
+def prefetch_actors(audits):
+    """
+    Loads the actors of `audits` with a query for each type of actor, along with the teams of internal users, rather
+    than resolving each audit's actor and its team separately
+    """
+    actor_ids = defaultdict(set)
+    for audit in audits:
+        if audit.actor_content_type_id:
+            actor_ids[audit.actor_content_type_id].add(audit.actor_object_id)
+
+    actors = {}
+    for content_type_id, object_ids in actor_ids.items():
+        model_class = ContentType.objects.get_for_id(content_type_id).model_class()
+        queryset = model_class.objects.filter(pk__in=object_ids)
+        if model_class is GovUser:
+            queryset = queryset.select_related("team")
+        actors.update({(content_type_id, actor.pk): actor for actor in queryset})
+
+    for audit in audits:
+        Audit.actor.set_cached_value(audit, actors.get((audit.actor_content_type_id, audit.actor_object_id)))
+
+
+def get_audit_text_cache_key(audit_id):
+    return f"{AUDIT_TEXT_CACHE_KEY}:{audit_id}"
+
+
+def get_audit_texts(audits):
+    """
+    Returns the text of each of `audits` by id. Audits don't change once they have been created, so their text is
+    cached rather than rendered again each time they are viewed.
+    """
+    cache_keys = {audit.id: get_audit_text_cache_key(audit.id) for audit in audits}
+    cached_texts = cache.get_many(cache_keys.values())
+
+    texts = {}
+    rendered_texts = {}
+    for audit in audits:
+        cache_key = cache_keys[audit.id]
+        if cache_key in cached_texts:
+            texts[audit.id] = cached_texts[cache_key]
+        else:
+            texts[audit.id] = rendered_texts[cache_key] = AuditSerializer.render_text(audit)
+
+    if rendered_texts:
+        cache.set_many(rendered_texts, timeout=settings.AUDIT_TEXT_CACHE_TIMEOUT)
+    return texts
+
+
+def serialize_activity(audits):
+    """
+    Serializes `audits` with their actors and texts resolved in bulk
+    """
+    audits = list(audits)
+    prefetch_actors(audits)
+    return AuditSerializer(audits, many=True, context={"texts": get_audit_texts(audits)}).data
+
+
 def get_objects_activity_filters(object_id, object_content_type):
     audit_qs = Audit.objects.filter(
         Q(action_object_object_id=object_id, action_object_content_type=object_content_type)
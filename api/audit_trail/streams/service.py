@@ -2,15 +2,18 @@
 MVP activity stream. To be extended appropriately as requirements are drawn up.
 """
 
-from datetime import datetime
+import uuid
+from datetime import datetime, timedelta
+
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q
 from django.utils import timezone
+from rest_framework.exceptions import ValidationError
 
 from api.audit_trail.models import Audit
 from api.audit_trail.enums import AuditType
 from api.cases.models import Case
-from api.common.models import prefetch_generic_relations
 from api.staticdata.statuses.enums import CaseStatusEnum
 
 STREAMED_AUDITS = [
@@ -47,12 +50,29 @@ def date_to_local_tz(date):
     return date.isoformat()
 
 
-def case_record_json(case_id, last_created_at, countries):
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def encode_cursor(audit):
+    """
+    Encodes the position of `audit` in the stream as its created_at in microseconds and its id
+    """
+    return f"{(audit.created_at - EPOCH) // timedelta(microseconds=1)}_{audit.id}"
+
+
+def decode_cursor(cursor):
+    try:
+        microseconds, audit_id = cursor.split("_")
+        return EPOCH + timedelta(microseconds=int(microseconds)), uuid.UUID(audit_id)
+    except (ValueError, OverflowError):
+        raise ValidationError({"cursor": "Invalid cursor"})
+
+
+def case_record_json(case, last_created_at, countries):
     """
     Creates an activity stream compatible record for an application.
     A record is only produced for a case with the last activity seen for a case.
     """
-    case = Case.objects.select_related("status", "case_officer", "case_type").get(id=case_id)
     return {
         "id": "dit:lite:case:{case_type}:{id}:{verb}".format(
             case_type=case.case_type.sub_type, id=case.id, verb="Update"
@@ -78,14 +98,14 @@ def convert_status(status):
     return converted if converted else status
 
 
-def case_activity_json(audit, case_type):
+def case_activity_json(audit, case):
     """
     Creates an activity stream compatible record for an application activity
     """
-    case = audit.target or audit.action_object
     if not case:
         # Some applications in draft status are being deleted
         return {}
+    case_type = case.case_type.sub_type
     data_type = TYPE_MAPPING[AuditType(audit.verb)]
     verb = VERB_MAPPING[AuditType(audit.verb)]
     object_data = {
@@ -102,10 +122,10 @@ def case_activity_json(audit, case_type):
 
     # TODO: standardize audit payloads and clean
     if AuditType(audit.verb) == AuditType.CREATED:
-        if not audit.payload:
-            audit.payload = {"status": {"new": "clc_review" if case_type == "end_user_advisory" else "submitted"}}
-            audit.save()
-        object_data["dit:to"] = {"dit:lite:case:status": audit.payload["status"]["new"]}
+        payload = audit.payload or {
+            "status": {"new": "clc_review" if case_type == "end_user_advisory" else "submitted"}
+        }
+        object_data["dit:to"] = {"dit:lite:case:status": payload["status"]["new"]}
         object_data["type"] = [
             "dit:lite:case:create",
             "dit:lite:activity",
@@ -134,39 +154,33 @@ def case_activity_json(audit, case_type):
     }
 
 
-def get_stream(timestamp):
-    """
-    Returns a paginated stream of activities.
-    """
-    audit_qs = Audit.objects.filter(
-        verb__in=STREAMED_AUDITS,
-    ).order_by("created_at")
-    if timestamp > 0:
-        audit_qs = audit_qs.filter(created_at__gte=datetime.fromtimestamp(timestamp, timezone.utc))
-    audit_qs = audit_qs[: settings.STREAM_PAGE_SIZE]
-
-    if not audit_qs:
-        return {"data": [], "next_timestamp": None}
-
-    last_created_at = audit_qs[len(audit_qs) - 1].created_at
-    timestamp_qs = Audit.objects.filter(verb__in=STREAMED_AUDITS, created_at=last_created_at)
-
-    if timestamp_qs.count() > 1:
-        audit_qs = audit_qs | timestamp_qs
-
-    qs = prefetch_generic_relations(audit_qs)
+def get_case_id(audit):
+    return audit.target_object_id if audit.verb != AuditType.CREATED else audit.action_object_object_id
 
-    case_ids = [
-        value["target_object_id"] if value["verb"] != AuditType.CREATED else value["action_object_object_id"]
-        for value in qs.values("target_object_id", "verb", "action_object_object_id")
-    ]
 
-    case_types = Case.objects.filter(id__in=case_ids).select_related("case_type").values("id", "case_type__sub_type")
-    case_types = {value["id"]: value["case_type__sub_type"] for value in case_types}
-
-    latest_case_audits = (
+def get_stream(timestamp, cursor=None):
+    """
+    Returns a page of activities ordered by (created_at, id), starting after `cursor` when given or else from
+    `timestamp`. Each page costs a fixed number of queries however many cases it refers to.
+    """
+    audits = Audit.objects.filter(verb__in=STREAMED_AUDITS).order_by("created_at", "id")
+    if cursor:
+        created_at, audit_id = decode_cursor(cursor)
+        audits = audits.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=audit_id))
+    elif timestamp > 0:
+        audits = audits.filter(created_at__gte=datetime.fromtimestamp(timestamp, timezone.utc))
+    audits = list(audits[: settings.STREAM_PAGE_SIZE])
+
+    if not audits:
+        return {"data": [], "next_timestamp": None, "next_cursor": None}
+
+    case_ids = {get_case_id(audit) for audit in audits} | {audit.target_object_id for audit in audits}
+    case_ids.discard(None)
+    cases = Case.objects.filter(id__in=case_ids).select_related("status", "case_officer", "case_type").in_bulk()
+
+    latest_case_audits = set(
         Audit.objects.filter(
-            target_object_id__in=case_ids,
+            target_object_id__in=[audit.target_object_id for audit in audits if audit.target_object_id],
             target_content_type=ContentType.objects.get_for_model(Case),
             verb__in=STREAMED_AUDITS,
         )
@@ -178,14 +192,18 @@ def get_stream(timestamp):
     # Create stream for each activity
     stream = []
 
-    for audit in qs:
-        case_id = audit.target_object_id if audit.verb != AuditType.CREATED else audit.action_object_object_id
-        data = case_activity_json(audit, case_types.get(case_id))
+    for audit in audits:
+        data = case_activity_json(audit, cases.get(get_case_id(audit)))
         if data:
             stream.append(data)
-        if audit.id in latest_case_audits:
+        if audit.id in latest_case_audits and audit.target_object_id in cases:
             # Only create a case record for last seen activity for a given case.
             countries = []
-            stream.append(case_record_json(audit.target_object_id, audit.created_at, countries))
+            stream.append(case_record_json(cases[audit.target_object_id], audit.created_at, countries))
 
-    return {"data": stream, "next_timestamp": int(last_created_at.timestamp()) + 1}
+    last_audit = audits[-1]
+    return {
+        "data": stream,
+        "next_timestamp": int(last_audit.created_at.timestamp()),
+        "next_cursor": encode_cursor(last_audit),
+    }
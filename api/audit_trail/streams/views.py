@@ -4,15 +4,23 @@ from rest_framework.decorators import api_view
 from api.audit_trail.streams.service import get_stream
 
 
-def get_next_page_url(request, n):
-    request_url = request.build_absolute_uri("/").strip("/") + "/audit-trail/streams/{n}".format(n=n)
+def get_next_page_url(request, n, cursor):
+    request_url = request.build_absolute_uri("/").strip("/") + "/audit-trail/streams/{n}?cursor={cursor}".format(
+        n=n, cursor=cursor
+    )
     secure_url = request_url.replace("http://", "https://")
     return secure_url
 
 
 @api_view(["GET"])
 def streams(request, timestamp):
-    stream = get_stream(timestamp)
+    stream = get_stream(timestamp, request.GET.get("cursor"))
+    # Pages can be empty of items when every case they refer to has been deleted, so carry on while audits remain
+    next_page = (
+        {"next": get_next_page_url(request, stream["next_timestamp"], stream["next_cursor"])}
+        if stream["next_cursor"]
+        else {}
+    )
 
     return JsonResponse(
         {
@@ -21,6 +29,6 @@ def streams(request, timestamp):
                 {"dit": "https://www.trade.gov.uk/ns/activitystreams/v1"},
             ],
             "orderedItems": stream["data"],
-            **({"next": get_next_page_url(request, stream["next_timestamp"])} if len(stream["data"]) > 0 else {}),
+            **next_page,
         }
     )
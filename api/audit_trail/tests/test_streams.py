@@ -1,11 +1,13 @@
 from datetime import timedelta, datetime
+from django.contrib.contenttypes.models import ContentType
 from django.test import override_settings
 from django.urls import reverse
 from django.utils import timezone
+from rest_framework import status
 
 from api.audit_trail.models import Audit
 from api.audit_trail.enums import AuditType
-from api.audit_trail.streams.service import date_to_local_tz
+from api.audit_trail.streams.service import STREAMED_AUDITS, date_to_local_tz, get_stream
 from api.staticdata.statuses.enums import CaseStatusEnum
 from test_helpers.clients import DataTestClient
 
@@ -73,7 +75,7 @@ class AuditTrailStreamTestCase(DataTestClient):
         )
 
     @override_settings(STREAM_PAGE_SIZE=1)
-    def test_duplicate_timestamp_appended(self):
+    def test_duplicate_timestamps_streamed_once_each(self):
         self.case = self.create_standard_application_case(self.organisation)
 
         now = datetime.now(timezone.utc)
@@ -99,10 +101,34 @@ class AuditTrailStreamTestCase(DataTestClient):
             payload={"status": {"new": "4", "old": "3"}},
         )
 
-        response = self.client.get(self.url, **self.exporter_headers)
+        streamed_audit_ids = []
+        url = self.url
+        while url:
+            stream = self.client.get(url, **self.exporter_headers).json()
+            streamed_audit_ids += [
+                item["id"].split(":")[-2] for item in stream["orderedItems"] if ":change:" in item["id"]
+            ]
+            url = stream.get("next")
+
+        expected_audit_ids = Audit.objects.filter(verb__in=STREAMED_AUDITS).order_by("created_at", "id")
+        self.assertEqual(streamed_audit_ids, [str(audit.id) for audit in expected_audit_ids])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {"cursor": "not-a-cursor"}, **self.exporter_headers)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cursor_out_of_range(self):
+        cursor = f"{10 ** 30}_00000000-0000-0000-0000-000000000000"
+        response = self.client.get(self.url, {"cursor": cursor}, **self.exporter_headers)
 
-        self.assertEqual(len(response.json()["orderedItems"]), 1)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
-        next_response = self.client.get(response.json()["next"], **self.exporter_headers)
+    def test_page_queries_do_not_grow_with_cases(self):
+        for _ in range(3):
+            self.create_standard_application_case(self.organisation)
 
-        self.assertEqual(len(next_response.json()["orderedItems"]), 2)  # Pulled in duplicate timestamp audit
+        # Audits, cases, the latest audit for each case and the case content type
+        ContentType.objects.clear_cache()
+        with self.assertNumQueries(4):
+            get_stream(0)
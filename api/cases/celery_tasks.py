@@ -3,17 +3,19 @@ from datetime import datetime, time
 from celery import shared_task
 from celery.utils.log import get_task_logger
 from django.conf import settings
-from django.db import transaction
+from django.db import connection, transaction
 from django.db.models import F
 from django.db.models import Q
 from django.utils import timezone
 from pytz import timezone as tz
 
 from api.cases.enums import CaseTypeSubTypeEnum
-from api.cases.models import Case, CaseAssignmentSLA, CaseQueue, DepartmentSLA, EcjuQuery
+from api.cases.models import Case, CaseAssignmentSLA, CaseQueue, DepartmentSLA, EcjuQuery, SLAUpdateRun
 from api.common.dates import is_weekend, is_bank_holiday
+from api.queues.models import Queue
 from api.staticdata.statuses.enums import CaseStatusEnum
 from api.staticdata.statuses.models import CaseStatus
+from api.teams.models import Team
 from api.cases.notify import notify_exporter_ecju_query_chaser
 
 
@@ -80,6 +82,47 @@ def get_case_ids_with_active_ecju_queries(date):
     )
 
 
+def increment_case_assignment_slas(case_ids):
+    """
+    Adds a day to the SLA of every queue the given cases are on, starting a new SLA where there isn't one yet
+    :return: How many SLAs were created or updated
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            insert into {CaseAssignmentSLA._meta.db_table} (queue_id, case_id, sla_days)
+            select distinct queue_id, case_id, 1 from {CaseQueue._meta.db_table}
+            where case_id = any(%(case_ids)s)
+            on conflict (queue_id, case_id) do update
+            set sla_days = {CaseAssignmentSLA._meta.db_table}.sla_days + 1
+            """,
+            {"case_ids": case_ids},
+        )
+        return cursor.rowcount
+
+
+def increment_department_slas(case_ids):
+    """
+    Adds a day to the SLA of every department with a team the given cases are queued for. Each department is
+    counted once per case however many of its teams have the case.
+    :return: How many SLAs were created or updated
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            insert into {DepartmentSLA._meta.db_table} (department_id, case_id, sla_days)
+            select distinct team.department_id, case_queue.case_id, 1 from {CaseQueue._meta.db_table} case_queue
+            join {Queue._meta.db_table} queue on queue.id = case_queue.queue_id
+            join {Team._meta.db_table} team on team.id = queue.team_id
+            where case_queue.case_id = any(%(case_ids)s) and team.department_id is not null
+            on conflict (department_id, case_id) do update
+            set sla_days = {DepartmentSLA._meta.db_table}.sla_days + 1
+            """,
+            {"case_ids": case_ids},
+        )
+        return cursor.rowcount
+
+
 MAX_ATTEMPTS = 3
 RETRY_BACKOFF = 180
 
@@ -118,34 +161,20 @@ def update_cases_sla():
                 .exclude(status__in=terminal_case_status)
             )
             with transaction.atomic():
-                # Keep track of the department SLA updates.
-                # We only want to update a department SLA once per case assignment per day.
-                department_slas_updated = set()
-                for assignment in CaseQueue.objects.filter(case__in=cases):
-                    # Update team SLAs
-                    try:
-                        assignment_sla = CaseAssignmentSLA.objects.get(queue=assignment.queue, case=assignment.case)
-                        assignment_sla.sla_days += 1
-                        assignment_sla.save()
-                    except CaseAssignmentSLA.DoesNotExist:
-                        CaseAssignmentSLA.objects.create(queue=assignment.queue, case=assignment.case, sla_days=1)
-                    # Update department SLAs
-                    department = assignment.queue.team.department
-                    if department is not None:
-                        try:
-                            department_sla = DepartmentSLA.objects.get(department=department, case=assignment.case)
-                            if department_sla.id not in department_slas_updated:
-                                department_sla.sla_days += 1
-                                department_sla.save()
-                        except DepartmentSLA.DoesNotExist:
-                            department_sla = DepartmentSLA.objects.create(
-                                department=department, case=assignment.case, sla_days=1
-                            )
-                        department_slas_updated.add(department_sla.id)
-
-                results = cases.select_for_update().update(
+                started_at = timezone.now()
+                case_ids = list(cases.select_for_update(of=("self",)).values_list("id", flat=True))
+                case_assignment_slas_updated = increment_case_assignment_slas(case_ids)
+                department_slas_updated = increment_department_slas(case_ids)
+                results = Case.objects.filter(id__in=case_ids).update(
                     sla_days=F("sla_days") + 1, sla_remaining_days=F("sla_remaining_days") - 1, sla_updated_at=date
                 )
+                SLAUpdateRun.objects.create(
+                    started_at=started_at,
+                    duration=timezone.now() - started_at,
+                    cases_updated=results,
+                    case_assignment_slas_updated=case_assignment_slas_updated,
+                    department_slas_updated=department_slas_updated,
+                )
 
             logger.info(f"SLA Update Successful. Updated {results} cases")
             return results
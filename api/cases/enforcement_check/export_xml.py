@@ -1,3 +1,4 @@
+import io
 from xml.dom import minidom  # nosec
 from xml.etree import ElementTree  # nosec
 from xml.sax.saxutils import escape  # nosec
@@ -7,34 +8,86 @@ from api.cases.enums import EnforcementXMLEntityTypes
 from api.cases.models import EnforcementCheckID
 from api.parties.enums import PartyRole, PartyType
 
+XML_DECLARATION = '<?xml version="1.0" ?>\n'
+
 
 def export_cases_xml(cases):
     """
     Takes a list of cases and converts into XML for the enforcement unit.
     XML includes party details, sites & the organisation for each application.
+    Enforcement IDs are allocated for every entity up front and the XML is then generated one stakeholder at a time.
     """
-    case_ids = cases.values_list("pk", flat=True)
+    case_ids = list(cases.values_list("pk", flat=True))
+    enforcement_ids = _allocate_enforcement_ids(_get_entities(case_ids, cases))
+    return _stream_xml(case_ids, cases, enforcement_ids)
+
 
-    # Build XML structure
-    base = ElementTree.Element("ENFORCEMENT_CHECK")
-    _export_parties_on_application(case_ids, base)
-    _export_sites_on_applications(case_ids, base)
-    _export_external_locations_on_applications(case_ids, base)
-    _export_organisations_on_applications(cases, base)
+def _stakeholder_to_xml(stakeholder):
+    """
+    Serialises a stakeholder exactly as minidom's toprettyxml() does when it is part of the whole document
+    """
+    writer = io.StringIO()
+    xml = ElementTree.tostring(stakeholder, encoding="utf-8", method="xml")  # nosec
+    minidom.parseString(xml).documentElement.writexml(writer, indent="\t", addindent="\t", newl="\n")  # nosec
+    return writer.getvalue()
 
-    # Export XML
-    xml = ElementTree.tostring(base, encoding="utf-8", method="xml")  # nosec
-    reparsed = minidom.parseString(xml).toprettyxml()  # nosec
-    return reparsed
 
+def _stream_xml(case_ids, cases, enforcement_ids):
+    yield XML_DECLARATION
+    has_stakeholders = False
+    for stakeholder in _export_stakeholders(case_ids, cases, enforcement_ids):
+        if not has_stakeholders:
+            yield "<ENFORCEMENT_CHECK>\n"
+            has_stakeholders = True
+        yield _stakeholder_to_xml(stakeholder)
+    # toprettyxml() writes an element without children as an empty tag
+    yield "</ENFORCEMENT_CHECK>\n" if has_stakeholders else "<ENFORCEMENT_CHECK/>\n"
 
-def get_enforcement_id(uuid):
-    return EnforcementCheckID.objects.get(entity_id=uuid).id
+
+def _export_stakeholders(case_ids, cases, enforcement_ids):
+    yield from _export_parties_on_application(case_ids, enforcement_ids)
+    yield from _export_sites_on_applications(case_ids, enforcement_ids)
+    yield from _export_external_locations_on_applications(case_ids, enforcement_ids)
+    yield from _export_organisations_on_applications(cases, enforcement_ids)
+
+
+def _get_entities(case_ids, cases):
+    """
+    Returns (uuid, entity type) for every entity that appears in the XML for the given cases
+    """
+    entities = {case_id: EnforcementXMLEntityTypes.APPLICATION for case_id in case_ids}
+    entities.update(
+        PartyOnApplication.objects.filter(application_id__in=case_ids).values_list("party_id", "party__type")
+    )
+    for site_id in SiteOnApplication.objects.filter(application_id__in=case_ids).values_list("site_id", flat=True):
+        entities[site_id] = EnforcementXMLEntityTypes.SITE
+    for external_location_id in ExternalLocationOnApplication.objects.filter(application_id__in=case_ids).values_list(
+        "external_location_id", flat=True
+    ):
+        entities[external_location_id] = EnforcementXMLEntityTypes.SITE
+    for organisation_id in cases.values_list("organisation_id", flat=True):
+        entities[organisation_id] = EnforcementXMLEntityTypes.ORGANISATION
+    return entities.items()
+
+
+def _allocate_enforcement_ids(entities):
+    """
+    Creates the enforcement IDs that don't exist yet for `entities` in a single insert, ignoring those that do, and
+    returns a mapping of every entity's uuid to its enforcement ID
+    """
+    EnforcementCheckID.objects.bulk_create(
+        [EnforcementCheckID(entity_id=entity_id, entity_type=entity_type) for entity_id, entity_type in entities],
+        ignore_conflicts=True,
+    )
+    return dict(
+        EnforcementCheckID.objects.filter(entity_id__in=[entity_id for entity_id, _ in entities]).values_list(
+            "entity_id", "id"
+        )
+    )
 
 
-def _uuid_to_enforcement_id(uuid, type):
-    enforcement_check_id, _ = EnforcementCheckID.objects.get_or_create(entity_id=uuid, entity_type=type)
-    return enforcement_check_id.id
+def get_enforcement_id(uuid):
+    return EnforcementCheckID.objects.get(entity_id=uuid).id
 
 
 def _dict_to_xml(parent, data):
@@ -57,15 +110,15 @@ def _format_address(address):
 
 
 def _entity_to_xml(
-    base, application_id, id, type, sh_type, country, organisation, address_line_1, name=None, address_line_2=None
+    enforcement_ids, application_id, id, sh_type, country, organisation, address_line_1, name=None, address_line_2=None
 ):
-    stakeholder = ElementTree.SubElement(base, "STAKEHOLDER")
+    stakeholder = ElementTree.Element("STAKEHOLDER")
     _dict_to_xml(
         stakeholder,
         {
-            "ELA_ID": _uuid_to_enforcement_id(application_id, EnforcementXMLEntityTypes.APPLICATION),
-            "ELA_DETAIL_ID": _uuid_to_enforcement_id(id, type),
-            "SH_ID": _uuid_to_enforcement_id(id, type),
+            "ELA_ID": enforcement_ids[application_id],
+            "ELA_DETAIL_ID": enforcement_ids[id],
+            "SH_ID": enforcement_ids[id],
             "SH_TYPE": sh_type,
             "COUNTRY": country,
             "ORG_NAME": organisation,
@@ -88,27 +141,22 @@ def _get_party_sh_type(type, role):
         return type.upper()
 
 
-def _export_parties_on_application(case_ids, xml_base):
-    parties_on_applications = (
-        PartyOnApplication.objects.filter(application_id__in=case_ids)
-        .prefetch_related("party")
-        .values(
-            "application_id",
-            "party_id",
-            "party__name",
-            "party__type",
-            "party__country__name",
-            "party__organisation__name",
-            "party__address",
-            "party__role",
-        )
+def _export_parties_on_application(case_ids, enforcement_ids):
+    parties_on_applications = PartyOnApplication.objects.filter(application_id__in=case_ids).values(
+        "application_id",
+        "party_id",
+        "party__name",
+        "party__type",
+        "party__country__name",
+        "party__organisation__name",
+        "party__address",
+        "party__role",
     )
-    for poa in parties_on_applications:
-        _entity_to_xml(
-            xml_base,
+    for poa in parties_on_applications.iterator():
+        yield _entity_to_xml(
+            enforcement_ids,
             application_id=poa["application_id"],
             id=poa["party_id"],
-            type=poa["party__type"],
             sh_type=_get_party_sh_type(type=poa["party__type"], role=poa["party__role"]),
             country=poa["party__country__name"],
             organisation=poa["party__organisation__name"],
@@ -117,24 +165,19 @@ def _export_parties_on_application(case_ids, xml_base):
         )
 
 
-def _export_external_locations_on_applications(case_ids, xml_base):
-    external_locations = (
-        ExternalLocationOnApplication.objects.filter(application_id__in=case_ids)
-        .prefetch_related("external_location")
-        .values(
-            "application_id",
-            "external_location_id",
-            "external_location__country__name",
-            "external_location__organisation__name",
-            "external_location__address",
-        )
+def _export_external_locations_on_applications(case_ids, enforcement_ids):
+    external_locations = ExternalLocationOnApplication.objects.filter(application_id__in=case_ids).values(
+        "application_id",
+        "external_location_id",
+        "external_location__country__name",
+        "external_location__organisation__name",
+        "external_location__address",
     )
-    for location in external_locations:
-        _entity_to_xml(
-            xml_base,
+    for location in external_locations.iterator():
+        yield _entity_to_xml(
+            enforcement_ids,
             application_id=location["application_id"],
             id=location["external_location_id"],
-            type=EnforcementXMLEntityTypes.SITE,
             sh_type="SOURCE",
             country=location["external_location__country__name"],
             organisation=location["external_location__organisation__name"],
@@ -142,28 +185,23 @@ def _export_external_locations_on_applications(case_ids, xml_base):
         )
 
 
-def _export_sites_on_applications(case_ids, xml_base):
-    sites_on_applications = (
-        SiteOnApplication.objects.filter(application_id__in=case_ids)
-        .prefetch_related("site", "site__address")
-        .values(
-            "application_id",
-            "site_id",
-            "site__organisation__name",
-            "site__address__address",
-            "site__address__address_line_1",
-            "site__address__address_line_2",
-            "site__address__country__name",
-            "site__address__postcode",
-            "site__address__city",
-        )
+def _export_sites_on_applications(case_ids, enforcement_ids):
+    sites_on_applications = SiteOnApplication.objects.filter(application_id__in=case_ids).values(
+        "application_id",
+        "site_id",
+        "site__organisation__name",
+        "site__address__address",
+        "site__address__address_line_1",
+        "site__address__address_line_2",
+        "site__address__country__name",
+        "site__address__postcode",
+        "site__address__city",
     )
-    for soa in sites_on_applications:
-        _entity_to_xml(
-            xml_base,
+    for soa in sites_on_applications.iterator():
+        yield _entity_to_xml(
+            enforcement_ids,
             application_id=soa["application_id"],
             id=soa["site_id"],
-            type=EnforcementXMLEntityTypes.SITE,
             sh_type="SOURCE",
             country=soa["site__address__country__name"],
             organisation=soa["site__organisation__name"],
@@ -174,10 +212,8 @@ def _export_sites_on_applications(case_ids, xml_base):
         )
 
 
-def _export_organisations_on_applications(cases, xml_base):
-    organisations_on_applications = cases.prefetch_related(
-        "organisation", "organisation__primary_site__address"
-    ).values(
+def _export_organisations_on_applications(cases, enforcement_ids):
+    organisations_on_applications = cases.values(
         "id",
         "organisation_id",
         "organisation__name",
@@ -188,12 +224,11 @@ def _export_organisations_on_applications(cases, xml_base):
         "organisation__primary_site__address__postcode",
         "organisation__primary_site__address__city",
     )
-    for org in organisations_on_applications:
-        _entity_to_xml(
-            xml_base,
+    for org in organisations_on_applications.iterator():
+        yield _entity_to_xml(
+            enforcement_ids,
             application_id=org["id"],
             id=org["organisation_id"],
-            type=EnforcementXMLEntityTypes.ORGANISATION,
             sh_type="LICENSEE",
             country=org["organisation__primary_site__address__country__name"],
             organisation=org["organisation__name"],
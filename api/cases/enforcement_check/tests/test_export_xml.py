@@ -1,13 +1,23 @@
+from xml.dom import minidom  # nosec
 from xml.etree import ElementTree  # nosec
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 
 from api.applications.models import SiteOnApplication, ExternalLocationOnApplication
-from api.cases.enforcement_check.export_xml import _get_address_line_2, get_enforcement_id
+from api.cases.enforcement_check.export_xml import (
+    _allocate_enforcement_ids,
+    _export_stakeholders,
+    _get_address_line_2,
+    _get_entities,
+    export_cases_xml,
+    get_enforcement_id,
+)
 from api.cases.enforcement_check.import_xml import enforcement_id_to_uuid
 from api.cases.enums import EnforcementXMLEntityTypes
-from api.cases.models import EnforcementCheckID
+from api.cases.models import Case, EnforcementCheckID
 from api.core.constants import GovPermissions
 from api.flags.enums import SystemFlags
 from api.parties.enums import PartyType, PartyRole
@@ -201,3 +211,48 @@ class ExportXML(DataTestClient):
         response = self.client.get(self.url, **self.gov_headers)
 
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+    def test_export_xml_number_of_queries_does_not_grow_with_cases(self):
+        application = self.create_standard_application_case(self.organisation)
+        application.flags.add(SystemFlags.ENFORCEMENT_CHECK_REQUIRED)
+        cases = Case.objects.filter(flags=SystemFlags.ENFORCEMENT_CHECK_REQUIRED)
+
+        with CaptureQueriesContext(connection) as queries:
+            xml = "".join(export_cases_xml(cases))
+
+        for _ in range(3):
+            other_application = self.create_standard_application_case(self.organisation)
+            other_application.flags.add(SystemFlags.ENFORCEMENT_CHECK_REQUIRED)
+
+        with CaptureQueriesContext(connection) as more_queries:
+            more_xml = "".join(export_cases_xml(cases))
+
+        self.assertEqual(len(more_queries), len(queries))
+        self.assertEqual(len(ElementTree.fromstring(more_xml)), len(ElementTree.fromstring(xml)) * 4)  # nosec
+        self.assertEqual(EnforcementCheckID.objects.filter(entity_id__in=cases.values("pk")).count(), 4)
+
+    @staticmethod
+    def _build_xml_as_one_document(cases):
+        # How the XML was built before it was generated one stakeholder at a time
+        case_ids = list(cases.values_list("pk", flat=True))
+        enforcement_ids = _allocate_enforcement_ids(_get_entities(case_ids, cases))
+        base = ElementTree.Element("ENFORCEMENT_CHECK")
+        base.extend(_export_stakeholders(case_ids, cases, enforcement_ids))
+        xml = ElementTree.tostring(base, encoding="utf-8", method="xml")  # nosec
+        return minidom.parseString(xml).toprettyxml()  # nosec
+
+    def test_export_xml_is_identical_to_one_document(self):
+        application = self.create_standard_application_case(self.organisation)
+        application.flags.add(SystemFlags.ENFORCEMENT_CHECK_REQUIRED)
+        party = application.parties.first().party
+        party.name = 'Smith & Sons <"Exports">'
+        party.address = "1 Street\nTown"
+        party.save()
+        cases = Case.objects.filter(flags=SystemFlags.ENFORCEMENT_CHECK_REQUIRED)
+
+        self.assertEqual("".join(export_cases_xml(cases)), self._build_xml_as_one_document(cases))
+
+    def test_export_xml_without_stakeholders_is_identical_to_one_document(self):
+        cases = Case.objects.none()
+
+        self.assertEqual("".join(export_cases_xml(cases)), self._build_xml_as_one_document(cases))
@@ -40,6 +40,7 @@ class EnforcementCheckView(APIView):
                 target=case,
             )
 
+        # Not streamed, as the frontend verifies the Hawk signature of this response against its content
         return HttpResponse(xml, content_type="text/xml")
 
     def post(self, request, queue_pk):
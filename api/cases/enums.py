@@ -1,5 +1,6 @@
 from uuid import UUID
 
+from django.db import models
 from rest_framework.exceptions import ValidationError
 
 from lite_content.lite_api import strings
@@ -484,3 +485,9 @@ class LicenceDecisionType:
 class ApplicationFeatures:
     LICENCE_ISSUE = "licence_issue"
     ROUTE_TO_COUNTERSIGNING_QUEUES = "route_to_countersigning_queues"
+
+
+class GeneratedDocumentBatchCaseStatus(models.TextChoices):
+    PENDING = "pending", "Pending"
+    GENERATED = "generated", "Generated"
+    FAILED = "failed", "Failed"
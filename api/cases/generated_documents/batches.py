@@ -0,0 +1,172 @@
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+
+from api.applications.helpers import reset_appeal_deadline
+from api.applications.models import BaseApplication
+from api.audit_trail import service as audit_trail_service
+from api.audit_trail.enums import AuditType
+from api.cases.enums import AdviceType, CaseDocumentState, GeneratedDocumentBatchCaseStatus
+from api.cases.generated_documents import helpers, rendering
+from api.cases.generated_documents.models import GeneratedCaseDocument, GeneratedDocumentBatchCase
+from api.cases.generated_documents.signing import sign_pdf
+from api.cases.models import Case
+from api.documents.libraries import s3_operations
+from api.letter_templates.context_generator import get_document_cases
+from api.letter_templates.helpers import DocumentPreviewError, generate_preview
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_batch_cases_to_generate(batch):
+    return batch.batch_cases.exclude(status=GeneratedDocumentBatchCaseStatus.GENERATED).order_by("id")
+
+
+def restart_batch(batch):
+    """
+    Puts the cases that failed back to pending so that the next run of the batch tries them again
+    """
+    return batch.batch_cases.filter(status=GeneratedDocumentBatchCaseStatus.FAILED).update(
+        status=GeneratedDocumentBatchCaseStatus.PENDING, error=""
+    )
+
+
+def mark_batch_case_failed(batch_case_id, error):
+    GeneratedDocumentBatchCase.objects.filter(id=batch_case_id).exclude(
+        status=GeneratedDocumentBatchCaseStatus.GENERATED
+    ).update(status=GeneratedDocumentBatchCaseStatus.FAILED, error=error)
+
+
+def build_batch_documents(batch, batch_cases):
+    """
+    Builds the HTML for a chunk of a batch's cases, which are loaded together so that the objects every document
+    context reads are fetched once for the chunk. Cases whose document can't be built are marked as failed and
+    (batch case, HTML) pairs are returned for the rest.
+    """
+    template = batch.template
+    cases = get_document_cases([batch_case.case_id for batch_case in batch_cases])
+    documents = []
+
+    for batch_case in batch_cases:
+        case = cases.get(batch_case.case_id)
+        if not case:
+            mark_batch_case_failed(batch_case.id, "Case not found")
+            continue
+
+        try:
+            html = generate_preview(
+                layout=template.layout.filename,
+                text=batch.text,
+                case=case,
+                include_digital_signature=template.include_digital_signature,
+                include_css=False,
+            )
+        except DocumentPreviewError as e:
+            logger.warning("Unable to build document for case %s in batch %s: %s", case.id, batch.id, e)
+            mark_batch_case_failed(batch_case.id, str(e))
+            continue
+
+        documents.append((batch_case, html))
+
+    return documents
+
+
+def get_batch_generated_document(case_id, template_id):
+    """
+    Returns the document a batch has already generated for the case from the template, if any
+    """
+    batch_case = (
+        GeneratedDocumentBatchCase.objects.filter(
+            case_id=case_id,
+            batch__template_id=template_id,
+            status=GeneratedDocumentBatchCaseStatus.GENERATED,
+            generated_document__isnull=False,
+        )
+        .select_related("generated_document")
+        .first()
+    )
+    return batch_case.generated_document if batch_case else None
+
+
+def mark_batch_case_generated(batch_case, generated_document):
+    batch_case.status = GeneratedDocumentBatchCaseStatus.GENERATED
+    batch_case.generated_document = generated_document
+    batch_case.error = ""
+    batch_case.save()
+
+
+def generate_batch_document(batch_case_id, html, base_url):
+    """
+    Renders and stores the document for one case in a batch. Does nothing if the case already has a document
+    generated from the template by this or another batch, so that a case picked up by more than one run of a batch,
+    or by overlapping batches, still only gets one.
+    """
+    batch_case = GeneratedDocumentBatchCase.objects.select_related(
+        "batch__template__layout", "batch__user", "case__status", "case__case_type"
+    ).get(id=batch_case_id)
+    if batch_case.status == GeneratedDocumentBatchCaseStatus.GENERATED:
+        return None
+
+    batch = batch_case.batch
+    template = batch.template
+    case = batch_case.case
+
+    pdf = rendering.render_pdf(html, template.layout.filename, base_url)
+    if template.include_digital_signature:
+        document_signing = case.get_application_manifest().document_signing
+        pdf = sign_pdf(
+            pdf, document_signing["signing_reason"], document_signing["location"], document_signing["image_name"]
+        )
+
+    advice_type = helpers.get_decision_type(None, template)
+    pdf_s3_key = s3_operations.generate_s3_key(template.name, "pdf")
+    css_s3_key = s3_operations.upload_content_addressed_file(
+        rendering.get_stylesheet_source(template.layout.filename), "css", "css"
+    )
+    s3_operations.upload_bytes_file(raw_file=html, s3_key=pdf_s3_key.replace("pdf", "html"))
+
+    with transaction.atomic():
+        # The case is locked so that batches for the same case and template generate its document one at a time
+        Case.objects.select_for_update().only("id").get(id=case.id)
+        batch_case = GeneratedDocumentBatchCase.objects.select_for_update().get(id=batch_case_id)
+        if batch_case.status == GeneratedDocumentBatchCaseStatus.GENERATED:
+            return None
+
+        existing_document = get_batch_generated_document(case.id, template.id)
+        if existing_document:
+            mark_batch_case_generated(batch_case, existing_document)
+            return None
+
+        generated_document = GeneratedCaseDocument.objects.create(
+            name=f"{pdf_s3_key[:len(template.name) + 6]}.pdf",
+            user=batch.user,
+            s3_key=pdf_s3_key,
+            css_s3_key=css_s3_key,
+            virus_scanned_at=timezone.now(),
+            safe=True,
+            type=CaseDocumentState.GENERATED,
+            case=case,
+            template=template,
+            text=batch.text,
+            # If the template is not visible to exporter this supersedes what is given for the batch
+            visible_to_exporter=batch.visible_to_exporter and template.visible_to_exporter,
+            licence=helpers.get_draft_licence(case, advice_type),
+        )
+        s3_operations.upload_bytes_file(raw_file=pdf, s3_key=pdf_s3_key)
+
+        if advice_type == AdviceType.REFUSE:
+            reset_appeal_deadline(BaseApplication.objects.get(pk=case.pk))
+
+        if advice_type in [AdviceType.REFUSE, AdviceType.NO_LICENCE_REQUIRED, AdviceType.INFORM]:
+            audit_trail_service.create(
+                actor=batch.user,
+                verb=AuditType.GENERATE_DECISION_LETTER,
+                target=case,
+                payload={"case_reference": case.reference_code, "decision": advice_type},
+            )
+
+        mark_batch_case_generated(batch_case, generated_document)
+
+    return generated_document
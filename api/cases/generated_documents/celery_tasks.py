@@ -0,0 +1,70 @@
+from base64 import b64encode
+
+from celery import group, shared_task
+from celery.signals import worker_process_init
+from celery.utils.log import get_task_logger
+from django.conf import settings
+
+from api.cases.generated_documents import batches, rendering
+from api.cases.generated_documents.models import GeneratedDocumentBatch
+
+
+logger = get_task_logger(__name__)
+
+
+MAX_ATTEMPTS = 3
+RETRY_BACKOFF = 30
+
+PDF_RENDERING_QUEUE = "pdf_rendering"
+
+# The number of cases whose documents are built together, sharing the queries that load them
+GENERATED_DOCUMENT_BATCH_CHUNK_SIZE = 50
+
+
+@worker_process_init.connect
+def warm_pdf_rendering(**kwargs):
+    rendering.warm_stylesheets()
+
+
+@shared_task
+def render_pdf(html, layout, base_url):
+    """
+    Renders a document on a worker with its stylesheets already parsed, returning the PDF base64 encoded so that it
+    can travel through the result backend as JSON
+    """
+    logger.info("Rendering %s PDF", layout)
+    return b64encode(rendering.render_pdf(html, layout, base_url)).decode()
+
+
+@shared_task
+def generate_document_batch(batch_id, base_url):
+    """
+    Builds the documents for every case in a batch that doesn't have one yet, a chunk of cases at a time, and
+    hands them out to be rendered in parallel
+    """
+    batch = GeneratedDocumentBatch.objects.select_related("template__layout").get(id=batch_id)
+    batch_cases = list(batches.get_batch_cases_to_generate(batch))
+    logger.info("Generating %s documents for batch %s", len(batch_cases), batch_id)
+
+    options = {"queue": PDF_RENDERING_QUEUE} if settings.PDF_RENDERING_QUEUE_ENABLED else {}
+    for i in range(0, len(batch_cases), GENERATED_DOCUMENT_BATCH_CHUNK_SIZE):
+        documents = batches.build_batch_documents(batch, batch_cases[i : i + GENERATED_DOCUMENT_BATCH_CHUNK_SIZE])
+        group(
+            generate_batch_document.s(str(batch_case.id), html, base_url) for batch_case, html in documents
+        ).apply_async(**options)
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=(Exception,),
+    max_retries=MAX_ATTEMPTS,
+    retry_backoff=RETRY_BACKOFF,
+)
+def generate_batch_document(self, batch_case_id, html, base_url):
+    try:
+        batches.generate_batch_document(batch_case_id, html, base_url)
+    except Exception as e:
+        if self.request.retries >= self.max_retries:
+            logger.exception("Generating document for batch case %s failed", batch_case_id)
+            batches.mark_batch_case_failed(batch_case_id, str(e))
+        raise
@@ -1,38 +1,41 @@
+from base64 import b64decode
 from collections import namedtuple
 
+from celery import current_task
+from django.conf import settings
 from django.utils import timezone
-from weasyprint import CSS, HTML
-from weasyprint.text.fonts import FontConfiguration
 from rest_framework.exceptions import ParseError, ValidationError
 
 from api.staticdata.statuses.enums import CaseStatusEnum
 from api.cases.enums import CaseDocumentState, AdviceType, ApplicationFeatures
+from api.cases.generated_documents import rendering
+from api.cases.generated_documents import celery_tasks
 from api.cases.libraries.get_case import get_case
 from api.cases.models import CaseDocument
 from api.core.exceptions import NotFoundError
 from api.documents.libraries import s3_operations
 from api.licences.models import Licence
-from api.letter_templates.helpers import get_css_location, generate_preview, DocumentPreviewError
+from api.letter_templates.helpers import generate_preview, DocumentPreviewError
 from api.letter_templates.models import LetterTemplate
 from lite_content.lite_api import strings
 from api.parties.enums import PartyType
 from api.parties.models import Party
 
-font_config = FontConfiguration()
 GeneratedDocumentPayload = namedtuple("GeneratedDocumentPayload", "case template document_html text")
 
 
 def html_to_pdf(html: str, template_name: str, base_url):
-    html = HTML(string=html, base_url=base_url)
-    css = CSS(filename=get_css_location(template_name), font_config=font_config)
-
     """
-    Presentational hints are not enabled by default and they include a wide array of attributes
-    that direct styling in HTML, including font color and size, list attributes like type and start,
-    various table alignment attributes, and others. If the document generated by WeasyPrint is
-    missing some of the features you expect from the HTML, try to enable this option
+    Renders a PDF on the PDF rendering queue when it is enabled, which keeps WeasyPrint out of web workers.
+    Callers that are already running as a Celery task render in their own process instead of waiting on
+    another worker.
     """
-    return html.write_pdf(stylesheets=[css], presentational_hints=True)
+    if settings.PDF_RENDERING_QUEUE_ENABLED and not current_task:
+        result = celery_tasks.render_pdf.apply_async(
+            args=(html, template_name, base_url), queue=celery_tasks.PDF_RENDERING_QUEUE
+        )
+        return b64decode(result.get(timeout=settings.PDF_RENDERING_TIMEOUT))
+    return rendering.render_pdf(html, template_name, base_url)
 
 
 def auto_generate_case_document(layout, case, document_name, base_url):
@@ -51,7 +54,7 @@ def auto_generate_case_document(layout, case, document_name, base_url):
     s3_operations.upload_bytes_file(raw_file=pdf, s3_key=s3_key)
 
 
-def get_generated_document_data(request_params, pk, include_css=True):
+def get_generated_document_data(request_params, pk, include_css=True, cache_context=False):
     template_id = request_params.get("template")
     if not template_id:
         raise AttributeError(strings.Cases.GeneratedDocuments.MISSING_TEMPLATE)
@@ -78,6 +81,7 @@ def get_generated_document_data(request_params, pk, include_css=True):
             additional_contact=additional_contact,
             include_digital_signature=template.include_digital_signature,
             include_css=include_css,
+            cache_context=cache_context,
         )
 
     except DocumentPreviewError:
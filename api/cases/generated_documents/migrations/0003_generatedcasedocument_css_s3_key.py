@@ -0,0 +1,18 @@
+# Generated by Django 4.2.19 on 2026-10-18 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("generated_documents", "0002_alter_generatedcasedocument_advice_type"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="generatedcasedocument",
+            name="css_s3_key",
+            field=models.CharField(blank=True, default="", max_length=1000),
+        ),
+    ]
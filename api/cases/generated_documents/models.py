@@ -1,17 +1,22 @@
+import uuid
+
 from django.contrib.contenttypes.fields import GenericRelation
 from django.db import models
 
-from api.cases.enums import AdviceType
-from api.cases.models import CaseDocument
+from api.cases.enums import AdviceType, GeneratedDocumentBatchCaseStatus
+from api.cases.models import Case, CaseDocument
+from api.common.models import TimestampableModel
 from api.licences.models import Licence
 from api.users.models import ExporterNotification
 from api.letter_templates.models import LetterTemplate
-from api.users.models import UserOrganisationRelationship
+from api.users.models import GovUser, UserOrganisationRelationship
 
 
 class GeneratedCaseDocument(CaseDocument):
     template = models.ForeignKey(LetterTemplate, on_delete=models.DO_NOTHING)
     text = models.TextField(blank=True)
+    # The stylesheet the document was rendered with, stored once per distinct stylesheet
+    css_s3_key = models.CharField(max_length=1000, blank=True, default="")
 
     notifications = GenericRelation(
         ExporterNotification,
@@ -33,3 +38,36 @@ class GeneratedCaseDocument(CaseDocument):
 
     class Meta:
         ordering = ["name"]
+
+
+class GeneratedDocumentBatch(TimestampableModel):
+    """
+    A request to generate the same letter template for many cases at once
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    template = models.ForeignKey(LetterTemplate, on_delete=models.DO_NOTHING)
+    user = models.ForeignKey(GovUser, on_delete=models.DO_NOTHING)
+    text = models.TextField(blank=True)
+    visible_to_exporter = models.BooleanField(default=False)
+
+
+class GeneratedDocumentBatchCase(TimestampableModel):
+    """
+    The progress of one case in a batch. A case only ever gets one document per batch, so restarting a batch
+    only generates documents for the cases that haven't got one yet
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    batch = models.ForeignKey(GeneratedDocumentBatch, on_delete=models.CASCADE, related_name="batch_cases")
+    case = models.ForeignKey(Case, on_delete=models.CASCADE, related_name="generated_document_batch_cases")
+    status = models.CharField(
+        choices=GeneratedDocumentBatchCaseStatus.choices,
+        default=GeneratedDocumentBatchCaseStatus.PENDING,
+        max_length=20,
+    )
+    generated_document = models.ForeignKey(GeneratedCaseDocument, null=True, blank=True, on_delete=models.SET_NULL)
+    error = models.TextField(blank=True, default="")
+
+    class Meta:
+        unique_together = [["batch", "case"]]
@@ -0,0 +1,46 @@
+import os
+from functools import lru_cache
+
+from django.conf import settings
+from weasyprint import CSS, HTML
+from weasyprint.text.fonts import FontConfiguration
+
+from api.letter_templates.helpers import get_css_location
+
+font_config = FontConfiguration()
+
+
+@lru_cache(maxsize=None)
+def get_stylesheet_source(layout):
+    with open(get_css_location(layout), "rb") as css_file:
+        return css_file.read()
+
+
+@lru_cache(maxsize=None)
+def get_stylesheet(layout):
+    """
+    Returns the parsed stylesheet for a letter layout, which is only parsed once per process
+    """
+    return CSS(filename=get_css_location(layout), font_config=font_config)
+
+
+def warm_stylesheets():
+    """
+    Parses every letter layout stylesheet up front so the first document rendered doesn't pay for it
+    """
+    for filename in sorted(os.listdir(settings.CSS_ROOT)):
+        layout, extension = os.path.splitext(filename)
+        if extension == ".css":
+            get_stylesheet(layout)
+
+
+def render_pdf(html: str, layout: str, base_url):
+    """
+    Presentational hints are not enabled by default and they include a wide array of attributes
+    that direct styling in HTML, including font color and size, list attributes like type and start,
+    various table alignment attributes, and others. If the document generated by WeasyPrint is
+    missing some of the features you expect from the HTML, try to enable this option
+    """
+    return HTML(string=html, base_url=base_url).write_pdf(
+        stylesheets=[get_stylesheet(layout)], font_config=font_config, presentational_hints=True
+    )
@@ -1,7 +1,14 @@
+from collections import Counter
+
 from rest_framework import serializers
 
-from api.cases.enums import AdviceType
-from api.cases.generated_documents.models import GeneratedCaseDocument
+from api.cases.enums import AdviceType, GeneratedDocumentBatchCaseStatus
+from api.cases.generated_documents.models import (
+    GeneratedCaseDocument,
+    GeneratedDocumentBatch,
+    GeneratedDocumentBatchCase,
+)
+from api.cases.models import Case
 from api.core.serializers import KeyValueChoiceField
 from api.gov_users.serializers import GovUserViewSerializer
 
@@ -39,3 +46,78 @@ class AdviceDocumentGovSerializer(serializers.ModelSerializer):
             "created_at",
             "visible_to_exporter",
         )
+
+
+class GeneratedDocumentBatchCreateSerializer(serializers.ModelSerializer):
+    case_ids = serializers.ListField(child=serializers.UUIDField(), allow_empty=False, write_only=True)
+
+    class Meta:
+        model = GeneratedDocumentBatch
+        fields = (
+            "template",
+            "text",
+            "visible_to_exporter",
+            "case_ids",
+        )
+
+    def validate(self, data):
+        case_ids = set(data["case_ids"])
+        valid_case_ids = set(
+            Case.objects.submitted()
+            .filter(id__in=case_ids, case_type__in=data["template"].case_types.all())
+            .values_list("id", flat=True)
+        )
+        invalid_case_ids = case_ids - valid_case_ids
+        if invalid_case_ids:
+            raise serializers.ValidationError(
+                {
+                    "case_ids": [
+                        "The template cannot be generated for these cases: "
+                        + ", ".join(sorted(str(case_id) for case_id in invalid_case_ids))
+                    ]
+                }
+            )
+        return data
+
+    def create(self, validated_data):
+        case_ids = validated_data.pop("case_ids")
+        batch = super().create(validated_data)
+        GeneratedDocumentBatchCase.objects.bulk_create(
+            [GeneratedDocumentBatchCase(batch=batch, case_id=case_id) for case_id in dict.fromkeys(case_ids)]
+        )
+        return batch
+
+
+class GeneratedDocumentBatchCaseSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = GeneratedDocumentBatchCase
+        fields = (
+            "case",
+            "status",
+            "generated_document",
+            "error",
+        )
+
+
+class GeneratedDocumentBatchSerializer(serializers.ModelSerializer):
+    progress = serializers.SerializerMethodField()
+    cases = GeneratedDocumentBatchCaseSerializer(source="batch_cases", many=True)
+
+    class Meta:
+        model = GeneratedDocumentBatch
+        fields = (
+            "id",
+            "template",
+            "text",
+            "visible_to_exporter",
+            "created_at",
+            "progress",
+            "cases",
+        )
+
+    def get_progress(self, instance):
+        counts = Counter(batch_case.status for batch_case in instance.batch_cases.all())
+        return {
+            "total": sum(counts.values()),
+            **{status: counts[status] for status in GeneratedDocumentBatchCaseStatus.values},
+        }
@@ -0,0 +1,143 @@
+import uuid
+from unittest import mock
+
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from api.cases.enums import CaseTypeEnum, GeneratedDocumentBatchCaseStatus
+from api.cases.generated_documents import batches
+from api.cases.generated_documents.models import (
+    GeneratedCaseDocument,
+    GeneratedDocumentBatch,
+    GeneratedDocumentBatchCase,
+)
+from api.documents.libraries import s3_operations
+from api.letter_templates.helpers import DocumentPreviewError, generate_preview
+from test_helpers.clients import DataTestClient
+
+
+@mock.patch("api.cases.generated_documents.batches.s3_operations.upload_bytes_file")
+@mock.patch("api.cases.generated_documents.batches.rendering.render_pdf", return_value=b"%PDF")
+class GeneratedDocumentBatchTests(DataTestClient):
+    def setUp(self):
+        super().setUp()
+        self.letter_template = self.create_letter_template(name="SIEL", case_types=[CaseTypeEnum.SIEL.id])
+        self.cases = [self.create_standard_application_case(self.organisation) for _ in range(3)]
+        self.data = {
+            "template": str(self.letter_template.id),
+            "text": "sample",
+            "visible_to_exporter": True,
+            "case_ids": [str(case.id) for case in self.cases],
+        }
+        self.url = reverse("cases:generated_document_batches")
+
+        for patcher in (
+            mock.patch.object(s3_operations, "_content_addressed_s3_keys", set()),
+            mock.patch.object(s3_operations, "file_exists", return_value=False),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def create_batch(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data=self.data, **self.gov_headers)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return GeneratedDocumentBatch.objects.get(id=response.json()["id"])
+
+    def test_generate_document_batch(self, mock_render_pdf, mock_upload):
+        batch = self.create_batch()
+
+        self.assertEqual(mock_render_pdf.call_count, 3)
+        for case in self.cases:
+            batch_case = GeneratedDocumentBatchCase.objects.get(batch=batch, case=case)
+            self.assertEqual(batch_case.status, GeneratedDocumentBatchCaseStatus.GENERATED)
+            document = GeneratedCaseDocument.objects.get(case=case)
+            self.assertEqual(batch_case.generated_document, document)
+            self.assertEqual(document.template, self.letter_template)
+            self.assertEqual(document.text, "sample")
+            self.assertTrue(document.visible_to_exporter)
+
+    def test_generate_document_batch_progress(self, mock_render_pdf, mock_upload):
+        batch = self.create_batch()
+
+        response = self.client.get(
+            reverse("cases:generated_document_batch", kwargs={"pk": batch.id}), **self.gov_headers
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data["progress"], {"total": 3, "pending": 0, "generated": 3, "failed": 0})
+        self.assertEqual(
+            {item["case"] for item in data["cases"]},
+            {str(case.id) for case in self.cases},
+        )
+
+    def test_generate_document_batch_invalid_cases(self, mock_render_pdf, mock_upload):
+        self.data["case_ids"].append(str(uuid.uuid4()))
+
+        response = self.client.post(self.url, data=self.data, **self.gov_headers)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("case_ids", response.json()["errors"])
+        self.assertFalse(GeneratedDocumentBatch.objects.exists())
+
+    def test_restart_generate_document_batch(self, mock_render_pdf, mock_upload):
+        failing_case = self.cases[0]
+
+        def generate_preview_failing_for_one_case(*args, **kwargs):
+            if kwargs["case"].id == failing_case.id:
+                raise DocumentPreviewError("error")
+            return generate_preview(*args, **kwargs)
+
+        with mock.patch(
+            "api.cases.generated_documents.batches.generate_preview",
+            side_effect=generate_preview_failing_for_one_case,
+        ):
+            batch = self.create_batch()
+
+        failed_case = GeneratedDocumentBatchCase.objects.get(batch=batch, case=failing_case)
+        self.assertEqual(failed_case.status, GeneratedDocumentBatchCaseStatus.FAILED)
+        self.assertEqual(failed_case.error, "error")
+        self.assertEqual(GeneratedCaseDocument.objects.count(), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("cases:generated_document_batch", kwargs={"pk": batch.id}), **self.gov_headers
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        failed_case.refresh_from_db()
+        self.assertEqual(failed_case.status, GeneratedDocumentBatchCaseStatus.GENERATED)
+        self.assertEqual(failed_case.error, "")
+        # Only the case that failed is generated again
+        self.assertEqual(GeneratedCaseDocument.objects.count(), 3)
+        self.assertEqual(mock_render_pdf.call_count, 3)
+
+    def test_generate_batch_document_is_idempotent(self, mock_render_pdf, mock_upload):
+        batch = self.create_batch()
+        batch_case = batch.batch_cases.first()
+
+        self.assertIsNone(batches.generate_batch_document(batch_case.id, "<html></html>", None))
+
+        self.assertEqual(GeneratedCaseDocument.objects.filter(case=batch_case.case).count(), 1)
+        self.assertEqual(mock_render_pdf.call_count, 3)
+
+    def test_generate_overlapping_batches_once_per_case_and_template(self, mock_render_pdf, mock_upload):
+        first_batch = self.create_batch()
+        second_batch = self.create_batch()
+
+        self.assertEqual(GeneratedCaseDocument.objects.count(), 3)
+        for case in self.cases:
+            first_batch_case = GeneratedDocumentBatchCase.objects.get(batch=first_batch, case=case)
+            second_batch_case = GeneratedDocumentBatchCase.objects.get(batch=second_batch, case=case)
+            self.assertEqual(second_batch_case.status, GeneratedDocumentBatchCaseStatus.GENERATED)
+            self.assertEqual(second_batch_case.generated_document, first_batch_case.generated_document)
+
+    def test_generate_batches_for_different_templates(self, mock_render_pdf, mock_upload):
+        self.create_batch()
+        self.data["template"] = str(
+            self.create_letter_template(name="Other SIEL", case_types=[CaseTypeEnum.SIEL.id]).id
+        )
+        self.create_batch()
+
+        self.assertEqual(GeneratedCaseDocument.objects.count(), 6)
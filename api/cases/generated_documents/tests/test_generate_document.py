@@ -1,3 +1,4 @@
+import hashlib
 import os, io
 import re
 
@@ -21,8 +22,10 @@ from api.applications.tests.factories import GoodOnApplicationFactory, StandardA
 from api.cases.enums import CaseTypeEnum, AdviceType
 from api.cases.generated_documents.helpers import html_to_pdf
 from api.cases.tests.factories import FinalAdviceFactory
+from api.documents.libraries import s3_operations
 from api.letter_templates.helpers import generate_preview, DocumentPreviewError
 from api.cases.generated_documents.models import GeneratedCaseDocument
+from api.cases.generated_documents.rendering import get_stylesheet_source
 from api.goods.tests.factories import GoodFactory
 from api.cases.generated_documents.signing import sign_pdf
 from api.licences.enums import LicenceStatus
@@ -65,6 +68,15 @@ class GenerateDocumentTests(DataTestClient):
         self.content_type = ContentType.objects.get_for_model(GeneratedCaseDocument)
         self.url = reverse("cases:generated_documents:generated_documents", kwargs={"pk": str(self.case.pk)})
 
+        css = get_stylesheet_source(self.letter_template.layout.filename)
+        self.css_s3_key = f"css/{hashlib.sha256(css).hexdigest()}.css"
+        for patcher in (
+            mock.patch.object(s3_operations, "_content_addressed_s3_keys", set()),
+            mock.patch.object(s3_operations, "file_exists", return_value=False),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
     @mock.patch("api.cases.generated_documents.views.html_to_pdf")
     @mock.patch("api.cases.generated_documents.views.s3_operations.upload_bytes_file")
     @mock.patch("api.cases.generated_documents.views.s3_operations.generate_s3_key")
@@ -78,7 +90,7 @@ class GenerateDocumentTests(DataTestClient):
         html_to_pdf_func.assert_called_once()
         upload_bytes_file_func.assert_has_calls(
             [
-                mock.call(raw_file=mock.ANY, s3_key="fake-s3-key.css"),
+                mock.call(raw_file=mock.ANY, s3_key=self.css_s3_key),
                 mock.call(raw_file=mock.ANY, s3_key="fake-s3-key.html"),
                 mock.call(raw_file=mock.ANY, s3_key="fake-s3-key.pdf"),
             ]
@@ -143,7 +155,7 @@ class GenerateDocumentTests(DataTestClient):
         html_to_pdf_func.assert_called_once()
         upload_bytes_file_func.assert_has_calls(
             [
-                mock.call(raw_file=mock.ANY, s3_key="fake-s3-key.css"),
+                mock.call(raw_file=mock.ANY, s3_key=self.css_s3_key),
                 mock.call(raw_file=mock.ANY, s3_key="fake-s3-key.html"),
                 mock.call(raw_file=mock.ANY, s3_key="fake-s3-key.pdf"),
             ]
@@ -177,7 +189,7 @@ class GenerateDocumentTests(DataTestClient):
         html_to_pdf_func.assert_called_once()
         upload_bytes_file_func.assert_has_calls(
             [
-                mock.call(raw_file=mock.ANY, s3_key="fake-s3-key.css"),
+                mock.call(raw_file=mock.ANY, s3_key=self.css_s3_key),
                 mock.call(raw_file=mock.ANY, s3_key="fake-s3-key.html"),
                 mock.call(raw_file=mock.ANY, s3_key="fake-s3-key.pdf"),
             ]
@@ -234,7 +246,7 @@ class GenerateDocumentTests(DataTestClient):
 
         upload_bytes_file_func.assert_has_calls(
             [
-                mock.call(raw_file=mock.ANY, s3_key="fake-s3-key.css"),
+                mock.call(raw_file=mock.ANY, s3_key=self.css_s3_key),
                 mock.call(raw_file=mock.ANY, s3_key="fake-s3-key.html"),
                 mock.call(raw_file=mock.ANY, s3_key="fake-s3-key.pdf"),
             ]
@@ -294,7 +306,7 @@ class GenerateDocumentTests(DataTestClient):
 
         upload_bytes_file_func.assert_has_calls(
             [
-                mock.call(raw_file=mock.ANY, s3_key="fake-s3-key.css"),
+                mock.call(raw_file=mock.ANY, s3_key=self.css_s3_key),
                 mock.call(raw_file=mock.ANY, s3_key="fake-s3-key.html"),
                 mock.call(raw_file=mock.ANY, s3_key="fake-s3-key.pdf"),
             ]
@@ -319,7 +331,7 @@ class GenerateDocumentTests(DataTestClient):
         html_to_pdf_func.assert_called_once()
         upload_bytes_file_func.assert_has_calls(
             [
-                mock.call(raw_file=mock.ANY, s3_key="fake-s3-key.css"),
+                mock.call(raw_file=mock.ANY, s3_key=self.css_s3_key),
                 mock.call(raw_file=mock.ANY, s3_key="fake-s3-key.html"),
                 mock.call(raw_file=mock.ANY, s3_key="fake-s3-key.pdf"),
             ]
@@ -375,7 +387,7 @@ class GenerateDocumentTests(DataTestClient):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         upload_bytes_file_func.assert_has_calls(
             [
-                mock.call(raw_file=mock.ANY, s3_key="fake-s3-key.css"),
+                mock.call(raw_file=mock.ANY, s3_key=self.css_s3_key),
                 mock.call(raw_file=mock.ANY, s3_key="fake-s3-key.html"),
                 mock.call(raw_file=mock.ANY, s3_key="fake-s3-key.pdf"),
             ]
@@ -420,12 +432,28 @@ class GenerateDocumentTests(DataTestClient):
         )
         upload_bytes_file_func.assert_has_calls(
             [
-                mock.call(raw_file=mock.ANY, s3_key="fake-s3-key.css"),
+                mock.call(raw_file=mock.ANY, s3_key=self.css_s3_key),
                 mock.call(raw_file=mock.ANY, s3_key="fake-s3-key.html"),
             ],
             any_order=True,
         )
 
+    @mock.patch("api.cases.generated_documents.views.html_to_pdf")
+    @mock.patch("api.cases.generated_documents.views.s3_operations.upload_bytes_file")
+    def test_generate_document_uploads_css_once(self, upload_bytes_file_func, html_to_pdf_func):
+        html_to_pdf_func.return_value = None
+
+        for _ in range(2):
+            response = self.client.post(self.url, **self.gov_headers, data=self.data)
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        css_uploads = [call for call in upload_bytes_file_func.call_args_list if call.kwargs["s3_key"].endswith(".css")]
+        self.assertEqual(css_uploads, [mock.call(raw_file=mock.ANY, s3_key=self.css_s3_key)])
+        self.assertEqual(
+            set(GeneratedCaseDocument.objects.values_list("css_s3_key", flat=True)),
+            {self.css_s3_key},
+        )
+
     @mock.patch("api.cases.generated_documents.views.html_to_pdf")
     @mock.patch("api.cases.generated_documents.views.s3_operations.upload_bytes_file")
     def test_generate_document_when_s3_throws_error_failure(self, upload_bytes_file_func, html_to_pdf_func):
@@ -534,6 +562,12 @@ class GenerateDocumentTests(DataTestClient):
         with NamedTemporaryFile(suffix=".pdf", delete=True) as tmp_file:
             tmp_file.write(resp)
 
+    @override_settings(PDF_RENDERING_QUEUE_ENABLED=True)
+    def test_generating_pdf_on_rendering_queue(self):
+        pdf = html_to_pdf("<div>Hello World !!</div>", "siel", None)
+
+        self.assertTrue(pdf.startswith(b"%PDF"))
+
     @mock.patch("api.cases.generated_documents.helpers.generate_preview")
     def test_get_document_preview_raises_error(self, mock_generate_preview):
         mock_generate_preview.side_effect = DocumentPreviewError("error")
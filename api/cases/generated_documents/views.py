@@ -1,4 +1,5 @@
 import logging
+from functools import partial
 
 from django.db import transaction
 from django.http import JsonResponse
@@ -21,10 +22,15 @@ from api.cases.generated_documents.helpers import (
     get_draft_licence,
 )
 from api.cases.models import BadSubStatus
-from api.cases.generated_documents.models import GeneratedCaseDocument
+from api.cases.generated_documents.batches import restart_batch
+from api.cases.generated_documents.celery_tasks import generate_document_batch
+from api.cases.generated_documents.models import GeneratedCaseDocument, GeneratedDocumentBatch
+from api.cases.generated_documents.rendering import get_stylesheet_source
 from api.cases.generated_documents.serializers import (
     GeneratedCaseDocumentGovSerializer,
     GeneratedCaseDocumentExporterSerializer,
+    GeneratedDocumentBatchCreateSerializer,
+    GeneratedDocumentBatchSerializer,
 )
 from api.cases.generated_documents.signing import sign_pdf
 from api.cases.libraries.delete_notifications import delete_exporter_notifications
@@ -33,7 +39,6 @@ from api.core.authentication import GovAuthentication, SharedAuthentication
 from api.core.decorators import authorised_to_view_application
 from api.core.helpers import str_to_bool
 from api.documents.libraries import s3_operations
-from api.letter_templates.helpers import get_css_location
 from lite_content.lite_api import strings
 from api.organisations.libraries.get_organisation import get_request_user_organisation_id
 from api.staticdata.statuses.enums import CaseSubStatusIdEnum
@@ -87,11 +92,10 @@ class GeneratedDocuments(generics.ListAPIView):
 
         pdf_s3_key = s3_operations.generate_s3_key(document.template.name, "pdf")
 
-        css_s3_key = pdf_s3_key.replace("pdf", "css")
-        css_file_path = get_css_location(document.template.layout.filename)
-        with open(css_file_path, "rb") as css_file:
-            logger.debug("Uploading CSS document `%s`", css_s3_key)
-            s3_operations.upload_bytes_file(raw_file=css_file, s3_key=css_s3_key)
+        css_s3_key = s3_operations.upload_content_addressed_file(
+            get_stylesheet_source(document.template.layout.filename), "css", "css"
+        )
+        logger.debug("Using CSS document `%s`", css_s3_key)
 
         html_s3_key = pdf_s3_key.replace("pdf", "html")
         logger.debug("Uploading HTML document `%s`", html_s3_key)
@@ -135,6 +139,7 @@ class GeneratedDocuments(generics.ListAPIView):
                     name=document_name,
                     user=request.user.govuser,
                     s3_key=pdf_s3_key,
+                    css_s3_key=css_s3_key,
                     virus_scanned_at=timezone.now(),
                     safe=True,
                     type=CaseDocumentState.GENERATED,
@@ -177,7 +182,7 @@ class GeneratedDocumentPreview(APIView):
         """
         Get a preview of the document to be generated
         """
-        document = get_generated_document_data(request.GET, pk)
+        document = get_generated_document_data(request.GET, pk, cache_context=True)
         return Response(data={"preview": document.document_html})
 
 
@@ -215,3 +220,38 @@ class GeneratedDocumentSend(APIView):
             return Response(data={"notification_sent": True, "document": serialized_document})
 
         return Response(data={"notification_sent": False, "document": serialized_document})
+
+
+class GeneratedDocumentBatches(APIView):
+    authentication_classes = (GovAuthentication,)
+
+    @transaction.atomic
+    def post(self, request):
+        """
+        Generate a letter template for many cases in the background
+        """
+        serializer = GeneratedDocumentBatchCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        batch = serializer.save(user=request.user.govuser)
+
+        transaction.on_commit(partial(generate_document_batch.delay, str(batch.id), request.build_absolute_uri()))
+
+        return JsonResponse(data=GeneratedDocumentBatchSerializer(batch).data, status=status.HTTP_201_CREATED)
+
+
+class GeneratedDocumentBatchDetail(generics.RetrieveAPIView):
+    authentication_classes = (GovAuthentication,)
+    serializer_class = GeneratedDocumentBatchSerializer
+    queryset = GeneratedDocumentBatch.objects.prefetch_related("batch_cases")
+
+    @transaction.atomic
+    def post(self, request, pk):
+        """
+        Restart a batch, generating documents for the cases that failed or haven't been generated yet
+        """
+        batch = self.get_object()
+        restart_batch(batch)
+
+        transaction.on_commit(partial(generate_document_batch.delay, str(batch.id), request.build_absolute_uri()))
+
+        return Response(data=self.get_serializer(self.get_object()).data)
@@ -1,7 +1,7 @@
 from datetime import timedelta
 
 from api.audit_trail.enums import AuditType
-from api.common.dates import is_bank_holiday, is_weekend
+from api.common.dates import get_working_day_calendar
 from api.users.models import BaseUser, GovUser
 from api.users.enums import SystemUser
 from api.staticdata.statuses.enums import CaseStatusEnum
@@ -25,8 +25,8 @@ def get_assigned_as_case_officer_case_ids(user: GovUser):
 
 
 def working_days_in_range(start_date, end_date):
-    dates_in_range = [start_date + timedelta(n) for n in range((end_date - start_date).days)]
-    return len([date for date in dates_in_range if (not is_bank_holiday(date) and not is_weekend(date))])
+    days = max((end_date - start_date).days, 0)
+    return get_working_day_calendar().working_days_between(start_date, start_date + timedelta(days=days))
 
 
 def create_system_mention(case, case_note_text, mention_user):
@@ -0,0 +1,67 @@
+# Generated by Django 4.2.19 on 2026-10-18 11:45
+
+from django.db import migrations, models
+import django.utils.timezone
+import model_utils.fields
+import uuid
+
+
+def merge_duplicate_slas(apps, schema_editor):
+    """
+    Keeps the highest count for each case's queue and department SLAs so that they can be made unique
+    """
+    for model_name, key_field in (("CaseAssignmentSLA", "queue_id"), ("DepartmentSLA", "department_id")):
+        model = apps.get_model("cases", model_name)
+        seen = set()
+        duplicate_ids = []
+        for sla in model.objects.order_by("-sla_days", "id").values("id", key_field, "case_id"):
+            key = (sla[key_field], sla["case_id"])
+            if key in seen:
+                duplicate_ids.append(sla["id"])
+            seen.add(key)
+        model.objects.filter(id__in=duplicate_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cases", "0085_add_export_licence_case_type"),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_slas, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name="caseassignmentsla",
+            unique_together={("queue", "case")},
+        ),
+        migrations.AlterUniqueTogether(
+            name="departmentsla",
+            unique_together={("department", "case")},
+        ),
+        migrations.CreateModel(
+            name="SLAUpdateRun",
+            fields=[
+                (
+                    "created_at",
+                    model_utils.fields.AutoCreatedField(
+                        default=django.utils.timezone.now, editable=False, verbose_name="created_at"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    model_utils.fields.AutoLastModifiedField(
+                        default=django.utils.timezone.now, editable=False, verbose_name="updated_at"
+                    ),
+                ),
+                ("id", models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ("started_at", models.DateTimeField()),
+                ("duration", models.DurationField()),
+                ("cases_updated", models.PositiveIntegerField()),
+                ("case_assignment_slas_updated", models.PositiveIntegerField()),
+                ("department_slas_updated", models.PositiveIntegerField()),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+    ]
@@ -613,6 +613,9 @@ class CaseAssignmentSLA(models.Model):
     queue = models.ForeignKey(Queue, related_name="slas", on_delete=models.CASCADE)
     case = models.ForeignKey(Case, related_name="slas", on_delete=models.CASCADE)
 
+    class Meta:
+        unique_together = [["queue", "case"]]
+
 
 class DepartmentSLA(models.Model):
     """
@@ -623,6 +626,22 @@ class DepartmentSLA(models.Model):
     department = models.ForeignKey(Department, on_delete=models.CASCADE, related_name="department_slas")
     case = models.ForeignKey(Case, on_delete=models.CASCADE, related_name="department_slas")
 
+    class Meta:
+        unique_together = [["department", "case"]]
+
+
+class SLAUpdateRun(TimestampableModel):
+    """
+    Records how long each nightly SLA update took and how many rows it changed
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    started_at = models.DateTimeField()
+    duration = models.DurationField()
+    cases_updated = models.PositiveIntegerField()
+    case_assignment_slas_updated = models.PositiveIntegerField()
+    department_slas_updated = models.PositiveIntegerField()
+
 
 class CaseReferenceCode(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
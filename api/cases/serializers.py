@@ -1,7 +1,7 @@
 from rest_framework import serializers
 
 from api.applications.libraries.get_applications import get_application
-from api.applications.models import BaseApplication, StandardApplication
+from api.applications.models import ApplicationSubmissionPipeline, BaseApplication, StandardApplication
 from api.applications.serializers.advice import AdviceViewSerializer, CountersignDecisionAdviceViewSerializer
 from api.staticdata.statuses.serializers import CaseSubStatusSerializer
 
@@ -278,6 +278,7 @@ class CaseDetailSerializer(serializers.ModelSerializer):
     case_type = PrimaryKeyRelatedSerializerField(queryset=CaseType.objects.all(), serializer=CaseTypeSerializer)
     amendment_of = CaseDetailBasicSerializer()
     superseded_by = CaseDetailBasicSerializer()
+    submission_pipeline = serializers.SerializerMethodField()
 
     class Meta:
         model = Case
@@ -303,6 +304,7 @@ class CaseDetailSerializer(serializers.ModelSerializer):
             "latest_activity",
             "amendment_of",
             "superseded_by",
+            "submission_pipeline",
         )
 
     def __init__(self, *args, **kwargs):
@@ -310,6 +312,13 @@ class CaseDetailSerializer(serializers.ModelSerializer):
         self.user = kwargs.pop("user", None)
         super().__init__(*args, **kwargs)
 
+    def get_submission_pipeline(self, instance):
+        return (
+            ApplicationSubmissionPipeline.objects.filter(application_id=instance.id)
+            .values("status", "completed_stages", "error", "updated_at")
+            .first()
+        )
+
     def get_data(self, instance):
         application = get_application(instance.id)
         application_manifest = application.get_application_manifest()
@@ -1,10 +1,21 @@
-from django.db.models.signals import post_save, pre_save
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
 from api.applications.notify import notify_caseworker_countersign_return
 from api.cases.models import Case
+from api.cases.views.search.service import invalidate_case_filters
+from api.letter_templates.context_cache import (
+    DOCUMENT_CONTEXT_CASE_IDS,
+    get_document_context_case_ids,
+    invalidate_document_contexts,
+)
 from api.staticdata.statuses.enums import CaseStatusEnum
 from api.staticdata.statuses.libraries.get_case_status import get_case_status_by_status
+from api.staticdata.statuses.models import CaseSubStatus
+from api.teams.models import Team
+from api.users.models import BaseUser, GovUser
 from lite_routing.routing_rules_internal.flagging_engine import apply_flagging_rules_to_case
 
 
@@ -47,3 +58,30 @@ def _check_for_countersign_rejection(case):
         # send notification to case officer as advice has been rejected by countersigner
         if case.case_officer and case.case_officer.email:
             notify_caseworker_countersign_return(case)
+
+
+# Gov users, sub-statuses and teams make up the cached filter options on the case search
+@receiver([post_save, post_delete], sender=BaseUser)
+@receiver([post_save, post_delete], sender=GovUser)
+@receiver([post_save, post_delete], sender=CaseSubStatus)
+@receiver([post_save, post_delete], sender=Team)
+def case_filters_data_changed_handler(sender, instance, **kwargs):
+    invalidate_case_filters()
+
+
+def document_context_data_changed_handler(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # Worked out now, as a deleted object's relations are gone by the time the transaction commits
+    case_ids = list(get_document_context_case_ids(instance))
+    if case_ids:
+        # Invalidated again once the transaction commits in case a concurrent request has memoised a context from the
+        # data before the change
+        invalidate_document_contexts(case_ids)
+        transaction.on_commit(lambda: invalidate_document_contexts(case_ids))
+
+
+# Cases are saved as their concrete type, such as StandardApplication, so each subclass is connected
+for model in [model for model in apps.get_models() if issubclass(model, Case)] + list(DOCUMENT_CONTEXT_CASE_IDS):
+    post_save.connect(document_context_data_changed_handler, sender=model)
+    post_delete.connect(document_context_data_changed_handler, sender=model)
@@ -1,5 +1,15 @@
+import json
+from base64 import b64encode
+from unittest.mock import patch
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from parameterized import parameterized
+from rest_framework import status
 
+from api.audit_trail.enums import AuditType
+from api.audit_trail.models import Audit
 from api.cases.enums import AdviceType, AdviceLevel
 from test_helpers.clients import DataTestClient
 
@@ -32,3 +42,69 @@ class ActivityViewTests(DataTestClient):
         assert len(data) == 2
         assert data[0]["user"]["team"] == "Admin"
         assert data[1]["user"]["team"] == ""
+
+    def create_activity(self, count):
+        for index in range(count):
+            Audit.objects.create(
+                actor=self.gov_user if index % 2 else self.exporter_user,
+                verb=AuditType.UPDATED_APPLICATION_NAME,
+                target=self.case,
+                payload={"old_name": f"name {index}", "new_name": f"name {index + 1}"},
+            )
+
+    def test_view_activity_paginated(self):
+        self.create_activity(5)
+        activity = self.client.get(self.url, **self.gov_headers).json()["activity"]
+
+        paginated_activity = []
+        url = f"{self.url}?pagination=keyset&limit=2"
+        while url:
+            response = self.client.get(url, **self.gov_headers)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.json()["activity"]), 2)
+            paginated_activity += response.json()["activity"]
+            url = response.json()["next"]
+
+        self.assertEqual(len(paginated_activity), 7)
+        self.assertEqual(paginated_activity, activity)
+
+    def test_view_activity_invalid_cursor(self):
+        response = self.client.get(f"{self.url}?cursor=invalid", **self.gov_headers)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @parameterized.expand(
+        [
+            ({"created_at": "not a date", "id": "00000000-0000-0000-0000-000000000000"},),
+            ({"created_at": "99999-01-01T00:00:00+00:00", "id": "00000000-0000-0000-0000-000000000000"},),
+            ({"created_at": "2024-01-01T00:00:00+00:00", "id": "not a uuid"},),
+            ({"created_at": "2024-01-01T00:00:00+00:00", "id": ["00000000-0000-0000-0000-000000000000"]},),
+        ]
+    )
+    def test_view_activity_invalid_cursor_values(self, position):
+        cursor = b64encode(json.dumps(position).encode()).decode()
+        response = self.client.get(self.url, {"cursor": cursor}, **self.gov_headers)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_view_activity_queries_do_not_grow_with_activity(self):
+        self.create_activity(2)
+        self.client.get(self.url, **self.gov_headers)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url, **self.gov_headers)
+
+        self.create_activity(10)
+        with CaptureQueriesContext(connection) as more_activity_queries:
+            response = self.client.get(self.url, **self.gov_headers)
+
+        self.assertEqual(len(response.json()["activity"]), 14)
+        self.assertLessEqual(len(more_activity_queries), len(queries))
+
+    def test_view_activity_text_cached(self):
+        activity = self.client.get(self.url, **self.gov_headers).json()["activity"]
+
+        with patch("api.audit_trail.service.AuditSerializer.render_text") as render_text:
+            response = self.client.get(self.url, **self.gov_headers)
+
+        render_text.assert_not_called()
+        self.assertEqual(response.json()["activity"], activity)
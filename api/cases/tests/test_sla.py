@@ -9,9 +9,11 @@ from pytz import timezone as tz
 from api.cases.enums import CaseTypeSubTypeEnum
 from api.cases.models import (
     Case,
+    CaseAssignmentSLA,
     CaseQueue,
     DepartmentSLA,
     EcjuQuery,
+    SLAUpdateRun,
 )
 from api.cases.celery_tasks import (
     update_cases_sla,
@@ -479,3 +481,27 @@ class DepartmentSLATests(DataTestClient):
         # teams that are both associated with 'test_department'
         test_department_sla = DepartmentSLA.objects.get(department=test_department)
         self.assertEqual(test_department_sla.sla_days, 1)
+
+
+class CaseAssignmentSLATests(DataTestClient):
+    @mock.patch("api.cases.celery_tasks.is_weekend")
+    @mock.patch("api.cases.celery_tasks.is_bank_holiday")
+    def test_existing_assignment_sla_incremented_and_run_recorded(self, mock_is_weekend, mock_is_bank_holiday):
+        mock_is_weekend.return_value = False
+        mock_is_bank_holiday.return_value = False
+        application = self.create_draft_standard_application(self.organisation)
+        case = self.submit_application(application)
+        _set_submitted_at(case, HOUR_BEFORE_CUTOFF)
+        CaseQueue.objects.create(case=case, queue=self.queue)
+        CaseAssignmentSLA.objects.create(case=case, queue=self.queue, sla_days=3)
+        new_queue = self.create_queue("new_queue", self.team)
+        CaseQueue.objects.create(case=case, queue=new_queue)
+
+        results = run_update_cases_sla_task()
+
+        self.assertEqual(results, 1)
+        self.assertEqual(CaseAssignmentSLA.objects.get(case=case, queue=self.queue).sla_days, 4)
+        self.assertEqual(CaseAssignmentSLA.objects.get(case=case, queue=new_queue).sla_days, 1)
+        run = SLAUpdateRun.objects.get()
+        self.assertEqual(run.cases_updated, 1)
+        self.assertEqual(run.case_assignment_slas_updated, 2)
@@ -1,6 +1,7 @@
 from django.urls import path, include
 
 from api.cases.enforcement_check import views as enforcement_check
+from api.cases.generated_documents import views as generated_documents
 from api.cases.views import views, case_notes, licences, case_actions, case_assignments
 from api.cases.views.search import views as search_views
 from api.cases.views.search.activity import CaseActivityView, CaseActivityFiltersView
@@ -81,6 +82,16 @@ urlpatterns = [
         name="case_ecju_query_open_count",
     ),
     path("<uuid:pk>/generated-documents/", include("api.cases.generated_documents.urls")),
+    path(
+        "generated-document-batches/",
+        generated_documents.GeneratedDocumentBatches.as_view(),
+        name="generated_document_batches",
+    ),
+    path(
+        "generated-document-batches/<uuid:pk>/",
+        generated_documents.GeneratedDocumentBatchDetail.as_view(),
+        name="generated_document_batch",
+    ),
     path("<uuid:pk>/finalise/", views.FinaliseView.as_view(), name="finalise"),
     path("<uuid:pk>/licences/", licences.LicencesView.as_view(), name="licences"),
     path("<uuid:pk>/assigned-queues/", case_actions.AssignedQueues.as_view(), name="assigned_queues"),
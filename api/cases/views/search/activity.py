@@ -4,12 +4,21 @@ from rest_framework import status
 from rest_framework.views import APIView
 
 from api.audit_trail import service as audit_trail_service
-from api.audit_trail.serializers import AuditSerializer
 from api.cases.models import Case
+from api.conf.pagination import KeysetPagination
 from api.core.authentication import GovAuthentication
 
 
+class CaseActivityPagination(KeysetPagination):
+    ordering = ("-created_at", "-id")
+
+
 class CaseActivityView(APIView):
+    """
+    Lists a case's activity, newest first. All of it is returned unless it is paged through with `?pagination=keyset`
+    (and optionally `limit`), in which case the response includes a `next` link.
+    """
+
     authentication_classes = (GovAuthentication,)
 
     def get(self, request, pk):
@@ -19,9 +28,17 @@ class CaseActivityView(APIView):
             object_id=pk, object_content_type=content_type, **filter_data
         )
 
-        data = AuditSerializer(audit_trail_qs, many=True).data
+        paginator = CaseActivityPagination()
+        if paginator.is_keyset(request):
+            audit_trail_qs = paginator.paginate_queryset(audit_trail_qs, request, view=self)
+        else:
+            audit_trail_qs = audit_trail_qs.order_by(*paginator.ordering)
+
+        data = {"activity": audit_trail_service.serialize_activity(audit_trail_qs)}
+        if paginator.keyset:
+            data["next"] = paginator.get_next_link()
 
-        return JsonResponse(data={"activity": data}, status=status.HTTP_200_OK)
+        return JsonResponse(data=data, status=status.HTTP_200_OK)
 
 
 class CaseActivityFiltersView(APIView):
@@ -1,8 +1,12 @@
+import uuid
+from collections import defaultdict
 from datetime import timedelta
 from typing import List, Dict
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import transaction
 from django.db.models import (
     Count,
     F,
@@ -55,22 +59,68 @@ def get_advice_types_list():
     return AdviceType.to_representation()
 
 
-def populate_goods_flags(cases: List[Dict]):
-    case_ids = [case["id"] for case in cases]
-    goods_flags = Flag.objects.filter(goods__goods_on_application__application_id__in=case_ids).annotate(
+CASE_FILTERS_CACHE_KEY = "case-search-filters"
+CASE_FILTERS_VERSION_CACHE_KEY = "case-search-filters-version"
+CASE_FILTERS_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def get_case_filters_version() -> str:
+    """
+    Returns the version of the case search filters, which changes whenever the data behind them changes
+    """
+    return cache.get_or_set(CASE_FILTERS_VERSION_CACHE_KEY, lambda: uuid.uuid4().hex, timeout=None)
+
+
+def get_case_filters_etag() -> str:
+    return f'"{get_case_filters_version()}"'
+
+
+def get_case_filters() -> Dict:
+    """
+    Returns the filter options for the case search, cached until the data behind them changes
+    """
+    return cache.get_or_set(
+        f"{CASE_FILTERS_CACHE_KEY}:{get_case_filters_version()}",
+        lambda: {
+            "statuses": get_case_status_list(),
+            "sub_statuses": get_case_sub_status_list(),
+            "case_types": get_case_type_type_list(),
+            "gov_users": list(get_gov_users_list()),
+            "advice_types": get_advice_types_list(),
+        },
+        timeout=CASE_FILTERS_CACHE_TIMEOUT,
+    )
+
+
+def invalidate_case_filters():
+    # Only once the change is committed, or a request in the meantime could cache filters built from the data before
+    # the change under the new version
+    transaction.on_commit(lambda: cache.delete(CASE_FILTERS_VERSION_CACHE_KEY))
+
+
+def _group_by_case_id(objects):
+    """
+    Index objects annotated with a `case_id` in a single pass, so that each case on the page
+    can be populated with a dict lookup rather than a scan of the whole result set.
+    """
+    grouped = defaultdict(set)
+    for obj in objects:
+        grouped[str(obj.case_id)].add(obj)
+    return grouped
+
+
+def populate_goods_flags(case_map):
+    goods_flags = Flag.objects.filter(goods__goods_on_application__application_id__in=list(case_map.keys())).annotate(
         case_id=F("goods__goods_on_application__application_id"),
     )
-    for case in cases:
-        case["goods_flags"] = CaseListFlagSerializer(
-            {flag for flag in goods_flags if str(flag.case_id) == str(case["id"])},
-            many=True,
-        ).data
+    flags_by_case = _group_by_case_id(goods_flags)
 
+    for case_id, case in case_map.items():
+        case["goods_flags"] = CaseListFlagSerializer(flags_by_case[case_id], many=True).data
 
-def populate_destinations_flags(cases: List[Dict]):
-    from api.flags.models import Flag
 
-    case_ids = [case["id"] for case in cases]
+def populate_destinations_flags(case_map):
+    case_ids = list(case_map.keys())
 
     flags = Flag.objects.filter(parties__parties_on_application__application_id__in=case_ids).annotate(
         case_id=F("parties__parties_on_application__application_id")
@@ -86,20 +136,18 @@ def populate_destinations_flags(cases: List[Dict]):
             case_id=F("parties_on_application__application_id")
         )
     )
+    # Further filtering isn't possible on union queries, so the combined result set is grouped in Python instead
+    flags_by_case = _group_by_case_id(flags)
 
-    for case in cases:
-        # It would seem sensible here to do flags.filter(case_id=case["id"]) however one cannot do further filtering on
-        # union queries
-        case_flags = {flag for flag in flags if str(flag.case_id) == str(case["id"])}
-        case["destinations_flags"] = CaseListFlagSerializer(case_flags, many=True).data
+    for case_id, case in case_map.items():
+        case["destinations_flags"] = CaseListFlagSerializer(flags_by_case[case_id], many=True).data
 
 
-def populate_organisation(cases: List[Dict]):
+def populate_organisation(case_map):
     from api.organisations.serializers import OrganisationCaseSerializer
 
-    case_ids = [case["id"] for case in cases]
     organisations = (
-        Organisation.objects.filter(cases__id__in=case_ids)
+        Organisation.objects.filter(cases__id__in=list(case_map.keys()))
         .annotate(case_id=F("cases__id"))
         .select_related("primary_site")
         .prefetch_related(
@@ -110,15 +158,13 @@ def populate_organisation(cases: List[Dict]):
             "primary_site__site_records_located_at__address__country",
         )
     )
+    organisations_by_case = {str(organisation.case_id): organisation for organisation in organisations}
 
-    for case in cases:
-        organisation = next(
-            organisation for organisation in organisations if str(organisation.case_id) == str(case["id"])
-        )
-        case["organisation"] = OrganisationCaseSerializer(organisation).data
+    for case_id, case in case_map.items():
+        case["organisation"] = OrganisationCaseSerializer(organisations_by_case[case_id]).data
 
 
-def populate_is_recently_updated(cases: List[Dict]):
+def populate_is_recently_updated(case_map):
     """
     Given a dictionary of cases, annotate each one with the field "is_recently_updated"
     If the case was submitted less than settings.RECENTLY_UPDATED_WORKING_DAYS ago, set the field to True
@@ -126,13 +172,16 @@ def populate_is_recently_updated(cases: List[Dict]):
     ago and return True, else return False
     """
     now = timezone.now()
+    working_days_since_submission = {
+        case_id: working_days_in_range(case["submitted_at"], now) for case_id, case in case_map.items()
+    }
     recent_audits = (
         Audit.objects.filter(
             target_content_type=ContentType.objects.get_for_model(Case),
             target_object_id__in=[
-                case["id"]
-                for case in cases
-                if working_days_in_range(case["submitted_at"], now) > settings.RECENTLY_UPDATED_WORKING_DAYS
+                case_id
+                for case_id, working_days in working_days_since_submission.items()
+                if working_days > settings.RECENTLY_UPDATED_WORKING_DAYS
             ],
             actor_content_type=ContentType.objects.get_for_model(GovUser),
             created_at__gt=now - timedelta(days=number_of_days_since(now, settings.RECENTLY_UPDATED_WORKING_DAYS)),
@@ -143,13 +192,38 @@ def populate_is_recently_updated(cases: List[Dict]):
 
     audit_dict = {str(audit["target_object_id"]): audit["target_object_id__count"] for audit in recent_audits}
 
-    for case in cases:
+    for case_id, case in case_map.items():
         case["is_recently_updated"] = bool(
-            working_days_in_range(case["submitted_at"], now) < settings.RECENTLY_UPDATED_WORKING_DAYS
-            or audit_dict.get(case["id"])
+            working_days_since_submission[case_id] < settings.RECENTLY_UPDATED_WORKING_DAYS or audit_dict.get(case_id)
         )
 
 
+def populate_cases(cases: List[Dict]):
+    """
+    Populate a page of serialized cases with the data that is fetched outside of the serializer for performance.
+    Each populate function runs a fixed number of queries for the whole page and fills the cases from
+    lookups keyed on case id, so the number of queries doesn't grow with the page size.
+    """
+    case_map = {}
+    for case in cases:
+        case["destinations"] = []
+        case["advice"] = []
+        case["denials"] = []
+        case["goods"] = []
+        case_map[case["id"]] = case
+
+    populate_goods_flags(case_map)
+    populate_destinations_flags(case_map)
+    populate_organisation(case_map)
+    populate_is_recently_updated(case_map)
+    populate_activity_updates(case_map)
+    populate_destinations(case_map)
+    populate_good_details(case_map)
+    populate_denials(case_map)
+    populate_ecju_queries(case_map)
+    populate_advice(case_map)
+
+
 def populate_destinations(case_map):
     poas = PartyOnApplication.objects.select_related("party", "party__country").filter(
         application__in=list(case_map.keys()), deleted_at=None
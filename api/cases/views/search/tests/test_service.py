@@ -3,6 +3,8 @@ from api.audit_trail.models import Audit
 from api.cases.models import Case
 from api.cases.views.search import service
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from lite_routing.routing_rules_internal.enums import FlagsEnum
 from test_helpers.clients import DataTestClient
 
@@ -61,3 +63,22 @@ class TestSearchService(DataTestClient):
             == f'updated the application name from "{old_name}" to "{new_name}".'
         )
         assert case_map[case_id]["activity_updates"][1]["text"] == f"updated the status to: {new_status}."
+
+    def _populated_cases_query_count(self, number_of_cases):
+        cases = []
+        for _ in range(number_of_cases):
+            case = self.create_standard_application_case(self.organisation).get_case()
+            cases.append({"id": str(case.id), "submitted_at": case.submitted_at})
+
+        with CaptureQueriesContext(connection) as queries:
+            service.populate_cases(cases)
+
+        for case in cases:
+            assert case["organisation"]["id"] == str(self.organisation.id)
+            assert "goods_flags" in case
+            assert "destinations_flags" in case
+            assert "is_recently_updated" in case
+        return len(queries)
+
+    def test_populate_cases_query_count_does_not_grow_with_page_size(self):
+        assert self._populated_cases_query_count(1) == self._populated_cases_query_count(3)
@@ -123,6 +123,62 @@ class FilterAndSortTests(DataTestClient):
             response_data["filters"]["gov_users"],
         )
 
+    def test_get_cases_filters_not_returned_when_etag_matches(self):
+        response = self.client.get(self.url, **self.gov_headers)
+        filters_etag = response.json()["results"]["filters_etag"]
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=filters_etag, **self.gov_headers)
+        response_data = response.json()["results"]
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response_data["filters"])
+        self.assertEqual(response_data["filters_etag"], filters_etag)
+
+    def test_get_cases_filters_not_returned_when_etag_in_list_matches(self):
+        response = self.client.get(self.url, **self.gov_headers)
+        filters_etag = response.json()["results"]["filters_etag"]
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=f'"stale", W/{filters_etag}', **self.gov_headers)
+
+        self.assertIsNone(response.json()["results"]["filters"])
+
+    def test_get_cases_filters_returned_when_etag_only_partly_matches(self):
+        response = self.client.get(self.url, **self.gov_headers)
+        filters_etag = response.json()["results"]["filters_etag"]
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=f'"{filters_etag}"', **self.gov_headers)
+
+        self.assertIsNotNone(response.json()["results"]["filters"])
+
+    def test_get_cases_filters_not_refreshed_until_gov_user_change_committed(self):
+        response = self.client.get(self.url, **self.gov_headers)
+        filters_etag = response.json()["results"]["filters_etag"]
+
+        with self.captureOnCommitCallbacks(execute=False):
+            self.gov_user.baseuser_ptr.first_name = "Renamed"
+            self.gov_user.baseuser_ptr.save()
+
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=filters_etag, **self.gov_headers)
+
+        self.assertEqual(response.json()["results"]["filters_etag"], filters_etag)
+
+    def test_get_cases_filters_refreshed_when_gov_user_changes(self):
+        response = self.client.get(self.url, **self.gov_headers)
+        filters_etag = response.json()["results"]["filters_etag"]
+
+        self.gov_user.baseuser_ptr.first_name = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.gov_user.baseuser_ptr.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=filters_etag, **self.gov_headers)
+        response_data = response.json()["results"]
+
+        self.assertNotEqual(response_data["filters_etag"], filters_etag)
+        self.assertIn(
+            f"Renamed {self.gov_user.last_name}",
+            [gov_user["full_name"] for gov_user in response_data["filters"]["gov_users"]],
+        )
+
     def test_get_cases_returns_all_cases_with_end_user_and_ultimate_end_user_data(self):
         """
         Check that the case data includes end user and ultimate end user information.
@@ -9,7 +9,7 @@ from api.cases.models import Case, EcjuQuery
 from api.cases.serializers import CaseListSerializer
 from api.cases.views.search import service
 from api.core.authentication import GovAuthentication
-from api.core.helpers import str_to_bool
+from api.core.helpers import if_none_match, str_to_bool
 from api.queues.constants import SYSTEM_QUEUES, ALL_CASES_QUEUE_ID, NON_WORK_QUEUES
 from api.queues.models import Queue
 from api.queues.service import get_system_queues, get_team_queues
@@ -49,25 +49,8 @@ class CasesSearchView(generics.ListAPIView):
         }
 
         cases = CaseListSerializer(page, context=context, team=user.team, include_hidden=include_hidden, many=True).data
-        # performance
-        case_map = {}
-        for case in cases:
-            case["destinations"] = []
-            case["advice"] = []
-            case["denials"] = []
-            case["goods"] = []
-            case_map[case["id"]] = case
         # Populate certain fields outside of the serializer for performance improvements
-        service.populate_goods_flags(cases)
-        service.populate_destinations_flags(cases)
-        service.populate_organisation(cases)
-        service.populate_is_recently_updated(cases)
-        service.populate_activity_updates(case_map)
-        service.populate_destinations(case_map)
-        service.populate_good_details(case_map)
-        service.populate_denials(case_map)
-        service.populate_ecju_queries(case_map)
-        service.populate_advice(case_map)
+        service.populate_cases(cases)
 
         # Get queue from system & my queues.
         # If this fails (i.e. I'm on a non team queue) fetch the queue data
@@ -79,23 +62,19 @@ class CasesSearchView(generics.ListAPIView):
             or Queue.objects.filter(id=queue_id).values()[0]
         )
 
-        statuses = service.get_case_status_list()
-        sub_statuses = service.get_case_sub_status_list()
-        case_types = service.get_case_type_type_list()
-        gov_users = service.get_gov_users_list()
-        advice_types = service.get_advice_types_list()
+        # The caseworker frontend sends back the ETag of the filters it already has so they aren't sent again
+        filters_etag = service.get_case_filters_etag()
+        if if_none_match(request, filters_etag):
+            case_filters = None
+        else:
+            case_filters = service.get_case_filters()
 
         return self.get_paginated_response(
             {
                 "queues": queues,
                 "cases": cases,
-                "filters": {
-                    "statuses": statuses,
-                    "sub_statuses": sub_statuses,
-                    "case_types": case_types,
-                    "gov_users": gov_users,
-                    "advice_types": advice_types,
-                },
+                "filters": case_filters,
+                "filters_etag": filters_etag,
                 "is_system_queue": context["is_system_queue"],
                 "is_work_queue": is_work_queue,
                 "queue": queue,
@@ -1,10 +1,13 @@
 import logging
-from datetime import timedelta
+import time
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
 
 import requests
 from rest_framework import status
 
 BANK_HOLIDAY_API = "https://www.gov.uk/bank-holidays.json"
+BANK_HOLIDAY_API_TIMEOUT = 5
 BACKUP_FILE_NAME = "bank-holidays.csv"
 LOG_PREFIX = "update_cases_sla background task:"
 
@@ -12,6 +15,9 @@ SECONDS_IN_DAY = 86400
 SECONDS_IN_HOUR = 3600
 SECONDS_IN_MINUTE = 60
 
+WORKING_DAY_CALENDAR_MAX_AGE = SECONDS_IN_DAY
+WORKING_DAY_CALENDAR_RETRY_AFTER = 5 * SECONDS_IN_MINUTE
+
 
 def get_time_in_seconds_from_datetime(datetime):
     return (datetime.hour * SECONDS_IN_HOUR) + (datetime.minute * SECONDS_IN_MINUTE) + datetime.second
@@ -31,13 +37,16 @@ def working_days_in_range(start_date, end_date):
     This function does not work as intended and should not be used, please see
     LTD-4628 for more information.
 
-    This is because of the predicate used in the list
-    comprehension, which incorrectly returns True early. An example fix is to replace the list comprehension
-    with `[date for date in dates_in_range if (not is_bank_holiday(date) and not is_weekend(date))]`
-    but this should be done and released at the same time as the other fixes in LTD-4628.
+    It counts every day from `start_date` up to but not including `end_date` except bank holidays that fall on a
+    weekend, so ordinary weekends and weekday bank holidays are counted as working days. This reproduces the
+    predicate the function has always used, `not is_bank_holiday(date) or not is_weekend(date)`, and should be fixed
+    at the same time as the other fixes in LTD-4628. The weekend bank holidays are counted with the working day
+    calendar rather than day by day.
     """
-    dates_in_range = [start_date + timedelta(n) for n in range((end_date - start_date).days)]
-    return len([date for date in dates_in_range if not is_bank_holiday(date) or not is_weekend(date)])
+    days = max((end_date - start_date).days, 0)
+    return days - get_working_day_calendar().weekend_bank_holidays_between(
+        start_date, start_date + timedelta(days=days)
+    )
 
 
 def working_hours_in_range(start_date, end_date):
@@ -97,7 +106,14 @@ def get_bank_holidays(call_api=True, data=[]):  # noqa
     if not call_api:
         return get_backup_bank_holidays()
 
-    r = requests.get(BANK_HOLIDAY_API)
+    try:
+        r = requests.get(BANK_HOLIDAY_API, timeout=BANK_HOLIDAY_API_TIMEOUT)
+    except requests.RequestException as e:
+        logging.warning(
+            f"{LOG_PREFIX} Cannot connect to the GOV Bank Holiday API ({BANK_HOLIDAY_API}): {e}. Using local backup"
+        )
+        return get_backup_bank_holidays()
+
     if r.status_code != status.HTTP_200_OK:
         logging.warning(
             f"{LOG_PREFIX} Cannot connect to the GOV Bank Holiday API ({BANK_HOLIDAY_API}). Using local backup"
@@ -129,13 +145,136 @@ def number_of_days_since(date, num_working_days):
     For example, given Wednesday and 5 working days, this
     function will return 7 (due to weekends)
     """
-    days = 0
-    while num_working_days > 0:
-        days += 1
-        if is_bank_holiday(date) or is_weekend(date):
-            date = date - timedelta(days=1)
-            continue
-        num_working_days -= 1
-        date = date - timedelta(days=1)
-
-    return days
+    if num_working_days <= 0:
+        return 0
+
+    calendar = get_working_day_calendar()
+    day = _as_date(date)
+    working_days_to_date = calendar.working_days_before(day + timedelta(days=1))
+    earliest_working_day = calendar.working_day_at(working_days_to_date - num_working_days)
+    return (day - earliest_working_day).days + 1
+
+
+def _as_date(day):
+    return day.date() if isinstance(day, datetime) else day
+
+
+def _weekdays_before(day):
+    # Day 0 (0001-01-01) is a Monday, so every full week before `day` has 5 weekdays
+    days = day.toordinal() - 1
+    return 5 * (days // 7) + min(days % 7, 5)
+
+
+def _weekday_at(index):
+    # Inverse of _weekdays_before: the weekday that has `index` weekdays before it
+    return date.fromordinal(1 + 7 * (index // 5) + index % 5)
+
+
+class WorkingDayCalendar:
+    """
+    Working day arithmetic over a fixed set of bank holidays.
+
+    Everything is answered from a prefix sum of working days, `working_days_before`, which counts weekdays
+    arithmetically and subtracts the bank holidays before the day found by binary search over a sorted list.
+    Each call is O(log n) in the number of bank holidays however long the range is.
+    """
+
+    def __init__(self, bank_holidays):
+        holidays = set()
+        for value in bank_holidays:
+            try:
+                holidays.add(_as_date(value) if isinstance(value, date) else date.fromisoformat(value))
+            except ValueError:
+                continue
+
+        self.bank_holidays = frozenset(holidays)
+        self.weekday_bank_holidays = sorted(day for day in holidays if not is_weekend(day))
+        self.weekend_bank_holidays = sorted(day for day in holidays if is_weekend(day))
+
+    def is_bank_holiday(self, day):
+        return _as_date(day) in self.bank_holidays
+
+    def is_working_day(self, day):
+        day = _as_date(day)
+        return not is_weekend(day) and day not in self.bank_holidays
+
+    def working_days_before(self, day):
+        """
+        Returns the number of working days before `day`, counted from 0001-01-01
+        """
+        day = _as_date(day)
+        return _weekdays_before(day) - bisect_left(self.weekday_bank_holidays, day)
+
+    def working_days_between(self, start_date, end_date):
+        """
+        Returns the number of working days from `start_date` up to but not including `end_date`
+        """
+        return max(self.working_days_before(end_date) - self.working_days_before(start_date), 0)
+
+    def working_days_between_bulk(self, start_dates, end_date):
+        """
+        Returns `working_days_between` for each of `start_dates` and the same `end_date`, in order
+        """
+        working_days_before_end = self.working_days_before(end_date)
+        return [max(working_days_before_end - self.working_days_before(day), 0) for day in start_dates]
+
+    def working_day_at(self, index):
+        """
+        Returns the working day that has `index` working days before it
+        """
+        holidays_before = 0
+        while True:
+            day = _weekday_at(index + holidays_before)
+            # Each weekday bank holiday on or before the candidate pushes the answer one weekday later
+            holidays_up_to = bisect_right(self.weekday_bank_holidays, day)
+            if holidays_up_to == holidays_before:
+                return day
+            holidays_before = holidays_up_to
+
+    def add_working_days(self, day, num_working_days):
+        """
+        Returns the date `num_working_days` working days after `day`, or before it when negative
+        """
+        day = _as_date(day)
+        if num_working_days > 0:
+            return self.working_day_at(self.working_days_before(day + timedelta(days=1)) + num_working_days - 1)
+        if num_working_days < 0:
+            return self.working_day_at(self.working_days_before(day) + num_working_days)
+        return day
+
+    def add_working_days_bulk(self, days, num_working_days):
+        return [self.add_working_days(day, num_working_days) for day in days]
+
+    def weekend_bank_holidays_between(self, start_date, end_date):
+        """
+        Returns the number of bank holidays falling on a weekend from `start_date` up to but not including `end_date`
+        """
+        start_date, end_date = _as_date(start_date), _as_date(end_date)
+        return max(
+            bisect_left(self.weekend_bank_holidays, end_date) - bisect_left(self.weekend_bank_holidays, start_date), 0
+        )
+
+
+_working_day_calendar = {}
+
+
+def refresh_working_day_calendar():
+    """
+    Rebuilds the working day calendar from the latest bank holidays, which also refreshes the local backup
+    """
+    bank_holidays = get_bank_holidays(data=[])
+    _working_day_calendar["calendar"] = WorkingDayCalendar(bank_holidays)
+    # Try again soon rather than going a whole day without bank holidays, but not on every call while the API is down
+    max_age = WORKING_DAY_CALENDAR_MAX_AGE if bank_holidays else WORKING_DAY_CALENDAR_RETRY_AFTER
+    _working_day_calendar["expires_at"] = time.monotonic() + max_age
+    return _working_day_calendar["calendar"]
+
+
+def get_working_day_calendar():
+    """
+    Returns the working day calendar, which each process builds once and then refreshes daily
+    """
+    expires_at = _working_day_calendar.get("expires_at")
+    if expires_at is None or time.monotonic() >= expires_at:
+        return refresh_working_day_calendar()
+    return _working_day_calendar["calendar"]
@@ -1,10 +1,20 @@
 import pytest
+import requests
 from django.utils.datetime_safe import date, datetime
 from parameterized import parameterized
+from unittest import mock
 
-import requests_mock
-
-from api.common.dates import is_weekend, is_bank_holiday, number_of_days_since, working_hours_in_range, BANK_HOLIDAY_API
+from api.common import dates
+from api.common.dates import (
+    is_weekend,
+    is_bank_holiday,
+    number_of_days_since,
+    working_hours_in_range,
+    get_working_day_calendar,
+    BANK_HOLIDAY_API,
+    BANK_HOLIDAY_API_TIMEOUT,
+    WorkingDayCalendar,
+)
 from test_helpers.clients import DataTestClient
 
 
@@ -424,3 +434,78 @@ class DatesTests(DataTestClient):
 
         result = working_hours_in_range(start_date, end_date)
         self.assertEqual(result, expected_result)
+
+
+class WorkingDayCalendarTests(DataTestClient):
+    def setUp(self):
+        super().setUp()
+        # Easter, and a Christmas Day on a Sunday followed by Boxing Day and the substitute day
+        self.calendar = WorkingDayCalendar(["2022-04-15", "2022-04-18", "2022-12-25", "2022-12-26", "2022-12-27"])
+
+    @parameterized.expand(
+        [
+            (date(2022, 4, 11), date(2022, 4, 11), 0),
+            (date(2022, 4, 11), date(2022, 4, 15), 4),
+            (date(2022, 4, 11), date(2022, 4, 22), 7),
+            (date(2022, 12, 23), date(2022, 12, 30), 3),
+            (date(2022, 4, 22), date(2022, 4, 11), 0),
+        ]
+    )
+    def test_working_days_between(self, start_date, end_date, expected_result):
+        self.assertEqual(self.calendar.working_days_between(start_date, end_date), expected_result)
+
+    def test_working_days_between_bulk(self):
+        result = self.calendar.working_days_between_bulk(
+            [date(2022, 4, 11), date(2022, 4, 14), date(2022, 4, 19)], date(2022, 4, 22)
+        )
+        self.assertEqual(result, [7, 4, 3])
+
+    @parameterized.expand(
+        [
+            (date(2022, 4, 14), 1, date(2022, 4, 19)),
+            (date(2022, 4, 14), 2, date(2022, 4, 20)),
+            (date(2022, 4, 19), -1, date(2022, 4, 14)),
+            (date(2022, 12, 23), 1, date(2022, 12, 28)),
+            (date(2022, 4, 16), 0, date(2022, 4, 16)),
+        ]
+    )
+    def test_add_working_days(self, start_date, num_working_days, expected_result):
+        self.assertEqual(self.calendar.add_working_days(start_date, num_working_days), expected_result)
+
+    def test_weekend_bank_holidays_between(self):
+        self.assertEqual(self.calendar.weekend_bank_holidays_between(date(2022, 12, 1), date(2023, 1, 1)), 1)
+
+
+@pytest.fixture()
+def empty_working_day_calendar():
+    dates._working_day_calendar.clear()
+    yield
+    dates._working_day_calendar.clear()
+
+
+@mock.patch("api.common.dates.get_backup_bank_holidays", return_value=[])
+def test_working_day_calendar_backs_off_when_bank_holiday_api_is_down(
+    mock_backup, requests_mock, empty_working_day_calendar
+):
+    requests_mock.get(BANK_HOLIDAY_API, exc=requests.ConnectTimeout)
+
+    get_working_day_calendar()
+    get_working_day_calendar()
+
+    assert requests_mock.call_count == 1
+    assert requests_mock.last_request.timeout == BANK_HOLIDAY_API_TIMEOUT
+    assert mock_backup.call_count == 1
+
+
+@mock.patch("api.common.dates.get_backup_bank_holidays", return_value=[])
+def test_working_day_calendar_retries_bank_holiday_api_after_failure(
+    mock_backup, requests_mock, empty_working_day_calendar
+):
+    requests_mock.get(BANK_HOLIDAY_API, exc=requests.ConnectionError)
+
+    with mock.patch("api.common.dates.time.monotonic", return_value=0):
+        get_working_day_calendar()
+    with mock.patch("api.common.dates.time.monotonic", return_value=dates.WORKING_DAY_CALENDAR_RETRY_AFTER):
+        get_working_day_calendar()
+
+    assert requests_mock.call_count == 2
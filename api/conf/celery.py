@@ -41,6 +41,10 @@ app.conf.beat_schedule = {
         "task": "api.cases.celery_tasks.schedule_all_ecju_query_chaser_emails",
         "schedule": crontab(hour="8, 16", minute=0),
     },
+    "reconcile queue case counts 3am": {
+        "task": "api.queues.celery_tasks.reconcile_case_counts",
+        "schedule": crontab(hour=3, minute=0),
+    },
 }
 
 celery_app = healthcheck.setup(app)
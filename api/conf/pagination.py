@@ -1,5 +1,13 @@
+import json
+from base64 import b64decode, b64encode
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
 from rest_framework import pagination
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 from api.core.helpers import str_to_bool
 
@@ -29,3 +37,140 @@ class MaxFiftyPageSizePaginator(MaxPageNumberPagination):
 
 class CreatedAtCursorPagination(pagination.CursorPagination):
     ordering = "created_at"
+
+
+class KeysetPagination(pagination.LimitOffsetPagination):
+    """
+    Limit/offset pagination that can instead page through the results by where the previous page ended, which is
+    asked for with `?pagination=keyset` and followed through the `next` links. Keyset pages don't count the results and
+    each one costs the same however far through the results it is, unlike an offset.
+
+    `ordering` must be unique, so should end with the primary key, and be covered by an index. Fields prefixed with
+    "-" are paged through in descending order.
+    """
+
+    ordering = ("id",)
+    mode_query_param = "pagination"
+    keyset_mode = "keyset"
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    keyset = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_keyset(request):
+            return super().paginate_queryset(queryset, request, view)
+
+        self.keyset = True
+        self.request = request
+        self.limit = self.get_limit(request) or api_settings.PAGE_SIZE
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request, queryset.model)
+        if position:
+            queryset = queryset.filter(self.get_after_position_filter(position))
+
+        # One more row than the page is fetched to find out whether there is a next page without counting
+        results = list(queryset[: self.limit + 1])
+        self.next_position = None
+        if len(results) > self.limit:
+            results = results[: self.limit]
+            self.next_position = self.get_position(queryset.model, results[-1])
+        return results
+
+    def is_keyset(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == self.keyset_mode
+            or self.cursor_query_param in request.query_params
+        )
+
+    def get_field_names(self):
+        return [field.lstrip("-") for field in self.ordering]
+
+    def get_after_position_filter(self, position):
+        # (a, b) > (x, y) written out as a > x OR (a = x AND b > y), with a >= x on its own as well so that the
+        # index on the leading field can be used. Descending fields compare the other way round.
+        after = Q()
+        for index, field in enumerate(self.ordering):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            equal = {previous: position[previous] for previous in self.get_field_names()[:index]}
+            after |= Q(**equal, **{f"{name}__{lookup}": position[name]})
+
+        leading = self.ordering[0]
+        leading_lookup = "lte" if leading.startswith("-") else "gte"
+        return Q(**{f"{leading.lstrip('-')}__{leading_lookup}": position[leading.lstrip("-")]}) & after
+
+    def get_position(self, model, row):
+        return {field: model._meta.get_field(field).value_to_string(row) for field in self.get_field_names()}
+
+    def encode_cursor(self, position):
+        return b64encode(json.dumps(position).encode()).decode()
+
+    def decode_cursor(self, request, model):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+
+        try:
+            position = json.loads(b64decode(cursor.encode(), validate=True))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, dict) or set(position) != set(self.get_field_names()):
+            raise NotFound(self.invalid_cursor_message)
+        if not all(isinstance(value, str) for value in position.values()):
+            raise NotFound(self.invalid_cursor_message)
+
+        # Values are checked the way the fields would check them, so that one the database can't compare with the
+        # field is an invalid cursor rather than an error
+        try:
+            return {
+                name: self.parse_position_value(model._meta.get_field(name), value) for name, value in position.items()
+            }
+        except (ValidationError, OverflowError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def parse_position_value(self, field, value):
+        value = field.to_python(value)
+        field.run_validators(value)
+        return value
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.next_position:
+            return None
+
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.offset_query_param)
+        url = replace_query_param(url, self.mode_query_param, self.keyset_mode)
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                "name": self.mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Page by where the previous page ended instead of by offset.",
+                "schema": {"type": "string", "enum": [self.keyset_mode]},
+            },
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Where the previous page ended, taken from its next link.",
+                "schema": {"type": "string"},
+            },
+        ]
+
+
+class CreatedAtKeysetPagination(KeysetPagination):
+    ordering = ("created_at", "id")
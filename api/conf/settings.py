@@ -161,6 +161,7 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "api.conf.middleware.HawkSigningMiddleware",
     "django_audit_log_middleware.AuditLogMiddleware",
+    "api.search.middleware.SearchIndexUpdateMiddleware",
 ]
 
 if DEBUG:
@@ -206,6 +207,8 @@ AUTHENTICATION_BACKENDS = ["django.contrib.auth.backends.ModelBackend"]
 
 HAWK_AUTHENTICATION_ENABLED = env("HAWK_AUTHENTICATION_ENABLED")
 HAWK_RECEIVER_NONCE_EXPIRY_SECONDS = 60
+# How long an authenticated user is cached for before their account and organisation are checked again
+AUTHENTICATION_PRINCIPAL_CACHE_TIMEOUT = env.int("AUTHENTICATION_PRINCIPAL_CACHE_TIMEOUT", 60)
 HAWK_ALGORITHM = "sha256"
 HAWK_LITE_API_CREDENTIALS = "lite-api"
 HAWK_LITE_PERFORMANCE_CREDENTIALS = "lite-performance"
@@ -253,6 +256,17 @@ STATIC_URL = "/assets/"
 STATIC_ROOT = os.path.join(os.path.dirname(BASE_DIR), "assets")
 CSS_ROOT = os.path.join(STATIC_ROOT, "css")
 
+# Render generated document PDFs on workers consuming the pdf_rendering queue rather than in the web process
+PDF_RENDERING_QUEUE_ENABLED = env.bool("PDF_RENDERING_QUEUE_ENABLED", False)
+PDF_RENDERING_TIMEOUT = env.int("PDF_RENDERING_TIMEOUT", 120)
+
+# How long a case's document context is reused for previews when nothing the context reads has changed
+DOCUMENT_CONTEXT_CACHE_TIMEOUT = env.int("DOCUMENT_CONTEXT_CACHE_TIMEOUT", 60 * 5)
+
+# How long the rendered text of an audit entry is reused for. Audit entries don't change, so this only bounds how long
+# changes to the way their text is written take to show
+AUDIT_TEXT_CACHE_TIMEOUT = env.int("AUDIT_TEXT_CACHE_TIMEOUT", 60 * 60 * 24)
+
 # Cache static files
 STATICFILES_STORAGE = env.str("STATICFILES_STORAGE", "whitenoise.storage.CompressedManifestStaticFilesStorage")
 
@@ -282,6 +296,14 @@ AV_SERVICE_URL = env("AV_SERVICE_URL")
 AV_SERVICE_USERNAME = env("AV_SERVICE_USERNAME")
 AV_SERVICE_PASSWORD = env("AV_SERVICE_PASSWORD")
 AV_REQUEST_TIMEOUT = 60  # Maximum time, in seconds, to wait between bytes of a response
+# The most files sent to the AV service at once across every worker, which is also the size of each process's
+# connection pool
+AV_MAX_CONCURRENT_SCANS = env.int("AV_MAX_CONCURRENT_SCANS", 4)
+# How long, in seconds, a scan's claim on one of those slots lasts, which frees the slots of workers that die mid scan
+AV_SCAN_SLOT_TIMEOUT = env.int("AV_SCAN_SLOT_TIMEOUT", 60 * 10)
+# How long, in seconds, a file's content found to be safe is trusted without scanning it again. Unsafe content is
+# never scanned again
+AV_SCAN_RESULT_MAX_AGE = env.int("AV_SCAN_RESULT_MAX_AGE", 60 * 60 * 24)
 
 # HMRC Integration
 LITE_HMRC_INTEGRATION_ENABLED = env("LITE_HMRC_INTEGRATION_ENABLED")
@@ -434,6 +456,14 @@ if DEBUG:
 CONTENT_DATA_MIGRATION_DIR = Path(BASE_DIR).parent / "lite_content/lite_api/migrations"
 
 BACKUP_DOCUMENT_DATA_TO_DB = env("BACKUP_DOCUMENT_DATA_TO_DB", default=True)
+# Number of files downloaded from S3 at once when backing up document data
+BACKUP_DOCUMENT_DATA_WORKERS = env.int("BACKUP_DOCUMENT_DATA_WORKERS", 8)
+
+# Number of rows read from the database at a time when exporting a Data Workspace table
+DATA_WORKSPACE_EXPORT_CHUNK_SIZE = env.int("DATA_WORKSPACE_EXPORT_CHUNK_SIZE", 2000)
+# How far, in seconds, before an updated_since or deleted_since watermark rows are still returned from, to pick up
+# rows changed before the watermark but committed after it. It must be longer than any transaction writing them
+DATA_WORKSPACE_DELTA_OVERLAP = env.int("DATA_WORKSPACE_DELTA_OVERLAP", 60 * 5)
 
 
 S3_BUCKET_TAG_ANONYMISER_DESTINATION = "anonymiser"
@@ -487,6 +517,15 @@ if IS_ENV_DBT_PLATFORM:
         CELERY_BROKER_URL = _build_redis_url(REDIS_BASE_URL, REDIS_CELERY_DB, **url_args)
         CELERY_RESULT_BACKEND = CELERY_BROKER_URL
 
+        # Share the django cache between processes so that invalidating a cached value applies everywhere
+        REDIS_CACHE_DB = env("REDIS_CACHE_DB", default=1)
+        CACHES = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                "LOCATION": _build_redis_url(REDIS_BASE_URL, REDIS_CACHE_DB, **url_args),
+            }
+        }
+
     # Elasticsearch configuration
     LITE_API_ENABLE_ES = env.bool("LITE_API_ENABLE_ES", False)
     if LITE_API_ENABLE_ES:
@@ -533,6 +572,15 @@ else:
         CELERY_BROKER_URL = _build_redis_url(REDIS_BASE_URL, REDIS_CELERY_DB, **url_args)
         CELERY_RESULT_BACKEND = CELERY_BROKER_URL
 
+        # Share the django cache between processes so that invalidating a cached value applies everywhere
+        REDIS_CACHE_DB = env("REDIS_CACHE_DB", default=1)
+        CACHES = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                "LOCATION": _build_redis_url(REDIS_BASE_URL, REDIS_CACHE_DB, **url_args),
+            }
+        }
+
     # Elasticsearch configuration
     LITE_API_ENABLE_ES = env.bool("LITE_API_ENABLE_ES", False)
     if LITE_API_ENABLE_ES:
@@ -9,6 +9,8 @@ SUPPRESS_TEST_OUTPUT = True
 
 AWS_ENDPOINT_URL = None
 
+CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
 INSTALLED_APPS += [
     "api.core.tests.apps.CoreTestsConfig",
     "api.support.tests.apps.SupportTestsConfig",
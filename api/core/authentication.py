@@ -8,6 +8,7 @@ from mohawk.exc import HawkFail, AlreadyProcessed
 from rest_framework import authentication
 
 from api.core.exceptions import PermissionDeniedError
+from api.core.principal_cache import EXPORTER_USER, GOV_USER, get_principal, get_principal_cache_key
 from api.gov_users.enums import GovUserStatuses
 from api.organisations.enums import OrganisationType, OrganisationStatus
 from api.organisations.models import Organisation
@@ -54,6 +55,15 @@ class ExporterBaseAuthentication(authentication.BaseAuthentication):
         ).exists():
             raise PermissionDeniedError(USER_DEACTIVATED_ERROR)
 
+    def get_organisation_exporter_user(self, user_id, organisation_id, organisation_status):
+        def load_principal():
+            self.check_organisation(user_id, organisation_id, organisation_status)
+            return self.get_exporter_user(user_id)
+
+        return get_principal(
+            get_principal_cache_key(EXPORTER_USER, user_id, organisation_id, organisation_status), load_principal
+        )
+
 
 class ExporterAuthentication(ExporterBaseAuthentication):
     def authenticate(self, request):
@@ -66,9 +76,7 @@ class ExporterAuthentication(ExporterBaseAuthentication):
 
         exporter_user_token, user_id, organisation_id = self.get_header_data(request)
 
-        self.check_organisation(user_id, organisation_id, OrganisationStatus.ACTIVE)
-
-        exporter_user = self.get_exporter_user(user_id)
+        exporter_user = self.get_organisation_exporter_user(user_id, organisation_id, OrganisationStatus.ACTIVE)
 
         return exporter_user.baseuser_ptr, hawk_receiver
 
@@ -84,9 +92,7 @@ class ExporterDraftOrganisationAuthentication(ExporterBaseAuthentication):
 
         exporter_user_token, user_id, organisation_id = self.get_header_data(request)
 
-        self.check_organisation(user_id, organisation_id, OrganisationStatus.DRAFT)
-
-        exporter_user = self.get_exporter_user(user_id)
+        exporter_user = self.get_organisation_exporter_user(user_id, organisation_id, OrganisationStatus.DRAFT)
 
         return exporter_user.baseuser_ptr, hawk_receiver
 
@@ -109,20 +115,27 @@ class HmrcExporterAuthentication(authentication.BaseAuthentication):
         else:
             raise PermissionDeniedError(MISSING_TOKEN_ERROR)
 
-        try:
-            exporter_user = ExporterUser.objects.get(pk=user_id)
-        except ExporterUser.DoesNotExist:
-            raise PermissionDeniedError(USER_NOT_FOUND_ERROR)
+        def load_principal():
+            try:
+                exporter_user = ExporterUser.objects.get(pk=user_id)
+            except ExporterUser.DoesNotExist:
+                raise PermissionDeniedError(USER_NOT_FOUND_ERROR)
 
-        if not Organisation.objects.filter(
-            id=organisation_id, status=OrganisationStatus.ACTIVE, type=OrganisationType.HMRC
-        ).exists():
-            raise PermissionDeniedError(ORGANISATION_DEACTIVATED_ERROR)
+            if not Organisation.objects.filter(
+                id=organisation_id, status=OrganisationStatus.ACTIVE, type=OrganisationType.HMRC
+            ).exists():
+                raise PermissionDeniedError(ORGANISATION_DEACTIVATED_ERROR)
 
-        if not UserOrganisationRelationship.objects.filter(
-            user_id=user_id, organisation_id=organisation_id, status=UserStatuses.ACTIVE
-        ).exists():
-            raise PermissionDeniedError(USER_DEACTIVATED_ERROR)
+            if not UserOrganisationRelationship.objects.filter(
+                user_id=user_id, organisation_id=organisation_id, status=UserStatuses.ACTIVE
+            ).exists():
+                raise PermissionDeniedError(USER_DEACTIVATED_ERROR)
+
+            return exporter_user
+
+        exporter_user = get_principal(
+            get_principal_cache_key(EXPORTER_USER, user_id, organisation_id, OrganisationType.HMRC), load_principal
+        )
 
         return exporter_user.baseuser_ptr, hawk_receiver
 
@@ -141,10 +154,13 @@ class ExporterOnlyAuthentication(authentication.BaseAuthentication):
         else:
             raise PermissionDeniedError(MISSING_TOKEN_ERROR)
 
-        try:
-            exporter_user = ExporterUser.objects.get(pk=user_id)
-        except ExporterUser.DoesNotExist:
-            raise PermissionDeniedError(USER_NOT_FOUND_ERROR)
+        def load_principal():
+            try:
+                return ExporterUser.objects.get(pk=user_id)
+            except ExporterUser.DoesNotExist:
+                raise PermissionDeniedError(USER_NOT_FOUND_ERROR)
+
+        exporter_user = get_principal(get_principal_cache_key(EXPORTER_USER, user_id), load_principal)
 
         return exporter_user.baseuser_ptr, hawk_receiver
 
@@ -203,13 +219,18 @@ class GovAuthentication(authentication.BaseAuthentication):
         else:
             raise PermissionDeniedError(MISSING_TOKEN_ERROR)
 
-        try:
-            gov_user = GovUser.objects.select_related("baseuser_ptr", "team").get(pk=user_id)
-        except GovUser.DoesNotExist:
-            raise PermissionDeniedError(USER_NOT_FOUND_ERROR)
+        def load_principal():
+            try:
+                gov_user = GovUser.objects.select_related("baseuser_ptr", "team").get(pk=user_id)
+            except GovUser.DoesNotExist:
+                raise PermissionDeniedError(USER_NOT_FOUND_ERROR)
 
-        if gov_user.status == GovUserStatuses.DEACTIVATED:
-            raise PermissionDeniedError(USER_DEACTIVATED_ERROR)
+            if gov_user.status == GovUserStatuses.DEACTIVATED:
+                raise PermissionDeniedError(USER_DEACTIVATED_ERROR)
+
+            return gov_user
+
+        gov_user = get_principal(get_principal_cache_key(GOV_USER, user_id), load_principal)
 
         return gov_user.baseuser_ptr, hawk_receiver
 
@@ -4,8 +4,10 @@ from urllib.parse import urljoin
 
 from dateutil.relativedelta import relativedelta
 from django.conf import settings
+from django.core.cache import cache
 from django.templatetags.tz import do_timezone
 from django.utils import timezone
+from django.utils.http import parse_etags
 
 DATE_FORMAT = "%d %B %Y"
 TIME_FORMAT = "%H:%M"
@@ -109,3 +111,28 @@ def get_caseworker_frontend_url(path):
 
 def get_exporter_frontend_url(path):
     return _get_frontend_url(settings.EXPORTER_BASE_URL, path)
+
+
+def _strip_weak_indicator(etag):
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def if_none_match(request, etag):
+    """
+    Returns whether the request's If-None-Match header matches `etag`. The header can list several entity tags or be
+    `*`, and they are compared weakly, as If-None-Match requires.
+    """
+    etags = parse_etags(request.headers.get("If-None-Match", ""))
+    if etags == ["*"]:
+        return True
+    return any(_strip_weak_indicator(tag) == _strip_weak_indicator(etag) for tag in etags)
+
+
+def increment_cache_counter(key, amount=1):
+    """
+    Adds `amount` to the counter stored in the cache under `key`, starting it if it doesn't exist yet
+    """
+    try:
+        cache.incr(key, amount)
+    except ValueError:
+        cache.set(key, amount, timeout=None)
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from api.core.principal_cache import get_principal_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Show the hit rate of the authenticated principal cache."
+
+    def handle(self, *args, **options):
+        stats = get_principal_cache_stats()
+        hit_rate = f"{stats['hit_rate']:.1%}" if stats["hit_rate"] is not None else "n/a"
+        self.stdout.write(f"Hits: {stats['hits']}, misses: {stats['misses']}, hit rate: {hit_rate}")
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from api.common.dates import refresh_working_day_calendar
+
+
+class Command(BaseCommand):
+    help = "Fetch the latest bank holidays, update the local backup and rebuild the working day calendar."
+
+    def handle(self, *args, **options):
+        calendar = refresh_working_day_calendar()
+        if not calendar.bank_holidays:
+            self.stderr.write("No bank holidays could be loaded from the API or the local backup")
+            return
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Loaded {len(calendar.bank_holidays)} bank holidays up to {max(calendar.bank_holidays)}"
+            )
+        )
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from api.documents.libraries.av_operations import get_virus_scan_stats
+
+
+class Command(BaseCommand):
+    help = "Show how long virus scans take and how many were avoided by reusing the result for identical files."
+
+    def handle(self, *args, **options):
+        stats = get_virus_scan_stats()
+        mean_duration = f"{stats['mean_duration_ms']:.0f}ms" if stats["mean_duration_ms"] is not None else "n/a"
+        max_duration = f"{stats['max_duration_ms']}ms" if stats["max_duration_ms"] is not None else "n/a"
+        dedupe_rate = f"{stats['dedupe_rate']:.1%}" if stats["dedupe_rate"] is not None else "n/a"
+        self.stdout.write(
+            f"Scanned: {stats['scanned']}, mean duration: {mean_duration}, max duration: {max_duration}, "
+            f"reused results: {stats['deduped']} ({dedupe_rate})"
+        )
@@ -0,0 +1,77 @@
+"""
+Short lived cache of the users that authentication has already checked, so a burst of requests from
+one session doesn't repeat the same user and organisation queries. Entries are keyed on the user and
+organisation and are removed whenever the data behind the checks changes.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+
+from api.core.helpers import increment_cache_counter
+from api.organisations.enums import OrganisationStatus, OrganisationType
+
+PRINCIPAL_CACHE_KEY_PREFIX = "auth-principal"
+PRINCIPAL_CACHE_HITS_KEY = f"{PRINCIPAL_CACHE_KEY_PREFIX}-hits"
+PRINCIPAL_CACHE_MISSES_KEY = f"{PRINCIPAL_CACHE_KEY_PREFIX}-misses"
+
+GOV_USER = "gov"
+EXPORTER_USER = "exporter"
+
+# The organisation checks the exporter authentication classes make
+ORGANISATION_CHECKS = [OrganisationStatus.ACTIVE, OrganisationStatus.DRAFT, OrganisationType.HMRC]
+
+
+def get_principal_cache_key(user_type, user_id, organisation_id=None, organisation_check=None):
+    if organisation_id:
+        return f"{PRINCIPAL_CACHE_KEY_PREFIX}:{user_type}:{user_id}:{organisation_id}:{organisation_check}"
+    return f"{PRINCIPAL_CACHE_KEY_PREFIX}:{user_type}:{user_id}"
+
+
+def get_principal(key, load_principal):
+    """
+    Returns the cached principal for the key, otherwise loads it with load_principal and caches it.
+    load_principal raises if the user fails authentication, so only authenticated users are cached.
+    """
+    principal = cache.get(key)
+    if principal is not None:
+        increment_cache_counter(PRINCIPAL_CACHE_HITS_KEY)
+        return principal
+
+    increment_cache_counter(PRINCIPAL_CACHE_MISSES_KEY)
+    principal = load_principal()
+    cache.set(key, principal, timeout=settings.AUTHENTICATION_PRINCIPAL_CACHE_TIMEOUT)
+    return principal
+
+
+def get_principal_cache_stats():
+    counts = cache.get_many([PRINCIPAL_CACHE_HITS_KEY, PRINCIPAL_CACHE_MISSES_KEY])
+    hits = counts.get(PRINCIPAL_CACHE_HITS_KEY, 0)
+    misses = counts.get(PRINCIPAL_CACHE_MISSES_KEY, 0)
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / (hits + misses) if hits + misses else None,
+    }
+
+
+def invalidate_user_principals(user_id, organisation_ids=()):
+    keys = [
+        get_principal_cache_key(GOV_USER, user_id),
+        get_principal_cache_key(EXPORTER_USER, user_id),
+    ]
+    for organisation_id in organisation_ids:
+        keys += [
+            get_principal_cache_key(EXPORTER_USER, user_id, organisation_id, organisation_check)
+            for organisation_check in ORGANISATION_CHECKS
+        ]
+    cache.delete_many(keys)
+
+
+def invalidate_organisation_principals(organisation_id, user_ids):
+    cache.delete_many(
+        [
+            get_principal_cache_key(EXPORTER_USER, user_id, organisation_id, organisation_check)
+            for user_id in user_ids
+            for organisation_check in ORGANISATION_CHECKS
+        ]
+    )
@@ -0,0 +1,49 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api.core.principal_cache import invalidate_organisation_principals, invalidate_user_principals
+from api.organisations.models import Organisation
+from api.teams.models import Team
+from api.users.models import BaseUser, ExporterUser, GovUser, UserOrganisationRelationship
+
+
+def _invalidate_principals(invalidate, *args):
+    # Removed straight away so that the rest of the transaction sees its own changes, and again once it commits in
+    # case a concurrent request has cached the principal from the data before them
+    invalidate(*args)
+    transaction.on_commit(lambda: invalidate(*args))
+
+
+@receiver([post_save, post_delete], sender=GovUser)
+def gov_user_changed_handler(sender, instance, **kwargs):
+    _invalidate_principals(invalidate_user_principals, instance.pk)
+
+
+@receiver([post_save, post_delete], sender=BaseUser)
+@receiver([post_save, post_delete], sender=ExporterUser)
+def user_changed_handler(sender, instance, **kwargs):
+    organisation_ids = list(
+        UserOrganisationRelationship.objects.filter(user_id=instance.pk).values_list("organisation_id", flat=True)
+    )
+    _invalidate_principals(invalidate_user_principals, instance.pk, organisation_ids)
+
+
+@receiver([post_save, post_delete], sender=UserOrganisationRelationship)
+def user_organisation_relationship_changed_handler(sender, instance, **kwargs):
+    _invalidate_principals(invalidate_user_principals, instance.user_id, [instance.organisation_id])
+
+
+@receiver([post_save, post_delete], sender=Organisation)
+def organisation_changed_handler(sender, instance, **kwargs):
+    user_ids = list(
+        UserOrganisationRelationship.objects.filter(organisation_id=instance.pk).values_list("user_id", flat=True)
+    )
+    _invalidate_principals(invalidate_organisation_principals, instance.pk, user_ids)
+
+
+@receiver([post_save, post_delete], sender=Team)
+def team_changed_handler(sender, instance, **kwargs):
+    # Cached gov users have their team loaded with them
+    for user_id in GovUser.objects.filter(team_id=instance.pk).values_list("pk", flat=True):
+        _invalidate_principals(invalidate_user_principals, user_id)
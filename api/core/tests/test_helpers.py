@@ -1,4 +1,5 @@
-from django.test import override_settings, TestCase
+from django.core.cache import cache
+from django.test import override_settings, RequestFactory, TestCase
 from parameterized import parameterized
 
 from api.core import helpers
@@ -24,3 +25,31 @@ class HelpersTest(TestCase):
     @override_settings(EXPORTER_BASE_URL="https://exporter.lite.com")
     def test_get_exporter_frontend_url(self, path, expected_url):
         assert helpers.get_exporter_frontend_url(path) == expected_url
+
+    @parameterized.expand(
+        [
+            ('"abc"', True),
+            ('W/"abc"', True),
+            ('"xyz", "abc"', True),
+            ('W/"xyz",W/"abc"', True),
+            ("*", True),
+            ('"xyz"', False),
+            ('"abcd"', False),
+            ('""abc""', False),
+            ('"abc', False),
+            ("", False),
+        ]
+    )
+    def test_if_none_match(self, header, expected):
+        request = RequestFactory().get("/", HTTP_IF_NONE_MATCH=header)
+
+        assert helpers.if_none_match(request, '"abc"') == expected
+
+    def test_if_none_match_without_header(self):
+        assert helpers.if_none_match(RequestFactory().get("/"), '"abc"') is False
+
+    def test_increment_cache_counter(self):
+        helpers.increment_cache_counter("test-counter")
+        helpers.increment_cache_counter("test-counter", 5)
+
+        assert cache.get("test-counter") == 6
@@ -0,0 +1,93 @@
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+
+from api.core.authentication import ExporterAuthentication, GovAuthentication
+from api.core.exceptions import PermissionDeniedError
+from api.core.principal_cache import GOV_USER, get_principal_cache_key, get_principal_cache_stats
+from api.gov_users.enums import GovUserStatuses
+from api.organisations.enums import OrganisationStatus
+from api.users.enums import UserStatuses
+from api.users.models import GovUser, UserOrganisationRelationship
+from test_helpers.clients import DataTestClient
+
+
+@override_settings(AUTHENTICATION_PRINCIPAL_CACHE_TIMEOUT=60)
+class PrincipalCacheTests(DataTestClient):
+    def setUp(self):
+        super().setUp()
+        self.factory = APIRequestFactory()
+
+    def test_gov_user_is_cached_after_first_authentication(self):
+        request = self.factory.get("/", **self.gov_headers)
+        GovAuthentication().authenticate(request)
+
+        with self.assertNumQueries(0):
+            user, _ = GovAuthentication().authenticate(request)
+
+        self.assertEqual(user.pk, self.gov_user.pk)
+        self.assertEqual(user.govuser.team, self.gov_user.team)
+        self.assertEqual(get_principal_cache_stats(), {"hits": 1, "misses": 1, "hit_rate": 0.5})
+
+    def test_deactivated_gov_user_is_no_longer_authenticated(self):
+        request = self.factory.get("/", **self.gov_headers)
+        GovAuthentication().authenticate(request)
+
+        self.gov_user.status = GovUserStatuses.DEACTIVATED
+        self.gov_user.save()
+
+        with self.assertRaises(PermissionDeniedError):
+            GovAuthentication().authenticate(request)
+
+    def test_exporter_user_is_cached_after_first_authentication(self):
+        request = self.factory.get("/", **self.exporter_headers)
+        ExporterAuthentication().authenticate(request)
+
+        with self.assertNumQueries(0):
+            user, _ = ExporterAuthentication().authenticate(request)
+
+        self.assertEqual(user.pk, self.exporter_user.pk)
+
+    def test_exporter_user_no_longer_authenticated_when_relationship_deactivated(self):
+        request = self.factory.get("/", **self.exporter_headers)
+        ExporterAuthentication().authenticate(request)
+
+        relationship = UserOrganisationRelationship.objects.get(user=self.exporter_user, organisation=self.organisation)
+        relationship.status = UserStatuses.DEACTIVATED
+        relationship.save()
+
+        with self.assertRaises(PermissionDeniedError):
+            ExporterAuthentication().authenticate(request)
+
+    def test_exporter_user_no_longer_authenticated_when_organisation_status_changes(self):
+        request = self.factory.get("/", **self.exporter_headers)
+        ExporterAuthentication().authenticate(request)
+
+        self.organisation.status = OrganisationStatus.IN_REVIEW
+        self.organisation.save()
+
+        with self.assertRaises(PermissionDeniedError):
+            ExporterAuthentication().authenticate(request)
+
+    def test_gov_user_team_change_is_picked_up(self):
+        request = self.factory.get("/", **self.gov_headers)
+        GovAuthentication().authenticate(request)
+
+        self.gov_user.team.name = "Renamed team"
+        self.gov_user.team.save()
+
+        user, _ = GovAuthentication().authenticate(request)
+        self.assertEqual(user.govuser.team.name, "Renamed team")
+
+    def test_principal_cached_before_change_committed_is_removed_on_commit(self):
+        request = self.factory.get("/", **self.gov_headers)
+        stale_gov_user = GovUser.objects.select_related("baseuser_ptr", "team").get(pk=self.gov_user.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.gov_user.status = GovUserStatuses.DEACTIVATED
+            self.gov_user.save()
+            # As if a concurrent request had authenticated against the data from before the change
+            cache.set(get_principal_cache_key(GOV_USER, self.gov_user.pk), stale_gov_user)
+
+        with self.assertRaises(PermissionDeniedError):
+            GovAuthentication().authenticate(request)
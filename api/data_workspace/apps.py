@@ -1,5 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete
 
 
 class DataWorkspaceConfig(AppConfig):
     name = "api.data_workspace"
+
+    def ready(self):
+        from .incremental import get_tombstoned_models
+        from .signals import data_workspace_row_deleted_handler
+
+        for model in get_tombstoned_models():
+            post_delete.connect(data_workspace_row_deleted_handler, sender=model)
@@ -0,0 +1,130 @@
+"""
+Incremental syncs of Data Workspace tables. A table that supports them can be asked for only the rows changed since
+Data Workspace's last sync with `updated_since`, and its `deleted` endpoint lists the rows deleted since then, which
+are recorded as tombstones when they are deleted.
+
+A row's change is timestamped when it is made, but only seen once its transaction commits, which may be after a sync
+has passed that time. So `updated_since` and `deleted_since` also return the rows changed in the
+DATA_WORKSPACE_DELTA_OVERLAP seconds (5 minutes by default) before them. Consecutive syncs overlap, and Data Workspace
+must de-duplicate the rows they return by id.
+"""
+
+import datetime
+import functools
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import serializers
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+
+from api.conf.pagination import KeysetPagination
+from api.data_workspace.models import Tombstone
+
+UPDATED_SINCE_QUERY_PARAM = "updated_since"
+DELETED_SINCE_QUERY_PARAM = "deleted_since"
+
+
+def parse_watermark(request, query_param):
+    value = request.query_params.get(query_param)
+    if value is None:
+        return None
+
+    watermark = parse_datetime(value)
+    if not watermark:
+        raise ValidationError({query_param: ["Must be an ISO 8601 date and time"]})
+    if timezone.is_naive(watermark):
+        watermark = timezone.make_aware(watermark, datetime.timezone.utc)
+    return watermark
+
+
+def get_delta_start(request, query_param):
+    """
+    Returns the time from which changes are returned for a watermark, which is the overlap before it
+    """
+    watermark = parse_watermark(request, query_param)
+    if watermark is None:
+        return None
+    return watermark - datetime.timedelta(seconds=settings.DATA_WORKSPACE_DELTA_OVERLAP)
+
+
+class TombstonePagination(KeysetPagination):
+    ordering = ("deleted_at", "id")
+
+    def is_keyset(self, request):
+        return True
+
+
+class TombstoneSerializer(serializers.ModelSerializer):
+    id = serializers.CharField(source="object_id")
+
+    class Meta:
+        model = Tombstone
+        fields = ("id", "deleted_at")
+
+
+class IncrementalSyncMixin:
+    """
+    Lets a Data Workspace viewset be synced incrementally. Viewsets opt in by setting `updated_at_fields`, the fields
+    of which at least one changes whenever anything in a row does, including whether it is in the table at all. Their
+    rows need to be identified by their model's primary key so that deleted rows can be matched up.
+    """
+
+    updated_at_fields = ()
+
+    @classmethod
+    def supports_deltas(cls):
+        return bool(cls.updated_at_fields)
+
+    def filter_updated_since(self, queryset):
+        updated_since = get_delta_start(self.request, UPDATED_SINCE_QUERY_PARAM)
+        if updated_since is None:
+            return queryset
+
+        if not self.supports_deltas():
+            raise ValidationError({UPDATED_SINCE_QUERY_PARAM: ["This table can only be synced in full"]})
+        updated = Q()
+        for field in self.updated_at_fields:
+            updated |= Q(**{f"{field}__gt": updated_since})
+        return queryset.filter(updated)
+
+    def filter_queryset(self, queryset):
+        return self.filter_updated_since(super().filter_queryset(queryset))
+
+    @action(detail=False, url_path="deleted")
+    def deleted(self, request):
+        """
+        Lists the rows deleted from the table, or with `deleted_since` only those deleted since shortly before then
+        """
+        if not self.supports_deltas():
+            raise NotFound()
+
+        model = self.get_queryset().model
+        tombstones = Tombstone.objects.filter(content_type=ContentType.objects.get_for_model(model))
+        deleted_since = get_delta_start(request, DELETED_SINCE_QUERY_PARAM)
+        if deleted_since:
+            tombstones = tombstones.filter(deleted_at__gt=deleted_since)
+
+        paginator = TombstonePagination()
+        page = paginator.paginate_queryset(tombstones, request, view=self)
+        return paginator.get_paginated_response(TombstoneSerializer(page, many=True).data)
+
+
+@functools.cache
+def get_tombstoned_models():
+    """
+    Returns the models whose deletions are recorded, which are those behind the tables that can be synced
+    incrementally
+    """
+    from api.data_workspace.v1.urls import router_v1
+    from api.data_workspace.v2.urls import router_v2
+
+    models = set()
+    for _, viewset, _ in router_v1.registry + router_v2.registry:
+        queryset = getattr(viewset, "queryset", None)
+        if issubclass(viewset, IncrementalSyncMixin) and viewset.supports_deltas() and isinstance(queryset, QuerySet):
+            models.add(queryset.model)
+    return models
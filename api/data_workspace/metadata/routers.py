@@ -2,7 +2,7 @@ import datetime
 import typing
 import uuid
 
-from rest_framework import serializers
+from rest_framework import pagination, serializers
 from rest_framework.response import Response
 from rest_framework.reverse import reverse
 from rest_framework.routers import DefaultRouter
@@ -13,6 +13,7 @@ from django.urls import (
     path,
 )
 
+from api.conf.pagination import KeysetPagination
 from api.core.authentication import DataWorkspaceOnlyAuthentication
 
 
@@ -40,12 +41,25 @@ class TableMetadataView(APIView):
                 # Don't bail out if eg. no list routes exist, only detail routes.
                 continue
 
+            action_urls = {}
+            for key in ("export_endpoint", "deleted_endpoint"):
+                action_url_name = table_metadata[key]
+                if action_url_name and namespace:
+                    action_url_name = f"{namespace}:{action_url_name}"
+                action_urls[key] = (
+                    reverse(action_url_name, args=args, kwargs=kwargs, request=request) if action_url_name else None
+                )
+
             tables.append(
                 {
                     "table_name": table_metadata["table_name"],
                     "endpoint": url,
                     "indexes": table_metadata["indexes"],
                     "fields": table_metadata["fields"],
+                    "pagination": table_metadata["pagination"],
+                    "export_endpoint": action_urls["export_endpoint"],
+                    "supports_deltas": table_metadata["supports_deltas"],
+                    "deleted_endpoint": action_urls["deleted_endpoint"],
                 }
             )
         return Response({"tables": tables})
@@ -138,6 +152,34 @@ def get_fields(view):
     return fields
 
 
+def get_pagination(viewset):
+    pagination_class = getattr(viewset, "pagination_class", None)
+    if not isinstance(pagination_class, type):
+        return None
+
+    if issubclass(pagination_class, KeysetPagination):
+        return {
+            "type": "keyset",
+            "ordering": list(pagination_class.ordering),
+            "query_parameters": {pagination_class.mode_query_param: pagination_class.keyset_mode},
+        }
+
+    if issubclass(pagination_class, pagination.CursorPagination):
+        ordering = pagination_class.ordering
+        return {
+            "type": "cursor",
+            "ordering": [ordering] if isinstance(ordering, str) else list(ordering),
+        }
+
+    if issubclass(pagination_class, pagination.LimitOffsetPagination):
+        return {"type": "limit_offset"}
+
+    if issubclass(pagination_class, pagination.PageNumberPagination):
+        return {"type": "page_number"}
+
+    return None  # pragma: no cover
+
+
 class TableMetadataRouter(DefaultRouter):
     def register(self, viewset):
         if not hasattr(viewset, "DataWorkspace"):  # pragma: no cover
@@ -160,12 +202,17 @@ class TableMetadataRouter(DefaultRouter):
             view.format_kwarg = {}
             view.request = None
 
+            supports_deltas = hasattr(viewset, "supports_deltas") and viewset.supports_deltas()
             metadata.append(
                 {
                     "table_name": data_workspace_metadata.table_name,
                     "endpoint": list_name.format(basename=basename),
                     "indexes": getattr(data_workspace_metadata, "indexes", []),
                     "fields": getattr(data_workspace_metadata, "fields", get_fields(view)),
+                    "pagination": get_pagination(viewset),
+                    "export_endpoint": f"{basename}-export" if hasattr(viewset, "export") else None,
+                    "supports_deltas": supports_deltas,
+                    "deleted_endpoint": f"{basename}-deleted" if supports_deltas else None,
                 }
             )
 
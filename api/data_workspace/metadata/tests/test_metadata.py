@@ -59,12 +59,24 @@ class MetadataTestCase(URLPatternsTestCase):
                     "endpoint": "http://testserver/api/endpoints/fake-table/",
                     "indexes": [],
                     "fields": [],
+                    "pagination": None,
+                    "export_endpoint": None,
+                    "supports_deltas": False,
+                    "deleted_endpoint": None,
                 },
                 {
                     "table_name": "another_fake_table",
                     "endpoint": "http://testserver/api/endpoints/another-fake-table/",
                     "indexes": ["one", "two", "three"],
                     "fields": [{"name": "id", "primary_key": True, "type": "UUID"}],
+                    "pagination": {
+                        "type": "keyset",
+                        "ordering": ["created_at", "id"],
+                        "query_parameters": {"pagination": "keyset"},
+                    },
+                    "export_endpoint": None,
+                    "supports_deltas": False,
+                    "deleted_endpoint": None,
                 },
             ],
         )
@@ -80,12 +92,24 @@ class MetadataTestCase(URLPatternsTestCase):
                     "endpoint": "http://testserver/namespaced/endpoints/fake-table/",
                     "indexes": [],
                     "fields": [],
+                    "pagination": None,
+                    "export_endpoint": None,
+                    "supports_deltas": False,
+                    "deleted_endpoint": None,
                 },
                 {
                     "table_name": "another_fake_table",
                     "endpoint": "http://testserver/namespaced/endpoints/another-fake-table/",
                     "indexes": ["one", "two", "three"],
                     "fields": [{"name": "id", "primary_key": True, "type": "UUID"}],
+                    "pagination": {
+                        "type": "keyset",
+                        "ordering": ["created_at", "id"],
+                        "query_parameters": {"pagination": "keyset"},
+                    },
+                    "export_endpoint": None,
+                    "supports_deltas": False,
+                    "deleted_endpoint": None,
                 },
             ],
         )
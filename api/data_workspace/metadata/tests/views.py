@@ -1,6 +1,8 @@
 from rest_framework import viewsets
 from rest_framework.response import Response
 
+from api.conf.pagination import CreatedAtKeysetPagination
+
 from . import serializers
 
 
@@ -16,6 +18,8 @@ class FakeTableViewSet(viewsets.ViewSet):
 
 
 class AnotherFakeTableViewSet(viewsets.ViewSet):
+    pagination_class = CreatedAtKeysetPagination
+
     class DataWorkspace:
         table_name = "another_fake_table"
         indexes = ["one", "two", "three"]
@@ -0,0 +1,8 @@
+from django.contrib.contenttypes.models import ContentType
+
+from api.data_workspace.models import Tombstone
+
+
+def data_workspace_row_deleted_handler(sender, instance, **kwargs):
+    # Connected in DataWorkspaceConfig.ready() to the models behind the tables that can be synced incrementally
+    Tombstone.objects.create(content_type=ContentType.objects.get_for_model(sender), object_id=str(instance.pk))
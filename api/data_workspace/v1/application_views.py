@@ -7,7 +7,9 @@ from api.applications import models
 from api.applications.serializers import standard_application, good, party, denial
 from api.audit_trail.enums import AuditType
 from api.audit_trail.models import Audit
+from api.conf.pagination import KeysetPagination
 from api.core.authentication import DataWorkspaceOnlyAuthentication
+from api.data_workspace.incremental import IncrementalSyncMixin
 from api.parties.enums import PartyType
 
 
@@ -59,11 +61,12 @@ class StandardApplicationListView(viewsets.ReadOnlyModelViewSet):
     )
 
 
-class GoodOnApplicationListView(viewsets.ReadOnlyModelViewSet):
+class GoodOnApplicationListView(IncrementalSyncMixin, viewsets.ReadOnlyModelViewSet):
     authentication_classes = (DataWorkspaceOnlyAuthentication,)
     serializer_class = good.GoodOnApplicationDataWorkspaceSerializer
-    pagination_class = LimitOffsetPagination
+    pagination_class = KeysetPagination
     queryset = models.GoodOnApplication.objects.all()
+    updated_at_fields = ("updated_at",)
 
 
 class GoodOnApplicationControlListEntriesListView(viewsets.ReadOnlyModelViewSet):
@@ -80,11 +83,12 @@ class GoodOnApplicationRegimeEntriesListView(viewsets.ReadOnlyModelViewSet):
     queryset = models.GoodOnApplicationRegimeEntry.objects.all()
 
 
-class PartyOnApplicationListView(viewsets.ReadOnlyModelViewSet):
+class PartyOnApplicationListView(IncrementalSyncMixin, viewsets.ReadOnlyModelViewSet):
     authentication_classes = (DataWorkspaceOnlyAuthentication,)
     serializer_class = party.PartyOnApplicationViewSerializer
-    pagination_class = LimitOffsetPagination
+    pagination_class = KeysetPagination
     queryset = models.PartyOnApplication.objects.all().order_by("id")
+    updated_at_fields = ("updated_at",)
 
 
 class DenialMatchOnApplicationListView(viewsets.ReadOnlyModelViewSet):
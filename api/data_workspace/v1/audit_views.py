@@ -7,6 +7,7 @@ from rest_framework.pagination import LimitOffsetPagination
 from api.audit_trail.enums import AuditType
 from api.audit_trail.models import Audit
 from api.cases.models import Case
+from api.conf.pagination import CreatedAtKeysetPagination
 from api.core.authentication import DataWorkspaceOnlyAuthentication
 from api.data_workspace.v1.serializers import (
     AuditBulkApprovalRecommendationSerializer,
@@ -102,7 +103,7 @@ class AuditUpdatedCaseStatusListView(viewsets.ReadOnlyModelViewSet):
 
     authentication_classes = (DataWorkspaceOnlyAuthentication,)
     serializer_class = AuditUpdatedCaseStatusSerializer
-    pagination_class = LimitOffsetPagination
+    pagination_class = CreatedAtKeysetPagination
 
     def get_queryset(self):
         return Audit.objects.filter(verb=AuditType.UPDATED_STATUS).order_by("created_at")
@@ -113,7 +114,7 @@ class AuditUpdatedLicenceStatusListView(viewsets.ReadOnlyModelViewSet):
 
     authentication_classes = (DataWorkspaceOnlyAuthentication,)
     serializer_class = AuditUpdatedLicenceStatusSerializer
-    pagination_class = LimitOffsetPagination
+    pagination_class = CreatedAtKeysetPagination
 
     def get_queryset(self):
         return Audit.objects.filter(verb=AuditType.LICENCE_UPDATED_STATUS).order_by("created_at")
@@ -124,7 +125,7 @@ class AuditBulkApprovalRecommendationListView(viewsets.ReadOnlyModelViewSet):
 
     authentication_classes = (DataWorkspaceOnlyAuthentication,)
     serializer_class = AuditBulkApprovalRecommendationSerializer
-    pagination_class = LimitOffsetPagination
+    pagination_class = CreatedAtKeysetPagination
 
     def get_queryset(self):
         return Audit.objects.filter(verb=AuditType.CREATE_BULK_APPROVAL_RECOMMENDATION).order_by("created_at")
@@ -1,7 +1,9 @@
 from rest_framework import viewsets
 from rest_framework.pagination import LimitOffsetPagination
 
+from api.conf.pagination import KeysetPagination
 from api.core.authentication import DataWorkspaceOnlyAuthentication
+from api.data_workspace.incremental import IncrementalSyncMixin
 from api.cases.models import CaseAssignment, CaseAssignmentSLA, CaseType, CaseQueue, EcjuQuery, DepartmentSLA
 from api.cases.serializers import (
     CaseAssignmentSLASerializer,
@@ -15,11 +17,12 @@ from api.data_workspace.v1.serializers import (
 )
 
 
-class CaseAssignmentList(viewsets.ReadOnlyModelViewSet):
+class CaseAssignmentList(IncrementalSyncMixin, viewsets.ReadOnlyModelViewSet):
     authentication_classes = (DataWorkspaceOnlyAuthentication,)
     serializer_class = CaseAssignmentSerializer
-    pagination_class = LimitOffsetPagination
+    pagination_class = KeysetPagination
     queryset = CaseAssignment.objects.all().order_by("id")
+    updated_at_fields = ("updated_at",)
 
 
 class CaseAssignmentSLAList(viewsets.ReadOnlyModelViewSet):
@@ -50,8 +53,9 @@ class CaseDepartmentList(viewsets.ReadOnlyModelViewSet):
     queryset = DepartmentSLA.objects.all()
 
 
-class EcjuQueryList(viewsets.ReadOnlyModelViewSet):
+class EcjuQueryList(IncrementalSyncMixin, viewsets.ReadOnlyModelViewSet):
     authentication_classes = (DataWorkspaceOnlyAuthentication,)
     serializer_class = EcjuQuerySerializer
-    pagination_class = LimitOffsetPagination
+    pagination_class = KeysetPagination
     queryset = EcjuQuery.objects.all().order_by("id")
+    updated_at_fields = ("updated_at",)
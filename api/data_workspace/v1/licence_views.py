@@ -1,21 +1,24 @@
 from rest_framework import viewsets
-from rest_framework.pagination import LimitOffsetPagination
 
+from api.conf.pagination import KeysetPagination
 from api.core.authentication import DataWorkspaceOnlyAuthentication
+from api.data_workspace.incremental import IncrementalSyncMixin
 from api.data_workspace.v1.serializers import LicenceSerializer
 from api.licences import models
 from api.licences.serializers import view_licence as serializers
 
 
-class GoodOnLicenceList(viewsets.ReadOnlyModelViewSet):
+class GoodOnLicenceList(IncrementalSyncMixin, viewsets.ReadOnlyModelViewSet):
     authentication_classes = (DataWorkspaceOnlyAuthentication,)
     serializer_class = serializers.GoodOnLicenceReportsViewSerializer
-    pagination_class = LimitOffsetPagination
+    pagination_class = KeysetPagination
     queryset = models.GoodOnLicence.objects.all()
+    updated_at_fields = ("updated_at",)
 
 
-class LicencesList(viewsets.ReadOnlyModelViewSet):
+class LicencesList(IncrementalSyncMixin, viewsets.ReadOnlyModelViewSet):
     authentication_classes = (DataWorkspaceOnlyAuthentication,)
     serializer_class = LicenceSerializer
-    pagination_class = LimitOffsetPagination
+    pagination_class = KeysetPagination
     queryset = models.Licence.objects.all()
+    updated_at_fields = ("updated_at",)
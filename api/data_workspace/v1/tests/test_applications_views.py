@@ -6,7 +6,7 @@ from urllib import parse
 
 from api.applications.enums import ApplicationExportType, ApplicationExportLicenceOfficialType
 from test_helpers.clients import DataTestClient
-from api.applications.models import GoodOnApplication, GoodOnApplicationControlListEntry
+from api.applications.models import GoodOnApplication, GoodOnApplicationControlListEntry, PartyOnApplication
 from api.applications.tests.factories import StandardApplicationFactory
 from api.organisations.tests.factories import OrganisationFactory
 from api.flags.enums import FlagLevels
@@ -228,3 +228,32 @@ class DataWorkspaceApplicationViewTests(DataTestClient):
         actual_keys = response.json()["actions"]["GET"].keys()
         expected_keys = {"id", "denial_entity", "application", "category"}
         self.assertEqual(expected_keys, actual_keys)
+
+    def test_dw_party_on_application_keyset_pagination(self):
+        self.create_standard_application_case(self.organisation, "Another application")
+
+        url = f"{self.party_on_applications}?pagination=keyset&limit=2"
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            payload = response.json()
+            self.assertNotIn("count", payload)
+            self.assertLessEqual(len(payload["results"]), 2)
+            ids += [result["id"] for result in payload["results"]]
+            url = payload["next"]
+
+        expected_ids = [str(pk) for pk in PartyOnApplication.objects.order_by("id").values_list("id", flat=True)]
+        self.assertGreater(len(expected_ids), 2)
+        self.assertEqual(ids, expected_ids)
+
+    def test_dw_party_on_application_keyset_pagination_invalid_cursor(self):
+        response = self.client.get(f"{self.party_on_applications}?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_dw_party_on_application_limit_offset_pagination(self):
+        response = self.client.get(f"{self.party_on_applications}?limit=1")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        payload = response.json()
+        self.assertEqual(payload["count"], PartyOnApplication.objects.count())
+        self.assertEqual(len(payload["results"]), 1)
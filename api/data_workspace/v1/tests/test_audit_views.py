@@ -91,6 +91,20 @@ class DataWorkspaceAuditUpdatedCaseStatusTests(DataTestClient):
         options = response.json()["actions"]["GET"]
         self.assertEqual(tuple(options.keys()), expected_fields)
 
+    def test_audit_updated_status_keyset_pagination(self):
+        self.create_audit(payload={"status": {"new": "open", "old": "submitted"}})
+        self.create_audit(payload={"status": {"new": "closed", "old": "open"}})
+
+        url = f"{self.url}?pagination=keyset&limit=1"
+        results = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            results += response.json()["results"]
+            url = response.json()["next"]
+
+        self.assertEqual([result["status"] for result in results], ["submitted", "open", "closed"])
+
 
 class DataWorkspaceAuditUpdatedLicenceStatusTests(DataTestClient):
     def setUp(self):
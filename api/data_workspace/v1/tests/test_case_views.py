@@ -1,4 +1,8 @@
+from datetime import timedelta
+
+from django.conf import settings
 from django.urls import reverse
+from django.utils.dateparse import parse_datetime
 from rest_framework import status
 
 from api.cases.models import CaseAssignmentSLA, CaseAssignment
@@ -108,3 +112,44 @@ class DataWorkspaceTests(DataTestClient):
         options = self.client.options(url).json()
         assert set(options["actions"].keys()) == allowed_actions
         assert set(options["actions"]["GET"].keys()) == expected_fields
+
+    def test_case_assignment_updated_since(self):
+        url = reverse("data_workspace:v1:dw-case-assignment-list")
+        case_assignment = CaseAssignment.objects.get(case=self.case)
+
+        response = self.client.get(url, {"updated_since": case_assignment.updated_at - timedelta(seconds=1)})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["id"] for row in response.json()["results"]], [str(case_assignment.id)])
+
+        overlap = timedelta(seconds=settings.DATA_WORKSPACE_DELTA_OVERLAP)
+        response = self.client.get(url, {"updated_since": case_assignment.updated_at - timedelta(seconds=1) + overlap})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["id"] for row in response.json()["results"]], [str(case_assignment.id)])
+
+        response = self.client.get(url, {"updated_since": case_assignment.updated_at + overlap})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["results"], [])
+
+    def test_case_assignment_updated_since_invalid(self):
+        url = reverse("data_workspace:v1:dw-case-assignment-list")
+
+        response = self.client.get(url, {"updated_since": "yesterday"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_case_assignment_deleted(self):
+        url = reverse("data_workspace:v1:dw-case-assignment-deleted")
+        case_assignment = CaseAssignment.objects.get(case=self.case)
+        case_assignment_id = str(case_assignment.id)
+        case_assignment.delete()
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.json()["results"]
+        self.assertEqual([row["id"] for row in results], [case_assignment_id])
+
+        deleted_at = parse_datetime(results[0]["deleted_at"])
+        response = self.client.get(
+            url, {"deleted_since": deleted_at + timedelta(seconds=settings.DATA_WORKSPACE_DELTA_OVERLAP)}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["results"], [])
@@ -0,0 +1,71 @@
+"""
+Bulk exports of Data Workspace tables, written as gzip compressed newline delimited JSON or CSV as the rows are read
+from the database so that the whole table is never held in memory.
+"""
+
+import csv
+import datetime
+import decimal
+import io
+import json
+import uuid
+import zlib
+
+JSONL = "jsonl"
+CSV = "csv"
+
+EXPORT_CONTENT_TYPES = {
+    JSONL: "application/x-ndjson",
+    CSV: "text/csv",
+}
+
+# Compressed data is only yielded once this much has been written, rather than for every row
+EXPORT_BUFFER_SIZE = 64 * 1024
+
+
+def _format_value(value):
+    # Written the same way as by the serializers' fields, keeping the microseconds that DjangoJSONEncoder drops
+    if isinstance(value, datetime.datetime):
+        value = value.isoformat()
+        return value[:-6] + "Z" if value.endswith("+00:00") else value
+    if isinstance(value, (datetime.date, datetime.time, decimal.Decimal, uuid.UUID)):
+        return str(value)
+    return value
+
+
+def _jsonl_lines(field_names, rows):
+    for row in rows:
+        yield json.dumps({field_name: _format_value(row[field_name]) for field_name in field_names}) + "\n"
+
+
+def _csv_lines(field_names, rows):
+    line = io.StringIO()
+    writer = csv.writer(line)
+    writer.writerow(field_names)
+    for row in rows:
+        writer.writerow([_format_value(row[field_name]) for field_name in field_names])
+        yield line.getvalue()
+        line.seek(0)
+        line.truncate()
+
+
+def stream_export(field_names, rows, export_format):
+    """
+    Yields `rows`, dictionaries keyed by `field_names`, in the given format and gzip compressed
+    """
+    lines = {JSONL: _jsonl_lines, CSV: _csv_lines}[export_format](field_names, rows)
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+
+    buffer = []
+    buffer_size = 0
+    for line in lines:
+        buffer.append(line)
+        buffer_size += len(line)
+        if buffer_size >= EXPORT_BUFFER_SIZE:
+            compressed = compressor.compress("".join(buffer).encode())
+            if compressed:
+                yield compressed
+            buffer = []
+            buffer_size = 0
+
+    yield compressor.compress("".join(buffer).encode()) + compressor.flush()
@@ -384,25 +384,26 @@ def run_processing_time_task(start, up_to):
 
 
 @pytest.fixture
-def submit_application(api_client, exporter_headers, mocker):
+def submit_application(api_client, exporter_headers, mocker, django_capture_on_commit_callbacks):
     def _submit_application(draft_application):
         type_code = "T" if draft_application.export_type == ApplicationExportType.TEMPORARY else "P"
         reference_code = f"GBSIEL/2024/0000001/{type_code}"
         mocker.patch("api.cases.models.Case.generate_reference_code", return_value=reference_code)
 
-        response = api_client.put(
-            reverse(
-                "applications:application_submit",
-                kwargs={
-                    "pk": draft_application.pk,
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.put(
+                reverse(
+                    "applications:application_submit",
+                    kwargs={
+                        "pk": draft_application.pk,
+                    },
+                ),
+                data={
+                    "submit_declaration": True,
+                    "agreed_to_declaration_text": "i agree",
                 },
-            ),
-            data={
-                "submit_declaration": True,
-                "agreed_to_declaration_text": "i agree",
-            },
-            **exporter_headers,
-        )
+                **exporter_headers,
+            )
         assert response.status_code == 200, response.json()["errors"]
 
         draft_application.refresh_from_db()
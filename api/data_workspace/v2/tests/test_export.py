@@ -0,0 +1,163 @@
+import csv
+import datetime
+import gzip
+import io
+import json
+
+import pytest
+from dateutil.parser import parse
+from django.conf import settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from api.applications.tests.factories import (
+    GoodOnApplicationFactory,
+    PartyOnApplicationFactory,
+    StandardApplicationFactory,
+)
+from api.cases.enums import LicenceDecisionType
+from api.cases.models import LicenceDecision
+from api.goods.tests.factories import GoodFactory
+from api.licences.enums import LicenceStatus
+from api.licences.tests.factories import (
+    GoodOnLicenceFactory,
+    StandardLicenceFactory,
+)
+from api.staticdata.statuses.enums import CaseStatusEnum
+from api.staticdata.statuses.models import CaseStatus
+from api.staticdata.units.enums import Units
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture()
+def licensed_application():
+    application = StandardApplicationFactory(
+        status=CaseStatus.objects.get(status=CaseStatusEnum.FINALISED),
+    )
+    PartyOnApplicationFactory(application=application)
+    good_on_application = GoodOnApplicationFactory(
+        application=application,
+        good=GoodFactory(organisation=application.organisation),
+        quantity=100.0,
+        value=1500,
+        unit=Units.NAR,
+    )
+    licence = StandardLicenceFactory(case=application, status=LicenceStatus.ISSUED)
+    GoodOnLicenceFactory(
+        good=good_on_application,
+        quantity=good_on_application.quantity,
+        usage=0.0,
+        value=good_on_application.value,
+        licence=licence,
+    )
+    LicenceDecision.objects.create(case=application, decision=LicenceDecisionType.ISSUED, licence=licence)
+    return application
+
+
+@pytest.fixture()
+def tables(api_client):
+    response = api_client.get(reverse("data_workspace:v2:table-metadata"))
+    return {table["table_name"]: table for table in response.json()["tables"]}
+
+
+def get_list_rows(api_client, url):
+    rows = []
+    while url:
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        rows += response.json()["results"]
+        url = response.json()["next"]
+    return rows
+
+
+def get_export(api_client, url, **params):
+    response = api_client.get(url, params)
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Encoding"] == "gzip"
+    return gzip.decompress(b"".join(response.streaming_content)).decode()
+
+
+def normalise(rows, fields):
+    # Dates and numbers are compared by value, as they aren't always written out the same way
+    types = {field["name"]: field.get("type") for field in fields}
+    normalised = []
+    for row in rows:
+        for name, value in row.items():
+            if value in (None, ""):
+                row[name] = None
+            elif types[name] == "DateTime":
+                row[name] = parse(value)
+            elif types[name] in ("Float", "Integer"):
+                row[name] = float(value)
+            else:
+                row[name] = str(value)
+        normalised.append(row)
+    return sorted(normalised, key=lambda row: json.dumps(row, sort_keys=True, default=str))
+
+
+@pytest.mark.parametrize(
+    "table_name",
+    [
+        "applications",
+        "countries",
+        "destinations",
+        "footnotes",
+        "goods",
+        "goods_descriptions",
+        "goods_on_licences",
+        "goods_ratings",
+        "licence_decisions",
+        "licence_refusal_criteria",
+        "units",
+    ],
+)
+def test_export_matches_list(api_client, tables, licensed_application, table_name):
+    table = tables[table_name]
+
+    exported = [json.loads(line) for line in get_export(api_client, table["export_endpoint"]).splitlines()]
+
+    assert normalise(exported, table["fields"]) == normalise(
+        get_list_rows(api_client, table["endpoint"]), table["fields"]
+    )
+
+
+def test_export_csv(api_client, tables, licensed_application):
+    table = tables["goods"]
+
+    exported = list(csv.DictReader(io.StringIO(get_export(api_client, table["export_endpoint"], export_format="csv"))))
+
+    assert normalise(exported, table["fields"]) == normalise(
+        get_list_rows(api_client, table["endpoint"]), table["fields"]
+    )
+
+
+def test_export_updated_since(api_client, tables, licensed_application):
+    url = tables["goods"]["export_endpoint"]
+    before = (licensed_application.created_at - datetime.timedelta(minutes=1)).isoformat()
+    after = (timezone.now() + datetime.timedelta(seconds=settings.DATA_WORKSPACE_DELTA_OVERLAP + 60)).isoformat()
+
+    assert len(get_export(api_client, url, updated_since=before).splitlines()) == 1
+    assert get_export(api_client, url, updated_since=after) == ""
+
+
+@pytest.mark.parametrize(
+    "table_name, params",
+    [
+        ("goods", {"export_format": "xml"}),
+        ("goods", {"updated_since": "yesterday"}),
+        ("units", {"updated_since": "2024-01-01T00:00:00Z"}),
+    ],
+)
+def test_export_invalid_parameters(api_client, tables, table_name, params):
+    response = api_client.get(tables[table_name]["export_endpoint"], params)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,145 @@
+import datetime
+from unittest import mock
+
+import pytest
+from django.conf import settings
+from django.urls import reverse
+from freezegun import freeze_time
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from api.applications.tests.factories import (
+    GoodOnApplicationFactory,
+    StandardApplicationFactory,
+)
+from api.cases.celery_tasks import update_cases_sla
+from api.cases.models import Case
+from api.data_workspace.models import Tombstone
+from api.goods.tests.factories import GoodFactory
+from api.staticdata.statuses.enums import CaseStatusEnum
+from api.staticdata.statuses.models import CaseStatus
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture()
+def tables(api_client):
+    response = api_client.get(reverse("data_workspace:v2:table-metadata"))
+    return {table["table_name"]: table for table in response.json()["tables"]}
+
+
+@pytest.fixture()
+def good_on_application():
+    application = StandardApplicationFactory(
+        status=CaseStatus.objects.get(status=CaseStatusEnum.SUBMITTED),
+    )
+    return GoodOnApplicationFactory(application=application, good=GoodFactory(organisation=application.organisation))
+
+
+def get_ids(api_client, url, **params):
+    response = api_client.get(url, params)
+    assert response.status_code == status.HTTP_200_OK
+    return [row["id"] for row in response.json()["results"]]
+
+
+def test_table_metadata_deltas(tables):
+    assert tables["goods"]["supports_deltas"] is True
+    assert tables["goods"]["deleted_endpoint"] == "http://testserver" + reverse("data_workspace:v2:dw-goods-deleted")
+    assert tables["applications"]["supports_deltas"] is True
+    assert tables["units"]["supports_deltas"] is False
+    assert tables["units"]["deleted_endpoint"] is None
+
+
+def get_overlap():
+    return datetime.timedelta(seconds=settings.DATA_WORKSPACE_DELTA_OVERLAP)
+
+
+def test_updated_since(api_client, tables, good_on_application):
+    url = tables["goods"]["endpoint"]
+    watermark = timezone.now() + get_overlap()
+
+    assert get_ids(api_client, url, updated_since=watermark.isoformat()) == []
+
+    with freeze_time(watermark):
+        good_on_application.quantity = 5
+        good_on_application.save()
+
+    assert get_ids(api_client, url, updated_since=watermark.isoformat()) == [str(good_on_application.id)]
+
+
+def test_updated_since_overlap(api_client, tables, good_on_application):
+    # A change committed after the watermark was taken can have been made before it
+    url = tables["goods"]["endpoint"]
+    good_on_application.quantity = 5
+    good_on_application.save()
+    watermark = good_on_application.updated_at + get_overlap() - datetime.timedelta(seconds=1)
+
+    assert get_ids(api_client, url, updated_since=watermark.isoformat()) == [str(good_on_application.id)]
+
+
+def test_updated_since_application_changes(api_client, tables, good_on_application):
+    # Goods aren't updated when their application is submitted, but still need picking up as new rows
+    url = tables["goods"]["endpoint"]
+    watermark = timezone.now()
+
+    good_on_application.application.save()
+
+    assert get_ids(api_client, url, updated_since=watermark.isoformat()) == [str(good_on_application.id)]
+
+
+@mock.patch("api.cases.celery_tasks.is_weekend", return_value=False)
+@mock.patch("api.cases.celery_tasks.is_bank_holiday", return_value=False)
+def test_updated_since_sla_update(mock_is_bank_holiday, mock_is_weekend, api_client, tables, good_on_application):
+    # The SLA job changes each application's processing time without saving it
+    application = good_on_application.application
+    Case.objects.filter(id=application.id).update(
+        submitted_at=timezone.now() - datetime.timedelta(days=1), sla_remaining_days=20
+    )
+    url = tables["applications"]["endpoint"]
+    watermark = timezone.now() + get_overlap()
+
+    assert get_ids(api_client, url, updated_since=watermark.isoformat()) == []
+
+    with freeze_time(watermark):
+        update_cases_sla.apply().get()
+
+    assert get_ids(api_client, url, updated_since=watermark.isoformat()) == [str(application.id)]
+
+
+def test_deleted(api_client, tables, good_on_application):
+    url = tables["goods"]["deleted_endpoint"]
+    good_on_application_id = str(good_on_application.id)
+
+    assert get_ids(api_client, url) == []
+
+    good_on_application.delete()
+
+    assert get_ids(api_client, url) == [good_on_application_id]
+    tombstone = Tombstone.objects.get(object_id=good_on_application_id)
+    watermark = tombstone.deleted_at + get_overlap()
+    assert get_ids(api_client, url, deleted_since=watermark.isoformat()) == []
+    assert get_ids(api_client, url, deleted_since=(watermark - datetime.timedelta(seconds=1)).isoformat()) == [
+        good_on_application_id
+    ]
+
+
+def test_deleted_by_cascade(good_on_application):
+    good_on_application.good.delete()
+
+    # Goods themselves aren't in a table synced incrementally, so only the good on application is recorded
+    assert list(Tombstone.objects.values_list("object_id", flat=True)) == [str(good_on_application.id)]
+
+
+def test_full_sync_only_table(api_client, tables):
+    response = api_client.get(tables["units"]["endpoint"], {"updated_since": "2024-01-01T00:00:00Z"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = api_client.get(reverse("data_workspace:v2:dw-units-deleted"))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -1,16 +1,32 @@
 import itertools
 
+from django.conf import settings
 from django.db.models import (
+    Case,
+    Exists,
     F,
+    OuterRef,
     Prefetch,
     Q,
+    QuerySet,
+    Subquery,
+    UUIDField,
+    Value,
+    When,
 )
 from django.db.models.aggregates import (
     Count,
     Min,
 )
+from django.db.models.functions import (
+    Coalesce,
+    Concat,
+)
 from django.db.models.lookups import GreaterThan
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.pagination import (
     CursorPagination,
     LimitOffsetPagination,
@@ -25,12 +41,20 @@ from api.applications.models import (
 )
 from api.audit_trail.enums import AuditType
 from api.audit_trail.models import Audit
+from api.cases.enums import LicenceDecisionType
 from api.cases.models import (
     Advice,
     LicenceDecision,
 )
 from api.conf.pagination import CreatedAtCursorPagination
 from api.core.authentication import DataWorkspaceOnlyAuthentication
+from api.data_workspace.incremental import IncrementalSyncMixin
+from api.data_workspace.v2.export import (
+    CSV,
+    EXPORT_CONTENT_TYPES,
+    JSONL,
+    stream_export,
+)
 from api.data_workspace.v2.serializers import (
     ApplicationSerializer,
     CountrySerializer,
@@ -52,7 +76,7 @@ from api.staticdata.statuses.enums import CaseStatusEnum
 from api.staticdata.units.enums import Units
 
 
-class BaseViewSet(viewsets.ReadOnlyModelViewSet):
+class BaseViewSet(IncrementalSyncMixin, viewsets.ReadOnlyModelViewSet):
     authentication_classes = (DataWorkspaceOnlyAuthentication,)
     renderer_classes = tuple(api_settings.DEFAULT_RENDERER_CLASSES) + (PaginatedCSVRenderer,)
 
@@ -67,6 +91,62 @@ class BaseViewSet(viewsets.ReadOnlyModelViewSet):
         # type of field to order on.
         raise NotImplementedError("You must provide a pagination class that is ideally a cursor paginator.")
 
+    # The columns of the table's export, mapped to the lookups or expressions they are read from, so that exported
+    # rows are read with `values_list()` rather than through the serializer. Tables without them are exported
+    # through the serializer.
+    export_fields = None
+
+    def get_export_queryset(self):
+        queryset = self.get_queryset()
+        if isinstance(queryset, QuerySet):
+            queryset = queryset.prefetch_related(None).order_by()
+        return queryset
+
+    def get_export_rows(self, queryset):
+        if self.export_fields is None:
+            objects = queryset
+            if isinstance(queryset, QuerySet):
+                objects = queryset.iterator(chunk_size=settings.DATA_WORKSPACE_EXPORT_CHUNK_SIZE)
+            return list(self.get_serializer().fields), (self.get_serializer(obj).data for obj in objects)
+
+        field_names = list(self.export_fields)
+        values = queryset.values_list(*self.export_fields.values()).iterator(
+            chunk_size=settings.DATA_WORKSPACE_EXPORT_CHUNK_SIZE
+        )
+        return field_names, (dict(zip(field_names, row)) for row in values)
+
+    @action(detail=False, url_path="export")
+    def export(self, request):
+        """
+        Streams the whole table, or with `updated_since` only the rows changed since shortly before then, as gzip
+        compressed newline delimited JSON or, with `export_format=csv`, CSV
+        """
+        export_format = request.query_params.get("export_format", JSONL)
+        if export_format not in EXPORT_CONTENT_TYPES:
+            raise ValidationError({"export_format": [f"Must be one of {JSONL} or {CSV}"]})
+
+        queryset = self.filter_updated_since(self.get_export_queryset())
+        field_names, rows = self.get_export_rows(queryset)
+        response = StreamingHttpResponse(
+            stream_export(field_names, rows, export_format),
+            content_type=EXPORT_CONTENT_TYPES[export_format],
+        )
+        response["Content-Encoding"] = "gzip"
+        response["Content-Disposition"] = f'attachment; filename="{self.DataWorkspace.table_name}.{export_format}"'
+        return response
+
+
+def get_latest_licence_id(**filters):
+    return Subquery(
+        LicenceDecision.objects.filter(
+            case_id=OuterRef("case_id"),
+            excluded_from_statistics_reason__isnull=True,
+            **filters,
+        )
+        .order_by("-created_at")
+        .values("licence_id")[:1]
+    )
+
 
 class LicenceDecisionViewSet(BaseViewSet):
     pagination_class = CreatedAtCursorPagination
@@ -85,6 +165,22 @@ class LicenceDecisionViewSet(BaseViewSet):
         )
         .select_related("case")
     )
+    # Matches LicenceDecisionSerializer.get_licence_id
+    export_fields = {
+        "id": "id",
+        "application_id": "case_id",
+        "decision": "decision",
+        "decision_made_at": "created_at",
+        "licence_id": Case(
+            When(decision=LicenceDecisionType.REFUSED, then=None),
+            When(
+                decision=LicenceDecisionType.ISSUED,
+                then=get_latest_licence_id(decision=LicenceDecisionType.ISSUED),
+            ),
+            default=get_latest_licence_id(),
+            output_field=UUIDField(),
+        ),
+    }
 
     class DataWorkspace:
         table_name = "licence_decisions"
@@ -94,6 +190,7 @@ class CountryViewSet(BaseViewSet):
     pagination_class = LimitOffsetPagination
     serializer_class = CountrySerializer
     queryset = Country.objects.all().order_by("id", "name")
+    export_fields = {"code": "id", "name": "name"}
 
     class DataWorkspace:
         table_name = "countries"
@@ -107,6 +204,7 @@ class DestinationViewSet(BaseViewSet):
         .exclude(application__status__status=CaseStatusEnum.DRAFT)
         .select_related("party", "party__country")
     )
+    export_fields = {"application_id": "application_id", "country_code": "party__country_id", "type": "party__type"}
 
     class DataWorkspace:
         table_name = "destinations"
@@ -116,6 +214,15 @@ class GoodViewSet(BaseViewSet):
     pagination_class = CreatedAtCursorPagination
     serializer_class = GoodSerializer
     queryset = GoodOnApplication.objects.exclude(application__status__status=CaseStatusEnum.DRAFT)
+    export_fields = {
+        "id": "id",
+        "application_id": "application_id",
+        "quantity": "quantity",
+        "unit": "unit",
+        "value": "value",
+    }
+    # Goods are only in the table once their application has been submitted, which doesn't update them
+    updated_at_fields = ("updated_at", "application__updated_at")
 
     class DataWorkspace:
         table_name = "goods"
@@ -132,6 +239,17 @@ class GoodDescriptionViewSet(BaseViewSet):
         report_summary_prefix_name=F("report_summaries__prefix__name"),
         report_summary_subject_name=F("report_summaries__subject__name"),
     )
+    # Matches GoodDescriptionSerializer.get_description
+    export_fields = {
+        "description": Case(
+            When(
+                Q(report_summary_prefix_name__isnull=True) | Q(report_summary_prefix_name=""),
+                then=F("report_summary_subject_name"),
+            ),
+            default=Concat(F("report_summary_prefix_name"), Value(" "), F("report_summary_subject_name")),
+        ),
+        "good_id": "id",
+    }
 
     class DataWorkspace:
         table_name = "goods_descriptions"
@@ -151,6 +269,7 @@ class GoodOnLicenceViewSet(BaseViewSet):
         licence__case__status__status=CaseStatusEnum.DRAFT,
         licence__status=LicenceStatus.DRAFT,
     )
+    export_fields = {"good_id": "good_id", "licence_id": "licence_id"}
 
     class DataWorkspace:
         table_name = "goods_on_licences"
@@ -179,6 +298,46 @@ class ApplicationViewSet(BaseViewSet):
         )
     )
 
+    # Matches ApplicationSerializer, with the annotations above worked out per row by subqueries instead
+    export_fields = {
+        "id": "id",
+        "licence_type": "case_type__reference",
+        "reference_code": "reference_code",
+        "sub_type": Case(
+            When(
+                Exists(
+                    GoodOnApplication.objects.filter(
+                        Q(is_good_incorporated=True) | Q(is_onward_incorporated=True),
+                        application_id=OuterRef("pk"),
+                    )
+                ),
+                then=Value("incorporation"),
+            ),
+            default=F("export_type"),
+        ),
+        "status": "status__status",
+        "processing_time": "sla_days",
+        "first_closed_at": Coalesce(
+            Subquery(
+                LicenceDecision.objects.filter(case_id=OuterRef("pk")).order_by("created_at").values("created_at")[:1]
+            ),
+            Subquery(
+                Audit.objects.filter(
+                    case=OuterRef("pk"),
+                    payload__status__new__in=get_closed_statuses(),
+                    verb=AuditType.UPDATED_STATUS,
+                )
+                .order_by("created_at")
+                .values("created_at")[:1]
+            ),
+        ),
+    }
+    # The SLA job updates the processing time without saving the application
+    updated_at_fields = ("updated_at", "sla_updated_at")
+
+    def get_export_queryset(self):
+        return StandardApplication.objects.exclude(status__status=CaseStatusEnum.DRAFT).order_by()
+
     class DataWorkspace:
         table_name = "applications"
 
@@ -201,6 +360,7 @@ class FootnoteViewSet(BaseViewSet):
         .order_by("case__pk")
         .distinct()
     )
+    export_fields = {"footnote": "footnote", "team_name": "team__name", "application_id": "case__pk", "type": "type"}
 
     class DataWorkspace:
         table_name = "footnotes"
@@ -212,6 +372,7 @@ class GoodRatingViewSet(BaseViewSet):
     queryset = GoodOnApplication.objects.exclude(control_list_entries__isnull=True).annotate(
         rating=F("control_list_entries__rating")
     )
+    export_fields = {"good_id": "id", "rating": "rating"}
 
     class DataWorkspace:
         table_name = "goods_ratings"
@@ -223,6 +384,7 @@ class LicenceRefusalCriteriaViewSet(BaseViewSet):
     queryset = DenialReason.objects.exclude(licencedecision__denial_reasons__isnull=True).annotate(
         licence_decision_id=F("licencedecision__id")
     )
+    export_fields = {"criteria": "display_value", "licence_decision_id": "licence_decision_id"}
 
     class DataWorkspace:
         table_name = "licence_refusal_criteria"
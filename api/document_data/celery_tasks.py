@@ -1,3 +1,6 @@
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
 from botocore.exceptions import ClientError
 from celery import shared_task
 from celery.utils.log import get_task_logger
@@ -5,7 +8,7 @@ from celery.utils.log import get_task_logger
 from django.conf import settings
 from django.utils import timezone
 
-from api.documents.libraries.s3_operations import get_object
+from api.documents.libraries.s3_operations import get_object, list_objects
 from api.documents.models import Document
 from api.document_data.models import (
     BackupLog,
@@ -19,6 +22,84 @@ logger = get_task_logger(__name__)
 MAX_ATTEMPTS = 3
 RETRY_BACKOFF = 180
 
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# Downloads larger than this are spooled to disk while they wait to be written to the database
+DOWNLOAD_SPOOL_SIZE = 10 * 1024 * 1024
+
+
+def get_s3_keys_to_backup(s3_keys):
+    """
+    Returns the keys out of `s3_keys` whose file in S3 has changed since it was last backed up, using a listing of the
+    bucket rather than retrieving each file
+    """
+    backed_up = dict(DocumentData.objects.values_list("s3_key", "last_modified"))
+    s3_keys = set(s3_keys)
+    found = set()
+    to_backup = []
+
+    for s3_key, last_modified, size in list_objects():
+        if s3_key not in s3_keys:
+            continue
+        found.add(s3_key)
+
+        # Listings give milliseconds but retrieved files only give seconds, which is what is stored
+        if s3_key in backed_up and last_modified.replace(microsecond=0) <= backed_up[s3_key]:
+            continue
+        to_backup.append((s3_key, size))
+
+    for s3_key in s3_keys - found:
+        logger.warning("File '%s' was not found in S3", s3_key)
+
+    return to_backup
+
+
+def download_file(document_id, s3_key):
+    """
+    Downloads a file in chunks, returning a file object holding its contents along with its last modified time and
+    content type, or None if it could not be retrieved
+    """
+    try:
+        file = get_object(document_id, s3_key)
+    except ClientError:
+        file = None
+
+    if not file:
+        logger.warning(
+            "Failed to retrieve file '%s' from S3 for document '%s'",
+            s3_key,
+            document_id,
+        )
+        return None
+
+    data = tempfile.SpooledTemporaryFile(max_size=DOWNLOAD_SPOOL_SIZE)
+    try:
+        for chunk in file["Body"].iter_chunks(DOWNLOAD_CHUNK_SIZE):
+            data.write(chunk)
+    finally:
+        file["Body"].close()
+    data.seek(0)
+
+    return data, file["LastModified"], file["ContentType"]
+
+
+def save_document_data(document_id, s3_key, downloaded_file):
+    data, last_modified, content_type = downloaded_file
+    with data:
+        _, created = DocumentData.objects.update_or_create(
+            s3_key=s3_key,
+            defaults={
+                "data": data.read(),
+                "last_modified": last_modified,
+                "content_type": content_type,
+            },
+        )
+    logger.info(
+        "%s '%s' for document '%s'",
+        "Created" if created else "Updated",
+        s3_key,
+        document_id,
+    )
+
 
 @shared_task(
     autoretry_for=(Exception,),
@@ -45,73 +126,40 @@ def backup_document_data(self):
 
     backup_log = BackupLog.objects.create(task_id=self.request.id)
 
-    safe_documents = Document.objects.filter(safe=True)
-    count = safe_documents.count()
+    document_ids = dict(Document.objects.filter(safe=True).values_list("s3_key", "pk"))
+    s3_keys_to_backup = get_s3_keys_to_backup(document_ids)
     logger.debug(
-        "Backing up %s documents",
-        count,
+        "Backing up %s of %s files (%s bytes)",
+        len(s3_keys_to_backup),
+        len(document_ids),
+        sum(size for _, size in s3_keys_to_backup),
     )
-    for index, (document_id, document_s3_key) in enumerate(safe_documents.values_list("pk", "s3_key"), start=1):
-        logger.debug(
-            "Processing %s of %s",
-            index,
-            count,
-        )
-        try:
-            file = get_object(document_id, document_s3_key)
-        except ClientError:
-            logger.warning(
-                "Failed to retrieve file '%s' from S3 for document '%s'",
-                document_s3_key,
-                document_id,
-            )
-            continue
 
-        if not file:
-            logger.warning(
-                "Failed to retrieve file '%s' from S3 for document '%s'",
-                document_s3_key,
-                document_id,
+    # Files are downloaded in parallel and written to the database here as they arrive, with the number waiting to be
+    # written bounded so that they don't build up faster than they can be saved
+    max_pending = settings.BACKUP_DOCUMENT_DATA_WORKERS * 2
+    pending = {}
+
+    def save(futures):
+        for future in futures:
+            s3_key = pending.pop(future)
+            downloaded_file = future.result()
+            if downloaded_file:
+                save_document_data(document_ids[s3_key], s3_key, downloaded_file)
+
+    with ThreadPoolExecutor(max_workers=settings.BACKUP_DOCUMENT_DATA_WORKERS) as executor:
+        for index, (s3_key, _) in enumerate(s3_keys_to_backup, start=1):
+            logger.debug(
+                "Processing %s of %s",
+                index,
+                len(s3_keys_to_backup),
             )
-            continue
+            pending[executor.submit(download_file, document_ids[s3_key], s3_key)] = s3_key
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                save(done)
 
-        try:
-            document_data = DocumentData.objects.get(s3_key=document_s3_key)
-        except DocumentData.DoesNotExist:
-            DocumentData.objects.create(
-                data=file["Body"].read(),
-                last_modified=file["LastModified"],
-                s3_key=document_s3_key,
-                content_type=file["ContentType"],
-            )
-            logger.info(
-                "Created '%s' for document '%s'",
-                document_s3_key,
-                document_id,
-            )
-            file["Body"].close()
-            del file  # Clear this out for garbage collection
-            continue
-
-        if file["LastModified"] > document_data.last_modified:  # noqa: WS03
-            document_data.last_modified = file["LastModified"]  # noqa: WS03
-            document_data.data = file["Body"].read()  # noqa: WS03
-            document_data.content_type = file["ContentType"]  # noqa: WS03
-            document_data.save()
-            logger.info(
-                "Updated '%s' for document '%s'",
-                document_s3_key,
-                document_id,
-            )
-            file["Body"].close()  # noqa: WS03
-            del file  # Clear this out for garbage collection
-            continue
-
-        logger.debug(
-            "Nothing required for '%s' for document '%s'",
-            document_s3_key,
-            document_id,
-        )
+        save(wait(pending).done)
 
     backup_log.ended_at = timezone.now()
     backup_log.save()
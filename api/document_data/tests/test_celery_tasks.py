@@ -207,3 +207,53 @@ class TestBackupDocumentData(DataTestClient):
             DocumentData.objects.count(),
             0,
         )
+
+    def test_backup_many_documents(self):
+        for index in range(5):
+            self.put_object_in_default_bucket(f"key-{index}", f"test {index}".encode())
+            DocumentFactory.create(
+                s3_key=f"key-{index}",
+                safe=True,
+            )
+
+        backup_document_data.apply()
+
+        self.assertEqual(
+            dict(DocumentData.objects.values_list("s3_key", "data")),
+            {f"key-{index}": f"test {index}".encode() for index in range(5)},
+        )
+
+    def test_unchanged_document_data_not_downloaded(self):
+        self.put_object_in_default_bucket("thisisakey", b"test")
+        DocumentFactory.create(
+            s3_key="thisisakey",
+            safe=True,
+        )
+        backup_document_data.apply()
+
+        with mock.patch("api.document_data.celery_tasks.get_object") as mock_get_object:
+            backup_document_data.apply()
+
+        mock_get_object.assert_not_called()
+        self.assertEqual(
+            DocumentData.objects.get().data,
+            b"test",
+        )
+
+    def test_ignore_document_missing_from_s3(self):
+        self.put_object_in_default_bucket("thisisakey", b"test")
+        DocumentFactory.create(
+            s3_key="thisisakey",
+            safe=True,
+        )
+        DocumentFactory.create(
+            s3_key="missingkey",
+            safe=True,
+        )
+
+        backup_document_data.apply()
+
+        self.assertEqual(
+            list(DocumentData.objects.values_list("s3_key", flat=True)),
+            ["thisisakey"],
+        )
@@ -1,30 +1,74 @@
+import hashlib
 import logging
-from contextlib import closing
+import threading
+import time
+import uuid
+from contextlib import closing, contextmanager
 
 import requests
 from django.conf import settings
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
 from requests_toolbelt.multipart.encoder import MultipartEncoder
 
-from api.conf.settings import AV_REQUEST_TIMEOUT
+from api.conf.settings import AV_MAX_CONCURRENT_SCANS, AV_REQUEST_TIMEOUT, AV_SCAN_SLOT_TIMEOUT
+from api.core.helpers import increment_cache_counter
+
+VIRUS_SCAN_STATS_KEY_PREFIX = "virus-scan"
+VIRUS_SCAN_COUNT_KEY = f"{VIRUS_SCAN_STATS_KEY_PREFIX}-count"
+VIRUS_SCAN_DURATION_MS_KEY = f"{VIRUS_SCAN_STATS_KEY_PREFIX}-duration-ms"
+VIRUS_SCAN_MAX_DURATION_MS_KEY = f"{VIRUS_SCAN_STATS_KEY_PREFIX}-max-duration-ms"
+VIRUS_SCAN_DEDUPED_KEY = f"{VIRUS_SCAN_STATS_KEY_PREFIX}-deduped"
+VIRUS_SCAN_MAX_DURATION_LOCK_KEY = f"{VIRUS_SCAN_MAX_DURATION_MS_KEY}-lock"
+# The scans in progress across every worker each hold one of these keys in the cache
+VIRUS_SCAN_SLOT_KEYS = [f"{VIRUS_SCAN_STATS_KEY_PREFIX}-slot-{slot}" for slot in range(AV_MAX_CONCURRENT_SCANS)]
+
+# How long, in seconds, to wait between attempts to claim a slot held in the cache
+CACHE_SLOT_POLL_INTERVAL = 0.1
+# How long, in seconds, to wait for the lock on the max scan duration before giving up on recording it
+MAX_DURATION_LOCK_WAIT = 1
+
+_session = None
+_session_lock = threading.Lock()
 
 
 class VirusScanException(Exception):
     """Exceptions raised when scanning documents for viruses."""
 
 
+class ContentHasher:
+    """Computes the SHA-256 of a file as it is streamed to the AV service."""
+
+    def __init__(self):
+        self._sha256 = hashlib.sha256()
+        self._read_whole_file = False
+
+    def update(self, content, remaining_bytes):
+        self._sha256.update(content)
+        self._read_whole_file = remaining_bytes == 0
+
+    def hexdigest(self):
+        """Returns the hash, or an empty string if the whole file hasn't been streamed."""
+
+        return self._sha256.hexdigest() if self._read_whole_file else ""
+
+
 class S3StreamingBodyWrapper:
     """S3 Object wrapper that plays nice with streamed multipart/form-data."""
 
-    def __init__(self, s3_obj):
+    def __init__(self, s3_obj, hasher=None):
         self._obj = s3_obj
         self._body = s3_obj["Body"]
         self._remaining_bytes = s3_obj["ContentLength"]
+        self._hasher = hasher
 
     def read(self, amt=-1):
         """Read given amount of bytes, and decrease remaining len."""
 
         content = self._body.read(amt)
         self._remaining_bytes -= len(content)
+        if self._hasher:
+            self._hasher.update(content, self._remaining_bytes)
 
         return content
 
@@ -37,32 +81,117 @@ class S3StreamingBodyWrapper:
         return self._remaining_bytes
 
 
-def scan_file_for_viruses(document_id, filename, file):
-    """Scans a file for viruses; returns True or False if a virus is detected."""
+def get_av_session():
+    """
+    Returns the session shared by every scan in this process, so that connections to the AV service are reused
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=AV_MAX_CONCURRENT_SCANS)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+    return _session
+
+
+@contextmanager
+def hold_cache_slot(keys, timeout, wait):
+    """
+    Claims the first of `keys` that nobody holds in the cache, waiting up to `wait` seconds for one to be released,
+    and holds it until the block exits. Yields the key held, or None if none could be claimed in time. Slots expire
+    after `timeout` seconds, so that a process dying while it holds one doesn't keep it forever
+    """
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + wait
+    while True:
+        held_key = next((key for key in keys if cache.add(key, token, timeout=timeout)), None)
+        if held_key or time.monotonic() >= deadline:
+            break
+        time.sleep(CACHE_SLOT_POLL_INTERVAL)
+
+    try:
+        yield held_key
+    finally:
+        # A slot held for longer than its timeout may have been claimed by another process, which keeps it
+        if held_key and cache.get(held_key) == token:
+            cache.delete(held_key)
+
+
+def record_virus_scan_latency(duration):
+    duration_ms = round(duration * 1000)
+    increment_cache_counter(VIRUS_SCAN_COUNT_KEY)
+    increment_cache_counter(VIRUS_SCAN_DURATION_MS_KEY, duration_ms)
+    # The max is compared and set under a lock, so that a shorter scan can't overwrite a longer one finishing with it
+    with hold_cache_slot([VIRUS_SCAN_MAX_DURATION_LOCK_KEY], timeout=10, wait=MAX_DURATION_LOCK_WAIT) as locked:
+        if not locked:
+            logging.warning("Failed to record max AV scan duration of %sms; the lock is held", duration_ms)
+        elif duration_ms > cache.get(VIRUS_SCAN_MAX_DURATION_MS_KEY, 0):
+            cache.set(VIRUS_SCAN_MAX_DURATION_MS_KEY, duration_ms, timeout=None)
+
+
+def record_virus_scan_dedupe():
+    increment_cache_counter(VIRUS_SCAN_DEDUPED_KEY)
+
+
+def get_virus_scan_stats():
+    stats = cache.get_many(
+        [VIRUS_SCAN_COUNT_KEY, VIRUS_SCAN_DURATION_MS_KEY, VIRUS_SCAN_MAX_DURATION_MS_KEY, VIRUS_SCAN_DEDUPED_KEY]
+    )
+    scanned = stats.get(VIRUS_SCAN_COUNT_KEY, 0)
+    deduped = stats.get(VIRUS_SCAN_DEDUPED_KEY, 0)
+    return {
+        "scanned": scanned,
+        "deduped": deduped,
+        "mean_duration_ms": stats.get(VIRUS_SCAN_DURATION_MS_KEY, 0) / scanned if scanned else None,
+        "max_duration_ms": stats.get(VIRUS_SCAN_MAX_DURATION_MS_KEY),
+        "dedupe_rate": deduped / (scanned + deduped) if scanned + deduped else None,
+    }
+
+
+def scan_file_for_viruses(document_id, filename, file, hasher=None):
+    """
+    Scans a file for viruses; returns True or False if a virus is detected. The file's content is passed to `hasher`,
+    a ContentHasher, as it is streamed.
+
+    At most AV_MAX_CONCURRENT_SCANS files are streamed to the AV service at once across every worker. A scan waits
+    up to AV_REQUEST_TIMEOUT seconds for another to finish, and then fails so that it can be retried later.
+    """
 
     with closing(file["Body"]):
         logging.info(f"AV scanning document '{document_id}' for viruses")
 
-        multipart_fields = {"file": (filename, S3StreamingBodyWrapper(file), file["ContentType"])}
+        multipart_fields = {"file": (filename, S3StreamingBodyWrapper(file, hasher), file["ContentType"])}
         encoder = MultipartEncoder(fields=multipart_fields)
 
-        try:
-            response = requests.post(
-                # Assumes HTTP Basic auth in URL
-                # see: https://github.com/uktrade/dit-clamav-rest
-                settings.AV_SERVICE_URL.strip(),
-                data=encoder,
-                auth=(settings.AV_SERVICE_USERNAME.strip(), settings.AV_SERVICE_PASSWORD.strip()),
-                headers={"Content-Type": encoder.content_type},
-                timeout=AV_REQUEST_TIMEOUT,
-            )
-        except requests.exceptions.Timeout:
-            raise VirusScanException(f"Timeout exceeded when AV scanning document '{document_id}'")
-        except requests.exceptions.RequestException as exc:
-            raise VirusScanException(
-                f"An unexpected error occurred when AV scanning document '{document_id}' -> "
-                f"{type(exc).__name__}: {exc}"
-            )
+        with hold_cache_slot(VIRUS_SCAN_SLOT_KEYS, timeout=AV_SCAN_SLOT_TIMEOUT, wait=AV_REQUEST_TIMEOUT) as slot:
+            if not slot:
+                raise VirusScanException(
+                    f"Timeout exceeded waiting for {AV_MAX_CONCURRENT_SCANS} AV scans in progress before scanning "
+                    f"document '{document_id}'"
+                )
+            started = time.monotonic()
+            try:
+                response = get_av_session().post(
+                    # Assumes HTTP Basic auth in URL
+                    # see: https://github.com/uktrade/dit-clamav-rest
+                    settings.AV_SERVICE_URL.strip(),
+                    data=encoder,
+                    auth=(settings.AV_SERVICE_USERNAME.strip(), settings.AV_SERVICE_PASSWORD.strip()),
+                    headers={"Content-Type": encoder.content_type},
+                    timeout=AV_REQUEST_TIMEOUT,
+                )
+            except requests.exceptions.Timeout:
+                raise VirusScanException(f"Timeout exceeded when AV scanning document '{document_id}'")
+            except requests.exceptions.RequestException as exc:
+                raise VirusScanException(
+                    f"An unexpected error occurred when AV scanning document '{document_id}' -> "
+                    f"{type(exc).__name__}: {exc}"
+                )
+            duration = time.monotonic() - started
+
+        record_virus_scan_latency(duration)
 
         response.raise_for_status()
         report = response.json()
@@ -71,7 +200,7 @@ def scan_file_for_viruses(document_id, filename, file):
         if "malware" not in report:
             raise VirusScanException(f"Failed to AV scan document {document_id}; 'malware' key not found in report")
 
-        logging.info(f"Successfully AV scanned document '{document_id}'")
+        logging.info(f"Successfully AV scanned document '{document_id}' in {duration:.2f}s")
 
         contains_virus = report.get("malware")
 
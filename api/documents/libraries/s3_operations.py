@@ -1,10 +1,12 @@
+import base64
+import hashlib
 import logging
 import mimetypes
 import uuid
 
 import boto3
 from botocore.config import Config
-from botocore.exceptions import BotoCoreError, ReadTimeoutError
+from botocore.exceptions import BotoCoreError, ClientError, ReadTimeoutError
 
 from django.conf import settings
 from django.http import FileResponse
@@ -15,6 +17,9 @@ logger = logging.getLogger(__name__)
 
 _client = None
 
+# Content addressed keys this process has already seen in S3, which never need checking again
+_content_addressed_s3_keys = set()
+
 
 def init_s3_client():
     # We want to instantiate this once, ideally, but there may be cases where we
@@ -42,11 +47,12 @@ def init_s3_client():
 init_s3_client()
 
 
-def get_object(document_id, s3_key):
+def get_object(document_id, s3_key, with_checksum=False):
     logger.info(f"Retrieving file '{s3_key}' on document '{document_id}'")
 
+    checksum_args = {"ChecksumMode": "ENABLED"} if with_checksum else {}
     try:
-        return _client.get_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=s3_key)
+        return _client.get_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=s3_key, **checksum_args)
     except ReadTimeoutError:
         logger.warning(
             "Timeout exceeded when retrieving file '%s' on document '%s'",
@@ -62,6 +68,31 @@ def get_object(document_id, s3_key):
         )
 
 
+def get_content_hash(s3_object):
+    """
+    Returns the hex SHA-256 of an object retrieved from S3 with its checksum, identifying the file's content without
+    reading it. Objects uploaded without a SHA-256 checksum, or in parts, which S3 only has a checksum of the parts
+    for, return an empty string.
+    """
+    if not s3_object:
+        return ""
+    checksum = s3_object.get("ChecksumSHA256", "")
+    if not checksum or "-" in checksum:
+        return ""
+    return base64.b64decode(checksum).hex()
+
+
+def list_objects():
+    """
+    Yields the key, last modified time and size of every object in the bucket, listed up to 1000 at a time so that
+    none of the objects have to be retrieved
+    """
+    paginator = _client.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=settings.AWS_STORAGE_BUCKET_NAME):
+        for s3_object in page.get("Contents", []):
+            yield s3_object["Key"], s3_object["LastModified"], s3_object["Size"]
+
+
 def generate_s3_key(document_name, file_extension):
     return f"{document_name}-{uuid.uuid4()}.{file_extension}"
 
@@ -71,6 +102,29 @@ def upload_bytes_file(raw_file, s3_key):
     _client.put_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=s3_key, Body=raw_file)
 
 
+def file_exists(s3_key):
+    try:
+        _client.head_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=s3_key)
+    except ClientError as exc:
+        if exc.response["Error"]["Code"] in ("404", "NoSuchKey"):
+            return False
+        raise
+    return True
+
+
+def upload_content_addressed_file(raw_file, prefix, file_extension):
+    """
+    Uploads `raw_file` under a key derived from its SHA-256, so identical content is only ever stored once
+    :return: The S3 key of the file
+    """
+    s3_key = f"{prefix}/{hashlib.sha256(raw_file).hexdigest()}.{file_extension}"
+    if s3_key not in _content_addressed_s3_keys:
+        if not file_exists(s3_key):
+            upload_bytes_file(raw_file=raw_file, s3_key=s3_key)
+        _content_addressed_s3_keys.add(s3_key)
+    return s3_key
+
+
 def delete_file(document_id, s3_key):
     logger.info(f"Deleting file '{s3_key}' on document '{document_id}'")
 
@@ -0,0 +1,116 @@
+import io
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from ..av_operations import (
+    ContentHasher,
+    S3StreamingBodyWrapper,
+    VIRUS_SCAN_MAX_DURATION_LOCK_KEY,
+    VIRUS_SCAN_MAX_DURATION_MS_KEY,
+    VIRUS_SCAN_SLOT_KEYS,
+    VirusScanException,
+    hold_cache_slot,
+    record_virus_scan_latency,
+    scan_file_for_viruses,
+)
+
+
+class ContentHasherTests(SimpleTestCase):
+    def test_hexdigest_of_whole_file(self):
+        hasher = ContentHasher()
+        wrapper = S3StreamingBodyWrapper({"Body": io.BytesIO(b"test"), "ContentLength": 4}, hasher)
+
+        wrapper.read(2)
+        wrapper.read(2)
+
+        self.assertEqual(hasher.hexdigest(), "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08")
+
+    def test_hexdigest_of_partly_read_file_is_empty(self):
+        hasher = ContentHasher()
+        wrapper = S3StreamingBodyWrapper({"Body": io.BytesIO(b"test"), "ContentLength": 4}, hasher)
+
+        wrapper.read(2)
+
+        self.assertEqual(hasher.hexdigest(), "")
+
+
+class HoldCacheSlotTests(SimpleTestCase):
+    def tearDown(self):
+        cache.delete_many(["slot-1", "slot-2"])
+        super().tearDown()
+
+    def test_holds_first_free_slot_until_exit(self):
+        cache.add("slot-1", "someone-else")
+
+        with hold_cache_slot(["slot-1", "slot-2"], timeout=60, wait=0) as held_key:
+            self.assertEqual(held_key, "slot-2")
+            self.assertIsNotNone(cache.get("slot-2"))
+
+        self.assertIsNone(cache.get("slot-2"))
+        self.assertEqual(cache.get("slot-1"), "someone-else")
+
+    def test_no_slot_when_all_are_held(self):
+        cache.add("slot-1", "someone-else")
+
+        with hold_cache_slot(["slot-1"], timeout=60, wait=0) as held_key:
+            self.assertIsNone(held_key)
+
+        self.assertEqual(cache.get("slot-1"), "someone-else")
+
+    def test_slot_claimed_by_another_process_after_expiring_is_kept(self):
+        with hold_cache_slot(["slot-1"], timeout=60, wait=0):
+            cache.set("slot-1", "someone-else")
+
+        self.assertEqual(cache.get("slot-1"), "someone-else")
+
+
+class RecordVirusScanLatencyTests(SimpleTestCase):
+    def tearDown(self):
+        cache.clear()
+        super().tearDown()
+
+    def test_keeps_longest_duration(self):
+        record_virus_scan_latency(2)
+        record_virus_scan_latency(1)
+
+        self.assertEqual(cache.get(VIRUS_SCAN_MAX_DURATION_MS_KEY), 2000)
+        self.assertIsNone(cache.get(VIRUS_SCAN_MAX_DURATION_LOCK_KEY))
+
+    @patch("api.documents.libraries.av_operations.MAX_DURATION_LOCK_WAIT", 0)
+    def test_skips_max_duration_while_locked(self):
+        cache.add(VIRUS_SCAN_MAX_DURATION_LOCK_KEY, "someone-else")
+
+        record_virus_scan_latency(2)
+
+        self.assertIsNone(cache.get(VIRUS_SCAN_MAX_DURATION_MS_KEY))
+
+
+@override_settings(AV_SERVICE_URL="http://av", AV_SERVICE_USERNAME="username", AV_SERVICE_PASSWORD="password")
+class ScanFileForVirusesTests(SimpleTestCase):
+    def tearDown(self):
+        cache.clear()
+        super().tearDown()
+
+    @patch("api.documents.libraries.av_operations.AV_REQUEST_TIMEOUT", 0)
+    @patch("api.documents.libraries.av_operations.get_av_session")
+    def test_fails_while_every_scan_slot_is_held(self, mock_get_av_session):
+        for key in VIRUS_SCAN_SLOT_KEYS:
+            cache.add(key, "someone-else")
+        file = {"Body": io.BytesIO(b"test"), "ContentLength": 4, "ContentType": "text/plain"}
+
+        with self.assertRaises(VirusScanException):
+            scan_file_for_viruses("document-id", "test.txt", file)
+
+        mock_get_av_session.assert_not_called()
+
+    @patch("api.documents.libraries.av_operations.get_av_session")
+    def test_releases_scan_slot(self, mock_get_av_session):
+        mock_get_av_session.return_value.post.return_value.json.return_value = {"malware": False}
+        file = {"Body": io.BytesIO(b"test"), "ContentLength": 4, "ContentType": "text/plain"}
+
+        contains_virus = scan_file_for_viruses("document-id", "test.txt", file)
+
+        self.assertIs(contains_virus, False)
+        self.assertEqual(cache.get_many(VIRUS_SCAN_SLOT_KEYS), {})
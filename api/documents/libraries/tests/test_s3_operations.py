@@ -22,8 +22,10 @@ from ..s3_operations import (
     delete_file,
     document_download_stream,
     init_s3_client,
+    get_content_hash,
     get_object,
     upload_bytes_file,
+    upload_content_addressed_file,
 )
 
 
@@ -135,6 +137,12 @@ class S3OperationsGetObjectTests(SimpleTestCase):
         self.assertEqual(returned_object, mock_object)
         mock_client.get_object.assert_called_with(Bucket="test-bucket", Key="s3-key")
 
+    @patch("api.documents.libraries.s3_operations._client")
+    def test_get_object_with_checksum(self, mock_client):
+        get_object("document-id", "s3-key", with_checksum=True)
+
+        mock_client.get_object.assert_called_with(Bucket="test-bucket", Key="s3-key", ChecksumMode="ENABLED")
+
     @patch("api.documents.libraries.s3_operations._client")
     def test_get_object_read_timeout_error(self, mock_client):
         mock_client.get_object.side_effect = ReadTimeoutError(
@@ -170,6 +178,22 @@ class S3OperationsGetObjectTests(SimpleTestCase):
         )
 
 
+class S3OperationsGetContentHashTests(SimpleTestCase):
+    def test_get_content_hash(self):
+        s3_object = {"ChecksumSHA256": "n4bQgYhMfWWaL+qgxVrQFaO/TxsrC4Is0V1sFbDwCgg="}
+
+        self.assertEqual(
+            get_content_hash(s3_object), "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08"
+        )
+
+    def test_get_content_hash_without_checksum(self):
+        self.assertEqual(get_content_hash({"ETag": '"098f6bcd4621d373cade4e832627b4f6"'}), "")
+        self.assertEqual(get_content_hash(None), "")
+
+    def test_get_content_hash_of_multipart_upload(self):
+        self.assertEqual(get_content_hash({"ChecksumSHA256": "n4bQgYhMfWWaL+qgxVrQFaO/TxsrC4Is0V1sFbDwCgg=-2"}), "")
+
+
 @mock_aws
 class S3OperationsDeleteFileTests(SimpleTestCase):
     databases = {"default"}
@@ -235,6 +259,38 @@ class S3OperationsUploadBytesFileTests(SimpleTestCase):
         self.s3_test_helper.assert_file_body("s3-key", b"test")
 
 
+TEST_SHA256 = "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08"
+
+
+@mock_aws
+class S3OperationsUploadContentAddressedFileTests(SimpleTestCase):
+    databases = {"default"}
+
+    def setUp(self, *args, **kwargs):
+        super().setUp(*args, **kwargs)
+
+        self.s3_test_helper = S3TesterHelper()
+        patcher = patch("api.documents.libraries.s3_operations._content_addressed_s3_keys", set())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_upload_content_addressed_file(self):
+        s3_key = upload_content_addressed_file(b"test", "css", "css")
+
+        self.assertEqual(s3_key, f"css/{TEST_SHA256}.css")
+        self.s3_test_helper.assert_file_in_s3(s3_key)
+        self.s3_test_helper.assert_file_body(s3_key, b"test")
+
+    @patch("api.documents.libraries.s3_operations.upload_bytes_file")
+    def test_upload_content_addressed_file_already_in_s3(self, mock_upload_bytes_file):
+        self.s3_test_helper.add_test_file(f"css/{TEST_SHA256}.css", b"test")
+
+        upload_content_addressed_file(b"test", "css", "css")
+        upload_content_addressed_file(b"test", "css", "css")
+
+        mock_upload_bytes_file.assert_not_called()
+
+
 @mock_aws
 class S3OperationsDocumentDownloadStreamTests(SimpleTestCase):
     databases = {"default"}
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.19 on 2026-10-18 15:20
+
+from django.db import migrations, models
+import django.utils.timezone
+import model_utils.fields
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("documents", "0002_alter_document_safe"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="document",
+            name="content_hash",
+            field=models.CharField(blank=True, db_index=True, default="", max_length=100),
+        ),
+        migrations.CreateModel(
+            name="VirusScanResult",
+            fields=[
+                (
+                    "created_at",
+                    model_utils.fields.AutoCreatedField(
+                        default=django.utils.timezone.now, editable=False, verbose_name="created_at"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    model_utils.fields.AutoLastModifiedField(
+                        default=django.utils.timezone.now, editable=False, verbose_name="updated_at"
+                    ),
+                ),
+                ("id", models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ("content_hash", models.CharField(max_length=100, unique=True)),
+                ("safe", models.BooleanField()),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+def clear_etag_content_hashes(apps, schema_editor):
+    """
+    Content hashes were S3 ETags, which aren't a hash of the content for files uploaded in parts or encrypted with
+    KMS, so results recorded against them can't be relied on
+    """
+    VirusScanResult = apps.get_model("documents", "VirusScanResult")
+    Document = apps.get_model("documents", "Document")
+    VirusScanResult.objects.all().delete()
+    Document.objects.exclude(content_hash="").update(content_hash="")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("documents", "0003_document_content_hash_virusscanresult"),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_etag_content_hashes, migrations.RunPython.noop),
+    ]
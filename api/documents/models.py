@@ -1,7 +1,10 @@
 import logging
 import uuid
+from datetime import timedelta
 
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Q
 from django.utils import timezone
 
 from api.common.models import TimestampableModel
@@ -19,6 +22,8 @@ class Document(TimestampableModel):
     size = models.IntegerField(null=True, blank=True)
     virus_scanned_at = models.DateTimeField(null=True, blank=True)
     safe = models.BooleanField(null=True)
+    # The hex SHA-256 of the file, recorded when the file is scanned
+    content_hash = models.CharField(max_length=100, blank=True, default="", db_index=True)
 
     def __str__(self):
         return self.name
@@ -26,6 +31,15 @@ class Document(TimestampableModel):
     def get_other_documents_sharing_file(self):
         return Document.objects.filter(s3_key=self.s3_key).exclude(pk=self.pk)
 
+    def get_other_documents_sharing_content(self):
+        """
+        Returns the other documents pointing at the same file, or at another file known to have the same content
+        """
+        sharing_content = Q(s3_key=self.s3_key)
+        if self.content_hash:
+            sharing_content |= Q(content_hash=self.content_hash)
+        return Document.objects.filter(sharing_content).exclude(pk=self.pk)
+
     def delete_s3(self, *, force_delete=False):
         """Removes the document's file from S3."""
         file_shared_with_other_documents = self.get_other_documents_sharing_file().exists()
@@ -41,9 +55,13 @@ class Document(TimestampableModel):
         document.save()
 
     def scan_for_viruses(self):
-        """Retrieves the document's file from S3 and scans it for viruses."""
+        """
+        Retrieves the document's file from S3 and scans it for viruses. Files whose S3 checksum matches content that
+        has been scanned before reuse that result rather than being sent to the AV service again, and the result is
+        applied to every document sharing the content at once.
+        """
 
-        file = s3_operations.get_object(self.id, self.s3_key)
+        file = s3_operations.get_object(self.id, self.s3_key, with_checksum=True)
 
         if not file:
             logger.warning(
@@ -52,16 +70,64 @@ class Document(TimestampableModel):
                 self.id,
             )
 
-        is_safe = not av_operations.scan_file_for_viruses(self.id, self.name, file)
+        # Files with a checksum in S3 can be matched to a previous scan without reading them
+        checksum = s3_operations.get_content_hash(file)
+        scan_result = VirusScanResult.get_reusable(checksum) if checksum else None
+
+        if scan_result:
+            logger.info("Document `%s` has the same content as a file that has already been scanned", self.id)
+            file["Body"].close()
+            av_operations.record_virus_scan_dedupe()
+            self.content_hash = checksum
+            is_safe = scan_result.safe
+        else:
+            hasher = av_operations.ContentHasher()
+            is_safe = not av_operations.scan_file_for_viruses(self.id, self.name, file, hasher=hasher)
+            self.content_hash = hasher.hexdigest()
+            if self.content_hash:
+                VirusScanResult.objects.update_or_create(content_hash=self.content_hash, defaults={"safe": is_safe})
+
         virus_scanned_at = timezone.now()
         self.set_virus_scan_result(self, is_safe, virus_scanned_at)
 
+        other_documents = self.get_other_documents_sharing_content()
+        if is_safe:
+            other_documents = other_documents.filter(virus_scanned_at__isnull=True)
+
+        with transaction.atomic():
+            # Documents locked by their own scan are skipped; that scan will reuse this result
+            other_documents = Document.objects.filter(
+                id__in=list(other_documents.select_for_update(skip_locked=True).values_list("id", flat=True))
+            )
+            unsafe_s3_keys = {self.s3_key, *other_documents.values_list("s3_key", flat=True)} if not is_safe else set()
+            updated = other_documents.update(safe=is_safe, virus_scanned_at=virus_scanned_at)
+
         if not is_safe:
             logger.warning("Document `%s` is not safe", self.id)
-            self.delete_s3(force_delete=True)
-            file_shared_with_other_documents = self.get_other_documents_sharing_file()
-            for other_document in file_shared_with_other_documents:
-                logger.warning("Other document `%s` is not safe because `%s` is not safe", other_document.id, self.id)
-                self.set_virus_scan_result(other_document, is_safe, virus_scanned_at)
+            if updated:
+                logger.warning("%s other documents are not safe because `%s` is not safe", updated, self.id)
+            for s3_key in unsafe_s3_keys:
+                s3_operations.delete_file(self.id, s3_key)
 
         return is_safe
+
+
+class VirusScanResult(TimestampableModel):
+    """
+    The result of scanning a file's content for viruses, so that files with the same content are only scanned once
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # The hex SHA-256 of the content
+    content_hash = models.CharField(max_length=100, unique=True)
+    safe = models.BooleanField()
+
+    @classmethod
+    def get_reusable(cls, content_hash):
+        """
+        Returns the result of a previous scan of the content that can still be relied on. Unsafe results always can,
+        but safe results expire after AV_SCAN_RESULT_MAX_AGE seconds, as the AV service may since have learned to
+        detect a virus in the content.
+        """
+        trusted_since = timezone.now() - timedelta(seconds=settings.AV_SCAN_RESULT_MAX_AGE)
+        return cls.objects.filter(Q(safe=False) | Q(updated_at__gte=trusted_since), content_hash=content_hash).first()
@@ -1,15 +1,28 @@
+import hashlib
 from unittest.mock import patch
 
 from freezegun import freeze_time
 
 from moto import mock_aws
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.utils import timezone
 
+from api.documents.libraries.av_operations import S3StreamingBodyWrapper
+from api.documents.models import VirusScanResult
 from api.documents.tests.factories import DocumentFactory
 from test_helpers.s3 import S3TesterHelper
 
+TEST_CONTENT_HASH = hashlib.sha256(b"test").hexdigest()
+
+
+def scan_reading_file(contains_virus):
+    def scan_file_for_viruses(document_id, filename, file, hasher=None):
+        S3StreamingBodyWrapper(file, hasher).read()
+        return contains_virus
+
+    return scan_file_for_viruses
+
 
 @mock_aws
 class DocumentModelTests(TestCase):
@@ -99,3 +112,101 @@ class DocumentModelTests(TestCase):
         another_document.refresh_from_db()
         self.assertIs(another_document.safe, False)
         self.assertEqual(another_document.virus_scanned_at, timezone.now())
+
+    @freeze_time("2020-01-01 12:00:01")
+    @patch("api.documents.models.av_operations.scan_file_for_viruses")
+    def test_scan_for_viruses_records_result_for_content(self, mock_scan_file_for_viruses):
+        self.s3_test_helper.add_test_file("s3-key", b"test")
+        mock_scan_file_for_viruses.side_effect = scan_reading_file(contains_virus=False)
+
+        document = DocumentFactory(s3_key="s3-key")
+        document.scan_for_viruses()
+
+        document.refresh_from_db()
+        self.assertEqual(document.content_hash, TEST_CONTENT_HASH)
+        self.assertIs(VirusScanResult.objects.get(content_hash=TEST_CONTENT_HASH).safe, True)
+
+    @patch("api.documents.models.av_operations.scan_file_for_viruses")
+    def test_scan_for_viruses_without_reading_file_records_no_result(self, mock_scan_file_for_viruses):
+        self.s3_test_helper.add_test_file("s3-key", b"test")
+        mock_scan_file_for_viruses.return_value = False
+
+        document = DocumentFactory(s3_key="s3-key")
+        document.scan_for_viruses()
+
+        document.refresh_from_db()
+        self.assertEqual(document.content_hash, "")
+        self.assertFalse(VirusScanResult.objects.exists())
+
+    @freeze_time("2020-01-01 12:00:01")
+    @patch("api.documents.models.s3_operations.get_content_hash", return_value=TEST_CONTENT_HASH)
+    @patch("api.documents.models.av_operations.scan_file_for_viruses")
+    def test_scan_for_viruses_reuses_result_for_same_content(self, mock_scan_file_for_viruses, _):
+        self.s3_test_helper.add_test_file("s3-key", b"test")
+        self.s3_test_helper.add_test_file("another-s3-key", b"test")
+        mock_scan_file_for_viruses.side_effect = scan_reading_file(contains_virus=False)
+
+        document = DocumentFactory(s3_key="s3-key")
+        document.scan_for_viruses()
+        another_document = DocumentFactory(s3_key="another-s3-key")
+        is_safe = another_document.scan_for_viruses()
+
+        self.assertIs(is_safe, True)
+        mock_scan_file_for_viruses.assert_called_once()
+        self.assertEqual(VirusScanResult.objects.get(content_hash=TEST_CONTENT_HASH).safe, True)
+        another_document.refresh_from_db()
+        self.assertIs(another_document.safe, True)
+        self.assertEqual(another_document.content_hash, TEST_CONTENT_HASH)
+        self.assertEqual(another_document.virus_scanned_at, timezone.now())
+
+    @freeze_time("2020-01-01 12:00:01")
+    @patch("api.documents.models.s3_operations.get_content_hash", return_value=TEST_CONTENT_HASH)
+    @patch("api.documents.models.av_operations.scan_file_for_viruses")
+    def test_scan_for_viruses_unsafe_same_content(self, mock_scan_file_for_viruses, _):
+        self.s3_test_helper.add_test_file("s3-key", b"test")
+        self.s3_test_helper.add_test_file("another-s3-key", b"test")
+        mock_scan_file_for_viruses.side_effect = scan_reading_file(contains_virus=True)
+
+        document = DocumentFactory(s3_key="s3-key")
+        document.scan_for_viruses()
+        another_document = DocumentFactory(s3_key="another-s3-key")
+        is_safe = another_document.scan_for_viruses()
+
+        self.assertIs(is_safe, False)
+        mock_scan_file_for_viruses.assert_called_once()
+        another_document.refresh_from_db()
+        self.assertIs(another_document.safe, False)
+        self.s3_test_helper.assert_file_not_in_s3("another-s3-key")
+
+    @override_settings(AV_SCAN_RESULT_MAX_AGE=60)
+    @patch("api.documents.models.s3_operations.get_content_hash", return_value=TEST_CONTENT_HASH)
+    @patch("api.documents.models.av_operations.scan_file_for_viruses")
+    def test_scan_for_viruses_rescans_content_found_safe_too_long_ago(self, mock_scan_file_for_viruses, _):
+        self.s3_test_helper.add_test_file("s3-key", b"test")
+        with freeze_time("2020-01-01 12:00:00"):
+            VirusScanResult.objects.create(content_hash=TEST_CONTENT_HASH, safe=True)
+        mock_scan_file_for_viruses.side_effect = scan_reading_file(contains_virus=True)
+
+        document = DocumentFactory(s3_key="s3-key")
+        with freeze_time("2020-01-01 12:01:01"):
+            is_safe = document.scan_for_viruses()
+
+        self.assertIs(is_safe, False)
+        mock_scan_file_for_viruses.assert_called_once()
+        self.assertIs(VirusScanResult.objects.get(content_hash=TEST_CONTENT_HASH).safe, False)
+
+    @override_settings(AV_SCAN_RESULT_MAX_AGE=60)
+    @patch("api.documents.models.s3_operations.get_content_hash", return_value=TEST_CONTENT_HASH)
+    @patch("api.documents.models.av_operations.scan_file_for_viruses")
+    def test_scan_for_viruses_reuses_unsafe_result_however_old(self, mock_scan_file_for_viruses, _):
+        self.s3_test_helper.add_test_file("s3-key", b"test")
+        with freeze_time("2020-01-01 12:00:00"):
+            VirusScanResult.objects.create(content_hash=TEST_CONTENT_HASH, safe=False)
+
+        document = DocumentFactory(s3_key="s3-key")
+        with freeze_time("2021-01-01 12:00:00"):
+            is_safe = document.scan_for_viruses()
+
+        self.assertIs(is_safe, False)
+        mock_scan_file_for_viruses.assert_not_called()
+        self.s3_test_helper.assert_file_not_in_s3("s3-key")
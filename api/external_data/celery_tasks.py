@@ -2,6 +2,8 @@ from celery import shared_task
 from celery.utils.log import get_task_logger
 from django.core.management import call_command
 
+from api.applications.celery_tasks import match_sanctions_for_open_cases
+
 
 MAX_ATTEMPTS = 3
 RETRY_BACKOFF = 180
@@ -18,4 +20,5 @@ logger = get_task_logger(__name__)
 def update_sanction_search_index():
     """Update sanction index"""
     logger.info("update_sanction_search_index celery task: Update Started")
-    call_command("ingest_sanctions", rebuild=True)
+    call_command("ingest_sanctions")
+    match_sanctions_for_open_cases.delay()
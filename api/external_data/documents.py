@@ -140,6 +140,7 @@ class SanctionDocumentType(Document):
     name = fields.Text(analyzer=name_analyzer)
     address = fields.Text(analyzer=address_analyzer)
     postcode = fields.Keyword(normalizer=postcode_normalizer)
+    content_hash = fields.Keyword()
 
     data = fields.Object(
         properties={
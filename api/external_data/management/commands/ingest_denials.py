@@ -1,11 +1,13 @@
 import logging
-import json
+from contextlib import closing
+from itertools import islice
 
+import ijson
 from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.db import transaction
 from api.applications.models import DenialMatchOnApplication
-from api.external_data.serializers import DenialEntitySerializer, DenialSerializer
+from api.external_data.serializers import DenialEntitySerializer, DenialLoadSerializer
 from rest_framework import serializers
 
 
@@ -14,16 +16,30 @@ from elasticsearch_dsl import connections
 from api.documents.libraries import s3_operations
 from api.external_data import documents
 from api.external_data.helpers import get_denial_entity_enum
-from api.external_data.models import DenialEntity
+from api.external_data.models import Denial, DenialEntity
 
 log = logging.getLogger(__name__)
 
+BATCH_SIZE = 1000
+
 
 def get_json_content_and_delete(filename):
+    """
+    Yields the rows of the JSON array as they are parsed from the S3 body, so memory use doesn't
+    grow with the size of the file, and deletes the file once it has been read
+    """
     json_file = s3_operations.get_object(document_id=filename, s3_key=filename)
-    # Let's delete the file
-    s3_operations.delete_file(document_id=filename, s3_key=filename)
-    return json.load(json_file["Body"])
+    try:
+        yield from ijson.items(json_file["Body"], "item")
+    finally:
+        # Let's delete the file
+        s3_operations.delete_file(document_id=filename, s3_key=filename)
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
 
 
 class Command(BaseCommand):
@@ -62,64 +78,108 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         if options["rebuild"]:
             self.rebuild_index()
-        self.load_denials(options["input_json"])
+        denial_entity_ids = self.load_denials(options["input_json"])
+        if settings.LITE_API_ENABLE_ES:
+            self.index_denial_entities(denial_entity_ids)
 
     @transaction.atomic
     def load_denials(self, filename):
-        data = get_json_content_and_delete(filename)
         errors = []
+        denial_entity_ids = []
+        matched_keys = None
+        loaded_regime_reg_refs = set()
+
+        with closing(get_json_content_and_delete(filename)) as rows:
+            for batch in batched(enumerate(rows, start=1), BATCH_SIZE):
+                if matched_keys is None:
+                    # Lets delete all denial records except ones that have been matched
+                    matched_entity_denial_ids = (
+                        DenialMatchOnApplication.objects.all().values_list("denial_entity_id", flat=True).distinct()
+                    )
+                    DenialEntity.objects.all().exclude(id__in=matched_entity_denial_ids).delete()
+                    # This is required so we don't reload the same denial entity and load duplicates
+                    matched_keys = set(
+                        DenialMatchOnApplication.objects.values_list(
+                            "denial_entity__denial__regime_reg_ref", "denial_entity__name"
+                        )
+                    )
+
+                denial_entity_ids.extend(self.load_batch(batch, matched_keys, loaded_regime_reg_refs, errors))
 
-        if data:
-            # Lets delete all denial records except ones that have been matched
-            matched_entity_denial_ids = (
-                DenialMatchOnApplication.objects.all().values_list("denial_entity_id", flat=True).distinct()
+        if errors:
+            log.exception(
+                "Error loading denials -> %s",
+                errors,
             )
-            DenialEntity.objects.all().exclude(id__in=matched_entity_denial_ids).delete()
+            raise serializers.ValidationError(errors)
+
+        return denial_entity_ids
 
-        for i, row in enumerate(data, start=1):
-            # This is required so we don't reload the same denial entity and load duplicates
+    def load_batch(self, batch, matched_keys, loaded_regime_reg_refs, errors):
+        """
+        Validates a batch of rows and bulk creates their denials and denial entities, checking
+        regime_reg_ref uniqueness against the database with one query for the whole batch
+        """
+        existing_regime_reg_refs = set(
+            Denial.objects.filter(regime_reg_ref__in=[row.get("regime_reg_ref") for _, row in batch]).values_list(
+                "regime_reg_ref", flat=True
+            )
+        )
+        unique_error = Denial._meta.get_field("regime_reg_ref").error_messages["unique"] % {
+            "model_name": Denial._meta.verbose_name,
+            "field_label": Denial._meta.get_field("regime_reg_ref").verbose_name,
+        }
+        denials = []
+        denial_entities = []
+
+        for i, row in batch:
             has_fields = bool(row.get("regime_reg_ref") and row.get("name"))
-            if has_fields:
-                exists = DenialMatchOnApplication.objects.filter(
-                    denial_entity__denial__regime_reg_ref=row["regime_reg_ref"], denial_entity__name=row["name"]
-                ).exists()
-                if exists:
-                    continue
+            if has_fields and (row["regime_reg_ref"], row["name"]) in matched_keys:
+                continue
 
             denial_entity_data = {field: row.pop(field, None) for field in self.required_headers_denial_entity}
             denial_data = {field: row.pop(field, None) for field in self.required_headers_denial}
             denial_entity_data["data"] = row
             denial_entity_data["entity_type"] = get_denial_entity_enum(denial_entity_data["data"])
 
-            denial_serializer = DenialSerializer(data=denial_data)
-
-            if denial_serializer.is_valid():
-                # Lets first save the denial
-                denial = denial_serializer.save()
-                log.info(
-                    "Saved Denial for row number -> %s",
-                    i,
-                )
-                denial_entity_data.update({"denial": denial.id})
-                denial_entity_serializer = DenialEntitySerializer(data=denial_entity_data)
-                denial_entity_serializer.is_valid(raise_exception=True)
-                # Denial is Save link the denial entity
-                denial_entity_serializer.save()
-                log.info(
-                    "Saved Denial Entity for row number -> %s",
-                    i,
-                )
-
-            else:
+            denial_serializer = DenialLoadSerializer(data=denial_data)
+            if not denial_serializer.is_valid():
                 self.add_bulk_errors(
                     errors=errors,
                     row_number=i + 1,
                     line_errors={**denial_serializer.errors},
                 )
+                continue
+
+            regime_reg_ref = denial_serializer.validated_data["regime_reg_ref"]
+            if regime_reg_ref in existing_regime_reg_refs or regime_reg_ref in loaded_regime_reg_refs:
+                self.add_bulk_errors(errors=errors, row_number=i + 1, line_errors={"regime_reg_ref": [unique_error]})
+                continue
+            loaded_regime_reg_refs.add(regime_reg_ref)
+
+            # The denial is linked once both have been validated, so only the entity's own fields are checked here
+            denial_entity_serializer = DenialEntitySerializer(data=denial_entity_data, partial=True)
+            denial_entity_serializer.is_valid(raise_exception=True)
+
+            denial = Denial(**denial_serializer.validated_data)
+            denials.append(denial)
+            denial_entities.append(DenialEntity(**denial_entity_serializer.validated_data, denial=denial))
 
         if errors:
-            log.exception(
-                "Error loading denials -> %s",
-                errors,
-            )
-            raise serializers.ValidationError(errors)
+            return []
+
+        Denial.objects.bulk_create(denials)
+        DenialEntity.objects.bulk_create(denial_entities)
+        log.info(
+            "Saved %s Denials and Denial Entities for rows %s to %s",
+            len(denials),
+            batch[0][0],
+            batch[-1][0],
+        )
+        return [denial_entity.id for denial_entity in denial_entities]
+
+    def index_denial_entities(self, denial_entity_ids):
+        # bulk_create doesn't send the signals that keep the search index in step, so index the new entities here
+        document = documents.DenialEntityDocument()
+        for ids in batched(denial_entity_ids, BATCH_SIZE):
+            document.update(DenialEntity.objects.filter(id__in=ids).select_related("denial"))
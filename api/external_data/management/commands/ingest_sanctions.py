@@ -1,13 +1,16 @@
-import itertools
+import json
 import logging
 import ssl
 import urllib3
+from collections import namedtuple
 
 from dateutil import parser
+from defusedxml import ElementTree
 
 from django.conf import settings
 from django.core.management.base import BaseCommand
 
+from elasticsearch.helpers import bulk, scan
 from elasticsearch_dsl import connections
 
 import requests
@@ -19,6 +22,10 @@ import hashlib
 
 logger = logging.getLogger(__name__)
 
+# Yielded in place of a document for a record that couldn't be converted, with the id its document would have had if
+# that is known, so that its existing document isn't deleted as if the record had been removed from the source
+FailedRecord = namedtuple("FailedRecord", "id")
+
 
 class CustomHttpAdapter(requests.adapters.HTTPAdapter):
     # "Transport adapter" that allows us to use custom ssl_context.
@@ -42,40 +49,59 @@ def get_legacy_session():
     return session
 
 
+def iter_xml_records(response, record_tags, depth, **parse_kwargs):
+    """
+    Streams the response body through an incremental XML parser and yields each element named in
+    `record_tags` at the given depth as a dict, discarding it once parsed so that memory use is bounded
+    by the size of a single record rather than the whole file
+    """
+    response.raw.decode_content = True
+    elements = []
+    for event, element in ElementTree.iterparse(response.raw, events=("start", "end")):
+        if event == "start":
+            elements.append(element)
+            continue
+
+        elements.pop()
+        if len(elements) != depth - 1:
+            continue
+
+        for child in element.iter():
+            child.tag = child.tag.rsplit("}", 1)[-1]
+        if element.tag.lower() in record_tags:
+            record = xmltodict.parse(
+                ElementTree.tostring(element),
+                postprocessor=(lambda path, key, value: (key.lower(), value)),
+                xml_attribs=False,
+                cdata_key="p",
+                **parse_kwargs,
+            )
+            yield record[element.tag.lower()] or {}
+        if elements:
+            elements[-1].remove(element)
+
+
 def get_un_sanctions():
-    response = get_legacy_session().get(settings.SANCTION_LIST_SOURCES["un_sanctions_file"])
+    response = get_legacy_session().get(settings.SANCTION_LIST_SOURCES["un_sanctions_file"], stream=True)
     response.raise_for_status()
-    return xmltodict.parse(
-        response.content,
-        postprocessor=(lambda path, key, value: (key.lower(), value)),
-        xml_attribs=False,
-        cdata_key="p",
+    return iter_xml_records(
+        response,
+        record_tags=["individual", "entity"],
+        depth=3,
         force_list=["entity_address", "individual_address"],
     )
 
 
 def get_office_financial_sanctions_implementation():
-    response = requests.get(settings.SANCTION_LIST_SOURCES["office_financial_sanctions_file"])
+    response = requests.get(settings.SANCTION_LIST_SOURCES["office_financial_sanctions_file"], stream=True)
     response.raise_for_status()
-    return xmltodict.parse(
-        response.content,
-        postprocessor=(lambda path, key, value: (key.lower(), value)),
-        xml_attribs=False,
-        cdata_key="p",
-    )
+    return iter_xml_records(response, record_tags=["financialsanctionstarget"], depth=2)
 
 
 def get_uk_sanctions_list():
-    response = requests.get(settings.SANCTION_LIST_SOURCES["uk_sanctions_file"])
+    response = requests.get(settings.SANCTION_LIST_SOURCES["uk_sanctions_file"], stream=True)
     response.raise_for_status()
-    doc = xmltodict.parse(
-        response.content,
-        postprocessor=(lambda path, key, value: (key.lower(), value)),
-        xml_attribs=False,
-        cdata_key="p",
-        force_list=["name", "address"],
-    )
-    return doc["designations"]["designation"]
+    return iter_xml_records(response, record_tags=["designation"], depth=2, force_list=["name", "address"])
 
 
 def join_fields(data, fields):
@@ -99,49 +125,85 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         if options["rebuild"]:
             self.rebuild_index()
+        elif not documents.SanctionDocumentType._index.exists():
+            documents.SanctionDocumentType.init()
+        else:
+            # init() can't be used on an existing index as it fails comparing the analysis settings, so only the
+            # fields added since the index was created are added to its mapping
+            documents.SanctionDocumentType._index.put_mapping(
+                body={"properties": {"content_hash": {"type": "keyword"}}}
+            )
 
         self.populate_united_nations_sanctions()
         self.populate_office_financial_sanctions_implementation()
         self.populate_uk_sanctions_list()
 
+    def get_existing_hashes(self, flag_uuid):
+        hits = scan(
+            connections.get_connection(),
+            index=settings.ELASTICSEARCH_SANCTION_INDEX_ALIAS,
+            query={"query": {"term": {"flag_uuid": flag_uuid}}},
+            _source=["content_hash"],
+        )
+        return {hit["_id"]: hit["_source"].get("content_hash") for hit in hits}
+
+    def index_documents(self, list_name, flag_uuid, sanction_documents):
+        """
+        Bulk indexes the documents that are new or have changed since the last run and deletes the ones
+        for this list that are no longer in the source, leaving unchanged documents untouched. Records that failed to
+        convert keep their existing documents, and if the id of one isn't known nothing is deleted.
+        """
+        connection = connections.get_connection()
+        existing_hashes = self.get_existing_hashes(flag_uuid)
+        seen_ids = set()
+        unchanged = 0
+        has_unknown_failures = False
+
+        def get_index_actions():
+            nonlocal unchanged, has_unknown_failures
+            for document in sanction_documents:
+                if isinstance(document, FailedRecord):
+                    if document.id:
+                        seen_ids.add(document.id)
+                    else:
+                        has_unknown_failures = True
+                    continue
+
+                seen_ids.add(document.meta.id)
+                document.content_hash = hash_values([json.dumps(document.to_dict(), sort_keys=True, default=str)])
+                if existing_hashes.get(document.meta.id) == document.content_hash:
+                    unchanged += 1
+                    continue
+                yield document.to_dict(include_meta=True)
+
+        indexed, index_errors = bulk(connection, get_index_actions(), raise_on_error=False)
+
+        # Only reached once the whole source has been read, so a failed download never removes records
+        if has_unknown_failures:
+            logger.warning("Not deleting %s records as some records failed to load", list_name)
+            deleted, delete_errors = 0, []
+        else:
+            delete_actions = (
+                {"_op_type": "delete", "_index": settings.ELASTICSEARCH_SANCTION_INDEX_ALIAS, "_id": document_id}
+                for document_id in existing_hashes.keys() - seen_ids
+            )
+            deleted, delete_errors = bulk(connection, delete_actions, raise_on_error=False)
+
+        for error in [*index_errors, *delete_errors]:
+            logger.error("Error indexing %s record -> %s", list_name, error)
+        logger.info(
+            "%s (indexed:%s unchanged:%s deleted:%s errors:%s)",
+            list_name,
+            indexed,
+            unchanged,
+            deleted,
+            len(index_errors) + len(delete_errors),
+        )
+
     def populate_united_nations_sanctions(self):
         try:
-            parsed = get_un_sanctions()
-            successful = 0
-            failed = 0
-            individuals = parsed["consolidated_list"]["individuals"]["individual"]
-            entities = parsed["consolidated_list"]["entities"]["entity"]
-            for item in itertools.chain(individuals, entities):
-                try:
-                    item.pop("nationality", None)
-                    item.pop("title", None)
-
-                    address_dicts = item.pop("entity_address", {}) or item.pop("individual_address", {})
-
-                    addresses = []
-                    for address_dict in address_dicts:
-                        if address_dict:
-                            addresses.append(" ".join([item for item in address_dict.values() if item]))
-
-                    document = documents.SanctionDocumentType(
-                        meta={"id": item["dataid"]},
-                        name=join_fields(item, fields=["first_name", "second_name", "third_name"]),
-                        address=addresses,
-                        flag_uuid=SystemFlags.SANCTION_UN_SC_MATCH,
-                        reference=item["dataid"],
-                        data=item,
-                    )
-                    document.save()
-                    successful += 1
-                except:  # pragma: no cover # noqa
-                    failed += 1
-                    logger.exception(
-                        "Error loading un sanction record -> %s",
-                        item["dataid"],
-                        exc_info=True,
-                    )
-            logger.info(
-                f"un sanctions (successful:{successful} failed:{failed})",
+            self.index_documents(
+                "un sanctions", SystemFlags.SANCTION_UN_SC_MATCH, self.get_united_nations_sanctions_documents()
             )
         except:  # pragma: no cover # noqa
             logger.exception(
@@ -149,54 +211,50 @@ class Command(BaseCommand):
                 exc_info=True,
             )
 
-    def populate_office_financial_sanctions_implementation(self):
+    def get_united_nations_sanctions_documents(self):
         successful = 0
         failed = 0
+        for item in get_un_sanctions():
+            try:
+                item.pop("nationality", None)
+                item.pop("title", None)
+
+                address_dicts = item.pop("entity_address", {}) or item.pop("individual_address", {})
+
+                addresses = []
+                for address_dict in address_dicts:
+                    if address_dict:
+                        addresses.append(" ".join([item for item in address_dict.values() if item]))
+
+                document = documents.SanctionDocumentType(
+                    meta={"id": item["dataid"]},
+                    name=join_fields(item, fields=["first_name", "second_name", "third_name"]),
+                    address=addresses,
+                    flag_uuid=SystemFlags.SANCTION_UN_SC_MATCH,
+                    reference=item["dataid"],
+                    data=item,
+                )
+                successful += 1
+            except:  # pragma: no cover # noqa
+                failed += 1
+                logger.exception(
+                    "Error loading un sanction record -> %s",
+                    item.get("dataid"),
+                    exc_info=True,
+                )
+                yield FailedRecord(item.get("dataid"))
+                continue
+            yield document
+        logger.info(
+            f"un sanctions (successful:{successful} failed:{failed})",
+        )
+
+    def populate_office_financial_sanctions_implementation(self):
         try:
-            parsed = get_office_financial_sanctions_implementation()
-            for item in parsed["arrayoffinancialsanctionstarget"]["financialsanctionstarget"]:
-                try:
-                    item.pop("nationality", None)
-                    address = join_fields(
-                        item, fields=["address1", "address2", "address3", "address4", "address5", "address6"]
-                    )
-                    name = join_fields(item, fields=["name1", "name2", "name3", "name4", "name5", "name6"])
-                    postcode = normalize_address(item["postcode"])
-                    if postcode not in normalize_address(address):
-                        address += " " + postcode
-
-                    try:
-                        item["lastupdated"] = normalize_datetime(item["lastupdated"])
-                    except KeyError:
-                        pass
-
-                    try:
-                        item["datedesignated"] = normalize_datetime(item["datedesignated"])
-                    except KeyError:
-                        pass
-
-                    # We need to hash the data that uniquely identifies records atm we only care about names
-                    unique_id = hash_values([item["groupid"], name])
-                    document = documents.SanctionDocumentType(
-                        meta={"id": f"ofs:{unique_id}"},
-                        name=name,
-                        address=address,
-                        postcode=postcode,
-                        flag_uuid=SystemFlags.SANCTION_OFSI_MATCH,
-                        reference=item["groupid"],
-                        data=item,
-                    )
-                    document.save()
-                    successful += 1
-                except:  # pragma: no cover # noqa
-                    failed += 1
-                    logger.exception(
-                        "Error loading office financial sanction record -> %s",
-                        f"ofs:{unique_id}",
-                        exc_info=True,
-                    )
-            logger.info(
-                f"office financial sanctions (successful:{successful} failed:{failed})",
+            self.index_documents(
+                "office financial sanctions",
+                SystemFlags.SANCTION_OFSI_MATCH,
+                self.get_office_financial_sanctions_implementation_documents(),
             )
         except:  # pragma: no cover # noqa
             logger.exception(
@@ -204,6 +262,57 @@ class Command(BaseCommand):
                 exc_info=True,
             )
 
+    def get_office_financial_sanctions_implementation_documents(self):
+        successful = 0
+        failed = 0
+        for item in get_office_financial_sanctions_implementation():
+            unique_id = None
+            try:
+                item.pop("nationality", None)
+                address = join_fields(
+                    item, fields=["address1", "address2", "address3", "address4", "address5", "address6"]
+                )
+                name = join_fields(item, fields=["name1", "name2", "name3", "name4", "name5", "name6"])
+                postcode = normalize_address(item["postcode"])
+                if postcode not in normalize_address(address):
+                    address += " " + postcode
+
+                try:
+                    item["lastupdated"] = normalize_datetime(item["lastupdated"])
+                except KeyError:
+                    pass
+
+                try:
+                    item["datedesignated"] = normalize_datetime(item["datedesignated"])
+                except KeyError:
+                    pass
+
+                # We need to hash the data that uniquely identifies records atm we only care about names
+                unique_id = hash_values([item["groupid"], name])
+                document = documents.SanctionDocumentType(
+                    meta={"id": f"ofs:{unique_id}"},
+                    name=name,
+                    address=address,
+                    postcode=postcode,
+                    flag_uuid=SystemFlags.SANCTION_OFSI_MATCH,
+                    reference=item["groupid"],
+                    data=item,
+                )
+                successful += 1
+            except:  # pragma: no cover # noqa
+                failed += 1
+                logger.exception(
+                    "Error loading office financial sanction record -> %s",
+                    f"ofs:{unique_id}",
+                    exc_info=True,
+                )
+                yield FailedRecord(f"ofs:{unique_id}" if unique_id else None)
+                continue
+            yield document
+        logger.info(
+            f"office financial sanctions (successful:{successful} failed:{failed})",
+        )
+
     def _get_primary_names_dict(self, names):
         backup_name = None
         for name in names:
@@ -220,68 +329,72 @@ class Command(BaseCommand):
         raise Exception("Primary name not found")
 
     def populate_uk_sanctions_list(self):
-        successful = 0
-        failed = 0
         try:
-            uk_sanctions_list = get_uk_sanctions_list()
-            for item in uk_sanctions_list:
-                unique_id = item.get("ofsigroupid", "UNKNOWN")
-
-                try:
-                    address_list = []
-
-                    for address_item in item.get("addresses", {}).get("address", []):
-                        address_list.append(" ".join(address_item.values()))
-
-                    if "names" not in item:
-                        logger.warning(
-                            "No name found for record %s",
-                            item,
-                        )
-                        continue
-                    primary_name = self._get_primary_names_dict(item["names"]["name"])
-
-                    name = join_fields(primary_name, fields=["name1", "name2", "name3", "name4", "name5", "name6"])
-                    address = ",".join(address_list)
-
-                    try:
-                        item["lastupdated"] = normalize_datetime(item["lastupdated"])
-                    except KeyError:
-                        pass
-
-                    try:
-                        item["datedesignated"] = normalize_datetime(item["datedesignated"])
-                    except KeyError:
-                        pass
-
-                    document = documents.SanctionDocumentType(
-                        meta={"id": f"uk:{unique_id}"},
-                        name=name,
-                        address=address,
-                        flag_uuid=SystemFlags.SANCTION_UK_MATCH,
-                        reference=unique_id,
-                        data=item,
-                    )
-                    document.save()
-                    successful += 1
-                except:  # noqa
-                    failed += 1
-                    logger.exception(
-                        "Error loading uk sanction record -> %s",
-                        f"uk:{unique_id}",
-                        exc_info=True,
-                    )
-            logger.info(
-                "uk sanctions (successful:%s failed:%s)",
-                successful,
-                failed,
-            )
+            self.index_documents("uk sanctions", SystemFlags.SANCTION_UK_MATCH, self.get_uk_sanctions_list_documents())
         except:  # pragma: no cover # noqa
             logger.exception(
                 "Error loading uk sanctions",
                 exc_info=True,
             )
 
+    def get_uk_sanctions_list_documents(self):
+        successful = 0
+        failed = 0
+        for item in get_uk_sanctions_list():
+            unique_id = item.get("ofsigroupid", "UNKNOWN")
+
+            try:
+                address_list = []
+
+                for address_item in item.get("addresses", {}).get("address", []):
+                    address_list.append(" ".join(address_item.values()))
+
+                if "names" not in item:
+                    logger.warning(
+                        "No name found for record %s",
+                        item,
+                    )
+                    continue
+                primary_name = self._get_primary_names_dict(item["names"]["name"])
+
+                name = join_fields(primary_name, fields=["name1", "name2", "name3", "name4", "name5", "name6"])
+                address = ",".join(address_list)
+
+                try:
+                    item["lastupdated"] = normalize_datetime(item["lastupdated"])
+                except KeyError:
+                    pass
+
+                try:
+                    item["datedesignated"] = normalize_datetime(item["datedesignated"])
+                except KeyError:
+                    pass
+
+                document = documents.SanctionDocumentType(
+                    meta={"id": f"uk:{unique_id}"},
+                    name=name,
+                    address=address,
+                    flag_uuid=SystemFlags.SANCTION_UK_MATCH,
+                    reference=unique_id,
+                    data=item,
+                )
+                successful += 1
+            except:  # noqa
+                failed += 1
+                logger.exception(
+                    "Error loading uk sanction record -> %s",
+                    f"uk:{unique_id}",
+                    exc_info=True,
+                )
+                yield FailedRecord(f"uk:{unique_id}" if "ofsigroupid" in item else None)
+                continue
+            yield document
+        logger.info(
+            "uk sanctions (successful:%s failed:%s)",
+            successful,
+            failed,
+        )
+
 
 def normalize_address(value):
     if isinstance(value, int):
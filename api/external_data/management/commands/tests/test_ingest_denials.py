@@ -157,3 +157,32 @@ def test_populate_denials_with_no_data_in_file(mock_get_file, mock_delete_file):
     call_command("ingest_denials", "json_file")
 
     assert DenialEntity.objects.all().count() == 1
+
+
+@pytest.mark.django_db
+@mock.patch.object(ingest_denials, "BATCH_SIZE", 3)
+@mock.patch.object(ingest_denials.s3_operations, "delete_file")
+@mock.patch.object(ingest_denials.s3_operations, "get_object")
+def test_populate_denials_across_batches(mock_get_file, mock_delete_file, json_file_data):
+    mock_get_file.return_value = json_file_data
+
+    call_command("ingest_denials", "json_file")
+
+    assert DenialEntity.objects.all().count() == 4
+    regime_reg_refs = DenialEntity.objects.values_list("denial__regime_reg_ref", flat=True)
+    assert sorted(regime_reg_refs) == ["12", "123", "1234", "12345"]
+    mock_delete_file.assert_called_with(document_id="json_file", s3_key="json_file")
+
+
+@pytest.mark.django_db
+@mock.patch.object(ingest_denials.s3_operations, "delete_file")
+@mock.patch.object(ingest_denials.s3_operations, "get_object")
+def test_populate_denials_duplicate_regime_reg_ref(mock_get_file, mock_delete_file):
+    rows = [{"regime_reg_ref": "12", "name": f"Test{i} case", "end_user_flag": "true"} for i in range(2)]
+    mock_get_file.return_value = {"Body": io.BytesIO(json.dumps(rows).encode())}
+
+    with pytest.raises(ValidationError) as error:
+        call_command("ingest_denials", "json_file")
+
+    assert error.value.detail == ["[Row 3] regime_reg_ref: denial with this regime reg ref already exists."]
+    assert not DenialEntity.objects.all().exists()
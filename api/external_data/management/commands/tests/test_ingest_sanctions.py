@@ -1,3 +1,4 @@
+import json
 from unittest import mock
 
 from elasticsearch.exceptions import NotFoundError
@@ -54,131 +55,115 @@ class PopulateSanctionsTests(DataTestClient):
             },
         ]
 
-        mock_get_office_financial_sanctions_implementation.return_value = {
-            "arrayoffinancialsanctionstarget": {
-                "financialsanctionstarget": [
-                    {
-                        "address1": None,
-                        "address2": None,
-                        "address3": None,
-                        "address4": None,
-                        "address5": None,
-                        "address6": None,
-                        "aliastype": "Prime Alias",
-                        "aliastypename": "Prime Alias",
-                        "businessregnumber": None,
-                        "country": None,
-                        "countryofbirth": None,
-                        "currentowners": None,
-                        "datelisted": "2001-10-12T00:00:00",
-                        "datelistedday": "12",
-                        "datelistedmonth": "10",
-                        "datelistedyear": "2001",
-                        "dateofbirth": None,
-                        "dateofbirthid": None,
-                        "dayofbirth": None,
-                        "emailaddress": None,
-                        "fcoid": "AQD0104",
-                        "flagofvessel": None,
-                        "fulladdress": None,
-                        "furtheridentifiyinginformation": "Pakistan. Review pursuant to Security",
-                        "gender": None,
-                        "groupid": "6897",
-                        "groupstatus": "Asset Freeze Targets",
-                        "grouptypedescription": "Individual",
-                        "grpstatus": "A",
-                        "hin": None,
-                        "id": "109",
-                        "imonumber": None,
-                        "lastupdated": "2020-12-31T00:00:00",
-                        "lastupdatedday": "31",
-                        "lastupdatedmonth": "12",
-                        "lastupdatedyear": "2020",
-                        "lengthofvessel": None,
-                        "listingtype": "UK and UN",
-                        "monthofbirth": None,
-                        "name1": "Haji",
-                        "name2": "Agha",
-                        "name3": None,
-                        "name4": None,
-                        "name5": None,
-                        "name6": "Abdul Manan",
-                        "nametitle": "Haji",
-                        "nationalidnumber": None,
-                        "nationality": None,
-                        "orgtype": None,
-                        "otherinformation": "(UN Ref):QDi.018. Also referred to as Abdul Man’am",
-                        "parentcompany": None,
-                        "passportdetails": None,
-                        "phonenumber": None,
-                        "position": None,
-                        "postcode": None,
-                        "previousflags": None,
-                        "previousowners": None,
-                        "regimename": "ISIL (Da'esh) and Al-Qaida",
-                        "subsidiaries": None,
-                        "tonnageofvessel": None,
-                        "townofbirth": None,
-                        "typeofvessel": None,
-                        "ukstatementofreasons": None,
-                        "website": None,
-                        "yearbuilt": None,
-                        "yearofbirth": None,
-                    }
-                ]
-            }
-        }
-        mock_get_un_sanctions.return_value = {
-            "consolidated_list": {
-                "individuals": {
-                    "individual": [
-                        {
-                            "dataid": "6908555",
-                            "versionnum": "1",
-                            "first_name": "RI",
-                            "second_name": "WON HO",
-                            "third_name": None,
-                            "un_list_type": "DPRK",
-                            "reference_number": "KPi.033",
-                            "listed_on": "2016-11-30",
-                            "comments1": "Ri Won Ho is a DPRK Ministry of State Security Official stationed in Syria.",
-                            "designation": {"value": "DPRK Ministry of State Security Official"},
-                            "nationality": {"value": "Democratic People's Republic of Korea"},
-                            "list_name": {"value": "UN List"},
-                            "last_day_updated": {"value": None},
-                            "individual_alias": {"quality": None, "alias_name": None},
-                            "individual_address": [{"country": None}],
-                            "individual_date_of_birth": {"type_of_date": "EXACT", "date": "1964-07-17"},
-                            "individual_place_of_birth": None,
-                            "individual_document": {"type_of_document": "Passport", "number": "381310014"},
-                            "sort_key": None,
-                            "sort_key_last_mod": None,
-                        }
-                    ],
-                },
-                "entities": {
-                    "entity": [
-                        {
-                            "comments1": "The Propaganda and Agitation Department has full control over",
-                            "dataid": "6908629",
-                            "entity_address": [
-                                {"city": "Pyongyang", "country": "Democratic People's Republic of Korea"}
-                            ],
-                            "entity_alias": {"alias_name": None, "quality": None},
-                            "first_name": "PROPAGANDA AND AGITATION DEPARTMENT (PAD)",
-                            "last_day_updated": {"value": None},
-                            "list_name": {"value": "UN List"},
-                            "listed_on": "2017-09-11",
-                            "reference_number": "KPe.053",
-                            "sort_key": None,
-                            "sort_key_last_mod": None,
-                            "un_list_type": "DPRK",
-                            "versionnum": "1",
-                        }
-                    ]
-                },
+        mock_get_office_financial_sanctions_implementation.return_value = [
+            {
+                "address1": None,
+                "address2": None,
+                "address3": None,
+                "address4": None,
+                "address5": None,
+                "address6": None,
+                "aliastype": "Prime Alias",
+                "aliastypename": "Prime Alias",
+                "businessregnumber": None,
+                "country": None,
+                "countryofbirth": None,
+                "currentowners": None,
+                "datelisted": "2001-10-12T00:00:00",
+                "datelistedday": "12",
+                "datelistedmonth": "10",
+                "datelistedyear": "2001",
+                "dateofbirth": None,
+                "dateofbirthid": None,
+                "dayofbirth": None,
+                "emailaddress": None,
+                "fcoid": "AQD0104",
+                "flagofvessel": None,
+                "fulladdress": None,
+                "furtheridentifiyinginformation": "Pakistan. Review pursuant to Security",
+                "gender": None,
+                "groupid": "6897",
+                "groupstatus": "Asset Freeze Targets",
+                "grouptypedescription": "Individual",
+                "grpstatus": "A",
+                "hin": None,
+                "id": "109",
+                "imonumber": None,
+                "lastupdated": "2020-12-31T00:00:00",
+                "lastupdatedday": "31",
+                "lastupdatedmonth": "12",
+                "lastupdatedyear": "2020",
+                "lengthofvessel": None,
+                "listingtype": "UK and UN",
+                "monthofbirth": None,
+                "name1": "Haji",
+                "name2": "Agha",
+                "name3": None,
+                "name4": None,
+                "name5": None,
+                "name6": "Abdul Manan",
+                "nametitle": "Haji",
+                "nationalidnumber": None,
+                "nationality": None,
+                "orgtype": None,
+                "otherinformation": "(UN Ref):QDi.018. Also referred to as Abdul Man’am",
+                "parentcompany": None,
+                "passportdetails": None,
+                "phonenumber": None,
+                "position": None,
+                "postcode": None,
+                "previousflags": None,
+                "previousowners": None,
+                "regimename": "ISIL (Da'esh) and Al-Qaida",
+                "subsidiaries": None,
+                "tonnageofvessel": None,
+                "townofbirth": None,
+                "typeofvessel": None,
+                "ukstatementofreasons": None,
+                "website": None,
+                "yearbuilt": None,
+                "yearofbirth": None,
+            },
+        ]
+        mock_get_un_sanctions.return_value = [
+            {
+                "dataid": "6908555",
+                "versionnum": "1",
+                "first_name": "RI",
+                "second_name": "WON HO",
+                "third_name": None,
+                "un_list_type": "DPRK",
+                "reference_number": "KPi.033",
+                "listed_on": "2016-11-30",
+                "comments1": "Ri Won Ho is a DPRK Ministry of State Security Official stationed in Syria.",
+                "designation": {"value": "DPRK Ministry of State Security Official"},
+                "nationality": {"value": "Democratic People's Republic of Korea"},
+                "list_name": {"value": "UN List"},
+                "last_day_updated": {"value": None},
+                "individual_alias": {"quality": None, "alias_name": None},
+                "individual_address": [{"country": None}],
+                "individual_date_of_birth": {"type_of_date": "EXACT", "date": "1964-07-17"},
+                "individual_place_of_birth": None,
+                "individual_document": {"type_of_document": "Passport", "number": "381310014"},
+                "sort_key": None,
+                "sort_key_last_mod": None,
+            },
+            {
+                "comments1": "The Propaganda and Agitation Department has full control over",
+                "dataid": "6908629",
+                "entity_address": [{"city": "Pyongyang", "country": "Democratic People's Republic of Korea"}],
+                "entity_alias": {"alias_name": None, "quality": None},
+                "first_name": "PROPAGANDA AND AGITATION DEPARTMENT (PAD)",
+                "last_day_updated": {"value": None},
+                "list_name": {"value": "UN List"},
+                "listed_on": "2017-09-11",
+                "reference_number": "KPe.053",
+                "sort_key": None,
+                "sort_key_last_mod": None,
+                "un_list_type": "DPRK",
+                "versionnum": "1",
             },
-        }
+        ]
 
         call_command("ingest_sanctions", rebuild=True)
 
@@ -252,132 +237,116 @@ class PopulateSanctionsTests(DataTestClient):
             },
         ]
 
-        mock_get_office_financial_sanctions_implementation.return_value = {
-            "arrayoffinancialsanctionstarget": {
-                "financialsanctionstarget": [
-                    {
-                        "address1": None,
-                        "address2": None,
-                        "address3": None,
-                        "address4": None,
-                        "address5": None,
-                        "address6": None,
-                        "aliastype": "Prime Alias",
-                        "aliastypename": "Prime Alias",
-                        "businessregnumber": None,
-                        "country": None,
-                        "countryofbirth": None,
-                        "currentowners": None,
-                        "datelisted": "2001-10-12T00:00:00",
-                        "datelistedday": "12",
-                        "datelistedmonth": "10",
-                        "datelistedyear": "2001",
-                        "dateofbirth": None,
-                        "dateofbirthid": None,
-                        "dayofbirth": None,
-                        "emailaddress": None,
-                        "fcoid": "AQD0104",
-                        "flagofvessel": None,
-                        "fulladdress": None,
-                        "furtheridentifiyinginformation": "Pakistan. Review pursuant to Security",
-                        "gender": None,
-                        "groupid": "6897",
-                        "groupstatus": "Asset Freeze Targets",
-                        "grouptypedescription": "Individual",
-                        "grpstatus": "A",
-                        "hin": None,
-                        "id": "109",
-                        "imonumber": None,
-                        "lastupdated": "2020-12-31T00:00:00",
-                        "lastupdatedday": "31",
-                        "lastupdatedmonth": "12",
-                        "lastupdatedyear": "2020",
-                        "datedesignated": "2020-12-10T00:00:00",
-                        "lengthofvessel": None,
-                        "listingtype": "UK and UN",
-                        "monthofbirth": None,
-                        "name1": "Haji",
-                        "name2": "Agha",
-                        "name3": None,
-                        "name4": None,
-                        "name5": None,
-                        "name6": "Abdul Manan",
-                        "nametitle": "Haji",
-                        "nationalidnumber": None,
-                        "nationality": None,
-                        "orgtype": None,
-                        "otherinformation": "(UN Ref):QDi.018. Also referred to as Abdul Man’am",
-                        "parentcompany": None,
-                        "passportdetails": None,
-                        "phonenumber": None,
-                        "position": None,
-                        "postcode": None,
-                        "previousflags": None,
-                        "previousowners": None,
-                        "regimename": "ISIL (Da'esh) and Al-Qaida",
-                        "subsidiaries": None,
-                        "tonnageofvessel": None,
-                        "townofbirth": None,
-                        "typeofvessel": None,
-                        "ukstatementofreasons": None,
-                        "website": None,
-                        "yearbuilt": None,
-                        "yearofbirth": None,
-                    }
-                ]
-            }
-        }
-        mock_get_un_sanctions.return_value = {
-            "consolidated_list": {
-                "individuals": {
-                    "individual": [
-                        {
-                            "dataid": "6908555",
-                            "versionnum": "1",
-                            "first_name": "RI",
-                            "second_name": "WON HO",
-                            "third_name": None,
-                            "un_list_type": "DPRK",
-                            "reference_number": "KPi.033",
-                            "listed_on": "2016-11-30",
-                            "comments1": "Ri Won Ho is a DPRK Ministry of State Security Official stationed in Syria.",
-                            "designation": {"value": "DPRK Ministry of State Security Official"},
-                            "nationality": {"value": "Democratic People's Republic of Korea"},
-                            "list_name": {"value": "UN List"},
-                            "last_day_updated": {"value": None},
-                            "individual_alias": {"quality": None, "alias_name": None},
-                            "individual_address": [{"country": None}],
-                            "individual_date_of_birth": {"type_of_date": "EXACT", "date": "1964-07-17"},
-                            "individual_place_of_birth": None,
-                            "individual_document": {"type_of_document": "Passport", "number": "381310014"},
-                            "sort_key": None,
-                            "sort_key_last_mod": None,
-                        }
-                    ],
-                },
-                "entities": {
-                    "entity": [
-                        {
-                            "comments1": "The Propaganda and Agitation Department has full control over",
-                            "dataid": "6908629",
-                            "entity_address": [
-                                {"city": "Pyongyang", "country": "Democratic People's Republic of Korea"}
-                            ],
-                            "entity_alias": {"alias_name": None, "quality": None},
-                            "first_name": "PROPAGANDA AND AGITATION DEPARTMENT (PAD)",
-                            "last_day_updated": {"value": None},
-                            "list_name": {"value": "UN List"},
-                            "listed_on": "2017-09-11",
-                            "reference_number": "KPe.053",
-                            "sort_key": None,
-                            "sort_key_last_mod": None,
-                            "un_list_type": "DPRK",
-                            "versionnum": "1",
-                        }
-                    ]
-                },
+        mock_get_office_financial_sanctions_implementation.return_value = [
+            {
+                "address1": None,
+                "address2": None,
+                "address3": None,
+                "address4": None,
+                "address5": None,
+                "address6": None,
+                "aliastype": "Prime Alias",
+                "aliastypename": "Prime Alias",
+                "businessregnumber": None,
+                "country": None,
+                "countryofbirth": None,
+                "currentowners": None,
+                "datelisted": "2001-10-12T00:00:00",
+                "datelistedday": "12",
+                "datelistedmonth": "10",
+                "datelistedyear": "2001",
+                "dateofbirth": None,
+                "dateofbirthid": None,
+                "dayofbirth": None,
+                "emailaddress": None,
+                "fcoid": "AQD0104",
+                "flagofvessel": None,
+                "fulladdress": None,
+                "furtheridentifiyinginformation": "Pakistan. Review pursuant to Security",
+                "gender": None,
+                "groupid": "6897",
+                "groupstatus": "Asset Freeze Targets",
+                "grouptypedescription": "Individual",
+                "grpstatus": "A",
+                "hin": None,
+                "id": "109",
+                "imonumber": None,
+                "lastupdated": "2020-12-31T00:00:00",
+                "lastupdatedday": "31",
+                "lastupdatedmonth": "12",
+                "lastupdatedyear": "2020",
+                "datedesignated": "2020-12-10T00:00:00",
+                "lengthofvessel": None,
+                "listingtype": "UK and UN",
+                "monthofbirth": None,
+                "name1": "Haji",
+                "name2": "Agha",
+                "name3": None,
+                "name4": None,
+                "name5": None,
+                "name6": "Abdul Manan",
+                "nametitle": "Haji",
+                "nationalidnumber": None,
+                "nationality": None,
+                "orgtype": None,
+                "otherinformation": "(UN Ref):QDi.018. Also referred to as Abdul Man’am",
+                "parentcompany": None,
+                "passportdetails": None,
+                "phonenumber": None,
+                "position": None,
+                "postcode": None,
+                "previousflags": None,
+                "previousowners": None,
+                "regimename": "ISIL (Da'esh) and Al-Qaida",
+                "subsidiaries": None,
+                "tonnageofvessel": None,
+                "townofbirth": None,
+                "typeofvessel": None,
+                "ukstatementofreasons": None,
+                "website": None,
+                "yearbuilt": None,
+                "yearofbirth": None,
             },
-        }
+        ]
+        mock_get_un_sanctions.return_value = [
+            {
+                "dataid": "6908555",
+                "versionnum": "1",
+                "first_name": "RI",
+                "second_name": "WON HO",
+                "third_name": None,
+                "un_list_type": "DPRK",
+                "reference_number": "KPi.033",
+                "listed_on": "2016-11-30",
+                "comments1": "Ri Won Ho is a DPRK Ministry of State Security Official stationed in Syria.",
+                "designation": {"value": "DPRK Ministry of State Security Official"},
+                "nationality": {"value": "Democratic People's Republic of Korea"},
+                "list_name": {"value": "UN List"},
+                "last_day_updated": {"value": None},
+                "individual_alias": {"quality": None, "alias_name": None},
+                "individual_address": [{"country": None}],
+                "individual_date_of_birth": {"type_of_date": "EXACT", "date": "1964-07-17"},
+                "individual_place_of_birth": None,
+                "individual_document": {"type_of_document": "Passport", "number": "381310014"},
+                "sort_key": None,
+                "sort_key_last_mod": None,
+            },
+            {
+                "comments1": "The Propaganda and Agitation Department has full control over",
+                "dataid": "6908629",
+                "entity_address": [{"city": "Pyongyang", "country": "Democratic People's Republic of Korea"}],
+                "entity_alias": {"alias_name": None, "quality": None},
+                "first_name": "PROPAGANDA AND AGITATION DEPARTMENT (PAD)",
+                "last_day_updated": {"value": None},
+                "list_name": {"value": "UN List"},
+                "listed_on": "2017-09-11",
+                "reference_number": "KPe.053",
+                "sort_key": None,
+                "sort_key_last_mod": None,
+                "un_list_type": "DPRK",
+                "versionnum": "1",
+            },
+        ]
 
         call_command("ingest_sanctions", rebuild=True)
 
@@ -432,132 +401,116 @@ class PopulateSanctionsTests(DataTestClient):
             },
         ]
 
-        mock_get_office_financial_sanctions_implementation.return_value = {
-            "arrayoffinancialsanctionstarget": {
-                "financialsanctionstarget": [
-                    {
-                        "address1": None,
-                        "address2": None,
-                        "address3": None,
-                        "address4": None,
-                        "address5": None,
-                        "address6": None,
-                        "aliastype": "Prime Alias",
-                        "aliastypename": "Prime Alias",
-                        "businessregnumber": None,
-                        "country": None,
-                        "countryofbirth": None,
-                        "currentowners": None,
-                        "datelisted": "2001-10-12T00:00:00",
-                        "datelistedday": "12",
-                        "datelistedmonth": "10",
-                        "datelistedyear": "2001",
-                        "dateofbirth": None,
-                        "dateofbirthid": None,
-                        "dayofbirth": None,
-                        "emailaddress": None,
-                        "fcoid": "AQD0104",
-                        "flagofvessel": None,
-                        "fulladdress": None,
-                        "furtheridentifiyinginformation": "Pakistan. Review pursuant to Security",
-                        "gender": None,
-                        "groupid": "6897",
-                        "groupstatus": "Asset Freeze Targets",
-                        "grouptypedescription": "Individual",
-                        "grpstatus": "A",
-                        "hin": None,
-                        "id": "109",
-                        "imonumber": None,
-                        "lastupdated": "2020/12/31",
-                        "lastupdatedday": "31",
-                        "lastupdatedmonth": "12",
-                        "lastupdatedyear": "2020",
-                        "datedesignated": "2020/12/10",
-                        "lengthofvessel": None,
-                        "listingtype": "UK and UN",
-                        "monthofbirth": None,
-                        "name1": "Haji",
-                        "name2": "Agha",
-                        "name3": None,
-                        "name4": None,
-                        "name5": None,
-                        "name6": "Abdul Manan",
-                        "nametitle": "Haji",
-                        "nationalidnumber": None,
-                        "nationality": None,
-                        "orgtype": None,
-                        "otherinformation": "(UN Ref):QDi.018. Also referred to as Abdul Man’am",
-                        "parentcompany": None,
-                        "passportdetails": None,
-                        "phonenumber": None,
-                        "position": None,
-                        "postcode": None,
-                        "previousflags": None,
-                        "previousowners": None,
-                        "regimename": "ISIL (Da'esh) and Al-Qaida",
-                        "subsidiaries": None,
-                        "tonnageofvessel": None,
-                        "townofbirth": None,
-                        "typeofvessel": None,
-                        "ukstatementofreasons": None,
-                        "website": None,
-                        "yearbuilt": None,
-                        "yearofbirth": None,
-                    }
-                ]
-            }
-        }
-        mock_get_un_sanctions.return_value = {
-            "consolidated_list": {
-                "individuals": {
-                    "individual": [
-                        {
-                            "dataid": "6908555",
-                            "versionnum": "1",
-                            "first_name": "RI",
-                            "second_name": "WON HO",
-                            "third_name": None,
-                            "un_list_type": "DPRK",
-                            "reference_number": "KPi.033",
-                            "listed_on": "2016-11-30",
-                            "comments1": "Ri Won Ho is a DPRK Ministry of State Security Official stationed in Syria.",
-                            "designation": {"value": "DPRK Ministry of State Security Official"},
-                            "nationality": {"value": "Democratic People's Republic of Korea"},
-                            "list_name": {"value": "UN List"},
-                            "last_day_updated": {"value": None},
-                            "individual_alias": {"quality": None, "alias_name": None},
-                            "individual_address": [{"country": None}],
-                            "individual_date_of_birth": {"type_of_date": "EXACT", "date": "1964-07-17"},
-                            "individual_place_of_birth": None,
-                            "individual_document": {"type_of_document": "Passport", "number": "381310014"},
-                            "sort_key": None,
-                            "sort_key_last_mod": None,
-                        }
-                    ],
-                },
-                "entities": {
-                    "entity": [
-                        {
-                            "comments1": "The Propaganda and Agitation Department has full control over",
-                            "dataid": "6908629",
-                            "entity_address": [
-                                {"city": "Pyongyang", "country": "Democratic People's Republic of Korea"}
-                            ],
-                            "entity_alias": {"alias_name": None, "quality": None},
-                            "first_name": "PROPAGANDA AND AGITATION DEPARTMENT (PAD)",
-                            "last_day_updated": {"value": None},
-                            "list_name": {"value": "UN List"},
-                            "listed_on": "2017-09-11",
-                            "reference_number": "KPe.053",
-                            "sort_key": None,
-                            "sort_key_last_mod": None,
-                            "un_list_type": "DPRK",
-                            "versionnum": "1",
-                        }
-                    ]
-                },
+        mock_get_office_financial_sanctions_implementation.return_value = [
+            {
+                "address1": None,
+                "address2": None,
+                "address3": None,
+                "address4": None,
+                "address5": None,
+                "address6": None,
+                "aliastype": "Prime Alias",
+                "aliastypename": "Prime Alias",
+                "businessregnumber": None,
+                "country": None,
+                "countryofbirth": None,
+                "currentowners": None,
+                "datelisted": "2001-10-12T00:00:00",
+                "datelistedday": "12",
+                "datelistedmonth": "10",
+                "datelistedyear": "2001",
+                "dateofbirth": None,
+                "dateofbirthid": None,
+                "dayofbirth": None,
+                "emailaddress": None,
+                "fcoid": "AQD0104",
+                "flagofvessel": None,
+                "fulladdress": None,
+                "furtheridentifiyinginformation": "Pakistan. Review pursuant to Security",
+                "gender": None,
+                "groupid": "6897",
+                "groupstatus": "Asset Freeze Targets",
+                "grouptypedescription": "Individual",
+                "grpstatus": "A",
+                "hin": None,
+                "id": "109",
+                "imonumber": None,
+                "lastupdated": "2020/12/31",
+                "lastupdatedday": "31",
+                "lastupdatedmonth": "12",
+                "lastupdatedyear": "2020",
+                "datedesignated": "2020/12/10",
+                "lengthofvessel": None,
+                "listingtype": "UK and UN",
+                "monthofbirth": None,
+                "name1": "Haji",
+                "name2": "Agha",
+                "name3": None,
+                "name4": None,
+                "name5": None,
+                "name6": "Abdul Manan",
+                "nametitle": "Haji",
+                "nationalidnumber": None,
+                "nationality": None,
+                "orgtype": None,
+                "otherinformation": "(UN Ref):QDi.018. Also referred to as Abdul Man’am",
+                "parentcompany": None,
+                "passportdetails": None,
+                "phonenumber": None,
+                "position": None,
+                "postcode": None,
+                "previousflags": None,
+                "previousowners": None,
+                "regimename": "ISIL (Da'esh) and Al-Qaida",
+                "subsidiaries": None,
+                "tonnageofvessel": None,
+                "townofbirth": None,
+                "typeofvessel": None,
+                "ukstatementofreasons": None,
+                "website": None,
+                "yearbuilt": None,
+                "yearofbirth": None,
             },
-        }
+        ]
+        mock_get_un_sanctions.return_value = [
+            {
+                "dataid": "6908555",
+                "versionnum": "1",
+                "first_name": "RI",
+                "second_name": "WON HO",
+                "third_name": None,
+                "un_list_type": "DPRK",
+                "reference_number": "KPi.033",
+                "listed_on": "2016-11-30",
+                "comments1": "Ri Won Ho is a DPRK Ministry of State Security Official stationed in Syria.",
+                "designation": {"value": "DPRK Ministry of State Security Official"},
+                "nationality": {"value": "Democratic People's Republic of Korea"},
+                "list_name": {"value": "UN List"},
+                "last_day_updated": {"value": None},
+                "individual_alias": {"quality": None, "alias_name": None},
+                "individual_address": [{"country": None}],
+                "individual_date_of_birth": {"type_of_date": "EXACT", "date": "1964-07-17"},
+                "individual_place_of_birth": None,
+                "individual_document": {"type_of_document": "Passport", "number": "381310014"},
+                "sort_key": None,
+                "sort_key_last_mod": None,
+            },
+            {
+                "comments1": "The Propaganda and Agitation Department has full control over",
+                "dataid": "6908629",
+                "entity_address": [{"city": "Pyongyang", "country": "Democratic People's Republic of Korea"}],
+                "entity_alias": {"alias_name": None, "quality": None},
+                "first_name": "PROPAGANDA AND AGITATION DEPARTMENT (PAD)",
+                "last_day_updated": {"value": None},
+                "list_name": {"value": "UN List"},
+                "listed_on": "2017-09-11",
+                "reference_number": "KPe.053",
+                "sort_key": None,
+                "sort_key_last_mod": None,
+                "un_list_type": "DPRK",
+                "versionnum": "1",
+            },
+        ]
 
         call_command("ingest_sanctions", rebuild=True)
 
@@ -583,24 +536,143 @@ class PopulateSanctionsTests(DataTestClient):
 
     def test_get_un_sanctions(self):
         with requests_mock.Mocker() as m:
-            m.get(settings.SANCTION_LIST_SOURCES["un_sanctions_file"], content=b"<note><to>Tove</to></note>")
-            ingest_sanctions.get_un_sanctions()
+            m.get(
+                settings.SANCTION_LIST_SOURCES["un_sanctions_file"],
+                content=(
+                    b"<CONSOLIDATED_LIST>"
+                    b"<INDIVIDUALS><INDIVIDUAL><DATAID>1</DATAID><FIRST_NAME>RI</FIRST_NAME>"
+                    b"<INDIVIDUAL_ADDRESS><CITY>Damascus</CITY></INDIVIDUAL_ADDRESS></INDIVIDUAL></INDIVIDUALS>"
+                    b"<ENTITIES><ENTITY><DATAID>2</DATAID><FIRST_NAME>PAD</FIRST_NAME></ENTITY></ENTITIES>"
+                    b"</CONSOLIDATED_LIST>"
+                ),
+            )
+            records = list(ingest_sanctions.get_un_sanctions())
+
+        self.assertEqual(
+            records,
+            [
+                {"dataid": "1", "first_name": "RI", "individual_address": [{"city": "Damascus"}]},
+                {"dataid": "2", "first_name": "PAD"},
+            ],
+        )
 
     def test_get_office_financial_sanctions_implementation(self):
         with requests_mock.Mocker() as m:
             m.get(
                 settings.SANCTION_LIST_SOURCES["office_financial_sanctions_file"],
-                content=b"<note><to>Tove</to></note>",
+                content=(
+                    b'<ArrayOfFinancialSanctionsTarget xmlns="http://schemas.hmtreasury.gov.uk/ofsi/consolidatedlist">'
+                    b"<FinancialSanctionsTarget><Name6>Abdul Manan</Name6><GroupID>6897</GroupID>"
+                    b"</FinancialSanctionsTarget>"
+                    b"</ArrayOfFinancialSanctionsTarget>"
+                ),
             )
-            ingest_sanctions.get_office_financial_sanctions_implementation()
+            records = list(ingest_sanctions.get_office_financial_sanctions_implementation())
+
+        self.assertEqual(records, [{"name6": "Abdul Manan", "groupid": "6897"}])
 
     def test_get_uk_sanctions_list(self):
         with requests_mock.Mocker() as m:
             m.get(
                 settings.SANCTION_LIST_SOURCES["uk_sanctions_file"],
-                content=b"<designations><designation>Designation</designation></designations>",
+                content=(
+                    b"<Designations><DateGenerated>2024-01-01</DateGenerated>"
+                    b"<Designation><OFSIGroupID>1234</OFSIGroupID><Names><Name><Name6>Exchange</Name6></Name></Names>"
+                    b"</Designation></Designations>"
+                ),
             )
-            ingest_sanctions.get_uk_sanctions_list()
+            records = list(ingest_sanctions.get_uk_sanctions_list())
+
+        self.assertEqual(records, [{"ofsigroupid": "1234", "names": {"name": [{"name6": "Exchange"}]}}])
+
+    @mock.patch.object(ingest_sanctions, "bulk")
+    @mock.patch.object(ingest_sanctions, "scan")
+    def test_index_documents_only_writes_changes(self, mock_scan, mock_bulk):
+        unchanged = documents.SanctionDocumentType(meta={"id": "uk:1"}, name="Unchanged", reference="1")
+        changed = documents.SanctionDocumentType(meta={"id": "uk:2"}, name="Changed", reference="2")
+        new = documents.SanctionDocumentType(meta={"id": "uk:3"}, name="New", reference="3")
+        unchanged_hash = ingest_sanctions.hash_values([json.dumps(unchanged.to_dict(), sort_keys=True, default=str)])
+        mock_scan.return_value = [
+            {"_id": "uk:1", "_source": {"content_hash": unchanged_hash}},
+            {"_id": "uk:2", "_source": {"content_hash": "stale"}},
+            {"_id": "uk:4", "_source": {"content_hash": "removed"}},
+        ]
+        bulk_actions = []
+        mock_bulk.side_effect = lambda connection, actions, **kwargs: (bulk_actions.append(list(actions)), (0, []))[1]
+
+        ingest_sanctions.Command().index_documents("uk sanctions", "flag", iter([unchanged, changed, new]))
+
+        index_actions, delete_actions = bulk_actions
+        self.assertEqual([action["_id"] for action in index_actions], ["uk:2", "uk:3"])
+        self.assertEqual(
+            delete_actions,
+            [{"_op_type": "delete", "_index": settings.ELASTICSEARCH_SANCTION_INDEX_ALIAS, "_id": "uk:4"}],
+        )
+
+    @mock.patch.object(ingest_sanctions, "bulk")
+    @mock.patch.object(ingest_sanctions, "scan")
+    def test_index_documents_keeps_documents_of_failed_records(self, mock_scan, mock_bulk):
+        mock_scan.return_value = [
+            {"_id": "uk:1", "_source": {"content_hash": "failed"}},
+            {"_id": "uk:2", "_source": {"content_hash": "removed"}},
+        ]
+        bulk_actions = []
+        mock_bulk.side_effect = lambda connection, actions, **kwargs: (bulk_actions.append(list(actions)), (0, []))[1]
+
+        ingest_sanctions.Command().index_documents(
+            "uk sanctions", "flag", iter([ingest_sanctions.FailedRecord("uk:1")])
+        )
+
+        index_actions, delete_actions = bulk_actions
+        self.assertEqual(index_actions, [])
+        self.assertEqual([action["_id"] for action in delete_actions], ["uk:2"])
+
+    @mock.patch.object(ingest_sanctions, "bulk")
+    @mock.patch.object(ingest_sanctions, "scan")
+    def test_index_documents_deletes_nothing_after_unidentified_failure(self, mock_scan, mock_bulk):
+        new = documents.SanctionDocumentType(meta={"id": "uk:3"}, name="New", reference="3")
+        mock_scan.return_value = [{"_id": "uk:1", "_source": {"content_hash": "unknown"}}]
+        bulk_actions = []
+        mock_bulk.side_effect = lambda connection, actions, **kwargs: (bulk_actions.append(list(actions)), (0, []))[1]
+
+        ingest_sanctions.Command().index_documents(
+            "uk sanctions", "flag", iter([new, ingest_sanctions.FailedRecord(None)])
+        )
+
+        self.assertEqual(len(bulk_actions), 1)
+        self.assertEqual([action["_id"] for action in bulk_actions[0]], ["uk:3"])
+
+    @mock.patch.object(ingest_sanctions, "get_uk_sanctions_list")
+    def test_get_uk_sanctions_list_documents_yields_failed_records(self, mock_get_uk_sanctions_list):
+        mock_get_uk_sanctions_list.return_value = [{"ofsigroupid": "1234", "names": {"name": [{"name1": "No type"}]}}]
+
+        records = list(ingest_sanctions.Command().get_uk_sanctions_list_documents())
+
+        self.assertEqual(records, [ingest_sanctions.FailedRecord("uk:1234")])
+
+    @mock.patch.object(ingest_sanctions.Command, "populate_uk_sanctions_list")
+    @mock.patch.object(ingest_sanctions.Command, "populate_office_financial_sanctions_implementation")
+    @mock.patch.object(ingest_sanctions.Command, "populate_united_nations_sanctions")
+    @mock.patch.object(documents.SanctionDocumentType, "init")
+    @mock.patch.object(documents.SanctionDocumentType._index, "put_mapping")
+    @mock.patch.object(documents.SanctionDocumentType._index, "exists", return_value=True)
+    def test_ingest_into_existing_index_only_adds_mapping(self, mock_exists, mock_put_mapping, mock_init, *args):
+        call_command("ingest_sanctions")
+
+        mock_init.assert_not_called()
+        mock_put_mapping.assert_called_once_with(body={"properties": {"content_hash": {"type": "keyword"}}})
+
+    @mock.patch.object(ingest_sanctions.Command, "populate_uk_sanctions_list")
+    @mock.patch.object(ingest_sanctions.Command, "populate_office_financial_sanctions_implementation")
+    @mock.patch.object(ingest_sanctions.Command, "populate_united_nations_sanctions")
+    @mock.patch.object(documents.SanctionDocumentType, "init")
+    @mock.patch.object(documents.SanctionDocumentType._index, "put_mapping")
+    @mock.patch.object(documents.SanctionDocumentType._index, "exists", return_value=False)
+    def test_ingest_creates_missing_index(self, mock_exists, mock_put_mapping, mock_init, *args):
+        call_command("ingest_sanctions")
+
+        mock_init.assert_called_once_with()
+        mock_put_mapping.assert_not_called()
 
     @pytest.mark.elasticsearch
     @mock.patch.object(ingest_sanctions, "get_un_sanctions")
@@ -643,22 +715,9 @@ class PopulateSanctionsTests(DataTestClient):
             },
         ]
 
-        mock_get_office_financial_sanctions_implementation.return_value = {
-            "arrayoffinancialsanctionstarget": {
-                "financialsanctionstarget": [],
-            }
-        }
+        mock_get_office_financial_sanctions_implementation.return_value = []
 
-        mock_get_un_sanctions.return_value = {
-            "consolidated_list": {
-                "individuals": {
-                    "individual": [],
-                },
-                "entities": {
-                    "entity": [],
-                },
-            },
-        }
+        mock_get_un_sanctions.return_value = []
 
         call_command("ingest_sanctions", rebuild=True)
 
@@ -706,22 +765,9 @@ class PopulateSanctionsTests(DataTestClient):
             },
         ]
 
-        mock_get_office_financial_sanctions_implementation.return_value = {
-            "arrayoffinancialsanctionstarget": {
-                "financialsanctionstarget": [],
-            }
-        }
+        mock_get_office_financial_sanctions_implementation.return_value = []
 
-        mock_get_un_sanctions.return_value = {
-            "consolidated_list": {
-                "individuals": {
-                    "individual": [],
-                },
-                "entities": {
-                    "entity": [],
-                },
-            },
-        }
+        mock_get_un_sanctions.return_value = []
 
         call_command("ingest_sanctions", rebuild=True)
 
@@ -768,22 +814,9 @@ class PopulateSanctionsTests(DataTestClient):
             },
         ]
 
-        mock_get_office_financial_sanctions_implementation.return_value = {
-            "arrayoffinancialsanctionstarget": {
-                "financialsanctionstarget": [],
-            }
-        }
+        mock_get_office_financial_sanctions_implementation.return_value = []
 
-        mock_get_un_sanctions.return_value = {
-            "consolidated_list": {
-                "individuals": {
-                    "individual": [],
-                },
-                "entities": {
-                    "entity": [],
-                },
-            },
-        }
+        mock_get_un_sanctions.return_value = []
 
         call_command("ingest_sanctions", rebuild=True)
 
@@ -860,22 +893,9 @@ class PopulateSanctionsTests(DataTestClient):
             },
         ]
 
-        mock_get_office_financial_sanctions_implementation.return_value = {
-            "arrayoffinancialsanctionstarget": {
-                "financialsanctionstarget": [],
-            }
-        }
+        mock_get_office_financial_sanctions_implementation.return_value = []
 
-        mock_get_un_sanctions.return_value = {
-            "consolidated_list": {
-                "individuals": {
-                    "individual": [],
-                },
-                "entities": {
-                    "entity": [],
-                },
-            },
-        }
+        mock_get_un_sanctions.return_value = []
 
         call_command("ingest_sanctions", rebuild=True)
 
@@ -941,22 +961,9 @@ class PopulateSanctionsTests(DataTestClient):
             },
         ]
 
-        mock_get_office_financial_sanctions_implementation.return_value = {
-            "arrayoffinancialsanctionstarget": {
-                "financialsanctionstarget": [],
-            }
-        }
+        mock_get_office_financial_sanctions_implementation.return_value = []
 
-        mock_get_un_sanctions.return_value = {
-            "consolidated_list": {
-                "individuals": {
-                    "individual": [],
-                },
-                "entities": {
-                    "entity": [],
-                },
-            },
-        }
+        mock_get_un_sanctions.return_value = []
 
         call_command("ingest_sanctions", rebuild=True)
 
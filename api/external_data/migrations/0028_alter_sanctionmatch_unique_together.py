@@ -0,0 +1,32 @@
+# Generated by Django 4.2.19 on 2026-10-18 11:20
+
+from django.db import migrations
+
+
+def delete_duplicate_sanction_matches(apps, schema_editor):
+    SanctionMatch = apps.get_model("external_data", "SanctionMatch")
+    seen = set()
+    duplicate_ids = []
+    for sanction_match in SanctionMatch.objects.order_by("created_at").values(
+        "id", "party_on_application_id", "elasticsearch_reference"
+    ):
+        key = (sanction_match["party_on_application_id"], sanction_match["elasticsearch_reference"])
+        if key in seen:
+            duplicate_ids.append(sanction_match["id"])
+        seen.add(key)
+    SanctionMatch.objects.filter(id__in=duplicate_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("external_data", "0027_remove_denialentity_consignee_name_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_sanction_matches, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name="sanctionmatch",
+            unique_together={("party_on_application", "elasticsearch_reference")},
+        ),
+    ]
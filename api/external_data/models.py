@@ -57,6 +57,9 @@ class SanctionMatch(TimestampableModel):
     is_revoked = models.BooleanField(default=False, help_text="If true do not include in search results")
     is_revoked_comment = models.TextField(default="")
 
+    class Meta:
+        unique_together = [["party_on_application", "elasticsearch_reference"]]
+
     def save(self, *args, **kwargs):
         flag = Flag.objects.get(pk=self.flag_uuid)
         if self.is_revoked:
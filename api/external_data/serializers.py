@@ -39,6 +39,19 @@ class DenialSerializer(serializers.ModelSerializer):
         }
 
 
+class DenialLoadSerializer(DenialSerializer):
+    """
+    Used when ingesting denials in bulk, where regime_reg_ref uniqueness is checked for a whole batch of rows
+    at once instead of with a query per row
+    """
+
+    class Meta(DenialSerializer.Meta):
+        extra_kwargs = {
+            **DenialSerializer.Meta.extra_kwargs,
+            "regime_reg_ref": {"validators": []},
+        }
+
+
 class DenialEntitySerializer(serializers.ModelSerializer):
     entity_type = KeyValueChoiceField(choices=models.DenialEntityType.choices, required=False)
     regime_reg_ref = serializers.CharField(source="denial.regime_reg_ref", required=False)
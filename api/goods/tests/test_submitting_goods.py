@@ -37,7 +37,8 @@ class GoodTests(DataTestClient):
         }
 
         url = reverse("applications:application_submit", kwargs={"pk": draft.id})
-        response = self.client.put(url, data, **self.exporter_headers)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put(url, data, **self.exporter_headers)
 
         response_data = response.json()
 
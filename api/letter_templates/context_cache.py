@@ -0,0 +1,67 @@
+"""
+Revisions of the data behind each case's document context. Memoised contexts are keyed on the case's revision,
+which changes whenever an object that the context reads for the case is saved or deleted. Objects shared between
+cases, such as organisations and sites, don't change the revision and are picked up when the memoised context
+expires.
+"""
+
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+from api.applications.models import (
+    ApplicationDocument,
+    ExternalLocationOnApplication,
+    GoodOnApplication,
+    PartyOnApplication,
+    SiteOnApplication,
+)
+from api.cases.models import Advice, Case, CaseNote, EcjuQuery
+from api.goods.models import Good
+from api.licences.models import GoodOnLicence, Licence
+from api.parties.models import Party
+
+DOCUMENT_CONTEXT_REVISION_CACHE_KEY = "document-context-revision"
+
+# How to find the cases whose document context reads each type of object
+DOCUMENT_CONTEXT_CASE_IDS = {
+    Advice: lambda advice: [advice.case_id],
+    CaseNote: lambda note: [note.case_id],
+    EcjuQuery: lambda query: [query.case_id],
+    Licence: lambda licence: [licence.case_id],
+    GoodOnLicence: lambda good_on_licence: Licence.objects.filter(id=good_on_licence.licence_id).values_list(
+        "case_id", flat=True
+    ),
+    ApplicationDocument: lambda document: [document.application_id],
+    ExternalLocationOnApplication: lambda location: [location.application_id],
+    GoodOnApplication: lambda good_on_application: [good_on_application.application_id],
+    PartyOnApplication: lambda party_on_application: [party_on_application.application_id],
+    SiteOnApplication: lambda site_on_application: [site_on_application.application_id],
+    Good: lambda good: good.goods_on_application.values_list("application_id", flat=True),
+    Party: lambda party: party.parties_on_application.values_list("application_id", flat=True),
+}
+
+
+def get_document_context_revision_cache_key(case_id):
+    return f"{DOCUMENT_CONTEXT_REVISION_CACHE_KEY}:{case_id}"
+
+
+def get_document_context_revision(case_id):
+    return cache.get_or_set(
+        get_document_context_revision_cache_key(case_id),
+        lambda: uuid.uuid4().hex,
+        timeout=settings.DOCUMENT_CONTEXT_CACHE_TIMEOUT,
+    )
+
+
+def get_document_context_case_ids(instance):
+    if isinstance(instance, Case):
+        return [instance.pk]
+
+    get_case_ids = DOCUMENT_CONTEXT_CASE_IDS.get(type(instance))
+    return get_case_ids(instance) if get_case_ids else []
+
+
+def invalidate_document_contexts(case_ids):
+    cache.delete_many([get_document_context_revision_cache_key(case_id) for case_id in case_ids])
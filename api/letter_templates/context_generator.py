@@ -1,7 +1,10 @@
 from collections import defaultdict
 from datetime import timedelta
 
+from django.conf import settings
 from django.contrib.humanize.templatetags.humanize import intcomma
+from django.core.cache import cache
+from django.db.models import Prefetch, prefetch_related_objects
 from django.utils import timezone
 
 from rest_framework import serializers
@@ -25,8 +28,11 @@ from api.goods.enums import (
 from api.applications.models import (
     BaseApplication,
     ApplicationDocument,
+    ExternalLocationOnApplication,
     StandardApplication,
     GoodOnApplication,
+    PartyOnApplication,
+    SiteOnApplication,
 )
 from api.goods.models import PvGradingDetails, Good, FirearmGoodDetails
 from api.cases.models import Advice, EcjuQuery, CaseNote, Case, CaseType
@@ -34,7 +40,7 @@ from api.organisations.models import Organisation
 from api.addresses.models import Address
 from api.parties.models import Party
 from api.compliance.models import ComplianceVisitCase, CompliancePerson
-from api.licences.models import Licence
+from api.licences.models import GoodOnLicence, Licence
 from api.organisations.models import Site, ExternalLocation
 from api.queries.end_user_advisories.models import EndUserAdvisoryQuery
 from api.queries.goods_query.models import GoodsQuery
@@ -43,6 +49,7 @@ from api.f680.models import SecurityReleaseOutcome
 from api.f680.enums import SecurityReleaseOutcomes
 
 from api.staticdata.countries.models import Country
+from api.letter_templates.context_cache import get_document_context_revision
 
 from lite_routing.routing_rules_internal.enums import QueuesEnum
 
@@ -565,7 +572,7 @@ class ComplianceVisitCaseSerializer(serializers.ModelSerializer):
 
     def get_people_present(self, obj):
         people = CompliancePerson.objects.filter(visit_case=obj.id)
-        return CompliancePersonSerializer(people, many=True)
+        return CompliancePersonSerializer(people, many=True).data
 
 
 class ComplianceVisitSerializer(ComplianceVisitCaseSerializer):
@@ -698,36 +705,195 @@ class AdviceSerializer(serializers.ModelSerializer):
         fields = ("type", "text", "note", "proviso", "denial_reasons")
 
 
+# The objects every document context reads through the case's foreign keys
+DOCUMENT_CONTEXT_SELECT_RELATED = (
+    "case_type",
+    "status",
+    "case_officer__baseuser_ptr",
+    "submitted_by__baseuser_ptr",
+    "organisation__primary_site__address__country",
+    "baseapplication",
+)
+
+# Queries and compliance cases aren't applications, so have no goods, parties or sites to load
+NON_APPLICATION_CASE_SUB_TYPES = [
+    CaseTypeSubTypeEnum.EUA,
+    CaseTypeSubTypeEnum.GOODS,
+    CaseTypeSubTypeEnum.COMP_SITE,
+    CaseTypeSubTypeEnum.COMP_VISIT,
+]
+
+DOCUMENT_CONTEXT_CACHE_KEY = "document-context"
+
+
+def get_document_context_prefetches(case_sub_type):
+    """
+    Returns the prefetch plan for the document context of a type of case: every related object the context
+    serializers read, so that they serialize from memory instead of querying once per object
+    """
+    prefetches = [
+        Prefetch(
+            "case_ecju_query",
+            queryset=EcjuQuery.objects.select_related("raised_by_user__baseuser_ptr", "responded_by_user"),
+            to_attr="context_ecju_queries",
+        ),
+        Prefetch("case_notes", queryset=CaseNote.objects.select_related("user"), to_attr="context_notes"),
+        Prefetch(
+            "advice",
+            queryset=Advice.objects.filter(level=AdviceLevel.FINAL).prefetch_related("denial_reasons"),
+            to_attr="context_final_advice",
+        ),
+    ]
+
+    if case_sub_type in NON_APPLICATION_CASE_SUB_TYPES:
+        return prefetches
+
+    return prefetches + [
+        Prefetch(
+            "licences",
+            queryset=Licence.objects.filter(
+                status__in=[LicenceStatus.DRAFT, LicenceStatus.ISSUED, LicenceStatus.REINSTATED]
+            ).prefetch_related(
+                Prefetch(
+                    "goods",
+                    queryset=GoodOnLicence.objects.select_related(
+                        "good__good__pv_grading_details", "good__firearm_details"
+                    )
+                    .prefetch_related("good__control_list_entries", "good__good__control_list_entries")
+                    .order_by("created_at"),
+                    to_attr="context_goods",
+                )
+            ),
+            to_attr="context_licences",
+        ),
+        Prefetch(
+            "baseapplication__goods",
+            queryset=GoodOnApplication.objects.select_related("good__pv_grading_details", "firearm_details")
+            .prefetch_related("control_list_entries", "good__control_list_entries")
+            .order_by("created_at"),
+            to_attr="context_goods",
+        ),
+        Prefetch(
+            "baseapplication__parties",
+            queryset=PartyOnApplication.objects.filter(deleted_at__isnull=True).select_related("party__country"),
+            to_attr="context_parties",
+        ),
+        Prefetch(
+            "baseapplication__application_sites",
+            queryset=SiteOnApplication.objects.select_related("site__address__country").order_by("site__name"),
+            to_attr="context_sites",
+        ),
+        Prefetch(
+            "baseapplication__external_application_sites",
+            queryset=ExternalLocationOnApplication.objects.select_related("external_location__country"),
+            to_attr="context_external_locations",
+        ),
+        Prefetch(
+            "baseapplication__applicationdocument_set",
+            queryset=ApplicationDocument.objects.order_by("-created_at"),
+            to_attr="context_documents",
+        ),
+    ]
+
+
+def get_document_cases(case_ids):
+    """
+    Loads cases along with everything their document context reads, following the prefetch plan for each case's
+    type. Loading cases together shares these queries between them.
+    """
+    cases = Case.objects.select_related(*DOCUMENT_CONTEXT_SELECT_RELATED).in_bulk(case_ids)
+
+    cases_by_sub_type = defaultdict(list)
+    for case in cases.values():
+        cases_by_sub_type[case.case_type.sub_type].append(case)
+    for case_sub_type, sub_type_cases in cases_by_sub_type.items():
+        prefetch_related_objects(sub_type_cases, *get_document_context_prefetches(case_sub_type))
+
+    return cases
+
+
 def get_document_context(case, addressee=None):
     """
     Generate universal context dictionary to provide data for all document types.
     """
+    return {**_get_case_document_context(case, addressee), **_get_current_document_context()}
+
+
+def get_cached_document_context(case, addressee=None):
+    """
+    Returns the document context for a case, memoised until something the context reads for the case changes, so
+    that previewing the same case again while editing a letter's text doesn't have to load the case again
+    """
+    revision = get_document_context_revision(case.pk)
+    key = f"{DOCUMENT_CONTEXT_CACHE_KEY}:{case.pk}:{revision}:{addressee.pk if addressee else ''}"
+    context = cache.get(key)
+    if context is None:
+        context = _get_case_document_context(case, addressee)
+        cache.set(key, context, timeout=settings.DOCUMENT_CONTEXT_CACHE_TIMEOUT)
+    return {**context, **_get_current_document_context()}
+
+
+def _get_current_document_context():
     date, time = get_date_and_time()
-    licence = Licence.objects.get_draft_or_active_licence(case.pk)
-    final_advice = Advice.objects.filter(level=AdviceLevel.FINAL, case_id=case.pk)
-    ecju_queries = EcjuQuery.objects.filter(case=case)
-    notes = CaseNote.objects.filter(case=case)
-    sites = Site.objects.filter(sites_on_application__application_id=case.pk)
-    external_locations = ExternalLocation.objects.filter(external_locations_on_application__application_id=case.pk)
-    documents = ApplicationDocument.objects.filter(application_id=case.pk).order_by("-created_at")
+    appeal_deadline = timezone.localtime() + timedelta(days=APPEAL_DAYS)
+    return {
+        "current_date": date,
+        "current_time": time,
+        "appeal_deadline": appeal_deadline.strftime("%d %B %Y"),
+    }
+
+
+def _get_context_licence(case):
+    """
+    Returns the Licence to be considered during finalised flow, prioritising draft licences over active ones
+    """
+    licences = sorted(case.context_licences, key=lambda licence: licence.status != LicenceStatus.DRAFT)
+    return licences[0] if licences else None
+
+
+def _get_case_document_context(case, addressee=None):
+    if not hasattr(case, "context_final_advice"):
+        case = get_document_cases([case.pk])[case.pk]
+
     base_application = case.baseapplication if getattr(case, "baseapplication", "") else None
+    licence = _get_context_licence(case) if base_application else None
+    final_advice = case.context_final_advice
+
+    end_user = consignee = None
+    ultimate_end_users = []
+    third_parties = []
+    goods = None
+    sites = []
+    external_locations = []
+    documents = []
     if base_application:
-        ultimate_end_users = (
-            [p.party for p in base_application.ultimate_end_users] if base_application.ultimate_end_users else None
-        )
-    else:
-        ultimate_end_users = None
-
-    if getattr(base_application, "goods", "") and base_application.goods.exists():
-        goods = _get_goods_context(base_application, final_advice, licence)
-    else:
-        goods = None
+        for party_on_application in base_application.context_parties:
+            party_type = party_on_application.party.type
+            if party_type == PartyType.END_USER:
+                end_user = end_user or party_on_application.party
+            elif party_type == PartyType.CONSIGNEE:
+                consignee = consignee or party_on_application.party
+            elif party_type == PartyType.ULTIMATE_END_USER:
+                ultimate_end_users.append(party_on_application.party)
+            elif party_type == PartyType.THIRD_PARTY:
+                third_parties.append(party_on_application.party)
+
+        if base_application.context_goods:
+            goods = _get_goods_context(
+                base_application.context_goods, final_advice, licence.context_goods if licence else None
+            )
+
+        sites = [site_on_application.site for site_on_application in base_application.context_sites]
+        external_locations = [
+            external_location_on_application.external_location
+            for external_location_on_application in base_application.context_external_locations
+        ]
+        documents = base_application.context_documents
 
     # compliance type cases contain neither an addressee or submitted_by user
     if not addressee and case.submitted_by:
         addressee = case.submitted_by
 
-    appeal_deadline = timezone.localtime() + timedelta(days=APPEAL_DAYS)
     exporter_reference = ""
     date_application_submitted = ""
 
@@ -743,35 +909,20 @@ def get_document_context(case, addressee=None):
         "case_submitted_at": case.submitted_at,
         "case_officer_name": case.get_case_officer_name(),
         "case_type": CaseTypeSerializer(case.case_type).data,
-        "current_date": date,
-        "current_time": time,
         "details": _get_details_context(case),
         "addressee": AddresseeSerializer(addressee).data,
         "organisation": OrganisationSerializer(case.organisation).data,
         "licence": LicenceSerializer(licence).data if licence else None,
-        "end_user": (
-            PartySerializer(base_application.end_user.party).data
-            if base_application and base_application.end_user
-            else None
-        ),
-        "consignee": (
-            PartySerializer(base_application.consignee.party).data
-            if base_application and base_application.consignee
-            else None
-        ),
+        "end_user": PartySerializer(end_user).data if end_user else None,
+        "consignee": PartySerializer(consignee).data if consignee else None,
         "ultimate_end_users": PartySerializer(ultimate_end_users, many=True).data or [],
-        "third_parties": (
-            _get_third_parties_context(base_application.third_parties)
-            if getattr(base_application, "third_parties", "")
-            else []
-        ),
+        "third_parties": _get_third_parties_context(third_parties) if third_parties else [],
         "goods": goods,
-        "ecju_queries": EcjuQuerySerializer(ecju_queries, many=True).data,
-        "notes": CaseNoteSerializer(notes, many=True).data,
+        "ecju_queries": EcjuQuerySerializer(case.context_ecju_queries, many=True).data,
+        "notes": CaseNoteSerializer(case.context_notes, many=True).data,
         "sites": FlattenedSiteSerializer(sites, many=True).data,
         "external_locations": ExternalLocationSerializer(external_locations, many=True).data,
         "documents": ApplicationDocumentSerializer(documents, many=True).data,
-        "appeal_deadline": appeal_deadline.strftime("%d %B %Y"),
         "date_application_submitted": date_application_submitted,
         "exporter_reference": exporter_reference,
     }
@@ -801,15 +952,13 @@ def _get_details_context(case):
 
 
 def _get_third_parties_context(third_parties):
-    parties = [third_party.party for third_party in third_parties]
-    third_parties_context = {"all": PartySerializer(parties, many=True).data}
+    third_parties_context = {"all": PartySerializer(third_parties, many=True).data}
 
     # Split third parties into lists based on role
     for role, _ in PartyRole.choices:
-        third_parties_of_type = third_parties.filter(party__role=role)
+        third_parties_of_type = [third_party for third_party in third_parties if third_party.role == role]
         if third_parties_of_type:
-            filtered_parties = [third_party.party for third_party in third_parties_of_type]
-            third_parties_context[role] = PartySerializer(filtered_parties, many=True).data
+            third_parties_context[role] = PartySerializer(third_parties_of_type, many=True).data
 
     return third_parties_context
 
@@ -847,7 +996,7 @@ def _get_good_on_licence_context(good_on_licence):
     return good_context
 
 
-def _get_goods_context(application, final_advice, licence=None):
+def _get_goods_context(goods_on_application, final_advice, goods_on_licence=None):
     """
     TODO: We should re-write this function to more clearly avoid all the pitfalls
     we have bolted on to it.
@@ -861,8 +1010,7 @@ def _get_goods_context(application, final_advice, licence=None):
     Right now, we do things a little backwards and add records to the context datastructure/grab/rewrite/overwrite them.
     That makes this quite hard to understand what is going on and very easy for bugs to manifest.
     """
-    goods_on_application = application.goods.all().order_by("created_at")
-    final_advice = final_advice.filter(good_id__isnull=False)
+    final_advice = [advice for advice in final_advice if advice.good_id]
     goods_context = {advice_type: [] for advice_type, _ in AdviceType.choices}
 
     # Create a mapping to get from Good.id to corresponding GoodOnApplication records
@@ -873,15 +1021,14 @@ def _get_goods_context(application, final_advice, licence=None):
         good_ids_to_goods_on_application[good_on_application.good_id].append(good_on_application)
     goods_context["all"] = GoodOnApplicationSerializer(goods_on_application, many=True).data
 
-    if licence:
-        goods_on_licence = licence.goods.all().order_by("created_at")
-        if goods_on_licence.exists():
+    if goods_on_licence is not None:
+        if goods_on_licence:
             goods_context[AdviceType.APPROVE] = [
                 _get_good_on_licence_context(good_on_licence) for good_on_licence in goods_on_licence
             ]
         # Remove APPROVE from advice as it is no longer needed
         # (no need to get approved GoodOnApplications if we have GoodOnLicence)
-        final_advice = final_advice.exclude(type=AdviceType.APPROVE)
+        final_advice = [advice for advice in final_advice if advice.type != AdviceType.APPROVE]
 
     # Ensure that for each proviso final advice record, we add a record to the goods
     #  context
@@ -9,7 +9,7 @@ from django.utils.html import (
 )
 from markdown import markdown
 
-from api.letter_templates.context_generator import get_document_context
+from api.letter_templates.context_generator import get_cached_document_context, get_document_context
 
 
 class DocumentPreviewError(Exception):
@@ -49,6 +49,7 @@ def generate_preview(
     additional_contact=None,
     include_digital_signature=False,
     include_css=True,
+    cache_context=False,
 ):
     template_name = f"letter_templates/{layout}.html"
 
@@ -65,7 +66,8 @@ def generate_preview(
     }
 
     if case:
-        context.update(get_document_context(case, additional_contact))
+        get_context = get_cached_document_context if cache_context else get_document_context
+        context.update(get_context(case, additional_contact))
         context["user_content"] = format_user_text(convert_var_to_text(text, context))
 
     return render_to_string(template_name, context)
@@ -1,10 +1,13 @@
 import pytest
 
 from datetime import date
+from unittest import mock
 from dateutil.relativedelta import relativedelta
 from freezegun import freeze_time
 
+from django.db import connection
 from django.template.loader import render_to_string
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from parameterized import parameterized
 
@@ -34,7 +37,8 @@ from api.goods.enums import (
 )
 from api.goods.tests.factories import GoodFactory, FirearmFactory
 from api.cases.tests.factories import CaseAssignmentFactory, EcjuQueryFactory
-from api.letter_templates.context_generator import get_document_context
+from api.letter_templates.context_cache import get_document_context_revision
+from api.letter_templates.context_generator import get_cached_document_context, get_document_context
 from api.licences.enums import LicenceStatus
 from api.licences.tests.factories import GoodOnLicenceFactory
 from api.parties.enums import PartyType, SubType
@@ -901,6 +905,58 @@ class DocumentContextGenerationTests(DataTestClient):
         self.assertEqual(context["case_reference"], application.reference_code)
         self._assert_good(context["goods"]["all"][0], goa)
 
+    def _count_context_queries(self, case):
+        with CaptureQueriesContext(connection) as queries:
+            get_document_context(case)
+        return len(queries)
+
+    def test_generate_context_queries_dont_grow_with_goods_and_parties(self):
+        small_application = self.create_standard_application_case(self.organisation, user=self.exporter_user)
+        FinalAdviceFactory(user=self.gov_user, case=small_application, good=small_application.goods.first().good)
+        large_application = self.create_standard_application_case(
+            self.organisation, user=self.exporter_user, num_products=10
+        )
+        for product in large_application.goods.all():
+            FinalAdviceFactory(user=self.gov_user, case=large_application, good=product.good)
+        for _ in range(3):
+            self.create_party("Ultimate end user", self.organisation, PartyType.ULTIMATE_END_USER, large_application)
+            self.create_case_note(large_application, "text", self.gov_user.baseuser_ptr)
+
+        self.assertEqual(self._count_context_queries(large_application), self._count_context_queries(small_application))
+
+    def test_cached_context_is_reused_until_case_changes(self):
+        case = self.create_standard_application_case(self.organisation, user=self.exporter_user)
+        context = get_cached_document_context(case)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_cached_document_context(case)["notes"], context["notes"])
+
+        note = self.create_case_note(case, "text", self.gov_user.baseuser_ptr)
+
+        self._assert_note(get_cached_document_context(case)["notes"][0], note)
+
+    def test_cached_context_from_before_change_committed_is_invalidated_on_commit(self):
+        case = self.create_standard_application_case(self.organisation, user=self.exporter_user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            note = self.create_case_note(case, "text", self.gov_user.baseuser_ptr)
+            # As if a concurrent request had memoised the context from the data before the note
+            with mock.patch(
+                "api.letter_templates.context_generator._get_case_document_context", return_value={"notes": []}
+            ):
+                self.assertEqual(get_cached_document_context(case)["notes"], [])
+
+        self._assert_note(get_cached_document_context(case)["notes"][0], note)
+
+    def test_cached_context_is_invalidated_when_application_is_saved(self):
+        # Applications are saved as their concrete type rather than as a Case
+        case = self.create_standard_application_case(self.organisation, user=self.exporter_user)
+        revision = get_document_context_revision(case.pk)
+
+        case.save()
+
+        self.assertNotEqual(get_document_context_revision(case.pk), revision)
+
 
 class SerializersTests(DataTestClient):
     def test_EcjuQuerySerializer_format(self):
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class QueuesConfig(AppConfig):
+    name = "api.queues"
+
+    def ready(self):
+        from . import signals  # noqa
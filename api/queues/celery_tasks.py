@@ -0,0 +1,16 @@
+from celery import shared_task
+from celery.utils.log import get_task_logger
+
+from api.queues.service import reconcile_queue_case_counts
+
+
+logger = get_task_logger(__name__)
+
+
+@shared_task
+def reconcile_case_counts():
+    """
+    Recount the maintained queue case counts from scratch to correct any drift
+    """
+    logger.info("Reconciling queue case counts")
+    reconcile_queue_case_counts()
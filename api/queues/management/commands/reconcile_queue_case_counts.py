@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api.queues.service import reconcile_queue_case_counts
+
+
+class Command(BaseCommand):
+    help = "Recount the maintained case counts for every queue from scratch."
+
+    def handle(self, *args, **options):
+        reconcile_queue_case_counts()
+        self.stdout.write(self.style.SUCCESS("Queue case counts reconciled"))
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.19 on 2026-10-18 09:12
+
+from django.db import migrations, models
+import django.utils.timezone
+import model_utils.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("queues", "0007_populate_lu_countersigning_queues_alias"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QueueCaseCount",
+            fields=[
+                (
+                    "created_at",
+                    model_utils.fields.AutoCreatedField(
+                        default=django.utils.timezone.now, editable=False, verbose_name="created_at"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    model_utils.fields.AutoLastModifiedField(
+                        default=django.utils.timezone.now, editable=False, verbose_name="updated_at"
+                    ),
+                ),
+                ("key", models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ("case_count", models.IntegerField(default=0)),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+    ]
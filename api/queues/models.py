@@ -2,6 +2,7 @@ import uuid
 
 from django.db import models
 
+from api.common.models import TimestampableModel
 from api.teams.models import Team
 
 
@@ -28,3 +29,14 @@ class Queue(models.Model):
         return (self.name, self.team.name)
 
     natural_key.dependencies = ["teams.Team"]
+
+
+class QueueCaseCount(TimestampableModel):
+    """
+    The number of cases on a queue, maintained by signals so that listing queues doesn't need to count
+    the case table on every request. Keyed on the queue id, and for system queues whose count depends on
+    the user's team, the queue id and team id.
+    """
+
+    key = models.CharField(primary_key=True, max_length=100)
+    case_count = models.IntegerField(default=0)
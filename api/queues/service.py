@@ -1,18 +1,17 @@
-from typing import List, Dict
+from typing import Dict, Iterable, List
 
-from django.db.models import Count, QuerySet
+from django.db.models import Count, F, QuerySet
 
-from api.cases.models import Case
+from api.cases.models import Case, CaseQueue
 from api.queues import helpers
 from api.queues.constants import (
     ALL_CASES_QUEUE_ID,
     OPEN_CASES_QUEUE_ID,
     MY_TEAMS_QUEUES_CASES_ID,
-    MY_ASSIGNED_CASES_QUEUE_ID,
-    MY_ASSIGNED_AS_CASE_OFFICER_CASES_QUEUE_ID,
     SYSTEM_QUEUES,
 )
-from api.queues.models import Queue
+from api.queues.models import Queue, QueueCaseCount
+from api.teams.models import Team
 
 
 def get_queue(pk):
@@ -46,7 +45,14 @@ def get_team_queues(team_id, include_team_info=True, include_case_count=False) -
     Returns a list of team queues in dictionary format with optional team and case count information
     """
     filters = {"team_id": team_id}
-    return list(get_queues_qs(filters, include_team_info, include_case_count).values())
+    queues = list(get_queues_qs(filters, include_team_info).values())
+
+    if include_case_count:
+        case_counts = get_queue_case_counts([queue["id"] for queue in queues])
+        for queue in queues:
+            queue["case_count"] = case_counts[str(queue["id"])]
+
+    return queues
 
 
 def get_system_queues(include_team_info=True, include_case_count=False, user=None) -> List[Dict]:
@@ -75,15 +81,107 @@ def _get_system_queues_case_count(user) -> Dict:
     """
     Returns a dictionary of system queues and their case count
     """
+    return get_queue_case_counts(SYSTEM_QUEUES.keys(), team_id=user.team_id)
+
+
+def _get_case_count_key(queue_id, team_id=None) -> str:
+    if str(queue_id) == MY_TEAMS_QUEUES_CASES_ID:
+        return f"{queue_id}:{team_id}"
+    return str(queue_id)
 
+
+def _count_cases(queue_id, team_id=None) -> int:
+    """
+    Counts the cases on a queue from scratch
+    """
+    queue_id = str(queue_id)
     case_qs = Case.objects.submitted()
 
-    cases_count = {
-        ALL_CASES_QUEUE_ID: case_qs.count(),
-        OPEN_CASES_QUEUE_ID: case_qs.is_open().count(),
-        MY_TEAMS_QUEUES_CASES_ID: case_qs.in_team(team_id=user.team.id).count(),
-        MY_ASSIGNED_CASES_QUEUE_ID: case_qs.assigned_to_user(user=user).not_terminal().count(),
-        MY_ASSIGNED_AS_CASE_OFFICER_CASES_QUEUE_ID: case_qs.assigned_as_case_officer(user=user).not_terminal().count(),
+    if queue_id == ALL_CASES_QUEUE_ID:
+        return case_qs.count()
+    if queue_id == OPEN_CASES_QUEUE_ID:
+        return case_qs.is_open().count()
+    if queue_id == MY_TEAMS_QUEUES_CASES_ID:
+        return case_qs.in_team(team_id=team_id).count()
+
+    return CaseQueue.objects.filter(queue_id=queue_id).count()
+
+
+def _store_case_counts(case_counts: Dict[str, int]):
+    QueueCaseCount.objects.bulk_create(
+        [QueueCaseCount(key=key, case_count=case_count) for key, case_count in case_counts.items()],
+        update_conflicts=True,
+        unique_fields=["key"],
+        update_fields=["case_count", "updated_at"],
+    )
+
+
+def get_queue_case_counts(queue_ids: Iterable, team_id=None) -> Dict[str, int]:
+    """
+    Returns a dictionary of queue ids and their maintained case count.
+    Counts that haven't been stored yet are counted from scratch and stored for subsequent requests.
+    """
+    keys = {str(queue_id): _get_case_count_key(queue_id, team_id) for queue_id in queue_ids}
+    stored_counts = dict(QueueCaseCount.objects.filter(key__in=keys.values()).values_list("key", "case_count"))
+
+    missing_counts = {
+        key: _count_cases(queue_id, team_id) for queue_id, key in keys.items() if key not in stored_counts
     }
+    if missing_counts:
+        _store_case_counts(missing_counts)
+        stored_counts.update(missing_counts)
 
-    return cases_count
+    return {queue_id: stored_counts[key] for queue_id, key in keys.items()}
+
+
+def refresh_queue_case_counts(queue_ids: Iterable):
+    """
+    Recounts the given work queues along with the My Team's Queues count for the teams that own them
+    """
+    queue_ids = {str(queue_id) for queue_id in queue_ids}
+    if not queue_ids:
+        return
+
+    case_counts = {queue_id: 0 for queue_id in queue_ids}
+    for queue_id, case_count in (
+        CaseQueue.objects.filter(queue_id__in=queue_ids).values_list("queue_id").annotate(Count("id"))
+    ):
+        case_counts[str(queue_id)] = case_count
+
+    for team_id in Queue.objects.filter(id__in=queue_ids).values_list("team_id", flat=True).distinct():
+        case_counts[_get_case_count_key(MY_TEAMS_QUEUES_CASES_ID, team_id)] = _count_cases(
+            MY_TEAMS_QUEUES_CASES_ID, team_id
+        )
+
+    _store_case_counts(case_counts)
+
+
+def adjust_queue_case_counts(adjustments: Dict[str, int]):
+    """
+    Applies relative changes to the stored counts of queues whose count doesn't depend on a team,
+    counts that haven't been stored yet are left to be counted when they are next requested
+    """
+    for queue_id, adjustment in adjustments.items():
+        if adjustment:
+            QueueCaseCount.objects.filter(key=_get_case_count_key(queue_id)).update(
+                case_count=F("case_count") + adjustment
+            )
+
+
+def reconcile_queue_case_counts():
+    """
+    Recounts every maintained queue case count from scratch
+    """
+    case_counts = {
+        ALL_CASES_QUEUE_ID: _count_cases(ALL_CASES_QUEUE_ID),
+        OPEN_CASES_QUEUE_ID: _count_cases(OPEN_CASES_QUEUE_ID),
+    }
+    for team_id in Team.objects.values_list("id", flat=True):
+        case_counts[_get_case_count_key(MY_TEAMS_QUEUES_CASES_ID, team_id)] = _count_cases(
+            MY_TEAMS_QUEUES_CASES_ID, team_id
+        )
+    queue_counts = dict(Queue.objects.annotate(case_count=Count("cases")).values_list("id", "case_count"))
+    case_counts.update({str(queue_id): case_count for queue_id, case_count in queue_counts.items()})
+
+    QueueCaseCount.objects.exclude(key__in=case_counts.keys()).delete()
+    _store_case_counts(case_counts)
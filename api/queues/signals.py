@@ -0,0 +1,68 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api.cases.models import Case
+from api.queues.constants import ALL_CASES_QUEUE_ID, OPEN_CASES_QUEUE_ID
+from api.queues.service import adjust_queue_case_counts, refresh_queue_case_counts
+from api.staticdata.statuses.enums import CaseStatusEnum
+
+
+def _get_system_queue_membership(status):
+    """
+    Returns whether a case with the given status is counted on the All cases and Open cases queues
+    """
+    is_submitted = status is None or status.status != CaseStatusEnum.DRAFT
+    is_open = status is not None and is_submitted and not status.is_terminal
+    return {ALL_CASES_QUEUE_ID: is_submitted, OPEN_CASES_QUEUE_ID: is_open}
+
+
+@receiver(m2m_changed, sender=Case.queues.through)
+def case_queues_changed_handler(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear":
+        # The cleared queues are no longer available once the clear has happened
+        instance._cleared_queue_ids = set(
+            instance.queues.values_list("id", flat=True) if not reverse else [instance.pk]
+        )
+        return
+    if action not in ["post_add", "post_remove", "post_clear"]:
+        return
+
+    if reverse:
+        queue_ids = {instance.pk}
+    elif action == "post_clear":
+        queue_ids = getattr(instance, "_cleared_queue_ids", set())
+    else:
+        queue_ids = set(pk_set or [])
+
+    transaction.on_commit(lambda: refresh_queue_case_counts(queue_ids))
+
+
+@receiver(post_delete, sender=Case.queues.through)
+def case_queue_deleted_handler(sender, instance, **kwargs):
+    # CaseQueue rows deleted with a queryset bypass m2m_changed
+    queue_id = instance.queue_id
+    transaction.on_commit(lambda: refresh_queue_case_counts([queue_id]))
+
+
+@receiver(post_save)
+def case_status_changed_handler(sender, instance, created, raw=False, **kwargs):
+    if raw or not isinstance(instance, Case):
+        return
+    if not created and instance._previous_status == instance.status:
+        return
+
+    previous = _get_system_queue_membership(instance._previous_status) if not created else {}
+    current = _get_system_queue_membership(instance.status)
+    adjustments = {
+        queue_id: int(is_member) - int(previous.get(queue_id, False)) for queue_id, is_member in current.items()
+    }
+    transaction.on_commit(lambda: adjust_queue_case_counts(adjustments))
+
+
+@receiver(post_delete, sender=Case)
+def case_deleted_handler(sender, instance, **kwargs):
+    adjustments = {
+        queue_id: -int(is_member) for queue_id, is_member in _get_system_queue_membership(instance.status).items()
+    }
+    transaction.on_commit(lambda: adjust_queue_case_counts(adjustments))
@@ -0,0 +1,67 @@
+from django.core.management import call_command
+
+from api.queues.constants import ALL_CASES_QUEUE_ID, MY_TEAMS_QUEUES_CASES_ID, OPEN_CASES_QUEUE_ID
+from api.queues.models import QueueCaseCount
+from api.queues.service import get_queue_case_counts, get_system_queues, get_team_queues
+from api.staticdata.statuses.enums import CaseStatusEnum
+from api.staticdata.statuses.libraries.get_case_status import get_case_status_by_status
+from test_helpers.clients import DataTestClient
+
+
+class QueueCaseCountTests(DataTestClient):
+    def setUp(self):
+        super().setUp()
+        self.queue = self.create_queue("queue", self.team)
+        self.case = self.create_standard_application_case(self.organisation).get_case()
+
+    def test_case_counts_are_stored_when_first_requested(self):
+        QueueCaseCount.objects.all().delete()
+
+        case_counts = get_queue_case_counts([ALL_CASES_QUEUE_ID, str(self.queue.id)])
+
+        self.assertEqual(case_counts[str(self.queue.id)], 0)
+        self.assertEqual(QueueCaseCount.objects.get(key=ALL_CASES_QUEUE_ID).case_count, case_counts[ALL_CASES_QUEUE_ID])
+        self.assertEqual(QueueCaseCount.objects.get(key=str(self.queue.id)).case_count, 0)
+
+    def test_adding_and_removing_case_from_queue_updates_counts(self):
+        get_team_queues(self.team.id, include_case_count=True)
+        get_system_queues(include_case_count=True, user=self.gov_user)
+        team_key = f"{MY_TEAMS_QUEUES_CASES_ID}:{self.team.id}"
+        team_count = QueueCaseCount.objects.get(key=team_key).case_count
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.case.queues.add(self.queue)
+
+        self.assertEqual(QueueCaseCount.objects.get(key=str(self.queue.id)).case_count, 1)
+        self.assertEqual(QueueCaseCount.objects.get(key=team_key).case_count, team_count + 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.case.queues.clear()
+
+        self.assertEqual(QueueCaseCount.objects.get(key=str(self.queue.id)).case_count, 0)
+        self.assertEqual(QueueCaseCount.objects.get(key=team_key).case_count, team_count)
+
+    def test_status_change_adjusts_open_cases_count(self):
+        case_counts = get_queue_case_counts([ALL_CASES_QUEUE_ID, OPEN_CASES_QUEUE_ID])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.case.status = get_case_status_by_status(CaseStatusEnum.FINALISED)
+            self.case.save()
+
+        self.assertEqual(
+            get_queue_case_counts([ALL_CASES_QUEUE_ID, OPEN_CASES_QUEUE_ID]),
+            {
+                ALL_CASES_QUEUE_ID: case_counts[ALL_CASES_QUEUE_ID],
+                OPEN_CASES_QUEUE_ID: case_counts[OPEN_CASES_QUEUE_ID] - 1,
+            },
+        )
+
+    def test_reconcile_command_recounts_from_scratch(self):
+        case_counts = get_queue_case_counts([ALL_CASES_QUEUE_ID, str(self.queue.id)])
+        QueueCaseCount.objects.filter(key=ALL_CASES_QUEUE_ID).update(case_count=999)
+        QueueCaseCount.objects.create(key="stale", case_count=1)
+
+        call_command("reconcile_queue_case_counts")
+
+        self.assertEqual(get_queue_case_counts([ALL_CASES_QUEUE_ID, str(self.queue.id)]), case_counts)
+        self.assertFalse(QueueCaseCount.objects.filter(key="stale").exists())
@@ -1,6 +1,16 @@
+from collections import defaultdict
+
 from celery import shared_task
 from django.apps import apps
 from django_elasticsearch_dsl.registries import registry
+from elasticsearch.helpers import bulk
+
+from api.applications.models import BaseApplication, GoodOnApplication, PartyOnApplication
+from api.cases.models import Case
+from api.goods.models import Good
+from api.organisations.models import Organisation
+from api.parties.models import Party
+from api.search.rebuilds import get_rebuilding_index
 
 UPDATE_SEARCH_INDEX_QUEUE = "update_search_index_queue"
 
@@ -9,6 +19,38 @@ MAX_ATTEMPTS = 3
 RETRY_BACKOFF = 180
 
 
+def get_document_pks(model_pk_pairs):
+    """
+    Works out the applications and products whose search documents are affected by changes to
+    the supplied instances, using one query per related model rather than one per instance
+    """
+    pks_by_model = defaultdict(set)
+    for model_name, pk in model_pk_pairs:
+        pks_by_model[apps.get_model(model_name)].add(pk)
+
+    application_pks = set()
+    product_pks = set()
+    for model, pks in pks_by_model.items():
+        if issubclass(model, (BaseApplication, Case)):
+            application_pks |= pks
+        elif issubclass(model, GoodOnApplication):
+            product_pks |= pks
+        elif issubclass(model, Good):
+            for product_pk, application_pk in GoodOnApplication.objects.filter(good_id__in=pks).values_list(
+                "pk", "application_id"
+            ):
+                product_pks.add(product_pk)
+                application_pks.add(application_pk)
+        elif issubclass(model, Party):
+            application_pks |= set(
+                PartyOnApplication.objects.filter(party_id__in=pks).values_list("application_id", flat=True)
+            )
+        elif issubclass(model, Organisation):
+            application_pks |= set(Case.objects.filter(organisation_id__in=pks).values_list("pk", flat=True))
+
+    return {BaseApplication: application_pks, GoodOnApplication: product_pks}
+
+
 @shared_task(
     autoretry_for=(Exception,),
     max_retries=MAX_ATTEMPTS,
@@ -17,9 +59,24 @@ RETRY_BACKOFF = 180
 def update_search_index(model_pk_pairs):
     """Update the search index with instances of a model as specified by
     the supplied model_name and ids.
+
+    The affected documents are loaded in bulk and sent to the search index in a single bulk request, along with
+    the index that is being rebuilt to replace it if there is one.
     """
+    actions = []
+    connection = None
 
-    for model_name, pk in model_pk_pairs:
-        model = apps.get_model(model_name)
-        instance = model.objects.get(pk=pk)
-        registry.update(instance)
+    for model, pks in get_document_pks(model_pk_pairs).items():
+        if not pks:
+            continue
+        for document_class in registry.get_documents([model]):
+            document = document_class()
+            connection = document._get_connection()
+            rebuilding_index = get_rebuilding_index(document._index._name)
+            for action in document.get_actions(document.get_indexing_queryset().filter(pk__in=pks), "index"):
+                actions.append(action)
+                if rebuilding_index:
+                    actions.append({**action, "_index": rebuilding_index})
+
+    if actions:
+        bulk(client=connection, actions=actions, refresh=True)
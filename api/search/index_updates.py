@@ -0,0 +1,47 @@
+import threading
+from contextlib import contextmanager
+
+from django.db import transaction
+
+from api.search.celery_tasks import update_search_index
+
+_pending = threading.local()
+
+
+def queue_search_index_update(model_name, pk):
+    """
+    Collect a changed instance to be reindexed once the current transaction, or request, is over.
+    The same instance changing repeatedly only results in it being reindexed once.
+    """
+    if getattr(_pending, "updates", None) is None:
+        _pending.updates = set()
+    _pending.updates.add((model_name, str(pk)))
+
+    if not getattr(_pending, "deferred", False):
+        # Callbacks registered after the first find nothing left to flush
+        transaction.on_commit(flush_search_index_updates)
+
+
+def flush_search_index_updates():
+    updates = getattr(_pending, "updates", None)
+    _pending.updates = None
+
+    if updates:
+        update_search_index.delay(sorted(updates))
+
+
+@contextmanager
+def defer_search_index_updates():
+    """
+    Hold back search index updates until the end of the block so they're sent as one task
+    """
+    _pending.deferred = True
+    try:
+        yield
+    finally:
+        _pending.deferred = False
+        transaction.on_commit(flush_search_index_updates)
+
+
+def discard_search_index_updates():
+    _pending.updates = None
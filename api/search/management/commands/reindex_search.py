@@ -0,0 +1,176 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from elasticsearch_dsl.connections import connections
+
+from api.search import reindex
+from api.search.rebuilds import finish_rebuild, start_rebuild
+
+LAST_INDEXED_PK = "last_indexed_pk"
+
+
+def get_pk_chunks(queryset, chunk_size, after_pk=None):
+    """
+    Yields lists of primary keys in ascending order, paging with `pk > last seen` rather than
+    OFFSET so that each chunk costs the same however far into the table it is
+    """
+    queryset = queryset.order_by("pk").values_list("pk", flat=True)
+    while True:
+        chunk_queryset = queryset.filter(pk__gt=after_pk) if after_pk is not None else queryset
+        pks = list(chunk_queryset[:chunk_size])
+        if not pks:
+            return
+        yield pks
+        after_pk = pks[-1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the search indexes without downtime: documents are bulk indexed in parallel into a new "
+        "timestamped index and the alias is switched over to it in one atomic operation once it is complete. "
+        "Live updates are written to the new index as well while it is being built."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--models",
+            nargs="+",
+            choices=reindex.DOCUMENT_NAMES,
+            default=list(reindex.DOCUMENT_NAMES),
+            help="Which indexes to rebuild",
+        )
+        parser.add_argument("--chunk-size", type=int, default=500, help="Number of documents per bulk request")
+        parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Number of indexing processes")
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue the most recent unfinished rebuild from its last completed chunk",
+        )
+        parser.add_argument(
+            "--keep-old-index",
+            action="store_true",
+            help="Keep the previous index after the alias has been switched away from it",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.LITE_API_ENABLE_ES:
+            raise CommandError("Elasticsearch is not enabled, set LITE_API_ENABLE_ES to rebuild the search indexes")
+
+        self.connection = connections.get_connection()
+
+        with ProcessPoolExecutor(
+            max_workers=options["workers"],
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=reindex.init_worker,
+        ) as executor:
+            for document_name in options["models"]:
+                self.reindex(executor, document_name, options)
+
+    def reindex(self, executor, document_name, options):
+        document_class = reindex.get_document_class(document_name)
+        alias = document_class._index._name
+
+        index_name, last_indexed_pk = self.get_unfinished_index(alias) if options["resume"] else (None, None)
+        if index_name:
+            self.stdout.write(f"Resuming '{index_name}' after {last_indexed_pk or 'the start'}")
+        else:
+            index_name = f"{alias}-{timezone.now():%Y%m%d%H%M%S%f}"
+            document_class.init(index=index_name)
+            self.stdout.write(f"Created index '{index_name}'")
+
+        # Before reading any documents, so that changes made after they are read reach the new index too
+        start_rebuild(alias, index_name)
+
+        queryset = document_class().get_queryset()
+        max_pending = options["workers"] * 2
+        pending = {}
+        completed = {}
+        next_chunk_to_record = 0
+        indexed = 0
+        started = time.monotonic()
+
+        def collect(futures):
+            nonlocal next_chunk_to_record, indexed
+            for future in futures:
+                chunk_number, last_pk = pending.pop(future)
+                indexed += future.result()
+                completed[chunk_number] = last_pk
+
+            # Chunks can finish out of order, so progress only moves past chunks that are all done
+            last_recorded_pk = None
+            while next_chunk_to_record in completed:
+                last_recorded_pk = completed.pop(next_chunk_to_record)
+                next_chunk_to_record += 1
+            if last_recorded_pk is not None:
+                self.record_progress(index_name, last_recorded_pk)
+                rate = indexed / max(time.monotonic() - started, 0.001)
+                self.stdout.write(f"{index_name}: {indexed} documents indexed ({rate:.0f} docs/sec)")
+
+        for chunk_number, pks in enumerate(get_pk_chunks(queryset, options["chunk_size"], last_indexed_pk)):
+            future = executor.submit(reindex.index_chunk, document_name, index_name, pks)
+            pending[future] = (chunk_number, str(pks[-1]))
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+
+        collect(wait(pending).done)
+
+        self.connection.indices.refresh(index=index_name)
+        old_indices = self.switch_alias(alias, index_name)
+        finish_rebuild(alias)
+
+        if not options["keep_old_index"]:
+            for old_index in old_indices:
+                self.connection.indices.delete(index=old_index, ignore=404)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"'{alias}' now points at '{index_name}': {indexed} documents indexed in {elapsed:.1f}s "
+                f"({indexed / max(elapsed, 0.001):.0f} docs/sec)"
+            )
+        )
+
+    def get_unfinished_index(self, alias):
+        """
+        Returns the newest index built for `alias` that the alias does not yet point at, along with the
+        primary key it was last indexed up to
+        """
+        aliased = self.get_aliased_indices(alias)
+        candidates = sorted(name for name in self.connection.indices.get(index=f"{alias}-*") if name not in aliased)
+        if not candidates:
+            return None, None
+
+        index_name = candidates[-1]
+        mapping = self.connection.indices.get_mapping(index=index_name)[index_name]["mappings"]
+        return index_name, mapping.get("_meta", {}).get(LAST_INDEXED_PK)
+
+    def record_progress(self, index_name, last_indexed_pk):
+        self.connection.indices.put_mapping(index=index_name, body={"_meta": {LAST_INDEXED_PK: last_indexed_pk}})
+
+    def get_aliased_indices(self, alias):
+        if not self.connection.indices.exists_alias(name=alias):
+            return set()
+        return set(self.connection.indices.get_alias(name=alias))
+
+    def switch_alias(self, alias, index_name):
+        """
+        Points `alias` at `index_name` and away from every other index in a single request, returning the
+        indices it was moved away from
+        """
+        old_indices = sorted(self.get_aliased_indices(alias) - {index_name})
+        actions = [{"add": {"alias": alias, "index": index_name}}]
+        actions += [{"remove": {"alias": alias, "index": old_index}} for old_index in old_indices]
+
+        # Indexes built with `search_index --rebuild` are concrete indices named after the alias, which have to
+        # be removed in the same request for the alias to take their name
+        if not old_indices and self.connection.indices.exists(index=alias):
+            actions.append({"remove_index": {"index": alias}})
+
+        self.connection.indices.update_aliases(body={"actions": actions})
+        return old_indices
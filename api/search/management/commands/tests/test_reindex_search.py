@@ -0,0 +1,96 @@
+from unittest import mock
+
+from elasticsearch.helpers import BulkIndexError
+
+from api.applications.models import BaseApplication
+from api.search import reindex
+from api.search.management.commands.reindex_search import Command, get_pk_chunks
+from test_helpers.clients import DataTestClient
+
+
+class GetPkChunksTests(DataTestClient):
+    def test_chunks_cover_every_pk_once_in_order(self):
+        for _ in range(5):
+            self.create_standard_application_case(self.organisation)
+        queryset = BaseApplication.objects.all()
+
+        chunks = list(get_pk_chunks(queryset, 2))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+        expected_pks = list(queryset.order_by("pk").values_list("pk", flat=True))
+        self.assertEqual([pk for chunk in chunks for pk in chunk], expected_pks)
+
+    def test_chunks_resume_after_pk(self):
+        for _ in range(3):
+            self.create_standard_application_case(self.organisation)
+        pks = list(BaseApplication.objects.order_by("pk").values_list("pk", flat=True))
+
+        chunks = list(get_pk_chunks(BaseApplication.objects.all(), 10, after_pk=str(pks[0])))
+
+        self.assertEqual(chunks, [pks[1:]])
+
+
+@mock.patch("api.search.reindex.bulk")
+@mock.patch("api.search.reindex.get_document_class")
+class IndexChunkTests(DataTestClient):
+    def test_documents_are_created_in_new_index(self, mock_get_document_class, mock_bulk):
+        document = mock_get_document_class.return_value.return_value
+        document.get_actions.return_value = [{"_op_type": "index", "_index": "search", "_id": "1"}]
+        mock_bulk.return_value = (1, [])
+
+        indexed = reindex.index_chunk("application", "search-new", ["1"])
+
+        self.assertEqual(indexed, 1)
+        self.assertEqual(
+            list(mock_bulk.call_args.kwargs["actions"]), [{"_op_type": "create", "_index": "search-new", "_id": "1"}]
+        )
+
+    def test_documents_already_written_by_live_updates_are_kept(self, mock_get_document_class, mock_bulk):
+        mock_bulk.return_value = (1, [{"create": {"_id": "2", "status": 409}}])
+
+        self.assertEqual(reindex.index_chunk("application", "search-new", ["1", "2"]), 1)
+
+    def test_other_errors_are_raised(self, mock_get_document_class, mock_bulk):
+        mock_bulk.return_value = (1, [{"create": {"_id": "2", "status": 400}}])
+
+        with self.assertRaises(BulkIndexError):
+            reindex.index_chunk("application", "search-new", ["1", "2"])
+
+
+class SwitchAliasTests(DataTestClient):
+    def setUp(self):
+        super().setUp()
+        self.command = Command()
+        self.command.connection = mock.Mock()
+
+    def test_switch_alias_moves_alias_atomically(self):
+        self.command.connection.indices.exists_alias.return_value = True
+        self.command.connection.indices.get_alias.return_value = {"search-old": {}}
+
+        old_indices = self.command.switch_alias("search", "search-new")
+
+        self.assertEqual(old_indices, ["search-old"])
+        self.command.connection.indices.update_aliases.assert_called_once_with(
+            body={
+                "actions": [
+                    {"add": {"alias": "search", "index": "search-new"}},
+                    {"remove": {"alias": "search", "index": "search-old"}},
+                ]
+            }
+        )
+
+    def test_switch_alias_replaces_concrete_index(self):
+        self.command.connection.indices.exists_alias.return_value = False
+        self.command.connection.indices.exists.return_value = True
+
+        old_indices = self.command.switch_alias("search", "search-new")
+
+        self.assertEqual(old_indices, [])
+        self.command.connection.indices.update_aliases.assert_called_once_with(
+            body={
+                "actions": [
+                    {"add": {"alias": "search", "index": "search-new"}},
+                    {"remove_index": {"index": "search"}},
+                ]
+            }
+        )
@@ -0,0 +1,14 @@
+from api.search.index_updates import defer_search_index_updates
+
+
+class SearchIndexUpdateMiddleware:
+    """
+    Send the search index updates for everything changed during a request as a single task
+    """
+
+    def __init__(self, get_response=None):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with defer_search_index_updates():
+            return self.get_response(request)
@@ -0,0 +1,25 @@
+"""
+Indexes that are being rebuilt by the `reindex_search` management command. Until the command switches the alias over
+to the new index, live updates are written to both so that nothing that changes during the rebuild is lost.
+"""
+
+from django.core.cache import cache
+
+REBUILDING_INDEX_CACHE_KEY = "search-rebuilding-index"
+
+
+def get_rebuilding_index_cache_key(alias):
+    return f"{REBUILDING_INDEX_CACHE_KEY}:{alias}"
+
+
+def get_rebuilding_index(alias):
+    return cache.get(get_rebuilding_index_cache_key(alias))
+
+
+def start_rebuild(alias, index_name):
+    # Kept until the rebuild finishes, so that updates carry on reaching an index whose rebuild is to be resumed
+    cache.set(get_rebuilding_index_cache_key(alias), index_name, timeout=None)
+
+
+def finish_rebuild(alias):
+    cache.delete(get_rebuilding_index_cache_key(alias))
@@ -0,0 +1,46 @@
+"""
+Functions run by the worker processes of the `reindex_search` management command.
+
+Workers are started with the "spawn" start method so they never share database or Elasticsearch
+sockets with the parent process, which means this module must be importable before Django is set up.
+"""
+
+import django
+from elasticsearch.helpers import BulkIndexError, bulk
+
+DOCUMENT_NAMES = ("application", "product")
+
+
+def get_document_class(document_name):
+    from api.search.application.documents import ApplicationDocumentType
+    from api.search.product.documents import ProductDocumentType
+
+    return {
+        "application": ApplicationDocumentType,
+        "product": ProductDocumentType,
+    }[document_name]
+
+
+def init_worker():
+    django.setup()
+
+
+def index_chunk(document_name, index_name, pks):
+    """
+    Indexes the documents for the supplied primary keys into `index_name` with one bulk request,
+    returning the number of documents indexed
+
+    Documents are only created, not replaced, as any that are already in the index were written by live updates
+    since this chunk was read and are newer.
+    """
+    document = get_document_class(document_name)()
+    queryset = document.get_indexing_queryset().filter(pk__in=pks)
+    actions = (
+        {**action, "_index": index_name, "_op_type": "create"} for action in document.get_actions(queryset, "index")
+    )
+    indexed, errors = bulk(client=document._get_connection(), actions=actions, raise_on_error=False)
+
+    failures = [error for error in errors if error["create"].get("status") != 409]
+    if failures:
+        raise BulkIndexError(f"{len(failures)} document(s) failed to index.", failures)
+    return indexed
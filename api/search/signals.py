@@ -1,11 +1,15 @@
-from django.core.exceptions import ObjectDoesNotExist
+import functools
+
 from django.conf import settings
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
+from django_elasticsearch_dsl.registries import registry
 
 from api.applications.models import BaseApplication, GoodOnApplication
 from api.goods.models import Good
-from api.search.celery_tasks import update_search_index
+from api.search.index_updates import queue_search_index_update
+from api.search.rebuilds import get_rebuilding_index
 
 
 @receiver(post_save)
@@ -17,45 +21,43 @@ def update_search_documents(sender, **kwargs):
     model_name = sender._meta.model_name
     instance = kwargs["instance"]
 
-    application_document_model = "applications.BaseApplication"
-    product_document_model = "applications.GoodOnApplication"
-
     """
     To keep the index fresh we need to update them whenever the underlying data is updated.
     The immediate attributes of the index are handled by django_elasticsearch_dsl but
     additional changes are required to update the related models.
-    The registry update code requires model corresponding to the index which is BaseApplication
-    and GoodOnApplication in our case. We intercept the signals and update the index.
+    Only the changed instance is recorded here, the search index task works out the
+    applications and products affected by it so that no related data is loaded during the request.
     """
-    to_update = []
-
     if issubclass(sender, BaseApplication):
-        to_update.append((application_document_model, instance.baseapplication.pk))
-
-    if issubclass(sender, GoodOnApplication):
-        to_update.append((product_document_model, instance.pk))
-
-    if issubclass(sender, Good):
-        for good_on_application in instance.goods_on_application.all():
-            to_update.append((product_document_model, good_on_application.pk))
-
-    try:
-        if app_label == "cases" and model_name == "caseassignment":
-            to_update.append((application_document_model, instance.case.baseapplication.pk))
-        elif app_label == "cases" and model_name == "case":
-            to_update.append((application_document_model, instance.baseapplication.pk))
-        elif app_label == "goods" and model_name == "good":
-            for good in instance.goods_on_application.all():
-                to_update.append((application_document_model, good.application.pk))
-        elif app_label == "parties" and model_name == "party":
-            for party in instance.parties_on_application.all():
-                to_update.append((application_document_model, party.application.pk))
-        elif app_label == "organisations" and model_name == "organisation":
-            for case in instance.cases.all():
-                to_update.append((application_document_model, case.baseapplication.pk))
-    except ObjectDoesNotExist:
-        pass
-
-    if to_update:
-        to_update = [(model_name, str(pk)) for model_name, pk in to_update]
-        update_search_index.delay(to_update)
+        queue_search_index_update("applications.BaseApplication", instance.pk)
+    elif issubclass(sender, GoodOnApplication):
+        queue_search_index_update("applications.GoodOnApplication", instance.pk)
+    elif issubclass(sender, Good):
+        queue_search_index_update("goods.Good", instance.pk)
+    elif app_label == "cases" and model_name == "caseassignment":
+        queue_search_index_update("cases.Case", instance.case_id)
+    elif app_label == "cases" and model_name == "case":
+        queue_search_index_update("cases.Case", instance.pk)
+    elif app_label == "parties" and model_name == "party":
+        queue_search_index_update("parties.Party", instance.pk)
+    elif app_label == "organisations" and model_name == "organisation":
+        queue_search_index_update("organisations.Organisation", instance.pk)
+
+
+@receiver(post_delete, sender=BaseApplication)
+@receiver(post_delete, sender=GoodOnApplication)
+def delete_from_rebuilding_index(sender, instance, **kwargs):
+    """
+    django_elasticsearch_dsl removes deleted documents from the index the alias points at, so they are only removed
+    here from an index being rebuilt to replace it
+    """
+    if not settings.LITE_API_ENABLE_ES:
+        return
+
+    for document_class in registry.get_documents([sender]):
+        rebuilding_index = get_rebuilding_index(document_class._index._name)
+        if rebuilding_index:
+            delete = functools.partial(
+                document_class._get_connection().delete, index=rebuilding_index, id=str(instance.pk), ignore=404
+            )
+            transaction.on_commit(delete)
@@ -1,73 +1,76 @@
-import json
-
 from unittest.mock import patch
 
 from django.test import override_settings
 
 from api.goods.tests.factories import GoodFactory
 from api.parties.models import PartyType
+from api.search.index_updates import discard_search_index_updates
 from test_helpers.clients import DataTestClient
 
 
+@override_settings(LITE_API_ENABLE_ES=True)
+@patch("api.search.index_updates.update_search_index")
 class UpdateApplicationDocumentTest(DataTestClient):
-    @override_settings(LITE_API_ENABLE_ES=True)
-    @patch("api.search.celery_tasks.registry")
-    def test_standard_application(self, mock_registry):
-        application = self.create_standard_application_case(self.organisation)
-        mock_registry.update.assert_any_call(application.baseapplication)
+    def assert_updates_queued(self, mock_update_search_index, *expected_updates):
+        mock_update_search_index.delay.assert_called_once()
+        queued_updates = mock_update_search_index.delay.call_args.args[0]
+        for model_name, pk in expected_updates:
+            self.assertIn((model_name, str(pk)), queued_updates)
 
-    @override_settings(LITE_API_ENABLE_ES=True)
-    @patch("api.search.celery_tasks.registry")
-    def test_case_assignment(self, mock_registry):
-        assignment = self.create_case_assignment(
-            self.queue, self.create_standard_application_case(self.organisation), self.gov_user
-        )
-        mock_registry.update.assert_any_call(assignment.case.baseapplication)
+    def test_standard_application(self, mock_update_search_index):
+        with self.captureOnCommitCallbacks(execute=True):
+            application = self.create_standard_application_case(self.organisation)
+
+        self.assert_updates_queued(mock_update_search_index, ("applications.BaseApplication", application.pk))
+
+    def test_case_assignment(self, mock_update_search_index):
+        case = self.create_standard_application_case(self.organisation)
 
-    @override_settings(LITE_API_ENABLE_ES=True)
-    @patch("api.search.celery_tasks.registry")
-    def test_case(self, mock_registry):
-        case = self.create_standard_application_case(self.organisation).get_case()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_case_assignment(self.queue, case, self.gov_user)
 
-        mock_registry.update.assert_any_call(case.baseapplication)
+        self.assert_updates_queued(mock_update_search_index, ("cases.Case", case.pk))
 
-    @override_settings(LITE_API_ENABLE_ES=True)
-    @patch("api.search.celery_tasks.registry")
-    def test_good(self, mock_registry):
+    def test_good(self, mock_update_search_index):
         application = self.create_standard_application_case(self.organisation)
-        good = GoodFactory(organisation=self.organisation)
-        good_on_app = self.create_good_on_application(application, good)
-        application.goods.add(good_on_app)
-        application.save()
 
-        mock_registry.update.assert_any_call(good_on_app)
+        with self.captureOnCommitCallbacks(execute=True):
+            good = GoodFactory(organisation=self.organisation)
+            good_on_app = self.create_good_on_application(application, good)
 
-    @override_settings(LITE_API_ENABLE_ES=True)
-    @patch("api.search.celery_tasks.registry")
-    def test_party(self, mock_registry):
+        self.assert_updates_queued(
+            mock_update_search_index,
+            ("goods.Good", good.pk),
+            ("applications.GoodOnApplication", good_on_app.pk),
+        )
+
+    def test_party(self, mock_update_search_index):
         application = self.create_standard_application_case(self.organisation)
-        party = self.create_party("test party", self.organisation, PartyType.END_USER, application=application)
-        party.save()
 
-        mock_registry.update.assert_any_call(application.baseapplication)
+        with self.captureOnCommitCallbacks(execute=True):
+            party = self.create_party("test party", self.organisation, PartyType.END_USER, application=application)
+
+        self.assert_updates_queued(mock_update_search_index, ("parties.Party", party.pk))
 
-    @override_settings(LITE_API_ENABLE_ES=True)
-    @patch("api.search.celery_tasks.registry")
-    def test_organisation(self, mock_registry):
-        application_organisation = self.create_standard_application_case(self.organisation)
+    def test_organisation(self, mock_update_search_index):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.organisation.save()
 
-        mock_registry.update.assert_any_call(application_organisation.baseapplication)
+        self.assert_updates_queued(mock_update_search_index, ("organisations.Organisation", self.organisation.pk))
 
-    @override_settings(LITE_API_ENABLE_ES=True)
-    @patch("api.search.celery_tasks.registry")
-    def test_good_on_application_update_in_index(self, mock_registry):
+    def test_repeated_saves_are_queued_once(self, mock_update_search_index):
         application = self.create_standard_application_case(self.organisation)
+        discard_search_index_updates()
 
-        for good_on_application in application.goods.all():
-            mock_registry.update.assert_any_call(good_on_application)
+        with self.captureOnCommitCallbacks(execute=True):
+            for _ in range(3):
+                application.save()
+
+        mock_update_search_index.delay.assert_called_once_with([("applications.BaseApplication", str(application.pk))])
 
     @override_settings(LITE_API_ENABLE_ES=False)
-    @patch("api.search.celery_tasks.registry")
-    def test_standard_application_with_elasticsearch_disabled(self, mock_registry):
-        self.create_standard_application_case(self.organisation)
-        mock_registry.update.assert_not_called()
+    def test_standard_application_with_elasticsearch_disabled(self, mock_update_search_index):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_standard_application_case(self.organisation)
+
+        mock_update_search_index.delay.assert_not_called()
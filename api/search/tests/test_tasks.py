@@ -1,12 +1,17 @@
-from unittest.mock import call, patch
+from unittest.mock import patch
 
-from api.search.celery_tasks import update_search_index
+from django.conf import settings
+
+from api.goods.tests.factories import GoodFactory
+from api.search.celery_tasks import get_document_pks, update_search_index
+from api.search.rebuilds import finish_rebuild, start_rebuild
+from api.applications.models import BaseApplication, GoodOnApplication
 from test_helpers.clients import DataTestClient
 
 
 class UpdateSearchIndexTests(DataTestClient):
-    @patch("api.search.celery_tasks.registry")
-    def test_update_index(self, mock_registry):
+    @patch("api.search.celery_tasks.bulk")
+    def test_update_index(self, mock_bulk):
         app1 = self.create_standard_application_case(self.organisation)
         app2 = self.create_standard_application_case(self.organisation)
 
@@ -17,5 +22,51 @@ class UpdateSearchIndexTests(DataTestClient):
             ]
         )
 
-        mock_registry.update.assert_any_call(app1)
-        mock_registry.update.assert_any_call(app2)
+        mock_bulk.assert_called_once()
+        actions = mock_bulk.call_args.kwargs["actions"]
+        self.assertEqual(
+            {
+                str(action["_id"])
+                for action in actions
+                if action["_index"] == settings.ELASTICSEARCH_APPLICATION_INDEX_ALIAS
+            },
+            {str(app1.pk), str(app2.pk)},
+        )
+
+    @patch("api.search.celery_tasks.bulk")
+    def test_update_index_also_updates_rebuilding_index(self, mock_bulk):
+        application = self.create_standard_application_case(self.organisation)
+        start_rebuild(settings.ELASTICSEARCH_APPLICATION_INDEX_ALIAS, "application-rebuild")
+
+        update_search_index.delay([("applications.StandardApplication", application.pk)])
+
+        actions = mock_bulk.call_args.kwargs["actions"]
+        self.assertEqual(
+            {(action["_index"], str(action["_id"])) for action in actions if str(action["_id"]) == str(application.pk)},
+            {
+                (settings.ELASTICSEARCH_APPLICATION_INDEX_ALIAS, str(application.pk)),
+                ("application-rebuild", str(application.pk)),
+            },
+        )
+
+        finish_rebuild(settings.ELASTICSEARCH_APPLICATION_INDEX_ALIAS)
+        update_search_index.delay([("applications.StandardApplication", application.pk)])
+
+        actions = mock_bulk.call_args.kwargs["actions"]
+        self.assertNotIn("application-rebuild", {action["_index"] for action in actions})
+
+    @patch("api.search.celery_tasks.bulk")
+    def test_update_index_nothing_to_update(self, mock_bulk):
+        update_search_index.delay([])
+
+        mock_bulk.assert_not_called()
+
+    def test_get_document_pks_for_good(self):
+        application = self.create_standard_application_case(self.organisation)
+        good = GoodFactory(organisation=self.organisation)
+        good_on_application = self.create_good_on_application(application, good)
+
+        document_pks = get_document_pks([("goods.Good", good.pk)])
+
+        self.assertEqual(document_pks[GoodOnApplication], {good_on_application.pk})
+        self.assertEqual(document_pks[BaseApplication], {application.pk})
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class ControlListEntriesConfig(AppConfig):
+    name = "api.staticdata.control_list_entries"
+
+    def ready(self):
+        from . import signals  # noqa
@@ -1,5 +1,9 @@
+from django.http import HttpResponse, HttpResponseNotModified
+
 from api.core.exceptions import NotFoundError
+from api.core.helpers import if_none_match
 from api.staticdata.control_list_entries.models import ControlListEntry
+from api.staticdata.control_list_entries.tree import get_control_list_entry_tree
 
 
 def get_control_list_entry(rating):
@@ -35,19 +39,7 @@ def get_clc_parent_nodes(rating):
     ML1b -> ML1b1, ML1b2
     Given ML1b1, it returns [ML1, ML1b]
     """
-
-    parent_nodes = []
-    try:
-        node = ControlListEntry.objects.get(rating=rating)
-    except ControlListEntry.DoesNotExist:
-        node = None
-
-    if node and node.parent and node.parent.controlled:
-        parent_nodes.append(node.parent.rating)
-        next_parent = get_clc_parent_nodes(node.parent.rating)
-        parent_nodes.extend(next_parent)
-
-    return parent_nodes
+    return get_control_list_entry_tree().get_parent_ratings(rating)
 
 
 def get_clc_child_nodes(group_rating):
@@ -59,19 +51,18 @@ def get_clc_child_nodes(group_rating):
     ML1b -> ML1b1, ML1b2
     Given ML1, it returns [ML1, ML1a, ML1b, ML1b1, ML1b2, ML1c, ML1d]
     """
-    child_nodes = []
-    try:
-        node = ControlListEntry.objects.get(rating=group_rating)
-    except ControlListEntry.DoesNotExist:
-        node = None
+    return get_control_list_entry_tree().get_child_ratings(group_rating)
 
-    if node and node.controlled:
-        if node.children.exists():
-            child_nodes.append(node.rating)
-            for child in node.children.all():
-                next_children = get_clc_child_nodes(child.rating)
-                child_nodes.extend(next_children)
-        else:
-            child_nodes.append(group_rating)
 
-    return child_nodes
+def control_list_entry_tree_response(request, name, build):
+    """
+    Returns a JSON response built from the control list entry tree by `build`, with the tree's ETag so that callers
+    which already have the current version get a 304 instead
+    """
+    tree = get_control_list_entry_tree()
+    if if_none_match(request, tree.etag):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(tree.get_payload(name, build), content_type="application/json")
+    response["ETag"] = tree.etag
+    return response
@@ -0,0 +1,26 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from api.staticdata.control_list_entries.models import ControlListEntry
+from api.staticdata.control_list_entries.tree import invalidate_control_list_entry_tree
+
+
+def _invalidate_tree():
+    # Invalidated straight away so that the rest of the transaction sees its own changes, and again once it commits
+    # in case a concurrent request has rebuilt the tree from the data before them
+    invalidate_control_list_entry_tree()
+    transaction.on_commit(invalidate_control_list_entry_tree)
+
+
+@receiver(post_save, sender=ControlListEntry)
+@receiver(post_delete, sender=ControlListEntry)
+def control_list_entry_changed_handler(sender, instance, **kwargs):
+    _invalidate_tree()
+
+
+@receiver(post_migrate)
+def control_list_entries_migrated_handler(sender, **kwargs):
+    # Data migrations change control list entries without sending save signals
+    if sender.name == "api.staticdata.control_list_entries":
+        _invalidate_tree()
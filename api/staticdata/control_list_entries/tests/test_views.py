@@ -1,7 +1,9 @@
+from django.core.cache import cache
 from rest_framework.reverse import reverse
 
 from api.staticdata.control_list_entries.models import ControlListEntry
 from api.staticdata.control_list_entries.factories import ControlListEntriesFactory
+from api.staticdata.control_list_entries.tree import CONTROL_LIST_ENTRY_TREE_VERSION_CACHE_KEY
 from test_helpers.clients import DataTestClient
 
 
@@ -51,3 +53,54 @@ class ControlListEntriesListTests(DataTestClient):
 
         # Assert that the data returned by the view contains the unselectable CLE
         self.assertIn("rating123", [cle["rating"] for cle in updated_cles_data])
+
+    def test_control_list_entries_not_modified(self):
+        response = self.client.get(self.url, **self.gov_headers)
+        etag = response["ETag"]
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag, **self.gov_headers)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_control_list_entries_not_modified_etag_list(self):
+        etag = self.client.get(self.url, **self.gov_headers)["ETag"]
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=f'"other", W/{etag}', **self.gov_headers)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_control_list_entries_partial_etag_is_modified(self):
+        etag = self.client.get(self.url, **self.gov_headers)["ETag"]
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=f'"x{etag[1:]}', **self.gov_headers)
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_control_list_entries_changed_after_save(self):
+        response = self.client.get(self.url + "?group=True", **self.gov_headers)
+        etag = response["ETag"]
+        parent = ControlListEntry.objects.get(rating="ML1")
+
+        ControlListEntriesFactory(rating="ML1z", text="text", parent=parent)
+        response = self.client.get(self.url + "?group=True", HTTP_IF_NONE_MATCH=etag, **self.gov_headers)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        ml1 = next(cle for cle in response.json()["control_list_entries"] if cle["rating"] == "ML1")
+        self.assertIn("ML1z", [child["rating"] for child in ml1["children"]])
+
+    def test_control_list_entries_rebuilt_before_change_committed_are_refreshed_on_commit(self):
+        etag = self.client.get(self.url + "?group=True", **self.gov_headers)["ETag"]
+        stale_version = cache.get(CONTROL_LIST_ENTRY_TREE_VERSION_CACHE_KEY)
+        parent = ControlListEntry.objects.get(rating="ML1")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ControlListEntriesFactory(rating="ML1z", text="text", parent=parent)
+            # As if a concurrent request had rebuilt the tree from the data before the change
+            cache.set(CONTROL_LIST_ENTRY_TREE_VERSION_CACHE_KEY, stale_version, timeout=None)
+
+        response = self.client.get(self.url + "?group=True", HTTP_IF_NONE_MATCH=etag, **self.gov_headers)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
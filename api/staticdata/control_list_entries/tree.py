@@ -0,0 +1,132 @@
+"""
+The control list entry hierarchy held in memory by each process, so that walking it, looking up entries by rating and
+returning it to the frontends doesn't go to the database. The index is rebuilt when the version held in the shared
+cache changes, which happens whenever a control list entry is saved or deleted.
+"""
+
+import json
+import threading
+import uuid
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+from api.staticdata.control_list_entries.models import ControlListEntry
+
+CONTROL_LIST_ENTRY_TREE_VERSION_CACHE_KEY = "control-list-entry-tree-version"
+
+_tree = None
+_tree_lock = threading.Lock()
+
+
+class ControlListEntryTree:
+    """
+    An index over every control list entry, with each entry's controlled ancestors and descendants worked out once
+    when the index is built
+    """
+
+    def __init__(self, entries, version):
+        self.version = version
+        self.entries = list(entries)
+        self.by_id = {entry["id"]: entry for entry in self.entries}
+        self.by_rating = {entry["rating"]: entry for entry in self.entries}
+
+        children = defaultdict(list)
+        for entry in self.entries:
+            if entry["parent_id"] in self.by_id:
+                children[entry["parent_id"]].append(entry)
+
+        self.parent_ratings = {}
+        self.child_ratings = {}
+        roots = [entry for entry in self.entries if entry["parent_id"] not in self.by_id]
+
+        # Ancestors are worked out top down, stopping at the first parent that isn't controlled
+        stack = [(root, ()) for root in roots]
+        while stack:
+            entry, ancestors = stack.pop()
+            self.parent_ratings[entry["rating"]] = ancestors
+            child_ancestors = (entry["rating"], *ancestors) if entry["controlled"] else ()
+            stack.extend((child, child_ancestors) for child in children[entry["id"]])
+
+        # Descendants are worked out bottom up, leaving out entries that aren't controlled along with everything
+        # below them
+        stack = [(root, False) for root in roots]
+        while stack:
+            entry, children_done = stack.pop()
+            if not children_done:
+                stack.append((entry, True))
+                stack.extend((child, False) for child in children[entry["id"]])
+                continue
+            if not entry["controlled"]:
+                self.child_ratings[entry["rating"]] = ()
+                continue
+            self.child_ratings[entry["rating"]] = (
+                entry["rating"],
+                *(rating for child in children[entry["id"]] for rating in self.child_ratings[child["rating"]]),
+            )
+
+        self._payloads = {}
+
+    @property
+    def etag(self):
+        return f'"{self.version}"'
+
+    def get(self, rating):
+        return self.by_rating.get(rating)
+
+    def get_parent_ratings(self, rating):
+        return list(self.parent_ratings.get(rating, ()))
+
+    def get_child_ratings(self, rating):
+        return list(self.child_ratings.get(rating, ()))
+
+    def get_payload(self, name, build):
+        """
+        Returns the JSON for a response built from the index, which is only serialized once per version
+        """
+        if name not in self._payloads:
+            self._payloads[name] = json.dumps(build(self), cls=DjangoJSONEncoder).encode()
+        return self._payloads[name]
+
+    def get_controlled_entries(self, include_unselectable=True):
+        return [
+            entry
+            for entry in self.entries
+            if entry["controlled"] and (include_unselectable or entry["selectable_for_assessment"])
+        ]
+
+    def get_controlled_tree(self):
+        """
+        Returns the controlled entries nested under their parents, in the same shape as
+        `convert_control_list_entries_to_tree`. Entries under a parent that isn't controlled are listed at the top level.
+        """
+        entries = {entry["id"]: dict(entry) for entry in self.get_controlled_entries()}
+        roots = []
+        for entry in entries.values():
+            parent = entries.get(entry["parent_id"])
+            if parent:
+                parent.setdefault("children", []).append(entry)
+            else:
+                roots.append(entry)
+        return roots
+
+
+def get_control_list_entry_tree_version():
+    return cache.get_or_set(CONTROL_LIST_ENTRY_TREE_VERSION_CACHE_KEY, lambda: uuid.uuid4().hex, timeout=None)
+
+
+def get_control_list_entry_tree():
+    """
+    Returns this process's index of the control list entries, rebuilding it if they have changed since it was built
+    """
+    global _tree
+    version = get_control_list_entry_tree_version()
+    with _tree_lock:
+        if _tree is None or _tree.version != version:
+            _tree = ControlListEntryTree(ControlListEntry.objects.values(), version)
+        return _tree
+
+
+def invalidate_control_list_entry_tree():
+    cache.delete(CONTROL_LIST_ENTRY_TREE_VERSION_CACHE_KEY)
@@ -4,8 +4,7 @@ from rest_framework.decorators import permission_classes
 from rest_framework.views import APIView
 
 from api.core.authentication import GovAuthentication, SharedAuthentication
-from api.staticdata.control_list_entries.helpers import get_control_list_entry, convert_control_list_entries_to_tree
-from api.staticdata.control_list_entries.models import ControlListEntry
+from api.staticdata.control_list_entries.helpers import control_list_entry_tree_response, get_control_list_entry
 from api.staticdata.control_list_entries.serializers import ControlListEntrySerializerWithLinks
 
 
@@ -14,22 +13,36 @@ from api.staticdata.control_list_entries.serializers import ControlListEntrySeri
 class ControlListEntriesList(APIView):
     authentication_classes = (GovAuthentication,)
 
-    def get_queryset(self, include_unselectable=False):
-        return ControlListEntry.objects.filter(controlled=True)
-
     def get(self, request):
         """
         Returns list of all Control List Entries
         """
-        queryset = self.get_queryset()
-
         if request.GET.get("group", False):
-            return JsonResponse(data={"control_list_entries": convert_control_list_entries_to_tree(queryset.values())})
+            return control_list_entry_tree_response(
+                request, "grouped", lambda tree: {"control_list_entries": tree.get_controlled_tree()}
+            )
 
         if request.GET.get("include_parent", False):
-            return JsonResponse(data={"control_list_entries": list(queryset.values("rating", "text", "parent"))})
-
-        return JsonResponse(data={"control_list_entries": list(queryset.values("rating", "text"))})
+            return control_list_entry_tree_response(
+                request,
+                "with_parents",
+                lambda tree: {
+                    "control_list_entries": [
+                        {"rating": entry["rating"], "text": entry["text"], "parent": entry["parent_id"]}
+                        for entry in tree.get_controlled_entries()
+                    ]
+                },
+            )
+
+        return control_list_entry_tree_response(
+            request,
+            "flat",
+            lambda tree: {
+                "control_list_entries": [
+                    {"rating": entry["rating"], "text": entry["text"]} for entry in tree.get_controlled_entries()
+                ]
+            },
+        )
 
 
 class ControlListEntryDetail(APIView):
@@ -1,18 +1,19 @@
-from rest_framework import generics
+from rest_framework.views import APIView
 
 from api.core.authentication import ExporterAuthentication
-from api.staticdata.control_list_entries.models import ControlListEntry
-from api.staticdata.exporter.control_list_entries.serializers import ControlListEntriesListSerializer
+from api.staticdata.control_list_entries.helpers import control_list_entry_tree_response
 
 
-class ControlListEntriesList(generics.ListAPIView):
+class ControlListEntriesList(APIView):
     authentication_classes = (ExporterAuthentication,)
-    pagination_class = None
-    serializer_class = ControlListEntriesListSerializer
 
-    def get_queryset(self):
-        include_unselectable = self.request.GET.get("include_non_selectable_for_assessment", False)
-        if include_unselectable:
-            return ControlListEntry.objects.filter(controlled=True)
-
-        return ControlListEntry.objects.filter(controlled=True, selectable_for_assessment=True)
+    def get(self, request):
+        include_unselectable = bool(request.GET.get("include_non_selectable_for_assessment", False))
+        return control_list_entry_tree_response(
+            request,
+            f"exporter:{include_unselectable}",
+            lambda tree: [
+                {"rating": entry["rating"], "text": entry["text"]}
+                for entry in tree.get_controlled_entries(include_unselectable=include_unselectable)
+            ],
+        )
@@ -0,0 +1,175 @@
+"""
+Builds the data the benchmarks run against. Everything is generated from a seed so that the same scale always gives
+the same shape of data, and each application is seeded by its position so that topping up from one scale to a larger
+one gives the same result as generating the larger scale from scratch.
+"""
+
+import random
+from collections import namedtuple
+from decimal import Decimal
+
+import factory.random
+from faker import Faker
+
+from django.utils import timezone
+
+from api.applications.models import StandardApplication
+from api.applications.tests.factories import (
+    GoodFactory,
+    GoodOnApplicationFactory,
+    PartyFactory,
+    PartyOnApplicationFactory,
+    StandardApplicationFactory,
+)
+from api.cases.enums import CaseTypeEnum
+from api.cases.models import Case
+from api.core.constants import Roles
+from api.goods.models import Good
+from api.letter_templates.models import LetterTemplate
+from api.letter_templates.tests.factories import SIELLicenceTemplateFactory
+from api.organisations.models import Organisation
+from api.organisations.tests.factories import OrganisationFactory
+from api.parties.enums import PartyType
+from api.staticdata.control_list_entries.models import ControlListEntry
+from api.staticdata.countries.models import Country
+from api.teams.models import Team
+from api.users.libraries.user_to_token import user_to_token
+from api.users.models import BaseUser, ExporterUser, GovUser, Role, UserOrganisationRelationship
+from api.users.tests.factories import ExporterUserFactory, GovUserFactory, UserOrganisationRelationshipFactory
+
+NUMBER_OF_ORGANISATIONS = 5
+NUMBER_OF_PRODUCTS_PER_ORGANISATION = 60
+MAX_GOODS_PER_APPLICATION = 5
+
+ORGANISATION_NAME = "Benchmark organisation {}"
+GOV_USER_EMAIL = "benchmark.caseworker@example.com"
+EXPORTER_USER_EMAIL = "benchmark.exporter@example.com"
+LETTER_TEMPLATE_NAME = "Benchmark letter"
+
+BenchmarkData = namedtuple("BenchmarkData", "gov_headers exporter_headers case_ids letter_template_id")
+
+
+def seed_random(*values):
+    seed = ":".join(str(value) for value in values)
+    random.seed(seed)
+    factory.random.reseed_random(seed)
+    Faker.seed(seed)
+
+
+def get_or_create_users(organisation):
+    base_user = BaseUser.objects.filter(email=GOV_USER_EMAIL).first()
+    if base_user:
+        gov_user = GovUser.objects.get(baseuser_ptr=base_user)
+    else:
+        gov_user = GovUserFactory(
+            baseuser_ptr__email=GOV_USER_EMAIL,
+            team=Team.objects.get(name="Admin"),
+            role_id=Roles.INTERNAL_SUPER_USER_ROLE_ID,
+        )
+
+    base_user = BaseUser.objects.filter(email=EXPORTER_USER_EMAIL).first()
+    if base_user:
+        exporter_user = ExporterUser.objects.get(baseuser_ptr=base_user)
+    else:
+        exporter_user = ExporterUserFactory(baseuser_ptr__email=EXPORTER_USER_EMAIL)
+    if not UserOrganisationRelationship.objects.filter(user=exporter_user, organisation=organisation).exists():
+        UserOrganisationRelationshipFactory(
+            user=exporter_user,
+            organisation=organisation,
+            role=Role.objects.get(id=Roles.EXPORTER_ADMINISTRATOR_ROLE_ID),
+        )
+
+    return gov_user, exporter_user
+
+
+def get_or_create_organisations(seed):
+    organisations = []
+    for index in range(NUMBER_OF_ORGANISATIONS):
+        name = ORGANISATION_NAME.format(index)
+        organisation = Organisation.objects.filter(name=name).first()
+        if not organisation:
+            seed_random(seed, "organisation", index)
+            organisation = OrganisationFactory(name=name)
+            for _ in range(NUMBER_OF_PRODUCTS_PER_ORGANISATION):
+                GoodFactory(organisation=organisation)
+        organisations.append(organisation)
+    return organisations
+
+
+def create_application(seed, index, organisation, exporter_user, products, control_list_entries, countries):
+    seed_random(seed, "application", index)
+
+    application = StandardApplicationFactory(
+        name=f"Benchmark application {index}",
+        organisation=organisation,
+        submitted_by=exporter_user,
+    )
+    Case.objects.filter(id=application.id).update(submitted_at=timezone.now())
+
+    for good in random.sample(products, random.randint(1, MAX_GOODS_PER_APPLICATION)):  # nosec
+        control_list_entry = random.choice(control_list_entries)  # nosec
+        good_on_application = GoodOnApplicationFactory(
+            application=application,
+            good=good,
+            quantity=random.randint(1, 99),  # nosec
+            unit="NAR",
+            value=Decimal(random.randint(1, 999)),  # nosec
+        )
+        good_on_application.control_list_entries.set([control_list_entry])
+
+    for party_type in [PartyType.CONSIGNEE, PartyType.END_USER, PartyType.ULTIMATE_END_USER]:
+        PartyOnApplicationFactory(
+            application=application,
+            party=PartyFactory(type=party_type, country=random.choice(countries)),  # nosec
+        )
+
+    return application
+
+
+def generate_benchmark_data(scale, seed=0, stdout=None):
+    """
+    Makes sure there are `scale` benchmark applications, creating only the ones that are missing
+    """
+    organisations = get_or_create_organisations(seed)
+    gov_user, exporter_user = get_or_create_users(organisations[0])
+
+    letter_template = LetterTemplate.objects.filter(name=LETTER_TEMPLATE_NAME).first()
+    if not letter_template:
+        letter_template = SIELLicenceTemplateFactory(name=LETTER_TEMPLATE_NAME, case_types=[CaseTypeEnum.SIEL.id])
+
+    applications = StandardApplication.objects.filter(organisation__in=organisations)
+    existing = applications.count()
+    if existing < scale:
+        products = {
+            organisation.id: list(Good.objects.filter(organisation=organisation).order_by("created_at", "id"))
+            for organisation in organisations
+        }
+        control_list_entries = list(ControlListEntry.objects.filter(controlled=True).order_by("rating"))
+        countries = list(Country.objects.order_by("id"))
+
+        for index in range(existing, scale):
+            # Most of the applications belong to the organisation the exporter user is in
+            organisation = organisations[0] if index % 2 == 0 else organisations[index % NUMBER_OF_ORGANISATIONS]
+            create_application(
+                seed,
+                index,
+                organisation,
+                exporter_user,
+                products[organisation.id],
+                control_list_entries,
+                countries,
+            )
+            if stdout and (index + 1) % 1000 == 0:
+                stdout.write(f"Created {index + 1} of {scale} applications")
+
+    return BenchmarkData(
+        gov_headers={"HTTP_GOV_USER_TOKEN": user_to_token(gov_user.baseuser_ptr)},
+        exporter_headers={
+            "HTTP_EXPORTER_USER_TOKEN": user_to_token(exporter_user.baseuser_ptr),
+            "HTTP_ORGANISATION_ID": str(organisations[0].id),
+        },
+        case_ids=list(
+            applications.filter(organisation=organisations[0]).order_by("name").values_list("id", flat=True)[:10]
+        ),
+        letter_template_id=letter_template.id,
+    )
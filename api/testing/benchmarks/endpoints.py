@@ -0,0 +1,64 @@
+from collections import namedtuple
+
+from django.urls import reverse
+
+# `get_path` is given the benchmark data and the iteration, so that detail endpoints can cycle through cases
+Benchmark = namedtuple("Benchmark", "name user get_path")
+
+GOV = "gov"
+EXPORTER = "exporter"
+DATA_WORKSPACE = "data_workspace"
+
+
+def _case_id(data, iteration):
+    return data.case_ids[iteration % len(data.case_ids)]
+
+
+BENCHMARKS = [
+    Benchmark("case_search", GOV, lambda data, iteration: reverse("cases:search")),
+    Benchmark(
+        "case_detail",
+        GOV,
+        lambda data, iteration: reverse("cases:case", kwargs={"pk": _case_id(data, iteration)}),
+    ),
+    Benchmark("application_list", EXPORTER, lambda data, iteration: reverse("applications:applications")),
+    Benchmark(
+        "application_detail",
+        EXPORTER,
+        lambda data, iteration: reverse("applications:application", kwargs={"pk": _case_id(data, iteration)}),
+    ),
+    Benchmark(
+        "letter_preview",
+        GOV,
+        lambda data, iteration: reverse("cases:generated_documents:preview", kwargs={"pk": _case_id(data, iteration)})
+        + f"?template={data.letter_template_id}&text=Benchmark",
+    ),
+    Benchmark(
+        "case_activity",
+        GOV,
+        lambda data, iteration: reverse("cases:activity", kwargs={"pk": _case_id(data, iteration)})
+        + "?pagination=keyset",
+    ),
+    Benchmark(
+        "data_workspace_v1_standard_applications",
+        DATA_WORKSPACE,
+        lambda data, iteration: reverse("data_workspace:v1:dw-standard-applications-list"),
+    ),
+    Benchmark(
+        "data_workspace_v1_good_on_applications",
+        DATA_WORKSPACE,
+        lambda data, iteration: reverse("data_workspace:v1:dw-good-on-applications-list"),
+    ),
+    Benchmark(
+        "data_workspace_v2_applications",
+        DATA_WORKSPACE,
+        lambda data, iteration: reverse("data_workspace:v2:dw-applications-list"),
+    ),
+    Benchmark(
+        "data_workspace_v2_goods",
+        DATA_WORKSPACE,
+        lambda data, iteration: reverse("data_workspace:v2:dw-goods-list"),
+    ),
+]
+
+BENCHMARK_NAMES = [benchmark.name for benchmark in BENCHMARKS]
@@ -0,0 +1,109 @@
+"""
+Runs the benchmarks in process with Django's test client, recording the latency and number of queries of each
+endpoint and comparing them against the budgets committed for the scale they were run at.
+"""
+
+import json
+import math
+import time
+from pathlib import Path
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from api.testing.benchmarks.endpoints import DATA_WORKSPACE, EXPORTER, GOV
+
+BUDGETS_PATH = Path(__file__).parent / "budgets.json"
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+def percentile(values, percent):
+    """
+    Returns the nearest-rank percentile of `values`
+    """
+    ordered = sorted(values)
+    return ordered[max(math.ceil(percent / 100 * len(ordered)) - 1, 0)]
+
+
+def get_headers(benchmark, data):
+    return {
+        GOV: data.gov_headers,
+        EXPORTER: data.exporter_headers,
+        DATA_WORKSPACE: {},
+    }[benchmark.user]
+
+
+def run_benchmark(benchmark, data, iterations, warmup=1):
+    """
+    Requests the benchmark's endpoint `warmup` times without recording anything, so that per process caches are
+    populated, and then `iterations` times, returning the p50 and p95 latency and the most queries any request made
+    """
+    client = Client()
+    headers = get_headers(benchmark, data)
+    durations = []
+    queries = 0
+
+    for iteration in range(-warmup, iterations):
+        path = benchmark.get_path(data, iteration)
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = client.get(path, **headers)
+            if response.streaming:
+                b"".join(response.streaming_content)
+            duration = time.perf_counter() - started
+
+        if response.status_code != 200:
+            raise BenchmarkError(f"{benchmark.name}: {path} returned {response.status_code}")
+        if iteration < 0:
+            continue
+
+        durations.append(duration * 1000)
+        queries = max(queries, len(captured))
+
+    return {
+        "p50_ms": round(percentile(durations, 50), 2),
+        "p95_ms": round(percentile(durations, 95), 2),
+        "queries": queries,
+    }
+
+
+def load_budgets(path=BUDGETS_PATH):
+    with open(path) as budgets_file:
+        return json.load(budgets_file)
+
+
+def save_budgets(budgets, path=BUDGETS_PATH):
+    with open(path, "w") as budgets_file:
+        json.dump(budgets, budgets_file, indent=2, sort_keys=True)
+        budgets_file.write("\n")
+
+
+def compare_with_budgets(results, budgets, latency_tolerance):
+    """
+    Returns a message for each endpoint that has no budget, made more queries than its budget allows, or whose p95
+    latency is over its budget by more than `latency_tolerance` (a fraction of the budget). A budget can leave out the
+    p95 latency, which unlike the number of queries depends on the machine the benchmarks run on.
+    """
+    regressions = []
+    for name, result in results.items():
+        budget = budgets.get(name)
+        if not budget:
+            regressions.append(f"{name}: no budget recorded")
+            continue
+
+        if result["queries"] > budget["queries"]:
+            regressions.append(f"{name}: {result['queries']} queries, budget is {budget['queries']}")
+
+        if "p95_ms" not in budget:
+            continue
+        allowed_p95_ms = budget["p95_ms"] * (1 + latency_tolerance)
+        if result["p95_ms"] > allowed_p95_ms:
+            regressions.append(
+                f"{name}: p95 of {result['p95_ms']}ms, budget is {budget['p95_ms']}ms "
+                f"(+{latency_tolerance:.0%} allows {allowed_p95_ms:.2f}ms)"
+            )
+    return regressions
@@ -0,0 +1,22 @@
+from unittest import mock
+
+from django.test import override_settings
+
+from api.testing.benchmarks.data import generate_benchmark_data
+from api.testing.benchmarks.endpoints import BENCHMARKS
+from api.testing.benchmarks.runner import run_benchmark
+from test_helpers.clients import DataTestClient
+
+
+@mock.patch("api.testing.benchmarks.data.NUMBER_OF_PRODUCTS_PER_ORGANISATION", 5)
+@override_settings(HAWK_AUTHENTICATION_ENABLED=False, ALLOWED_HOSTS=["*"])
+class BenchmarkQueryCountTests(DataTestClient):
+    def test_query_counts_do_not_grow_with_scale(self):
+        # The query budgets hold at every scale only if no endpoint makes queries per row
+        data = generate_benchmark_data(2)
+        queries = {benchmark.name: run_benchmark(benchmark, data, iterations=2)["queries"] for benchmark in BENCHMARKS}
+
+        data = generate_benchmark_data(6)
+        for benchmark in BENCHMARKS:
+            with self.subTest(benchmark=benchmark.name):
+                self.assertEqual(run_benchmark(benchmark, data, iterations=2)["queries"], queries[benchmark.name])
@@ -0,0 +1,55 @@
+import pytest
+
+from api.testing.benchmarks.runner import compare_with_budgets, percentile
+
+
+@pytest.mark.parametrize(
+    "values, percent, expected",
+    [
+        ([5], 50, 5),
+        ([5], 95, 5),
+        ([4, 1, 3, 2], 50, 2),
+        ([4, 1, 3, 2], 95, 4),
+        (list(range(1, 21)), 95, 19),
+        (list(range(1, 21)), 100, 20),
+        (list(range(1, 21)), 0, 1),
+    ],
+)
+def test_percentile(values, percent, expected):
+    assert percentile(values, percent) == expected
+
+
+def test_compare_with_budgets_within_budget():
+    results = {"case_search": {"p50_ms": 10, "p95_ms": 23.9, "queries": 12}}
+    budgets = {"case_search": {"p50_ms": 10, "p95_ms": 20, "queries": 12}}
+
+    assert compare_with_budgets(results, budgets, latency_tolerance=0.2) == []
+
+
+def test_compare_with_budgets_over_query_budget():
+    results = {"case_search": {"p50_ms": 10, "p95_ms": 20, "queries": 13}}
+    budgets = {"case_search": {"p50_ms": 10, "p95_ms": 20, "queries": 12}}
+
+    assert compare_with_budgets(results, budgets, latency_tolerance=0.2) == ["case_search: 13 queries, budget is 12"]
+
+
+def test_compare_with_budgets_over_latency_budget():
+    results = {"case_search": {"p50_ms": 10, "p95_ms": 24.1, "queries": 12}}
+    budgets = {"case_search": {"p50_ms": 10, "p95_ms": 20, "queries": 12}}
+
+    assert compare_with_budgets(results, budgets, latency_tolerance=0.2) == [
+        "case_search: p95 of 24.1ms, budget is 20ms (+20% allows 24.00ms)"
+    ]
+
+
+def test_compare_with_budgets_query_only_budget():
+    results = {"case_search": {"p50_ms": 10, "p95_ms": 1000, "queries": 12}}
+    budgets = {"case_search": {"queries": 12}}
+
+    assert compare_with_budgets(results, budgets, latency_tolerance=0.2) == []
+
+
+def test_compare_with_budgets_missing_budget():
+    results = {"case_search": {"p50_ms": 10, "p95_ms": 20, "queries": 12}}
+
+    assert compare_with_budgets(results, {}, latency_tolerance=0.2) == ["case_search: no budget recorded"]
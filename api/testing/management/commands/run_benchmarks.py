@@ -0,0 +1,104 @@
+import json
+import logging
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from api.testing.benchmarks.data import generate_benchmark_data
+from api.testing.benchmarks.endpoints import BENCHMARK_NAMES, BENCHMARKS
+from api.testing.benchmarks.runner import (
+    BUDGETS_PATH,
+    compare_with_budgets,
+    load_budgets,
+    run_benchmark,
+    save_budgets,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates benchmark data at the given scale, times the main endpoints against it and fails if any of them "
+        "go over the query count or latency budgets recorded for that scale"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", type=int, default=1000, help="Number of applications to benchmark against")
+        parser.add_argument("--seed", type=int, default=0, help="Seed used to generate the benchmark data")
+        parser.add_argument("--iterations", type=int, default=20, help="Number of timed requests per endpoint")
+        parser.add_argument(
+            "--benchmark",
+            action="append",
+            choices=BENCHMARK_NAMES,
+            help="Only run the named benchmark, can be given more than once",
+        )
+        parser.add_argument("--output", help="File to write the results to as JSON")
+        parser.add_argument("--budgets", default=str(BUDGETS_PATH), help="File the budgets are read from")
+        parser.add_argument(
+            "--update-budgets",
+            action="store_true",
+            help="Record the query counts as the budgets for this scale instead of comparing against them",
+        )
+        parser.add_argument(
+            "--include-latency",
+            action="store_true",
+            help="Also record the p95 latency in the budgets, which only holds on the machine they are recorded on",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.2,
+            help="Fraction by which the p95 latency can go over its budget before it counts as a regression",
+        )
+
+    def handle(self, *args, **options):
+        env = settings.ENV
+        if env != "localhost":
+            logging.error("Command only allowed to execute in local environment, current env is %s\n", env)
+            return
+
+        if not settings.DEBUG:
+            logging.error("Command allowed only when DEBUG is enabled\n")
+            return
+
+        scale = options["scale"]
+        data = generate_benchmark_data(scale, seed=options["seed"], stdout=self.stdout)
+        benchmarks = [
+            benchmark for benchmark in BENCHMARKS if not options["benchmark"] or benchmark.name in options["benchmark"]
+        ]
+
+        results = {}
+        # Data Workspace endpoints are authenticated with Hawk, which the test client can't sign requests for
+        with override_settings(HAWK_AUTHENTICATION_ENABLED=False, ALLOWED_HOSTS=["*"]):
+            for benchmark in benchmarks:
+                result = run_benchmark(benchmark, data, options["iterations"])
+                results[benchmark.name] = result
+                self.stdout.write(
+                    f"{benchmark.name}: p50 {result['p50_ms']}ms, p95 {result['p95_ms']}ms, "
+                    f"{result['queries']} queries"
+                )
+
+        if options["output"]:
+            with open(options["output"], "w") as output_file:
+                json.dump({"scale": scale, "seed": options["seed"], "results": results}, output_file, indent=2)
+
+        budgets = load_budgets(options["budgets"])
+        if options["update_budgets"]:
+            budgets.setdefault(str(scale), {}).update(
+                {
+                    name: result if options["include_latency"] else {"queries": result["queries"]}
+                    for name, result in results.items()
+                }
+            )
+            save_budgets(budgets, options["budgets"])
+            self.stdout.write(self.style.SUCCESS(f"Updated the budgets for a scale of {scale}"))
+            return
+
+        scale_budgets = budgets.get(str(scale))
+        if not scale_budgets:
+            raise CommandError(f"No budgets recorded for a scale of {scale}, record them with --update-budgets")
+
+        regressions = compare_with_budgets(results, scale_budgets, options["tolerance"])
+        if regressions:
+            raise CommandError("Benchmarks went over budget:\n" + "\n".join(regressions))
+        self.stdout.write(self.style.SUCCESS("All benchmarks within budget"))
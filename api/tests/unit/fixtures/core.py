@@ -218,22 +218,23 @@ def get_draft_application(organisation):
 
 
 @pytest.fixture
-def submit_application(api_client, exporter_headers, mocker):
+def submit_application(api_client, exporter_headers, mocker, django_capture_on_commit_callbacks):
     def _submit_application(draft_application):
         mocker.patch("api.documents.libraries.s3_operations.upload_bytes_file", return_value=None)
-        response = api_client.put(
-            reverse(
-                "applications:application_submit",
-                kwargs={
-                    "pk": draft_application.pk,
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.put(
+                reverse(
+                    "applications:application_submit",
+                    kwargs={
+                        "pk": draft_application.pk,
+                    },
+                ),
+                data={
+                    "submit_declaration": True,
+                    "agreed_to_declaration_text": "i agree",
                 },
-            ),
-            data={
-                "submit_declaration": True,
-                "agreed_to_declaration_text": "i agree",
-            },
-            **exporter_headers,
-        )
+                **exporter_headers,
+            )
         assert response.status_code == 200, response.json()["errors"]  # nosec
 
         draft_application.refresh_from_db()
@@ -1,5 +1,6 @@
 import os
 
+from django.core.cache import cache
 from django.core.management import call_command
 from django.db.migrations.executor import MigrationExecutor
 from django import db
@@ -77,6 +78,19 @@ def disable_hawk(settings):
     settings.HAWK_AUTHENTICATION_ENABLED = False
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def discard_search_index_updates():
+    # Updates are sent on commit, which doesn't happen for most tests
+    from api.search.index_updates import discard_search_index_updates
+
+    discard_search_index_updates()
+
+
 @pytest.fixture()
 def migration(transactional_db):
     """